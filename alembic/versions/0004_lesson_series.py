@@ -0,0 +1,71 @@
+"""Recurring lesson series"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0004_lesson_series"
+down_revision = "0003_coach_clubs_lesson_courts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    lesson_type = postgresql.ENUM("club", "private", name="lesson_type", create_type=False)
+    lesson_status = postgresql.ENUM("draft", "set", "executed", "invoiced", name="lesson_status", create_type=False)
+
+    op.create_table(
+        "lesson_series",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("coach_id", sa.Integer(), sa.ForeignKey("coaches.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("club_id", sa.Integer(), sa.ForeignKey("clubs.id", ondelete="SET NULL")),
+        sa.Column("rrule", sa.String(length=255), nullable=False),
+        sa.Column("starts_on", sa.Date(), nullable=False),
+        sa.Column("ends_on", sa.Date()),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("total_amount", sa.Numeric(10, 2), nullable=False),
+        sa.Column("type", lesson_type, nullable=False),
+        sa.Column("status", lesson_status, nullable=False, server_default="set"),
+        sa.Column("club_reimbursement_amount", sa.Numeric(10, 2)),
+        sa.Column("notes", sa.Text()),
+        sa.Column("active", sa.Boolean(), nullable=False, server_default=sa.text("true")),
+        sa.Column("expanded_until", sa.Date()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.CheckConstraint("duration_minutes > 0", name="ck_lesson_series_duration_positive"),
+    )
+    op.create_index("ix_lesson_series_coach_id", "lesson_series", ["coach_id"])
+
+    for name, column, target in (
+        ("series_players", "player_id", "players.id"),
+        ("series_strokes", "stroke_id", "strokes.id"),
+        ("series_courts", "court_id", "courts.id"),
+    ):
+        op.create_table(
+            name,
+            sa.Column(
+                "series_id", sa.Integer(), sa.ForeignKey("lesson_series.id", ondelete="CASCADE"), primary_key=True
+            ),
+            sa.Column(column, sa.Integer(), sa.ForeignKey(target, ondelete="CASCADE"), primary_key=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+    op.create_index("ix_series_players_player_id", "series_players", ["player_id"])
+
+    op.add_column(
+        "lessons", sa.Column("series_id", sa.Integer(), sa.ForeignKey("lesson_series.id", ondelete="SET NULL"))
+    )
+    op.create_index("ix_lessons_series_date", "lessons", ["series_id", "date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_lessons_series_date", table_name="lessons")
+    op.drop_column("lessons", "series_id")
+    op.drop_index("ix_series_players_player_id", table_name="series_players")
+    op.drop_table("series_courts")
+    op.drop_table("series_strokes")
+    op.drop_table("series_players")
+    op.drop_index("ix_lesson_series_coach_id", table_name="lesson_series")
+    op.drop_table("lesson_series")
@@ -0,0 +1,38 @@
+"""Coach rate cards"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0005_rate_cards"
+down_revision = "0004_lesson_series"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    lesson_type = postgresql.ENUM("club", "private", name="lesson_type", create_type=False)
+
+    op.create_table(
+        "rate_cards",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("coach_id", sa.Integer(), sa.ForeignKey("coaches.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("club_id", sa.Integer(), sa.ForeignKey("clubs.id", ondelete="CASCADE")),
+        sa.Column("lesson_type", lesson_type),
+        sa.Column("min_players", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_players", sa.Integer()),
+        sa.Column("hourly_rate", sa.Numeric(10, 2), nullable=False),
+        sa.Column("club_reimbursement_hourly_rate", sa.Numeric(10, 2)),
+        sa.Column("active", sa.Boolean(), nullable=False, server_default=sa.text("true")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.CheckConstraint("min_players >= 0", name="ck_rate_cards_min_players"),
+        sa.CheckConstraint("max_players IS NULL OR max_players >= min_players", name="ck_rate_cards_player_band"),
+    )
+    op.create_index("ix_rate_cards_coach_id", "rate_cards", ["coach_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_cards_coach_id", table_name="rate_cards")
+    op.drop_table("rate_cards")
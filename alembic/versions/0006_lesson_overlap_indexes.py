@@ -0,0 +1,23 @@
+"""Indexes for lesson overlap checks"""
+
+from alembic import op
+
+
+revision = "0006_lesson_overlap_indexes"
+down_revision = "0005_rate_cards"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_lessons_date_start", "lessons", ["date", "start_time"])
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_lessons_period_gist ON lessons USING gist (tsrange(date + start_time, date + end_time))"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_lessons_period_gist")
+    op.drop_index("ix_lessons_date_start", table_name="lessons")
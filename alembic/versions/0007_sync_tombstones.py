@@ -0,0 +1,33 @@
+"""Sync tombstones and updated_at indexes"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_sync_tombstones"
+down_revision = "0006_lesson_overlap_indexes"
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ("clubs", "courts", "strokes", "players", "lessons", "invoices")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("coach_id", sa.Integer()),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_sync_tombstones_deleted_at", "sync_tombstones", ["deleted_at", "id"])
+    for table in SYNCED_TABLES:
+        op.create_index(f"ix_{table}_updated_at", table, ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    for table in SYNCED_TABLES:
+        op.drop_index(f"ix_{table}_updated_at", table_name=table)
+    op.drop_index("ix_sync_tombstones_deleted_at", table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
@@ -0,0 +1,32 @@
+"""Client-generated ids and edit times for offline upserts"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_offline_client_ids"
+down_revision = "0007_sync_tombstones"
+branch_labels = None
+depends_on = None
+
+TABLES = ("courts", "players", "lessons")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column("client_id", sa.Uuid()))
+        op.add_column(
+            table, sa.Column("edited_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False)
+        )
+    op.create_unique_constraint("uq_courts_client_id", "courts", ["client_id"])
+    op.create_unique_constraint("uq_players_client_id", "players", ["client_id"])
+    op.create_unique_constraint("uq_lessons_coach_client_id", "lessons", ["coach_id", "client_id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_lessons_coach_client_id", "lessons", type_="unique")
+    op.drop_constraint("uq_players_client_id", "players", type_="unique")
+    op.drop_constraint("uq_courts_client_id", "courts", type_="unique")
+    for table in TABLES:
+        op.drop_column(table, "edited_at")
+        op.drop_column(table, "client_id")
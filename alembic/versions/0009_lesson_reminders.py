@@ -0,0 +1,26 @@
+"""Sent lesson reminders"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_lesson_reminders"
+down_revision = "0008_offline_client_ids"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lesson_reminders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("lesson_id", sa.Integer(), sa.ForeignKey("lessons.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("player_id", sa.Integer(), sa.ForeignKey("players.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("lesson_date", sa.Date(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("lesson_id", "player_id", "lesson_date", name="uq_lesson_reminders_sent"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("lesson_reminders")
@@ -0,0 +1,30 @@
+"""Outbox for queued domain event handlers"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_domain_event_outbox"
+down_revision = "0010_job_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "domain_event_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("handler", sa.String(length=128), nullable=False),
+        sa.Column("event", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("processed_at", sa.DateTime()),
+        sa.Column("last_error", sa.Text()),
+    )
+    op.create_index("ix_domain_event_outbox_pending", "domain_event_outbox", ["processed_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_domain_event_outbox_pending", table_name="domain_event_outbox")
+    op.drop_table("domain_event_outbox")
@@ -0,0 +1,19 @@
+"""Club scope for sync tombstones"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012_tombstone_club_scope"
+down_revision = "0011_domain_event_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing player, club and court tombstones keep a NULL scope, which now limits them to admins.
+    op.add_column("sync_tombstones", sa.Column("club_id", sa.Integer()))
+
+
+def downgrade() -> None:
+    op.drop_column("sync_tombstones", "club_id")
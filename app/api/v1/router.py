@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.routers import auth, coaches, players, clubs, strokes, lessons, invoices
+from app.api.v1.routers import auth, coaches, players, clubs, strokes, lessons, schedule, series, rate_cards, invoices, payouts, reports, exports, analytics, calendar, sync, events, jobs
 
 api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(auth.router)
@@ -9,4 +9,15 @@ api_router.include_router(players.router)
 api_router.include_router(clubs.router)
 api_router.include_router(strokes.router)
 api_router.include_router(lessons.router)
+api_router.include_router(schedule.router)
+api_router.include_router(series.router)
+api_router.include_router(rate_cards.router)
 api_router.include_router(invoices.router)
+api_router.include_router(payouts.router)
+api_router.include_router(reports.router)
+api_router.include_router(exports.router)
+api_router.include_router(analytics.router)
+api_router.include_router(calendar.router)
+api_router.include_router(sync.router)
+api_router.include_router(events.router)
+api_router.include_router(jobs.router)
@@ -0,0 +1,43 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import require_admin
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.analytics import (
+    AnalyticsQueryInfo,
+    AnalyticsQueryRequest,
+    AnalyticsQueryResult,
+    AnalyticsSyncResult,
+)
+from app.services import analytics as analytics_service
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/queries", response_model=List[AnalyticsQueryInfo])
+def list_queries(_: User = Depends(require_admin)):
+    return [
+        AnalyticsQueryInfo(name=name, description=definition["description"])
+        for name, definition in analytics_service.PREDEFINED_QUERIES.items()
+    ]
+
+
+@router.post("/query", response_model=AnalyticsQueryResult)
+def run_query(payload: AnalyticsQueryRequest, _: User = Depends(require_admin)):
+    if payload.name not in analytics_service.PREDEFINED_QUERIES:
+        raise HTTPException(status_code=404, detail="Unknown analytics query")
+    try:
+        return analytics_service.run_query(payload.name, payload.params.dict())
+    except analytics_service.AnalyticsUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+
+@router.post("/sync", response_model=AnalyticsSyncResult)
+def sync_mirror(db: Session = Depends(get_db), _: User = Depends(require_admin)):
+    try:
+        return AnalyticsSyncResult(tables=analytics_service.sync(db))
+    except analytics_service.AnalyticsUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
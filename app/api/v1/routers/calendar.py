@@ -0,0 +1,67 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_current_user, resolve_coach
+from app.core.security import create_calendar_token, verify_calendar_token
+from app.db.session import get_db
+from app.models.coach import Coach
+from app.models.enums import UserRole
+from app.models.user import User
+from app.schemas.calendar import CalendarFeedLink, CalendarFeeds
+from app.services import calendar as calendar_service
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+FEED_HEADERS = {"Cache-Control": "private, no-cache"}
+
+
+def _link(request: Request, scope: str, subject_id: int, name: str) -> CalendarFeedLink:
+    url = request.url_for(f"{scope}_calendar_feed", token=create_calendar_token(scope, subject_id))
+    return CalendarFeedLink(scope=scope, subject_id=subject_id, name=name, url=str(url))
+
+
+@router.get("/feeds", response_model=CalendarFeeds)
+def list_calendar_feeds(
+    request: Request,
+    coach_id: Optional[int] = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role == UserRole.coach:
+        coach = resolve_coach(current_user=current_user, db=db)
+    elif coach_id is None:
+        raise HTTPException(status_code=400, detail="coach_id is required")
+    else:
+        coach = db.get(Coach, coach_id)
+        if not coach:
+            raise HTTPException(status_code=404, detail="Coach not found")
+    return CalendarFeeds(
+        coach=_link(request, "coach", coach.id, coach.full_name),
+        clubs=[_link(request, "club", club.id, club.name) for club in sorted(coach.clubs, key=lambda club: club.name)],
+    )
+
+
+def _feed(request: Request, db: Session, scope: str, token: str) -> Response:
+    subject_id = verify_calendar_token(scope, token)
+    if subject_id is None:
+        raise HTTPException(status_code=404, detail="Calendar not found")
+    etag = calendar_service.feed_etag(db, scope, subject_id)
+    headers = {**FEED_HEADERS, "ETag": etag}
+    if calendar_service.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = calendar_service.cached_feed(db, scope, subject_id, etag)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Calendar not found")
+    return Response(content=body, media_type="text/calendar; charset=utf-8", headers=headers)
+
+
+@router.get("/coach/{token}.ics", name="coach_calendar_feed")
+def coach_calendar_feed(token: str, request: Request, db: Session = Depends(get_db)):
+    return _feed(request, db, "coach", token)
+
+
+@router.get("/club/{token}.ics", name="club_calendar_feed")
+def club_calendar_feed(token: str, request: Request, db: Session = Depends(get_db)):
+    return _feed(request, db, "club", token)
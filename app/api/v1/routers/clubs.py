@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date, time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, selectinload
 
@@ -9,9 +11,12 @@ from app.models.coach import Coach
 from app.models.court import Court
 from app.models.enums import UserRole
 from app.models.user import User
-from app.schemas.club import ClubCreate, ClubRead, ClubUpdate
+from app.schemas.club import ClubAvailability, ClubCreate, ClubRead, ClubUpdate
 from app.schemas.court import CourtCreate, CourtRead, CourtUpdate
 from app.schemas.common import Message, PaginatedResponse
+from app.services.occupancy import occupancy
+
+MAX_AVAILABILITY_DAYS = 31
 
 router = APIRouter(prefix="/clubs", tags=["Clubs"])
 
@@ -79,6 +84,31 @@ def get_club(club_id: int, db: Session = Depends(get_db), current_user: User = D
     return club
 
 
+@router.get("/{club_id}/availability", response_model=ClubAvailability)
+def get_club_availability(
+    club_id: int,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    duration: int = Query(default=60, ge=5, le=24 * 60),
+    opens: time = Query(default=time(7, 0)),
+    closes: time = Query(default=time(22, 0)),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Availability spans at most {MAX_AVAILABILITY_DAYS} days")
+    if closes <= opens:
+        raise HTTPException(status_code=400, detail="'closes' must be after 'opens'")
+    if not db.get(Club, club_id):
+        raise HTTPException(status_code=404, detail="Club not found")
+    slots = occupancy.free_slots(db, club_id, date_from, date_to, duration, opens=opens, closes=closes)
+    return ClubAvailability(
+        club_id=club_id, date_from=date_from, date_to=date_to, duration_minutes=duration, slots=slots
+    )
+
+
 @router.patch("/{club_id}", response_model=ClubRead)
 def update_club(
     club_id: int,
@@ -112,6 +142,7 @@ def delete_club(club_id: int, db: Session = Depends(get_db), current_user: User
 
     db.delete(club)
     db.commit()
+    occupancy.invalidate(club_id)
     return Message(detail="Club deleted")
 
 
@@ -137,10 +168,18 @@ def _get_court(db: Session, club_id: int, court_id: int) -> Court:
 def create_court(
     club_id: int,
     payload: CourtCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_coach),
 ):
     _get_club_with_permission(db, club_id, current_user)
+    if payload.client_id is not None:
+        existing = db.query(Court).filter(Court.client_id == payload.client_id).first()
+        if existing and existing.club_id == club_id:
+            response.status_code = status.HTTP_200_OK
+            return existing
+        if existing:
+            raise HTTPException(status_code=409, detail="client_id already belongs to a court of another club")
     existing = (
         db.query(Court)
         .filter(Court.club_id == club_id, Court.name.ilike(payload.name))
@@ -149,13 +188,14 @@ def create_court(
     if existing:
         raise HTTPException(status_code=400, detail="Court with this name already exists for the club")
 
-    court = Court(club_id=club_id, name=payload.name, active=payload.active)
+    court = Court(club_id=club_id, client_id=payload.client_id, name=payload.name, active=payload.active)
     db.add(court)
     try:
         db.commit()
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=400, detail="Court with this name already exists for the club") from exc
+    occupancy.invalidate(club_id)
     db.refresh(court)
     return court
 
@@ -189,6 +229,7 @@ def update_court(
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=400, detail="Court with this name already exists for the club") from exc
+    occupancy.invalidate(club_id)
     db.refresh(court)
     return court
 
@@ -204,4 +245,5 @@ def delete_court(
     court = _get_court(db, club_id, court_id)
     db.delete(court)
     db.commit()
+    occupancy.invalidate(club_id)
     return Message(detail="Court deleted")
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_current_user, resolve_coach
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.enums import UserRole
+from app.models.user import User
+from app.services import events as event_service
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _stream_coach_id(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> Optional[int]:
+    if current_user.role == UserRole.coach:
+        return resolve_coach(current_user=current_user, db=db).id
+    return None
+
+
+@router.get("/stream")
+async def stream_events(
+    club_id: Optional[int] = Query(default=None),
+    coach_id: Optional[int] = Depends(_stream_coach_id),
+):
+    # Everything after this runs on the event loop. FastAPI >= 0.106 closes the dependencies' session before
+    # the body streams, so an open stream holds no pooled connection.
+    subscription = event_service.broadcaster.subscribe(coach_id=coach_id, club_id=club_id)
+    return StreamingResponse(
+        event_service.stream(subscription, settings.events_keepalive_seconds),
+        media_type="text/event-stream",
+        headers=STREAM_HEADERS,
+    )
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import require_admin
+from app.db.session import get_db
+from app.models.user import User
+from app.services import exports as export_service
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+@router.get("/{table_name}.parquet")
+def download_parquet(
+    table_name: str,
+    chunk_size: int = Query(default=0, ge=0, le=100_000),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    if table_name not in export_service.EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail="Unknown export table")
+    try:
+        export_service.arrow_schema(export_service.EXPORT_TABLES[table_name])
+    except export_service.ExportUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    return StreamingResponse(
+        export_service.stream_parquet(db, table_name, chunk_size),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f'attachment; filename="{table_name}.parquet"'},
+    )
@@ -1,7 +1,8 @@
 from datetime import date
-from typing import Optional
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.v1.dependencies import get_current_user, resolve_coach
@@ -18,8 +19,10 @@ from app.schemas.invoice import (
     InvoicePrepareRequest,
     InvoicePrepareResponse,
     InvoiceRead,
+    ReconciliationResult,
 )
 from app.services import invoice as invoice_service
+from app.services import invoice_archive, reconciliation
 
 router = APIRouter(prefix="/invoices", tags=["Invoices"])
 
@@ -55,6 +58,69 @@ def list_invoices(
     return PaginatedResponse(items=invoices, total=total, page=page, size=size)
 
 
+@router.get("/archive")
+def download_archive(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    coach_id: Optional[int] = Query(default=None),
+    include_drafts: bool = Query(default=False),
+    compression: Literal["stored", "deflate"] = Query(default="deflate"),
+):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    clauses = [Invoice.period_end >= date_from, Invoice.period_end <= date_to]
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    if coach_id:
+        clauses.append(Invoice.coach_id == coach_id)
+    if not include_drafts:
+        clauses.append(Invoice.status != InvoiceStatus.draft)
+    return StreamingResponse(
+        invoice_archive.stream_archive(db, clauses, compression),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="invoices-{date_from}-{date_to}.zip"'},
+    )
+
+
+@router.post("/reconcile", response_model=ReconciliationResult)
+def reconcile_statement(
+    file: UploadFile = File(...),
+    dry_run: bool = Query(default=False),
+    threshold: float = Query(default=0.9, ge=0, le=1),
+    window_days: int = Query(default=60, ge=1, le=366),
+    statement_format: Optional[Literal["csv", "ofx"]] = Query(default=None, alias="format"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    content = file.file.read()
+    statement_format = statement_format or reconciliation.detect_format(file.filename, content)
+    try:
+        transactions, errors = reconciliation.parse_statement(content, statement_format)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    clauses = []
+    if current_user.role == UserRole.coach:
+        clauses.append(Invoice.coach_id == resolve_coach(current_user=current_user, db=db).id)
+    index = reconciliation.InvoiceIndex.load(db, clauses)
+    result = reconciliation.reconcile(index, transactions, threshold=threshold, window_days=window_days)
+
+    applied = 0
+    if result["matches"] and not dry_run:
+        paid = invoice_service.mark_invoices_paid(db, [match["invoice_id"] for match in result["matches"]])
+        db.commit()
+        applied = len(paid)
+    return ReconciliationResult(
+        dry_run=dry_run,
+        transactions=len(transactions),
+        applied=applied,
+        errors=[{"row": row, "error": error} for row, error in sorted(errors.items())],
+        **result,
+    )
+
+
 @router.get("/{invoice_id}", response_model=InvoiceDetail)
 def get_invoice(invoice_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     invoice = db.get(Invoice, invoice_id)
@@ -155,7 +221,7 @@ def mark_invoice_paid(
     if current_user.role == UserRole.coach and invoice.coach_id != resolve_coach(current_user=current_user, db=db).id:
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    invoice = invoice_service.mark_invoice_paid(invoice)
+    invoice = invoice_service.mark_invoice_paid(db, invoice)
     db.commit()
     db.refresh(invoice)
     return invoice
@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import require_admin
+from app.db.session import get_db
+from app.jobs.runner import last_runs, run_job
+from app.jobs.tasks import JOBS
+from app.models.job_run import JobRun
+from app.models.user import User
+from app.schemas.job import JobRead, JobRunRead
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("", response_model=List[JobRead])
+def list_jobs(db: Session = Depends(get_db), _: User = Depends(require_admin)):
+    now = datetime.utcnow()
+    runs = last_runs(db)
+    return [
+        JobRead(
+            name=job.name,
+            schedule=job.cron,
+            description=job.description,
+            next_run_at=job.schedule.next_after(now),
+            last_run=runs.get(job.name),
+        )
+        for job in JOBS.values()
+    ]
+
+
+@router.get("/runs", response_model=List[JobRunRead])
+def list_runs(
+    job: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    query = db.query(JobRun)
+    if job:
+        query = query.filter(JobRun.job == job)
+    return query.order_by(JobRun.id.desc()).limit(limit).all()
+
+
+@router.post("/{name}/run", response_model=JobRunRead)
+def trigger_job(name: str, db: Session = Depends(get_db), _: User = Depends(require_admin)):
+    job = JOBS.get(name)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    run = run_job(db, job, trigger="manual")
+    if run is None:
+        raise HTTPException(status_code=409, detail="Job is already running")
+    return run
@@ -1,7 +1,9 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.v1.dependencies import get_current_user, resolve_coach
@@ -14,18 +16,39 @@ from app.models.player import Player
 from app.models.stroke import Stroke
 from app.models.user import User
 from app.schemas.common import Message, PaginatedResponse
-from app.schemas.lesson import LessonCreate, LessonRead, LessonUpdate
+from app.schemas.lesson import (
+    LessonBatchRequest,
+    LessonBatchResult,
+    LessonBulkTransition,
+    LessonBulkTransitionResult,
+    LessonCreate,
+    LessonFilters,
+    LessonGroupRequest,
+    LessonGroupsRead,
+    LessonImportResult,
+    LessonRead,
+    LessonUpdate,
+)
+from app.schemas.stroke import StrokeRecommendation
+from app.services import lesson_batch, lesson_export, lesson_import
+from app.services.conflicts import Slot, find_conflicts
+from app.services.domain_events import LessonCreated, LessonDeleted, LessonUpdated, bus
+from app.services.grouping import build_lesson_groups
+from app.services.lessons import lesson_filter_clauses, transition_lessons
+from app.services.recommendations import LEVEL_INDEX, recommend_for_players
 from app.utils.time import calculate_duration_minutes
 
 router = APIRouter(prefix="/lessons", tags=["Lessons"])
 
 
-def _scoped_query(db: Session, user: User):
-    query = db.query(Lesson)
+def _scope_clauses(db: Session, user: User) -> list:
     if user.role == UserRole.coach:
-        coach = resolve_coach(current_user=user, db=db)
-        query = query.filter(Lesson.coach_id == coach.id)
-    return query
+        return [Lesson.coach_id == resolve_coach(current_user=user, db=db).id]
+    return []
+
+
+def _scoped_query(db: Session, user: User):
+    return db.query(Lesson).filter(*_scope_clauses(db, user))
 
 
 def _ensure_player_visibility(db: Session, user: User, player_ids: List[int]) -> List[Player]:
@@ -84,33 +107,39 @@ def _get_courts(db: Session, club_id: Optional[int], court_ids: List[int]) -> Li
     return courts
 
 
-@router.get("/", response_model=PaginatedResponse[LessonRead])
-def list_lessons(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    page: int = 1,
-    size: int = 20,
+def _ensure_free(db: Session, slot: Slot) -> None:
+    conflicts = find_conflicts(db, [slot])[0]
+    if conflicts:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="; ".join(conflicts))
+
+
+def lesson_filters(
     date_from: Optional[date] = Query(default=None),
     date_to: Optional[date] = Query(default=None),
     status_filter: Optional[LessonStatus] = Query(default=None, alias="status"),
     payment_status: Optional[LessonPaymentStatus] = Query(default=None),
     club_id: Optional[int] = Query(default=None),
     player_id: Optional[int] = Query(default=None),
+) -> LessonFilters:
+    return LessonFilters(
+        date_from=date_from,
+        date_to=date_to,
+        status=status_filter,
+        payment_status=payment_status,
+        club_id=club_id,
+        player_id=player_id,
+    )
+
+
+@router.get("/", response_model=PaginatedResponse[LessonRead])
+def list_lessons(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    page: int = 1,
+    size: int = 20,
+    filters: LessonFilters = Depends(lesson_filters),
 ):
-    query = _scoped_query(db, current_user)
-
-    if date_from:
-        query = query.filter(Lesson.date >= date_from)
-    if date_to:
-        query = query.filter(Lesson.date <= date_to)
-    if status_filter:
-        query = query.filter(Lesson.status == status_filter)
-    if payment_status:
-        query = query.filter(Lesson.payment_status == payment_status)
-    if club_id:
-        query = query.filter(Lesson.club_id == club_id)
-    if player_id:
-        query = query.join(Lesson.players).filter(Player.id == player_id)
+    query = _scoped_query(db, current_user).filter(*lesson_filter_clauses(filters))
 
     total = query.count()
     lessons = (
@@ -122,9 +151,90 @@ def list_lessons(
     return PaginatedResponse(items=lessons, total=total, page=page, size=size)
 
 
+@router.get("/export")
+def export_lessons(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    filters: LessonFilters = Depends(lesson_filters),
+    export_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format"),
+    chunk_size: int = Query(default=0, ge=0, le=50_000),
+):
+    clauses = _scope_clauses(db, current_user) + lesson_filter_clauses(filters)
+    if export_format == "ndjson":
+        body = lesson_export.stream_ndjson(db, clauses, chunk_size)
+        media_type = "application/x-ndjson"
+    else:
+        body = lesson_export.stream_csv(db, clauses, chunk_size)
+        media_type = "text/csv"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="lessons.{export_format}"'},
+    )
+
+
+@router.post("/import", response_model=LessonImportResult)
+def import_lessons(
+    file: UploadFile = File(...),
+    dry_run: bool = Query(default=False),
+    import_format: Optional[Literal["csv", "ndjson"]] = Query(default=None, alias="format"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    coach_id = None
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    import_format = import_format or lesson_import.detect_format(file.filename, file.content_type)
+    try:
+        result = lesson_import.import_lessons(
+            db, file.file.read(), import_format, coach_id=coach_id, dry_run=dry_run
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return result
+
+
+@router.post("/batch", response_model=LessonBatchResult)
+def batch_lessons(
+    payload: LessonBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    coach_id = None
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    return lesson_batch.run_batch(db, payload.items, mode=payload.mode, coach_id=coach_id)
+
+
+@router.post("/bulk-transition", response_model=LessonBulkTransitionResult)
+def bulk_transition_lessons(
+    payload: LessonBulkTransition,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    clauses = _scope_clauses(db, current_user)
+    if payload.lesson_ids is not None:
+        clauses.append(Lesson.id.in_(payload.lesson_ids))
+    if payload.filters is not None:
+        clauses.extend(lesson_filter_clauses(payload.filters))
+    lesson_ids = transition_lessons(
+        db, clauses, status=payload.status, payment_status=payload.payment_status
+    )
+    bus.record(db, *LessonUpdated.for_ids(db, lesson_ids))
+    db.commit()
+    return LessonBulkTransitionResult(updated=len(lesson_ids), lesson_ids=sorted(lesson_ids))
+
+
+def _lesson_by_client_id(db: Session, coach_id: int, client_id) -> Optional[Lesson]:
+    if client_id is None:
+        return None
+    return db.query(Lesson).filter(Lesson.coach_id == coach_id, Lesson.client_id == client_id).first()
+
+
 @router.post("/", response_model=LessonRead, status_code=status.HTTP_201_CREATED)
 def create_lesson(
     payload: LessonCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -132,6 +242,12 @@ def create_lesson(
     if current_user.role == UserRole.coach:
         coach_id = resolve_coach(current_user=current_user, db=db).id
 
+    # A retried create with the same client_id returns the lesson the first attempt stored.
+    existing = _lesson_by_client_id(db, coach_id, payload.client_id)
+    if existing:
+        response.status_code = status.HTTP_200_OK
+        return existing
+
     club_id = _resolve_club_id(db, current_user, payload.club_id)
 
     duration = calculate_duration_minutes(payload.start_time, payload.end_time)
@@ -140,8 +256,12 @@ def create_lesson(
     if reimbursement is not None:
         reimbursement = abs(reimbursement)
 
+    courts = _get_courts(db, club_id, payload.court_ids)
+    _ensure_free(db, Slot(payload.date, payload.start_time, payload.end_time, coach_id, [court.id for court in courts]))
+
     lesson = Lesson(
         coach_id=coach_id,
+        client_id=payload.client_id,
         club_id=club_id,
         date=payload.date,
         start_time=payload.start_time,
@@ -155,15 +275,24 @@ def create_lesson(
         notes=payload.notes,
     )
     db.add(lesson)
-    db.flush()
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        existing = _lesson_by_client_id(db, coach_id, payload.client_id)
+        if not existing:
+            raise
+        response.status_code = status.HTTP_200_OK
+        return existing
 
     player_ids = payload.player_ids or []
     if payload.type != LessonType.club and not player_ids:
         raise HTTPException(status_code=400, detail="At least one player is required for this lesson type")
     lesson.players = _ensure_player_visibility(db, current_user, player_ids)
     lesson.strokes = _get_strokes(db, [code.value for code in payload.stroke_codes])
-    lesson.courts = _get_courts(db, club_id, payload.court_ids)
+    lesson.courts = courts
 
+    bus.record(db, LessonCreated.of(lesson))
     db.commit()
     db.refresh(lesson)
     return lesson
@@ -183,6 +312,61 @@ def get_lesson(
     return lesson
 
 
+@router.get("/{lesson_id}/recommended-strokes", response_model=List[StrokeRecommendation])
+def recommend_lesson_strokes(
+    lesson_id: int,
+    limit: int = Query(default=3, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    lesson = db.get(Lesson, lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    if current_user.role == UserRole.coach and lesson.coach_id != resolve_coach(current_user=current_user, db=db).id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return recommend_for_players(db, lesson.players, limit=limit)
+
+
+@router.post("/{lesson_id}/groups", response_model=LessonGroupsRead)
+def build_groups(
+    lesson_id: int,
+    payload: Optional[LessonGroupRequest] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    lesson = db.get(Lesson, lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    if current_user.role == UserRole.coach and lesson.coach_id != resolve_coach(current_user=current_user, db=db).id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if lesson.type != LessonType.club:
+        raise HTTPException(status_code=400, detail="Groups can only be built for club lessons")
+    if not lesson.courts:
+        raise HTTPException(status_code=400, detail="Lesson has no courts to split players across")
+
+    payload = payload or LessonGroupRequest()
+    courts = sorted(lesson.courts, key=lambda court: court.id)
+    groups = build_lesson_groups(
+        db, lesson.players, len(courts), seed=payload.seed, exposure_days=payload.exposure_days
+    )
+    return LessonGroupsRead(
+        lesson_id=lesson.id,
+        seed=payload.seed,
+        groups=[
+            {
+                "court": court,
+                "players": players,
+                "mean_skill": (
+                    round(sum(LEVEL_INDEX[player.skill_level] for player in players) / len(players), 3)
+                    if players
+                    else None
+                ),
+            }
+            for court, players in zip(courts, groups)
+        ],
+    )
+
+
 @router.patch("/{lesson_id}", response_model=LessonRead)
 def update_lesson(
     lesson_id: int,
@@ -217,6 +401,25 @@ def update_lesson(
     if "club_reimbursement_amount" in data and data["club_reimbursement_amount"] is not None:
         data["club_reimbursement_amount"] = abs(data["club_reimbursement_amount"])
 
+    courts = None
+    if court_ids is not None:
+        courts = _get_courts(db, target_club_id, court_ids)
+    elif "club_id" in data and lesson.courts:
+        courts = [court for court in lesson.courts if court.club_id == target_club_id]
+    if court_ids or data.keys() & {"date", "start_time", "end_time", "coach_id"}:
+        slot_courts = courts if courts is not None else lesson.courts
+        _ensure_free(
+            db,
+            Slot(
+                data.get("date", lesson.date),
+                start_time,
+                end_time,
+                data.get("coach_id", lesson.coach_id),
+                [court.id for court in slot_courts],
+                lesson_id=lesson.id,
+            ),
+        )
+
     for field, value in data.items():
         setattr(lesson, field, value)
 
@@ -227,12 +430,11 @@ def update_lesson(
     if stroke_codes is not None:
         stroke_values = [code.value if hasattr(code, "value") else code for code in stroke_codes]
         lesson.strokes = _get_strokes(db, stroke_values)
-    if court_ids is not None:
-        lesson.courts = _get_courts(db, target_club_id, court_ids)
-    elif "club_id" in data and lesson.courts:
-        lesson.courts = [court for court in lesson.courts if court.club_id == target_club_id]
+    if courts is not None:
+        lesson.courts = courts
 
     db.add(lesson)
+    bus.record(db, LessonUpdated.of(lesson))
     db.commit()
     db.refresh(lesson)
     return lesson
@@ -249,6 +451,7 @@ def delete_lesson(
         raise HTTPException(status_code=404, detail="Lesson not found")
     if current_user.role == UserRole.coach and lesson.coach_id != resolve_coach(current_user=current_user, db=db).id:
         raise HTTPException(status_code=403, detail="Forbidden")
+    bus.record(db, LessonDeleted.of(lesson))
     db.delete(lesson)
     db.commit()
     return Message(detail="Lesson deleted")
@@ -0,0 +1,77 @@
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import require_admin
+from app.db.session import get_db
+from app.models.invoice import Invoice
+from app.models.user import User
+from app.schemas.payout import PayoutSummary
+from app.services import payouts as payout_service
+
+router = APIRouter(prefix="/payouts", tags=["Payouts"])
+
+
+def _period_clauses(date_from: date, date_to: date) -> List:
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    return [Invoice.period_end >= date_from, Invoice.period_end <= date_to]
+
+
+@router.get("/preview", response_model=PayoutSummary)
+def preview_payouts(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    payout_format: Literal["sepa", "bacs"] = Query(default="sepa", alias="format"),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    return payout_service.summarize(db, _period_clauses(date_from, date_to), payout_format)
+
+
+@router.get("/file")
+def download_payout_file(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    payout_format: Literal["sepa", "bacs"] = Query(default="sepa", alias="format"),
+    execution_date: Optional[date] = Query(default=None),
+    skip_invalid: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    clauses = _period_clauses(date_from, date_to)
+    try:
+        debtor = payout_service.debtor_details(payout_format)
+    except payout_service.PayoutConfigurationError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    summary = payout_service.summarize(db, clauses, payout_format)
+    if summary["issues"] and not skip_invalid:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{len(summary['issues'])} payee(s) cannot be paid; see /payouts/preview or pass skip_invalid=true",
+        )
+    if not summary["payees"]:
+        raise HTTPException(status_code=404, detail="No issued invoices to pay in this period")
+
+    if payout_format == "sepa":
+        body = payout_service.stream_sepa(
+            db,
+            clauses,
+            summary,
+            debtor,
+            execution_date=execution_date or date.today(),
+            remittance=f"Coaching invoices {date_from} to {date_to}",
+        )
+        media_type, extension = "application/xml", "xml"
+    else:
+        body = payout_service.stream_bacs(db, clauses, summary, debtor, reference=f"COACHING {date_to:%b%y}")
+        media_type, extension = "text/plain", "txt"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="payouts-{date_from}-{date_to}.{extension}"'},
+    )
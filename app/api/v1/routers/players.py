@@ -1,10 +1,10 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
-from app.api.v1.dependencies import get_current_user, resolve_coach
+from app.api.v1.dependencies import get_current_user, require_admin, resolve_coach
 from app.db.session import get_db
 from app.models.coach import Coach
 from app.models.player import Player
@@ -12,7 +12,16 @@ from app.models.associations import player_coach_table
 from app.models.enums import UserRole
 from app.models.user import User
 from app.schemas.common import Message, PaginatedResponse
-from app.schemas.player import PlayerCreate, PlayerRead, PlayerUpdate
+from app.schemas.player import (
+    PlayerCreate,
+    PlayerDuplicateCandidate,
+    PlayerMergeRequest,
+    PlayerRead,
+    PlayerUpdate,
+)
+from app.services import player_dedupe
+from app.schemas.stroke import StrokeRecommendation
+from app.services.recommendations import recommend_for_players, recommender
 
 router = APIRouter(prefix="/players", tags=["Players"])
 
@@ -45,6 +54,7 @@ def list_players(
 @router.post("/", response_model=PlayerRead, status_code=status.HTTP_201_CREATED)
 def create_player(
     payload: PlayerCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -53,11 +63,19 @@ def create_player(
         coach = resolve_coach(current_user=current_user, db=db)
         coach_ids = [coach.id]
 
+    if payload.client_id is not None:
+        existing = db.query(Player).filter(Player.client_id == payload.client_id).first()
+        if existing:
+            _check_player_access(existing, current_user, db)
+            response.status_code = status.HTTP_200_OK
+            return existing
+
     coaches = db.query(Coach).filter(Coach.id.in_(coach_ids)).all()
     if len(coaches) != len(set(coach_ids)):
         raise HTTPException(status_code=400, detail="One or more coaches not found")
 
     player = Player(
+        client_id=payload.client_id,
         full_name=payload.full_name,
         email=payload.email,
         phone=payload.phone,
@@ -81,6 +99,38 @@ def _check_player_access(player: Player, current_user: User, db: Session) -> Non
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
 
+@router.get("/duplicates", response_model=List[PlayerDuplicateCandidate])
+def list_duplicate_players(
+    min_score: float = Query(default=0.5, ge=0, le=1),
+    limit: int = Query(default=100, ge=1, le=1000),
+    include_inactive: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    return player_dedupe.find_duplicates(db, min_score=min_score, limit=limit, include_inactive=include_inactive)
+
+
+@router.post("/merge", response_model=PlayerRead)
+def merge_players(
+    payload: PlayerMergeRequest,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin),
+):
+    source_ids = set(payload.source_ids)
+    if payload.target_id in source_ids:
+        raise HTTPException(status_code=400, detail="Target player cannot also be a source")
+    target = db.get(Player, payload.target_id)
+    found = db.scalar(select(func.count()).select_from(Player).where(Player.id.in_(source_ids)))
+    if not target or found != len(source_ids):
+        raise HTTPException(status_code=404, detail="Player not found")
+
+    player_dedupe.merge_players(db, target, sorted(source_ids))
+    db.commit()
+    db.refresh(target)
+    recommender.invalidate()
+    return target
+
+
 @router.get("/{player_id}", response_model=PlayerRead)
 def get_player(player_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     player = db.get(Player, player_id)
@@ -90,6 +140,20 @@ def get_player(player_id: int, db: Session = Depends(get_db), current_user: User
     return player
 
 
+@router.get("/{player_id}/recommended-strokes", response_model=List[StrokeRecommendation])
+def recommend_player_strokes(
+    player_id: int,
+    limit: int = Query(default=3, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    player = db.get(Player, player_id)
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+    _check_player_access(player, current_user, db)
+    return recommend_for_players(db, [player], limit=limit)
+
+
 @router.patch("/{player_id}", response_model=PlayerRead)
 def update_player(
     player_id: int,
@@ -105,6 +169,7 @@ def update_player(
 
     data = payload.dict(exclude_unset=True)
     coach_ids = data.pop("coach_ids", None)
+    skill_changed = "skill_level" in data and data["skill_level"] != player.skill_level
     for field, value in data.items():
         setattr(player, field, value)
 
@@ -118,6 +183,8 @@ def update_player(
     db.add(player)
     db.commit()
     db.refresh(player)
+    if skill_changed:
+        recommender.invalidate()
     return player
 
 
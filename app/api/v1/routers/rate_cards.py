@@ -0,0 +1,137 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_current_user, resolve_coach
+from app.db.session import get_db
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.enums import UserRole
+from app.models.lesson import Lesson
+from app.models.rate_card import RateCard
+from app.models.user import User
+from app.schemas.common import Message
+from app.schemas.rate_card import RateCardCreate, RateCardRead, RateCardUpdate, RepriceRequest, RepriceResult
+from app.services import pricing
+
+router = APIRouter(prefix="/rate-cards", tags=["Rate cards"])
+
+
+def _check_club(db: Session, user: User, club_id: Optional[int]) -> None:
+    if club_id is None:
+        return
+    if not db.get(Club, club_id):
+        raise HTTPException(status_code=404, detail="Club not found")
+    if user.role == UserRole.coach:
+        coach = resolve_coach(current_user=user, db=db)
+        if club_id not in {club.id for club in coach.clubs}:
+            raise HTTPException(status_code=403, detail="Coach cannot use this club")
+
+
+def _get_card(db: Session, user: User, card_id: int) -> RateCard:
+    card = db.get(RateCard, card_id)
+    if not card:
+        raise HTTPException(status_code=404, detail="Rate card not found")
+    if user.role == UserRole.coach and card.coach_id != resolve_coach(current_user=user, db=db).id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return card
+
+
+@router.get("/", response_model=List[RateCardRead])
+def list_rate_cards(
+    coach_id: Optional[int] = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    query = db.query(RateCard)
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    if coach_id:
+        query = query.filter(RateCard.coach_id == coach_id)
+    return query.order_by(RateCard.coach_id, RateCard.id).all()
+
+
+@router.post("/", response_model=RateCardRead, status_code=status.HTTP_201_CREATED)
+def create_rate_card(
+    payload: RateCardCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    coach_id = payload.coach_id
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    elif coach_id is None:
+        raise HTTPException(status_code=400, detail="coach_id is required")
+    elif not db.get(Coach, coach_id):
+        raise HTTPException(status_code=404, detail="Coach not found")
+    _check_club(db, current_user, payload.club_id)
+
+    card = RateCard(**payload.dict(exclude={"coach_id"}), coach_id=coach_id)
+    db.add(card)
+    db.commit()
+    db.refresh(card)
+    return card
+
+
+@router.post("/reprice", response_model=RepriceResult)
+def reprice_lessons(
+    payload: RepriceRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    coach_id = payload.coach_id
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    if payload.date_from and payload.date_to and payload.date_to < payload.date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+
+    clauses = []
+    if coach_id:
+        clauses.append(Lesson.coach_id == coach_id)
+    if payload.club_id:
+        clauses.append(Lesson.club_id == payload.club_id)
+    if payload.lesson_type:
+        clauses.append(Lesson.type == payload.lesson_type)
+    if payload.date_from:
+        clauses.append(Lesson.date >= payload.date_from)
+    if payload.date_to:
+        clauses.append(Lesson.date <= payload.date_to)
+
+    result = pricing.reprice_lessons(db, clauses, dry_run=payload.dry_run)
+    if result["lessons"] and not payload.dry_run:
+        db.commit()
+    return result
+
+
+@router.get("/{card_id}", response_model=RateCardRead)
+def get_rate_card(card_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return _get_card(db, current_user, card_id)
+
+
+@router.patch("/{card_id}", response_model=RateCardRead)
+def update_rate_card(
+    card_id: int,
+    payload: RateCardUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    card = _get_card(db, current_user, card_id)
+    data = payload.dict(exclude_unset=True)
+    if "club_id" in data:
+        _check_club(db, current_user, data["club_id"])
+    for field, value in data.items():
+        setattr(card, field, value)
+    if card.max_players is not None and card.max_players < card.min_players:
+        raise HTTPException(status_code=400, detail="max_players must not be below min_players")
+    db.commit()
+    db.refresh(card)
+    return card
+
+
+@router.delete("/{card_id}", response_model=Message)
+def delete_rate_card(card_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    card = _get_card(db, current_user, card_id)
+    db.delete(card)
+    db.commit()
+    return Message(detail="Rate card deleted")
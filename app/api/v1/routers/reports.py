@@ -0,0 +1,51 @@
+from datetime import date
+from typing import Optional
+
+from dateutil.relativedelta import relativedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_current_user, resolve_coach
+from app.db.session import get_db
+from app.models.enums import UserRole
+from app.models.user import User
+from app.schemas.report import RetentionReport
+from app.services import reports as report_service
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+
+@router.get("/retention", response_model=RetentionReport)
+def player_retention(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    date_from: Optional[date] = Query(default=None, description="First cohort month"),
+    date_to: Optional[date] = Query(default=None, description="Last cohort month"),
+    club_id: Optional[int] = Query(default=None),
+    coach_id: Optional[int] = Query(default=None),
+    max_offset: int = Query(default=12, ge=0, le=36),
+):
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+
+    date_to = (date_to or date.today()).replace(day=1)
+    date_from = (date_from or date_to - relativedelta(months=11)).replace(day=1)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be before date_to")
+
+    matrix = report_service.retention_report(
+        db,
+        date_from=date_from,
+        date_to=date_to,
+        club_id=club_id,
+        coach_id=coach_id,
+        max_offset=max_offset,
+    )
+    return RetentionReport(
+        date_from=date_from,
+        date_to=date_to,
+        club_id=club_id,
+        coach_id=coach_id,
+        offsets=list(range(max_offset + 1)),
+        cohorts=report_service.retention_rows(matrix),
+    )
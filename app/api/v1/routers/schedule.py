@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_current_user, resolve_coach
+from app.api.v1.routers.lessons import _ensure_player_visibility
+from app.db.session import get_db
+from app.models.coach import Coach
+from app.models.enums import LessonType, UserRole
+from app.models.lesson import Lesson
+from app.models.user import User
+from app.schemas.schedule import ScheduleSolveRequest, ScheduleSolveResult
+from app.services import autoschedule, pricing
+from app.services.conflicts import Slot, find_conflicts
+from app.services.domain_events import LessonCreated, bus
+from app.services.lessons import insert_lessons
+from app.services.occupancy import SLOT_MINUTES
+
+router = APIRouter(prefix="/schedule", tags=["Schedule"])
+
+
+@router.post("/solve", response_model=ScheduleSolveResult)
+def solve_schedule(
+    payload: ScheduleSolveRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role == UserRole.coach:
+        own_id = resolve_coach(current_user=current_user, db=db).id
+        if any(item.coach_id not in (None, own_id) for item in payload.requests):
+            raise HTTPException(status_code=403, detail="Coaches can only schedule their own lessons")
+        coach_ids = [own_id] * len(payload.requests)
+    else:
+        coach_ids = [item.coach_id or payload.coach_id for item in payload.requests]
+        if None in coach_ids:
+            raise HTTPException(status_code=400, detail="coach_id is required")
+    coaches = {coach.id: coach for coach in db.query(Coach).filter(Coach.id.in_(set(coach_ids)))}
+    if len(coaches) != len(set(coach_ids)):
+        raise HTTPException(status_code=404, detail="Coach not found")
+
+    for index, item in enumerate(payload.requests):
+        if item.type != LessonType.club and not item.player_ids:
+            raise HTTPException(
+                status_code=400, detail=f"Request {index}: at least one player is required for this lesson type"
+            )
+    _ensure_player_visibility(db, current_user, list({pid for item in payload.requests for pid in item.player_ids}))
+
+    schedule, rejected = autoschedule.solve(db, payload.requests, coaches, coach_ids, payload.time_budget_ms)
+    lessons = autoschedule.scheduled_lessons(schedule, payload.requests)
+
+    committed = False
+    if payload.commit and lessons:
+        # The index may lag writes made by other processes; the stored lessons have the final say.
+        slots = [
+            Slot(lesson["date"], lesson["start_time"], lesson["end_time"], lesson["coach_id"], lesson["court_ids"])
+            for lesson in lessons
+        ]
+        free = []
+        for lesson, conflicts in zip(lessons, find_conflicts(db, slots)):
+            if conflicts:
+                rejected[lesson["request"]] = "; ".join(conflicts)
+            else:
+                free.append(lesson)
+        lessons = free
+        lesson_ids = insert_lessons(db, autoschedule.prepare_lessons(payload.requests, lessons, payload.status))
+        for lesson, lesson_id in zip(lessons, lesson_ids):
+            lesson["lesson_id"] = lesson_id
+        unpriced = [
+            lesson["lesson_id"] for lesson in lessons if payload.requests[lesson["request"]].total_amount is None
+        ]
+        if unpriced:
+            pricing.reprice_lessons(db, [Lesson.id.in_(unpriced)])
+        bus.record(db, *LessonCreated.for_ids(db, lesson_ids))
+        db.commit()
+        committed = True
+
+    return ScheduleSolveResult(
+        committed=committed,
+        scheduled=lessons,
+        unscheduled=[{"request": index, "reason": reason} for index, reason in sorted(rejected.items())],
+        gap_minutes=schedule.gap_slots * SLOT_MINUTES,
+        iterations=schedule.iterations,
+    )
@@ -0,0 +1,175 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_current_user, require_admin, resolve_coach
+from app.api.v1.routers.lessons import (
+    _ensure_player_visibility,
+    _get_courts,
+    _get_strokes,
+    _resolve_club_id,
+)
+from app.db.session import get_db
+from app.models.enums import LessonType, UserRole
+from app.models.lesson_series import LessonSeries
+from app.models.user import User
+from app.schemas.common import Message, PaginatedResponse
+from app.schemas.series import LessonSeriesCreate, LessonSeriesRead, LessonSeriesUpdate, SeriesExpansionResult
+from app.services import series as series_service
+from app.utils.time import calculate_duration_minutes
+
+router = APIRouter(prefix="/series", tags=["Lesson series"])
+
+
+def _duration(start_time, end_time) -> int:
+    try:
+        return calculate_duration_minutes(start_time, end_time)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _get_series(db: Session, user: User, series_id: int) -> LessonSeries:
+    series = db.get(LessonSeries, series_id)
+    if not series:
+        raise HTTPException(status_code=404, detail="Series not found")
+    if user.role == UserRole.coach and series.coach_id != resolve_coach(current_user=user, db=db).id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return series
+
+
+@router.get("/", response_model=PaginatedResponse[LessonSeriesRead])
+def list_series(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    page: int = 1,
+    size: int = 20,
+    active: Optional[bool] = Query(default=None),
+):
+    query = db.query(LessonSeries)
+    if current_user.role == UserRole.coach:
+        query = query.filter(LessonSeries.coach_id == resolve_coach(current_user=current_user, db=db).id)
+    if active is not None:
+        query = query.filter(LessonSeries.active.is_(active))
+    total = query.count()
+    items = (
+        query.order_by(LessonSeries.starts_on.desc(), LessonSeries.id.desc())
+        .offset((page - 1) * size)
+        .limit(size)
+        .all()
+    )
+    return PaginatedResponse(items=items, total=total, page=page, size=size)
+
+
+@router.post("/", response_model=LessonSeriesRead, status_code=status.HTTP_201_CREATED)
+def create_series(
+    payload: LessonSeriesCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    coach_id = payload.coach_id
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    club_id = _resolve_club_id(db, current_user, payload.club_id)
+    if payload.ends_on and payload.ends_on < payload.starts_on:
+        raise HTTPException(status_code=400, detail="Series cannot end before it starts")
+    if payload.type != LessonType.club and not payload.player_ids:
+        raise HTTPException(status_code=400, detail="At least one player is required for this lesson type")
+
+    data = payload.dict(exclude={"player_ids", "stroke_codes", "court_ids"})
+    if data["club_reimbursement_amount"] is not None:
+        data["club_reimbursement_amount"] = abs(data["club_reimbursement_amount"])
+    data.update(
+        coach_id=coach_id,
+        club_id=club_id,
+        duration_minutes=_duration(payload.start_time, payload.end_time),
+    )
+    series = LessonSeries(**data)
+    series.players = _ensure_player_visibility(db, current_user, payload.player_ids)
+    series.strokes = _get_strokes(db, [code.value for code in payload.stroke_codes])
+    series.courts = _get_courts(db, club_id, payload.court_ids)
+    db.add(series)
+    db.commit()
+
+    series_service.expand_series(db, series_ids=[series.id])
+    db.refresh(series)
+    return series
+
+
+@router.post("/expand", response_model=SeriesExpansionResult)
+def expand_all_series(
+    horizon_days: int = Query(default=0, ge=0, le=730),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    return series_service.expand_series(db, horizon_days=horizon_days)
+
+
+@router.get("/{series_id}", response_model=LessonSeriesRead)
+def get_series(series_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return _get_series(db, current_user, series_id)
+
+
+@router.patch("/{series_id}", response_model=LessonSeriesRead)
+def update_series(
+    series_id: int,
+    payload: LessonSeriesUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    series = _get_series(db, current_user, series_id)
+    data = payload.dict(exclude_unset=True)
+    player_ids = data.pop("player_ids", None)
+    stroke_codes = data.pop("stroke_codes", None)
+    court_ids = data.pop("court_ids", None)
+    changed = set(data)
+
+    if "club_id" in data or current_user.role == UserRole.coach:
+        data["club_id"] = _resolve_club_id(db, current_user, data.get("club_id", series.club_id))
+    target_club_id = data.get("club_id", series.club_id)
+    if "start_time" in data or "end_time" in data:
+        data["duration_minutes"] = _duration(
+            data.get("start_time", series.start_time), data.get("end_time", series.end_time)
+        )
+        changed.add("duration_minutes")
+    if data.get("club_reimbursement_amount") is not None:
+        data["club_reimbursement_amount"] = abs(data["club_reimbursement_amount"])
+    starts_on, ends_on = data.get("starts_on", series.starts_on), data.get("ends_on", series.ends_on)
+    if ends_on and ends_on < starts_on:
+        raise HTTPException(status_code=400, detail="Series cannot end before it starts")
+
+    for field, value in data.items():
+        setattr(series, field, value)
+    if player_ids is not None:
+        if data.get("type", series.type) != LessonType.club and not player_ids:
+            raise HTTPException(status_code=400, detail="At least one player is required for this lesson type")
+        series.players = _ensure_player_visibility(db, current_user, player_ids)
+        changed.add("players")
+    if stroke_codes is not None:
+        series.strokes = _get_strokes(db, [code.value for code in stroke_codes])
+        changed.add("strokes")
+    if court_ids is not None:
+        series.courts = _get_courts(db, target_club_id, court_ids)
+        changed.add("courts")
+    elif "club_id" in changed and series.courts:
+        series.courts = [court for court in series.courts if court.club_id == target_club_id]
+        changed.add("courts")
+
+    db.flush()
+    try:
+        series_service.propagate_changes(db, series, changed)
+    except series_service.SeriesConflictError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    db.commit()
+    series_service.expand_series(db, series_ids=[series.id])
+    db.refresh(series)
+    return series
+
+
+@router.delete("/{series_id}", response_model=Message)
+def delete_series(series_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    series = _get_series(db, current_user, series_id)
+    series_service.detach_series(db, series)
+    db.delete(series)
+    db.commit()
+    return Message(detail="Series deleted")
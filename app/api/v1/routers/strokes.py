@@ -8,6 +8,7 @@ from app.models.stroke import Stroke
 from app.models.user import User
 from app.schemas.common import Message, PaginatedResponse
 from app.schemas.stroke import StrokeCreate, StrokeRead, StrokeUpdate
+from app.services.recommendations import recommender
 
 router = APIRouter(prefix="/strokes", tags=["Strokes"])
 
@@ -26,6 +27,7 @@ def create_stroke(payload: StrokeCreate, db: Session = Depends(get_db), _: User
     db.add(stroke)
     db.commit()
     db.refresh(stroke)
+    recommender.invalidate()
     return stroke
 
 
@@ -43,6 +45,7 @@ def update_stroke(
         setattr(stroke, field, value)
     db.commit()
     db.refresh(stroke)
+    recommender.invalidate()
     return stroke
 
 
@@ -53,4 +56,5 @@ def delete_stroke(stroke_id: int, db: Session = Depends(get_db), _: User = Depen
         raise HTTPException(status_code=404, detail="Stroke not found")
     db.delete(stroke)
     db.commit()
+    recommender.invalidate()
     return Message(detail="Stroke deleted")
@@ -0,0 +1,54 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.v1.dependencies import get_current_user, resolve_coach
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.enums import UserRole
+from app.models.user import User
+from app.schemas.sync import SyncChanges, SyncUpsertRequest, SyncUpsertResult
+from app.services import sync as sync_service
+from app.services import sync_upsert
+from app.services.domain_events import LessonCreated, LessonUpdated, bus
+from app.services.occupancy import occupancy
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("/changes", response_model=SyncChanges)
+def get_changes(
+    since: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=5_000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    coach_id = None
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    try:
+        return sync_service.changes(db, since, coach_id=coach_id, limit=limit or settings.sync_page_size)
+    except sync_service.InvalidSyncToken as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.put("/upsert", response_model=SyncUpsertResult)
+def upsert_changes(
+    payload: SyncUpsertRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    coach_id = None
+    if current_user.role == UserRole.coach:
+        coach_id = resolve_coach(current_user=current_user, db=db).id
+    outcome = sync_upsert.upsert(db, payload, coach_id=coach_id)
+    bus.record(
+        db,
+        *LessonCreated.for_ids(db, outcome.created_lessons),
+        *LessonUpdated.for_ids(db, outcome.updated_lessons),
+    )
+    db.commit()
+    for club_id in outcome.court_club_ids:
+        occupancy.invalidate(club_id)
+    return outcome.as_result()
@@ -0,0 +1,155 @@
+"""Operational commands: ``python -m app.cli <command> [options]``."""
+
+import argparse
+import logging
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def export_parquet(args: argparse.Namespace) -> None:
+    from app.services import exports as export_service
+
+    db = SessionLocal()
+    try:
+        if args.table:
+            args.out.mkdir(parents=True, exist_ok=True)
+            counts = {
+                table: export_service.write_parquet(db, table, str(args.out / f"{table}.parquet"), args.chunk_size)
+                for table in args.table
+            }
+        else:
+            counts = export_service.export_all(db, args.out, args.chunk_size)
+    finally:
+        db.close()
+    for table, rows in counts.items():
+        print(f"{table}: {rows} rows -> {args.out / f'{table}.parquet'}")
+
+
+def analytics_sync(args: argparse.Namespace) -> None:
+    from app.services import analytics as analytics_service
+
+    db = SessionLocal()
+    try:
+        result = analytics_service.sync(db, args.chunk_size)
+    finally:
+        db.close()
+    for table, counts in result.items():
+        print(f"{table}: {counts['upserted']} upserted, {counts['deleted']} deleted")
+
+
+def expand_series(args: argparse.Namespace) -> None:
+    from app.services import series as series_service
+
+    db = SessionLocal()
+    try:
+        result = series_service.expand_series(db, horizon_days=args.horizon_days, series_ids=args.series_id)
+    finally:
+        db.close()
+    print(f"{result['series']} series expanded, {result['lessons']} lessons created")
+    for conflict in result["conflicts"]:
+        print(f"skipped series {conflict['series_id']} on {conflict['date']}: {'; '.join(conflict['errors'])}")
+
+
+def find_duplicate_players(args: argparse.Namespace) -> None:
+    from app.services import player_dedupe
+
+    db = SessionLocal()
+    try:
+        candidates = player_dedupe.find_duplicates(
+            db, min_score=args.min_score, limit=args.limit, include_inactive=args.include_inactive
+        )
+    finally:
+        db.close()
+    for candidate in candidates:
+        left, right = candidate["player_ids"]
+        print(f"{left}\t{right}\t{candidate['score']:.2f}\t{', '.join(candidate['reasons'])}")
+
+
+def send_reminders(args: argparse.Namespace) -> None:
+    from app.services import reminders
+
+    db = SessionLocal()
+    try:
+        result = reminders.send_lesson_reminders(db, day=args.date, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"{result['date']}: {result['sent']} sent, {result['failed']} failed, {result['pending']} pending")
+
+
+def run_job(args: argparse.Namespace) -> None:
+    from app.jobs import runner
+    from app.jobs.tasks import JOBS
+
+    db = SessionLocal()
+    try:
+        result = runner.run_job(db, JOBS[args.name], trigger="manual")
+    finally:
+        db.close()
+    if result is None:
+        print(f"{args.name}: already running elsewhere")
+    else:
+        print(f"{args.name}: {result.status} {result.result or result.error}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export-parquet", help="Export lessons and invoices to Parquet files")
+    export.add_argument("--out", type=Path, default=Path("exports"))
+    export.add_argument("--chunk-size", type=int, default=0)
+    export.add_argument("--table", action="append", choices=sorted(_export_tables()))
+    export.set_defaults(handler=export_parquet)
+
+    sync = commands.add_parser("analytics-sync", help="Incrementally sync the DuckDB analytics mirror")
+    sync.add_argument("--chunk-size", type=int, default=0)
+    sync.set_defaults(handler=analytics_sync)
+
+    expand = commands.add_parser("expand-series", help="Materialize lesson series occurrences up to the horizon")
+    expand.add_argument("--horizon-days", type=int, default=0)
+    expand.add_argument("--series-id", type=int, action="append")
+    expand.set_defaults(handler=expand_series)
+
+    duplicates = commands.add_parser("find-duplicate-players", help="List likely duplicate players for review")
+    duplicates.add_argument("--min-score", type=float, default=0.5)
+    duplicates.add_argument("--limit", type=int, default=1000)
+    duplicates.add_argument("--include-inactive", action="store_true")
+    duplicates.set_defaults(handler=find_duplicate_players)
+
+    reminders = commands.add_parser("send-reminders", help="E-mail players about their lessons tomorrow")
+    reminders.add_argument("--date", type=date.fromisoformat, help="Lesson date to remind about (default: tomorrow)")
+    reminders.add_argument("--batch-size", type=int, default=0)
+    reminders.set_defaults(handler=send_reminders)
+
+    job = commands.add_parser("run-job", help="Run one maintenance job now, unless another worker is running it")
+    job.add_argument("name", choices=_job_names())
+    job.set_defaults(handler=run_job)
+
+    return parser
+
+
+def _export_tables() -> List[str]:
+    from app.services.exports import EXPORT_TABLES
+
+    return list(EXPORT_TABLES)
+
+
+def _job_names() -> List[str]:
+    from app.jobs.tasks import JOBS
+
+    return list(JOBS)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
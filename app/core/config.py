@@ -31,11 +31,55 @@ class Settings(BaseSettings):
     smtp_password: Optional[str] = None
     smtp_from: Optional[str] = None
     smtp_tls: bool = True
+    smtp_timeout_seconds: int = 30
+    reminder_batch_size: int = 100
+    reminder_cron: str = "0 17 * * *"
+    lesson_reminder_retention_days: int = 30
 
     frontend_base_url: str = "http://localhost:8080"
     file_storage_dir: str = "storage"
     password_reset_token_exp_minutes: int = 60
 
+    report_cache_ttl_seconds: int = 300
+    export_chunk_size: int = 10_000
+    import_batch_size: int = 1_000
+    series_horizon_days: int = 90
+    occupancy_warm_on_startup: bool = False
+
+    calendar_token_secret: Optional[str] = None
+    calendar_past_days: int = 90
+    calendar_cache_ttl_seconds: int = 3600
+    calendar_timezone: Optional[str] = None
+
+    # Must exceed the longest write transaction on backends other than PostgreSQL,
+    # where sync also waits for the oldest open transaction (see app/services/sync.py).
+    sync_settle_seconds: int = 5
+    sync_page_size: int = 500
+
+    events_backend: str = "local"
+    events_channel: str = "lagana_events"
+    events_keepalive_seconds: int = 15
+    events_queue_size: int = 100
+
+    domain_events_workers: int = 4
+    domain_events_retry_after_seconds: int = 60
+
+    jobs_enabled: bool = False
+    jobs_purge_batch_size: int = 1_000
+    jobs_invoice_file_grace_minutes: int = 60
+    jobs_run_retention_days: int = 90
+
+    payout_debtor_name: Optional[str] = None
+    payout_debtor_iban: Optional[str] = None
+    payout_debtor_bic: Optional[str] = None
+    payout_debtor_sort_code: Optional[str] = None
+    payout_debtor_account_number: Optional[str] = None
+    payout_currency: str = "EUR"
+
+    analytics_db_path: Optional[str] = None
+    analytics_sync_overlap_seconds: int = 300
+    analytics_serve_reports: bool = False
+
     class Config:
         env_file = ".env"
         case_sensitive = False
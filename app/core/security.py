@@ -1,5 +1,7 @@
+import hashlib
+import hmac
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -55,3 +57,22 @@ def decode_token(token: str, expected_type: str = "access") -> Dict[str, Any]:
     if payload.get("type") != expected_type:
         raise AuthenticationError("Invalid token type")
     return payload
+
+
+def _calendar_signature(scope: str, subject_id: int) -> str:
+    key = (settings.calendar_token_secret or settings.secret_key).encode()
+    return hmac.new(key, f"calendar:{scope}:{subject_id}".encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def create_calendar_token(scope: str, subject_id: int) -> str:
+    """Long-lived feed token; rotating ``CALENDAR_TOKEN_SECRET`` revokes every issued feed URL."""
+    return f"{subject_id}-{_calendar_signature(scope, subject_id)}"
+
+
+def verify_calendar_token(scope: str, token: str) -> Optional[int]:
+    subject, _, signature = token.partition("-")
+    if not subject.isdigit():
+        return None
+    if not hmac.compare_digest(signature, _calendar_signature(scope, int(subject))):
+        return None
+    return int(subject)
@@ -1,6 +1,9 @@
+import uuid
 from datetime import datetime
+from typing import Optional, Tuple
 
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import Uuid, event, inspect
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
 from sqlalchemy.sql import func
 
 
@@ -11,7 +14,36 @@ class Base(DeclarativeBase):
 class TimestampMixin:
     """Reusable mixin adding created/updated timestamps."""
 
+    # Relationship names whose changes should also bump ``updated_at``; a
+    # many-to-many change alone does not emit an UPDATE for the parent row.
+    __touch_on_change__: Tuple[str, ...] = ()
+
     created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         default=func.now(), onupdate=func.now(), nullable=False
     )
+
+
+class ClientEditMixin:
+    """Client-generated id and edit time for rows that offline clients create.
+
+    ``client_id`` is unique per table (per coach for lessons); each model
+    declares that constraint. ``edited_at`` is when the row's content was last
+    edited by the clock of whoever edited it: server writes stamp it like
+    ``updated_at``, offline upserts carry the device's time and only win when
+    it is not older than the stored one.
+    """
+
+    client_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid)
+    edited_at: Mapped[datetime] = mapped_column(default=func.now(), onupdate=func.now(), nullable=False)
+
+
+@event.listens_for(Session, "before_flush")
+def _touch_on_relationship_change(session: Session, flush_context, instances) -> None:
+    for obj in session.dirty:
+        names = getattr(obj, "__touch_on_change__", ())
+        if not names:
+            continue
+        state = inspect(obj)
+        if any(state.attrs[name].history.has_changes() for name in names):
+            obj.updated_at = func.now()
@@ -0,0 +1,97 @@
+"""Five-field cron expressions: ``minute hour day-of-month month day-of-week``.
+
+Each field is ``*``, a number, a range ``a-b``, a step ``*/n`` or ``a-b/n``,
+or a comma-separated list of those. Day of week runs from 0 (Sunday) to 6,
+and 7 is also accepted for Sunday. As in cron, when both day fields are
+restricted a day matches if either of them does.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+FIELDS: Tuple[Tuple[str, int, int], ...] = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+)
+# Far enough to reach any valid date, e.g. 29 February.
+SEARCH_DAYS = 366 * 8
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        spec, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start_text, end_text = spec.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = end = int(spec)
+            if step_text:
+                end = high
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid {name} field: {text}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    expression: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        parts = expression.split()
+        if len(parts) != len(FIELDS):
+            raise ValueError(f"Expected {len(FIELDS)} cron fields: {expression!r}")
+        try:
+            minutes, hours, days, months, weekdays = (
+                _parse_field(part, *field) for part, field in zip(parts, FIELDS)
+            )
+        except ValueError as exc:
+            raise ValueError(f"Invalid cron expression {expression!r}: {exc}") from exc
+        return cls(
+            expression=expression,
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            weekdays=frozenset(day % 7 for day in weekdays),
+            any_day=parts[2] == "*",
+            any_weekday=parts[4] == "*",
+        )
+
+    def _day_matches(self, moment: datetime) -> bool:
+        if moment.month not in self.months:
+            return False
+        in_days = moment.day in self.days
+        in_weekdays = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first matching minute strictly after ``moment``."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(SEARCH_DAYS):
+            if self._day_matches(candidate):
+                for hour in sorted(hour for hour in self.hours if hour >= candidate.hour):
+                    first_minute = candidate.minute if hour == candidate.hour else 0
+                    minutes = [minute for minute in sorted(self.minutes) if minute >= first_minute]
+                    if minutes:
+                        return candidate.replace(hour=hour, minute=minutes[0])
+            candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
@@ -0,0 +1,140 @@
+"""Run jobs under a per-job lock and record each run in ``job_runs``.
+
+On PostgreSQL the lock is a session-level advisory lock held on its own
+connection, so two API workers (or a worker and the CLI) never run the same
+job at once. Scheduled runs additionally claim their slot by inserting the
+``(job, scheduled_for)`` row, which the unique constraint lets only one
+worker do, so a slot is not run twice by workers whose clocks differ.
+Elsewhere the lock is process-local.
+
+``Scheduler`` is a daemon thread that evaluates the cron schedules in UTC
+and runs due jobs one after another. Slots missed while no worker was up
+are skipped rather than caught up.
+"""
+
+import json
+import logging
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.jobs.tasks import JOBS, Job
+from app.models.job_run import JobRun
+
+logger = logging.getLogger(__name__)
+
+MAX_SLEEP_SECONDS = 60
+
+_local_locks: Dict[str, threading.Lock] = {}
+_local_locks_guard = threading.Lock()
+
+
+def lock_key(name: str) -> int:
+    return zlib.crc32(f"lagana-job:{name}".encode())
+
+
+@contextmanager
+def job_lock(db: Session, name: str) -> Iterator[bool]:
+    """Yields whether the lock was acquired; never waits for it."""
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        key = lock_key(name)
+        with bind.connect() as connection:
+            acquired = connection.scalar(select(func.pg_try_advisory_lock(key)))
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    connection.scalar(select(func.pg_advisory_unlock(key)))
+        return
+
+    with _local_locks_guard:
+        lock = _local_locks.setdefault(name, threading.Lock())
+    acquired = lock.acquire(blocking=False)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            lock.release()
+
+
+def run_job(db: Session, job: Job, trigger: str = "manual", scheduled_for: Optional[datetime] = None) -> Optional[JobRun]:
+    """The finished run, or ``None`` when another worker holds the job or already claimed the slot."""
+    with job_lock(db, job.name) as acquired:
+        if not acquired:
+            return None
+        run = JobRun(job=job.name, trigger=trigger, scheduled_for=scheduled_for, status="running")
+        db.add(run)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return None
+
+        try:
+            result = job.func(db)
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Job %s failed", job.name)
+            run.status, run.error = "failed", f"{type(exc).__name__}: {exc}"
+        else:
+            run.status, run.result = "succeeded", json.loads(json.dumps(result or {}, default=str))
+        run.finished_at = func.now()
+        db.commit()
+        db.refresh(run)
+        return run
+
+
+def last_runs(db: Session) -> Dict[str, JobRun]:
+    latest = select(JobRun.job, func.max(JobRun.id).label("id")).group_by(JobRun.job).subquery()
+    runs = db.scalars(select(JobRun).join(latest, latest.c.id == JobRun.id))
+    return {run.job: run for run in runs}
+
+
+class Scheduler:
+    def __init__(self, jobs: Dict[str, Job]) -> None:
+        self.jobs = jobs
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="job-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Job scheduler started with %s jobs", len(self.jobs))
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        now = datetime.utcnow()
+        due = {name: job.schedule.next_after(now) for name, job in self.jobs.items()}
+        while True:
+            wait = (min(due.values()) - datetime.utcnow()).total_seconds()
+            if self._stop.wait(min(max(wait, 0), MAX_SLEEP_SECONDS)):
+                return
+            now = datetime.utcnow()
+            for name, slot in sorted(due.items(), key=lambda item: item[1]):
+                if slot > now or self._stop.is_set():
+                    continue
+                try:
+                    with SessionLocal() as db:
+                        run_job(db, self.jobs[name], trigger="schedule", scheduled_for=slot)
+                except Exception:
+                    logger.exception("Could not run scheduled job %s", name)
+                due[name] = self.jobs[name].schedule.next_after(max(now, datetime.utcnow()))
+
+
+scheduler = Scheduler(JOBS)
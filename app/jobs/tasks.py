@@ -0,0 +1,166 @@
+"""The maintenance jobs and their schedules.
+
+Purges remove rows in batches of ``JOBS_PURGE_BATCH_SIZE``: each batch
+selects a page of ids, deletes exactly those rows and commits, so no
+transaction holds row locks for longer than one small delete and
+concurrent requests only ever wait on a single batch.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from sqlalchemy import delete, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.jobs.cron import CronSchedule
+from app.models.invoice import Invoice
+from app.models.job_run import JobRun
+from app.models.lesson_reminder import LessonReminder
+from app.models.outbox_event import OutboxEvent
+from app.models.password_reset_token import PasswordResetToken
+from app.services import invoice as invoice_service
+from app.services import reminders
+from app.services import series as series_service
+from app.services.domain_events import bus
+
+INVOICE_FILE = re.compile(r"^invoice-(\d+)\.(pdf|csv)$")
+# Tables with the most churn; the planner's statistics on them go stale first.
+ANALYZE_TABLES = (
+    "lessons",
+    "lesson_players",
+    "lesson_courts",
+    "invoices",
+    "invoice_items",
+    "sync_tombstones",
+    "lesson_reminders",
+    "password_reset_tokens",
+    "job_runs",
+    "domain_event_outbox",
+)
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    cron: str
+    description: str
+    func: Callable[[Session], dict]
+    schedule: CronSchedule = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "schedule", CronSchedule.parse(self.cron))
+
+
+def purge_in_batches(db: Session, model, clauses: List, batch_size: int = 0) -> int:
+    batch_size = batch_size or settings.jobs_purge_batch_size
+    deleted = 0
+    while True:
+        ids = db.scalars(select(model.id).where(*clauses).order_by(model.id).limit(batch_size)).all()
+        if not ids:
+            return deleted
+        db.execute(delete(model).where(model.id.in_(ids)), execution_options={"synchronize_session": False})
+        db.commit()
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            return deleted
+
+
+def purge_password_reset_tokens(db: Session) -> dict:
+    now = datetime.now(timezone.utc)
+    clauses = [or_(PasswordResetToken.used.is_(True), PasswordResetToken.expires_at < now)]
+    return {"deleted": purge_in_batches(db, PasswordResetToken, clauses)}
+
+
+def purge_invoice_files(db: Session) -> dict:
+    """Delete stored PDF/CSV documents whose invoice no longer exists.
+
+    Files younger than the grace period are left alone, so a document
+    rendered moments ago is never raced against the row it belongs to.
+    """
+    cutoff = time.time() - settings.jobs_invoice_file_grace_minutes * 60
+    files: Dict[int, list] = {}
+    for path in invoice_service.storage_dir.iterdir():
+        match = INVOICE_FILE.match(path.name)
+        if match and path.stat().st_mtime < cutoff:
+            files.setdefault(int(match.group(1)), []).append(path)
+
+    candidates = sorted(files)
+    batch_size = settings.jobs_purge_batch_size
+    deleted = 0
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start : start + batch_size]
+        existing = set(db.scalars(select(Invoice.id).where(Invoice.id.in_(batch))))
+        for invoice_id in batch:
+            if invoice_id in existing:
+                continue
+            for path in files[invoice_id]:
+                path.unlink(missing_ok=True)
+                deleted += 1
+    return {"scanned": sum(len(paths) for paths in files.values()), "deleted": deleted}
+
+
+def purge_lesson_reminders(db: Session) -> dict:
+    cutoff = date.today() - timedelta(days=settings.lesson_reminder_retention_days)
+    return {"deleted": purge_in_batches(db, LessonReminder, [LessonReminder.lesson_date < cutoff])}
+
+
+def purge_job_runs(db: Session) -> dict:
+    cutoff = datetime.utcnow() - timedelta(days=settings.jobs_run_retention_days)
+    return {"deleted": purge_in_batches(db, JobRun, [JobRun.started_at < cutoff, JobRun.finished_at.isnot(None)])}
+
+
+def purge_domain_event_outbox(db: Session) -> dict:
+    cutoff = datetime.utcnow() - timedelta(days=settings.jobs_run_retention_days)
+    return {"deleted": purge_in_batches(db, OutboxEvent, [OutboxEvent.processed_at < cutoff])}
+
+
+def analyze_tables(db: Session) -> dict:
+    """``VACUUM (ANALYZE)`` on PostgreSQL, which refuses to run it inside a transaction; ``ANALYZE`` elsewhere."""
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for table in ANALYZE_TABLES:
+                connection.execute(text(f'VACUUM (ANALYZE) "{table}"'))
+    else:
+        for table in ANALYZE_TABLES:
+            db.execute(text(f'ANALYZE "{table}"'))
+        db.commit()
+    return {"tables": list(ANALYZE_TABLES)}
+
+
+def dispatch_domain_events(db: Session) -> dict:
+    """Retry queued event handlers whose post-commit run never happened or failed."""
+    return bus.drain(db.get_bind(), older_than_seconds=settings.domain_events_retry_after_seconds)
+
+
+def expand_series(db: Session) -> dict:
+    """Move every active series' occurrences up to the rolling horizon.
+
+    Runs inside the API worker so the lesson events reach its occupancy index
+    and recommender, which a CLI run in a separate process would not update.
+    """
+    return series_service.expand_series(db)
+
+
+def send_lesson_reminders(db: Session) -> dict:
+    return reminders.send_lesson_reminders(db)
+
+
+JOBS: Dict[str, Job] = {
+    job.name: job
+    for job in (
+        Job("purge-password-reset-tokens", "15 * * * *", "Delete used and expired password reset tokens", purge_password_reset_tokens),
+        Job("purge-invoice-files", "30 3 * * *", "Delete stored invoice documents whose invoice is gone", purge_invoice_files),
+        Job("purge-lesson-reminders", "45 3 * * *", "Delete reminder records for lessons past the retention window", purge_lesson_reminders),
+        Job("purge-job-runs", "0 4 * * 0", "Delete job run history past the retention window", purge_job_runs),
+        Job("purge-domain-event-outbox", "15 4 * * 0", "Delete handled domain events past the retention window", purge_domain_event_outbox),
+        Job("analyze-tables", "30 4 * * *", "Refresh planner statistics on the busiest tables", analyze_tables),
+        Job("expand-series", "0 2 * * *", "Materialize lesson series occurrences up to the horizon", expand_series),
+        Job("dispatch-domain-events", "* * * * *", "Retry queued domain event handlers", dispatch_domain_events),
+        Job("send-lesson-reminders", settings.reminder_cron, "E-mail players about their lessons tomorrow", send_lesson_reminders),
+    )
+}
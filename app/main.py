@@ -6,6 +6,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.db.session import SessionLocal
+from app.jobs.runner import scheduler
+from app.services.domain_events import bus
+from app.services.occupancy import occupancy
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,16 @@ def create_application() -> FastAPI:
         storage_path = Path(settings.file_storage_dir) / "invoices"
         storage_path.mkdir(parents=True, exist_ok=True)
         logger.info("Storage directory ready at %%s", storage_path)
+        if settings.occupancy_warm_on_startup:
+            with SessionLocal() as db:
+                occupancy.warm(db)
+        if settings.jobs_enabled:
+            scheduler.start()
+
+    @app.on_event("shutdown")
+    def _shutdown() -> None:
+        scheduler.stop(timeout=5)
+        bus.shutdown()
 
     app.include_router(api_router)
     return app
@@ -4,8 +4,14 @@ from app.models.player import Player
 from app.models.club import Club
 from app.models.court import Court
 from app.models.lesson import Lesson
+from app.models.lesson_series import LessonSeries
+from app.models.rate_card import RateCard
 from app.models.stroke import Stroke
 from app.models.invoice import Invoice
 from app.models.invoice_item import InvoiceItem
 from app.models.password_reset_token import PasswordResetToken
+from app.models.tombstone import Tombstone
+from app.models.lesson_reminder import LessonReminder
+from app.models.job_run import JobRun
+from app.models.outbox_event import OutboxEvent
 from app.models import associations  # noqa: F401
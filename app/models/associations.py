@@ -54,3 +54,28 @@ lesson_courts_table = Table(
     Index("ix_lesson_courts_lesson_id", "lesson_id"),
     Index("ix_lesson_courts_court_id", "court_id"),
 )
+
+series_players_table = Table(
+    "series_players",
+    Base.metadata,
+    Column("series_id", ForeignKey("lesson_series.id", ondelete="CASCADE"), primary_key=True),
+    Column("player_id", ForeignKey("players.id", ondelete="CASCADE"), primary_key=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Index("ix_series_players_player_id", "player_id"),
+)
+
+series_strokes_table = Table(
+    "series_strokes",
+    Base.metadata,
+    Column("series_id", ForeignKey("lesson_series.id", ondelete="CASCADE"), primary_key=True),
+    Column("stroke_id", ForeignKey("strokes.id", ondelete="CASCADE"), primary_key=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+series_courts_table = Table(
+    "series_courts",
+    Base.metadata,
+    Column("series_id", ForeignKey("lesson_series.id", ondelete="CASCADE"), primary_key=True),
+    Column("court_id", ForeignKey("courts.id", ondelete="CASCADE"), primary_key=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+)
@@ -1,9 +1,9 @@
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base, TimestampMixin
+from app.db.base_class import Base, ClientEditMixin, TimestampMixin
 from app.models.associations import lesson_courts_table
 
 if TYPE_CHECKING:
@@ -11,8 +11,12 @@ if TYPE_CHECKING:
     from app.models.lesson import Lesson
 
 
-class Court(TimestampMixin, Base):
+class Court(TimestampMixin, ClientEditMixin, Base):
     __tablename__ = "courts"
+    __table_args__ = (
+        Index("ix_courts_updated_at", "updated_at", "id"),
+        UniqueConstraint("client_id", name="uq_courts_client_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     club_id: Mapped[int] = mapped_column(ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False, index=True)
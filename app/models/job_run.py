@@ -0,0 +1,32 @@
+from datetime import datetime as dt_datetime
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class JobRun(Base):
+    """One execution of a maintenance job, scheduled or triggered by an admin."""
+
+    __tablename__ = "job_runs"
+    # Claiming a schedule slot inserts its row, so the unique key lets only one worker run each slot.
+    __table_args__ = (
+        UniqueConstraint("job", "scheduled_for", name="uq_job_runs_slot"),
+        Index("ix_job_runs_job_started", "job", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job: Mapped[str] = mapped_column(String(64), nullable=False)
+    trigger: Mapped[str] = mapped_column(String(16), nullable=False)
+    scheduled_for: Mapped[Optional[dt_datetime]] = mapped_column(DateTime)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="running")
+    started_at: Mapped[dt_datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    finished_at: Mapped[Optional[dt_datetime]] = mapped_column(DateTime)
+    result: Mapped[Optional[dict]] = mapped_column(JSON)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+
+    def __repr__(self) -> str:
+        return f"<JobRun {self.job} id={self.id} status={self.status}>"
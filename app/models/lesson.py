@@ -13,10 +13,11 @@ from sqlalchemy import (
     String,
     Time,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base, TimestampMixin
+from app.db.base_class import Base, ClientEditMixin, TimestampMixin
 from app.models.associations import lesson_players_table, lesson_strokes_table, lesson_courts_table
 from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType
 
@@ -29,8 +30,9 @@ if TYPE_CHECKING:
     from app.models.court import Court
 
 
-class Lesson(TimestampMixin, Base):
+class Lesson(TimestampMixin, ClientEditMixin, Base):
     __tablename__ = "lessons"
+    __touch_on_change__ = ("players", "strokes", "courts")
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     coach_id: Mapped[int] = mapped_column(ForeignKey("coaches.id", ondelete="CASCADE"), index=True)
@@ -51,6 +53,7 @@ class Lesson(TimestampMixin, Base):
     )
     club_reimbursement_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
     notes: Mapped[Optional[str]] = mapped_column(Text)
+    series_id: Mapped[Optional[int]] = mapped_column(ForeignKey("lesson_series.id", ondelete="SET NULL"))
 
     coach: Mapped["Coach"] = relationship("Coach", back_populates="lessons", lazy="joined")
     club: Mapped[Optional["Club"]] = relationship("Club", back_populates="lessons", lazy="joined")
@@ -85,6 +88,10 @@ class Lesson(TimestampMixin, Base):
             name="ck_lessons_reimbursement_positive",
         ),
         Index("ix_lessons_coach_date", "coach_id", "date"),
+        Index("ix_lessons_series_date", "series_id", "date"),
+        Index("ix_lessons_date_start", "date", "start_time"),
+        Index("ix_lessons_updated_at", "updated_at", "id"),
+        UniqueConstraint("coach_id", "client_id", name="uq_lessons_coach_client_id"),
     )
 
     def __repr__(self) -> str:
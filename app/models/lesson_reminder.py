@@ -0,0 +1,24 @@
+from datetime import date as dt_date, datetime as dt_datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class LessonReminder(Base):
+    """A reminder e-mail sent to one player for one lesson on one date; reruns skip what is recorded here."""
+
+    __tablename__ = "lesson_reminders"
+    # The date is part of the key so a lesson moved to another day is reminded again.
+    __table_args__ = (UniqueConstraint("lesson_id", "player_id", "lesson_date", name="uq_lesson_reminders_sent"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    lesson_id: Mapped[int] = mapped_column(ForeignKey("lessons.id", ondelete="CASCADE"), nullable=False)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
+    lesson_date: Mapped[dt_date] = mapped_column(Date, nullable=False)
+    sent_at: Mapped[dt_datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<LessonReminder lesson={self.lesson_id} player={self.player_id} date={self.lesson_date}>"
@@ -0,0 +1,52 @@
+from datetime import date as dt_date, time as dt_time
+from decimal import Decimal
+from typing import TYPE_CHECKING, List, Optional
+
+from sqlalchemy import Boolean, CheckConstraint, Date, Enum, ForeignKey, Integer, Numeric, String, Text, Time
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base_class import Base, TimestampMixin
+from app.models.associations import series_courts_table, series_players_table, series_strokes_table
+from app.models.enums import LessonStatus, LessonType
+
+if TYPE_CHECKING:
+    from app.models.court import Court
+    from app.models.player import Player
+    from app.models.stroke import Stroke
+
+
+class LessonSeries(TimestampMixin, Base):
+    """A recurring lesson template; occurrences are materialized as ``Lesson`` rows."""
+
+    __tablename__ = "lesson_series"
+    __touch_on_change__ = ("players", "strokes", "courts")
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    coach_id: Mapped[int] = mapped_column(ForeignKey("coaches.id", ondelete="CASCADE"), index=True)
+    club_id: Mapped[Optional[int]] = mapped_column(ForeignKey("clubs.id", ondelete="SET NULL"))
+    rrule: Mapped[str] = mapped_column(String(255), nullable=False)
+    starts_on: Mapped[dt_date] = mapped_column(Date, nullable=False)
+    ends_on: Mapped[Optional[dt_date]] = mapped_column(Date)
+    start_time: Mapped[dt_time] = mapped_column(Time, nullable=False)
+    end_time: Mapped[dt_time] = mapped_column(Time, nullable=False)
+    duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    type: Mapped[LessonType] = mapped_column(Enum(LessonType, name="lesson_type"), nullable=False)
+    status: Mapped[LessonStatus] = mapped_column(
+        Enum(LessonStatus, name="lesson_status"), default=LessonStatus.set, nullable=False
+    )
+    club_reimbursement_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    expanded_until: Mapped[Optional[dt_date]] = mapped_column(Date)
+
+    players: Mapped[List["Player"]] = relationship("Player", secondary=series_players_table, lazy="selectin")
+    strokes: Mapped[List["Stroke"]] = relationship("Stroke", secondary=series_strokes_table, lazy="selectin")
+    courts: Mapped[List["Court"]] = relationship("Court", secondary=series_courts_table, lazy="selectin")
+
+    __table_args__ = (
+        CheckConstraint("duration_minutes > 0", name="ck_lesson_series_duration_positive"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<LessonSeries id={self.id} coach={self.coach_id} rrule={self.rrule}>"
@@ -0,0 +1,27 @@
+from datetime import datetime as dt_datetime
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class OutboxEvent(Base):
+    """A domain event waiting for one queued handler; written in the transaction that raised it."""
+
+    __tablename__ = "domain_event_outbox"
+    __table_args__ = (Index("ix_domain_event_outbox_pending", "processed_at", "id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    handler: Mapped[str] = mapped_column(String(128), nullable=False)
+    event: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[dt_datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    processed_at: Mapped[Optional[dt_datetime]] = mapped_column(DateTime)
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent {self.event} -> {self.handler} id={self.id}>"
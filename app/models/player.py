@@ -1,10 +1,10 @@
 from datetime import date as dt_date
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Boolean, Date, Enum, Integer, String, Text
+from sqlalchemy import Boolean, Date, Enum, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base_class import Base, TimestampMixin
+from app.db.base_class import Base, ClientEditMixin, TimestampMixin
 from app.models.associations import lesson_players_table, player_coach_table
 from app.models.enums import SkillLevel
 
@@ -13,8 +13,13 @@ if TYPE_CHECKING:
     from app.models.lesson import Lesson
 
 
-class Player(TimestampMixin, Base):
+class Player(TimestampMixin, ClientEditMixin, Base):
     __tablename__ = "players"
+    __touch_on_change__ = ("coaches",)
+    __table_args__ = (
+        Index("ix_players_updated_at", "updated_at", "id"),
+        UniqueConstraint("client_id", name="uq_players_client_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
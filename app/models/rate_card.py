@@ -0,0 +1,31 @@
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Boolean, CheckConstraint, Enum, ForeignKey, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base, TimestampMixin
+from app.models.enums import LessonType
+
+
+class RateCard(TimestampMixin, Base):
+    """Hourly price for a coach's lessons; ``NULL`` club, type or upper band act as wildcards."""
+
+    __tablename__ = "rate_cards"
+    __table_args__ = (
+        CheckConstraint("min_players >= 0", name="ck_rate_cards_min_players"),
+        CheckConstraint("max_players IS NULL OR max_players >= min_players", name="ck_rate_cards_player_band"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    coach_id: Mapped[int] = mapped_column(ForeignKey("coaches.id", ondelete="CASCADE"), index=True)
+    club_id: Mapped[Optional[int]] = mapped_column(ForeignKey("clubs.id", ondelete="CASCADE"))
+    lesson_type: Mapped[Optional[LessonType]] = mapped_column(Enum(LessonType, name="lesson_type"))
+    min_players: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_players: Mapped[Optional[int]] = mapped_column(Integer)
+    hourly_rate: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    club_reimbursement_hourly_rate: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
+    active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RateCard id={self.id} coach_id={self.coach_id} hourly_rate={self.hourly_rate}>"
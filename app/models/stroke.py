@@ -1,4 +1,4 @@
-from sqlalchemy import Enum, Integer, String
+from sqlalchemy import Enum, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_class import Base, TimestampMixin
@@ -7,6 +7,7 @@ from app.models.enums import StrokeCode
 
 class Stroke(TimestampMixin, Base):
     __tablename__ = "strokes"
+    __table_args__ = (Index("ix_strokes_updated_at", "updated_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     code: Mapped[StrokeCode] = mapped_column(
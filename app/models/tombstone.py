@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import DateTime, Index, Integer, String, event
+from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+# Tables whose hard deletes are published to sync clients.
+SYNCED_TABLES = ("clubs", "courts", "strokes", "players", "lessons", "invoices")
+
+
+class Tombstone(Base):
+    """Marker left behind by a hard delete so ``/sync/changes`` can report it."""
+
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (Index("ix_sync_tombstones_deleted_at", "deleted_at", "id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity: Mapped[str] = mapped_column(String(32), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Who may see the deletion, mirroring how ``/sync/changes`` scopes live rows: the owning coach for
+    # lessons and invoices (one tombstone per linked coach for players), the club for clubs and courts.
+    # Strokes are a shared catalogue; any other row without a scope is visible to admins only.
+    coach_id: Mapped[Optional[int]] = mapped_column(Integer)
+    club_id: Mapped[Optional[int]] = mapped_column(Integer)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Tombstone {self.entity}:{self.entity_id}>"
+
+
+def _owners(obj, table: str) -> List[Tuple[Optional[int], Optional[int]]]:
+    """``(coach_id, club_id)`` pairs to record for a deleted row."""
+    if table == "players":
+        return [(coach.id, None) for coach in obj.coaches] or [(None, None)]
+    if table == "clubs":
+        return [(None, obj.id)]
+    if table == "courts":
+        return [(None, obj.club_id)]
+    return [(getattr(obj, "coach_id", None), None)]
+
+
+@event.listens_for(Session, "before_flush")
+def _record_deletes(session: Session, flush_context, instances) -> None:
+    for obj in list(session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in SYNCED_TABLES:
+            for coach_id, club_id in _owners(obj, table):
+                session.add(Tombstone(entity=table, entity_id=obj.id, coach_id=coach_id, club_id=club_id))
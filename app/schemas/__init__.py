@@ -7,11 +7,55 @@ from app.schemas.auth import (
 )
 from app.schemas.user import UserRead, UserCreate
 from app.schemas.coach import CoachRead, CoachCreate, CoachUpdate, CoachSelfUpdate
-from app.schemas.player import PlayerRead, PlayerCreate, PlayerUpdate
-from app.schemas.club import ClubRead, ClubCreate, ClubUpdate
+from app.schemas.player import (
+    PlayerRead,
+    PlayerCreate,
+    PlayerUpdate,
+    PlayerDuplicateCandidate,
+    PlayerMergeRequest,
+)
+from app.schemas.club import ClubRead, ClubCreate, ClubUpdate, ClubAvailability, FreeSlot
 from app.schemas.court import CourtRead, CourtCreate, CourtUpdate
-from app.schemas.stroke import StrokeRead, StrokeCreate, StrokeUpdate
-from app.schemas.lesson import LessonRead, LessonCreate, LessonUpdate, LessonFilters
+from app.schemas.stroke import StrokeRead, StrokeCreate, StrokeUpdate, StrokeRecommendation
+from app.schemas.lesson import (
+    LessonRead,
+    LessonCreate,
+    LessonUpdate,
+    LessonFilters,
+    LessonGroupRequest,
+    LessonGroupsRead,
+    LessonImportResult,
+    LessonBatchRequest,
+    LessonBatchResult,
+    LessonBulkTransition,
+    LessonBulkTransitionResult,
+)
+from app.schemas.calendar import CalendarFeedLink, CalendarFeeds
+from app.schemas.sync import (
+    SyncChanges,
+    SyncCourt,
+    SyncCourtUpsert,
+    SyncDeletion,
+    SyncLessonUpsert,
+    SyncPlayerUpsert,
+    SyncUpsertError,
+    SyncUpsertRequest,
+    SyncUpsertResult,
+)
+from app.schemas.schedule import (
+    ScheduleWindow,
+    ScheduleRequestItem,
+    ScheduleSolveRequest,
+    ScheduledLesson,
+    UnscheduledRequest,
+    ScheduleSolveResult,
+)
+from app.schemas.series import (
+    LessonSeriesRead,
+    LessonSeriesCreate,
+    LessonSeriesUpdate,
+    SeriesExpansionResult,
+)
 from app.schemas.invoice import (
     InvoiceRead,
     InvoiceDetail,
@@ -20,5 +64,16 @@ from app.schemas.invoice import (
     InvoiceConfirmRequest,
     InvoiceIssueRequest,
     InvoiceMarkPaidRequest,
+    ReconciliationResult,
+)
+from app.schemas.rate_card import (
+    RateCardRead,
+    RateCardCreate,
+    RateCardUpdate,
+    RepriceRequest,
+    RepriceResult,
 )
+from app.schemas.payout import PayoutIssue, PayoutSummary
+from app.schemas.report import RetentionCohort, RetentionReport
+from app.schemas.job import JobRead, JobRunRead
 from app.schemas.common import PaginatedResponse, Message
@@ -0,0 +1,31 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class AnalyticsQueryParams(BaseModel):
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    coach_id: Optional[int] = None
+    club_id: Optional[int] = None
+
+
+class AnalyticsQueryRequest(BaseModel):
+    name: str
+    params: AnalyticsQueryParams = AnalyticsQueryParams()
+
+
+class AnalyticsQueryResult(BaseModel):
+    name: str
+    columns: List[str]
+    rows: List[List[Any]]
+
+
+class AnalyticsQueryInfo(BaseModel):
+    name: str
+    description: str
+
+
+class AnalyticsSyncResult(BaseModel):
+    tables: Dict[str, Dict[str, int]]
@@ -0,0 +1,15 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class CalendarFeedLink(BaseModel):
+    scope: Literal["coach", "club"]
+    subject_id: int
+    name: str
+    url: str
+
+
+class CalendarFeeds(BaseModel):
+    coach: Optional[CalendarFeedLink] = None
+    clubs: List[CalendarFeedLink] = []
@@ -1,3 +1,4 @@
+from datetime import date, time
 from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr
@@ -36,3 +37,19 @@ class ClubRead(ClubBase):
 
     class Config:
         orm_mode = True
+
+
+class FreeSlot(BaseModel):
+    date: date
+    court_id: int
+    court_name: str
+    start_time: time
+    end_time: time
+
+
+class ClubAvailability(BaseModel):
+    club_id: int
+    date_from: date
+    date_to: date
+    duration_minutes: int
+    slots: List[FreeSlot]
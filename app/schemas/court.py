@@ -1,4 +1,5 @@
 from typing import Optional
+from uuid import UUID
 
 from pydantic import BaseModel
 
@@ -9,7 +10,7 @@ class CourtBase(BaseModel):
 
 
 class CourtCreate(CourtBase):
-    pass
+    client_id: Optional[UUID] = None
 
 
 class CourtUpdate(BaseModel):
@@ -19,6 +20,7 @@ class CourtUpdate(BaseModel):
 
 class CourtRead(CourtBase):
     id: int
+    client_id: Optional[UUID] = None
 
     class Config:
         orm_mode = True
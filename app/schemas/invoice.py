@@ -74,3 +74,39 @@ class InvoiceIssueRequest(BaseModel):
 
 class InvoiceMarkPaidRequest(BaseModel):
     paid_at: Optional[date] = Field(default=None, description="Optional payment date override")
+
+
+class ReconciliationMatch(BaseModel):
+    row: int
+    invoice_id: int
+    amount: Decimal
+    score: float
+
+
+class ReconciliationCandidate(BaseModel):
+    invoice_id: int
+    score: float
+    reasons: List[str]
+
+
+class ReconciliationReviewItem(BaseModel):
+    row: int
+    posted_on: date
+    amount: Decimal
+    reference: str
+    candidates: List[ReconciliationCandidate]
+
+
+class ReconciliationRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ReconciliationResult(BaseModel):
+    dry_run: bool
+    transactions: int
+    applied: int
+    matches: List[ReconciliationMatch]
+    review: List[ReconciliationReviewItem]
+    unmatched: int
+    errors: List[ReconciliationRowError]
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class JobRunRead(BaseModel):
+    id: int
+    job: str
+    trigger: str
+    scheduled_for: Optional[datetime]
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+    class Config:
+        orm_mode = True
+
+
+class JobRead(BaseModel):
+    name: str
+    schedule: str
+    description: str
+    next_run_at: datetime
+    last_run: Optional[JobRunRead] = None
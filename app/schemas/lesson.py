@@ -1,10 +1,11 @@
 import datetime as dt
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator
 
-from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, StrokeCode
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, StrokeCode
 from app.schemas.court import CourtRead
 from app.schemas.player import PlayerRead
 from app.schemas.stroke import StrokeRead
@@ -25,6 +26,7 @@ class LessonBase(BaseModel):
 
 class LessonCreate(LessonBase):
     coach_id: int
+    client_id: Optional[UUID] = None
     player_ids: List[int] = Field(default_factory=list)
     stroke_codes: List[StrokeCode] = Field(default_factory=list)
     court_ids: List[int] = Field(default_factory=list)
@@ -48,6 +50,7 @@ class LessonUpdate(BaseModel):
 
 class LessonRead(LessonBase):
     id: int
+    client_id: Optional[UUID] = None
     duration_minutes: int
     coach_id: int
     players: List[PlayerRead]
@@ -65,3 +68,121 @@ class LessonFilters(BaseModel):
     payment_status: Optional[LessonPaymentStatus] = None
     club_id: Optional[int] = None
     player_id: Optional[int] = None
+
+
+class LessonGroupRequest(BaseModel):
+    seed: int = 0
+    exposure_days: int = Field(default=90, ge=1, le=730)
+
+
+class LessonGroupPlayer(BaseModel):
+    id: int
+    full_name: str
+    skill_level: SkillLevel
+
+    class Config:
+        orm_mode = True
+
+
+class LessonGroup(BaseModel):
+    court: CourtRead
+    players: List[LessonGroupPlayer]
+    mean_skill: Optional[float] = None
+
+
+class LessonGroupsRead(BaseModel):
+    lesson_id: int
+    seed: int
+    groups: List[LessonGroup]
+
+
+IMPORT_LIST_DELIMITER = "|"
+
+
+class LessonImportRow(LessonBase):
+    """One lesson of an import file; players and courts are ids or emails/names."""
+
+    coach_id: Optional[int] = None
+    players: List[str] = Field(default_factory=list)
+    strokes: List[StrokeCode] = Field(default_factory=list)
+    courts: List[str] = Field(default_factory=list)
+
+    @root_validator(pre=True)
+    def _normalise(cls, values):
+        values = {key: value for key, value in values.items() if value not in ("", None)}
+        for target, sources in (
+            ("players", ("players", "player_ids", "player_emails")),
+            ("strokes", ("strokes", "stroke_codes")),
+            ("courts", ("courts", "court_ids", "court_names")),
+        ):
+            raw = next((values[source] for source in sources if source in values), [])
+            if isinstance(raw, str):
+                raw = raw.split(IMPORT_LIST_DELIMITER)
+            elif not isinstance(raw, list):
+                raw = [raw]
+            values[target] = [str(item).strip() for item in raw if str(item).strip()]
+        return values
+
+
+class LessonImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class LessonImportResult(BaseModel):
+    dry_run: bool
+    total_rows: int
+    valid_rows: int
+    imported: int
+    errors: List[LessonImportError]
+
+
+class LessonBatchCreate(BaseModel):
+    op: Literal["create"]
+    lesson: LessonCreate
+
+
+class LessonBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    changes: LessonUpdate
+
+
+class LessonBatchRequest(BaseModel):
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+    items: List[Union[LessonBatchCreate, LessonBatchUpdate]] = Field(..., min_items=1, max_items=500)
+
+
+class LessonBatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "updated", "failed", "skipped"]
+    lesson_id: Optional[int] = None
+    errors: List[str] = Field(default_factory=list)
+
+
+class LessonBatchResult(BaseModel):
+    mode: str
+    committed: bool
+    results: List[LessonBatchItemResult]
+
+
+class LessonBulkTransition(BaseModel):
+    lesson_ids: Optional[List[int]] = Field(default=None, max_items=10_000)
+    filters: Optional[LessonFilters] = None
+    status: Optional[LessonStatus] = None
+    payment_status: Optional[LessonPaymentStatus] = None
+
+    @root_validator(skip_on_failure=True)
+    def _check_targets(cls, values):
+        if values.get("status") is None and values.get("payment_status") is None:
+            raise ValueError("Provide a target status and/or payment_status")
+        if values.get("status") == LessonStatus.invoiced:
+            raise ValueError("Lessons are marked invoiced through the invoice flow")
+        if values.get("lesson_ids") is None and values.get("filters") is None:
+            raise ValueError("Provide lesson_ids or filters")
+        return values
+
+
+class LessonBulkTransitionResult(BaseModel):
+    updated: int
+    lesson_ids: List[int]
@@ -0,0 +1,19 @@
+from decimal import Decimal
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+
+class PayoutIssue(BaseModel):
+    coach_id: int
+    coach_name: str
+    error: str
+
+
+class PayoutSummary(BaseModel):
+    format: Literal["sepa", "bacs"]
+    currency: str
+    payees: int
+    invoices: int
+    total: Decimal
+    issues: List[PayoutIssue]
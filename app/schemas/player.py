@@ -1,7 +1,8 @@
 from datetime import date
 from typing import List, Optional
+from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, conlist
 
 from app.models.enums import SkillLevel
 from app.schemas.coach import CoachSimple
@@ -19,6 +20,7 @@ class PlayerBase(BaseModel):
 
 class PlayerCreate(PlayerBase):
     coach_ids: List[int]
+    client_id: Optional[UUID] = None
 
 
 class PlayerUpdate(BaseModel):
@@ -34,7 +36,19 @@ class PlayerUpdate(BaseModel):
 
 class PlayerRead(PlayerBase):
     id: int
+    client_id: Optional[UUID] = None
     coaches: List[CoachSimple]
 
     class Config:
         orm_mode = True
+
+
+class PlayerDuplicateCandidate(BaseModel):
+    player_ids: List[int]
+    score: float
+    reasons: List[str]
+
+
+class PlayerMergeRequest(BaseModel):
+    target_id: int
+    source_ids: conlist(int, min_items=1, max_items=100)
@@ -0,0 +1,77 @@
+import datetime as dt
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, root_validator
+
+from app.models.enums import LessonType
+
+
+def _check_band(cls, values):
+    low, high = values.get("min_players"), values.get("max_players")
+    if low is not None and high is not None and high < low:
+        raise ValueError("max_players must not be below min_players")
+    return values
+
+
+class RateCardBase(BaseModel):
+    club_id: Optional[int] = None
+    lesson_type: Optional[LessonType] = None
+    min_players: int = Field(default=0, ge=0)
+    max_players: Optional[int] = Field(default=None, ge=0)
+    hourly_rate: Decimal = Field(..., ge=0)
+    club_reimbursement_hourly_rate: Optional[Decimal] = Field(default=None, ge=0)
+    active: bool = True
+
+    _band = root_validator(allow_reuse=True)(_check_band)
+
+
+class RateCardCreate(RateCardBase):
+    coach_id: Optional[int] = None
+
+
+class RateCardUpdate(BaseModel):
+    club_id: Optional[int] = None
+    lesson_type: Optional[LessonType] = None
+    min_players: Optional[int] = Field(default=None, ge=0)
+    max_players: Optional[int] = Field(default=None, ge=0)
+    hourly_rate: Optional[Decimal] = Field(default=None, ge=0)
+    club_reimbursement_hourly_rate: Optional[Decimal] = Field(default=None, ge=0)
+    active: Optional[bool] = None
+
+    _band = root_validator(allow_reuse=True)(_check_band)
+
+
+class RateCardRead(RateCardBase):
+    id: int
+    coach_id: int
+
+    class Config:
+        orm_mode = True
+
+
+class RepriceRequest(BaseModel):
+    coach_id: Optional[int] = None
+    club_id: Optional[int] = None
+    lesson_type: Optional[LessonType] = None
+    date_from: Optional[dt.date] = None
+    date_to: Optional[dt.date] = None
+    dry_run: bool = False
+
+
+class LessonPriceChange(BaseModel):
+    lesson_id: int
+    date: dt.date
+    rate_card_id: Optional[int] = None
+    total_amount_before: Decimal
+    total_amount_after: Decimal
+    club_reimbursement_before: Optional[Decimal] = None
+    club_reimbursement_after: Optional[Decimal] = None
+
+
+class RepriceResult(BaseModel):
+    dry_run: bool
+    lessons: int
+    total_before: Decimal
+    total_after: Decimal
+    changes: List[LessonPriceChange]
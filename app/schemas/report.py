@@ -0,0 +1,20 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class RetentionCohort(BaseModel):
+    cohort: str
+    size: int
+    active: List[Optional[int]]
+    retention: List[Optional[float]]
+
+
+class RetentionReport(BaseModel):
+    date_from: date
+    date_to: date
+    club_id: Optional[int] = None
+    coach_id: Optional[int] = None
+    offsets: List[int]
+    cohorts: List[RetentionCohort]
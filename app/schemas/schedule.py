@@ -0,0 +1,63 @@
+import datetime as dt
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, conlist, validator
+
+from app.models.enums import LessonStatus, LessonType
+
+
+class ScheduleWindow(BaseModel):
+    date: dt.date
+    start_time: dt.time
+    end_time: dt.time
+
+    @validator("end_time")
+    def _end_after_start(cls, value: dt.time, values: dict) -> dt.time:
+        if "start_time" in values and value <= values["start_time"]:
+            raise ValueError("end_time must be after start_time")
+        return value
+
+
+class ScheduleRequestItem(BaseModel):
+    coach_id: Optional[int] = None
+    player_ids: List[int] = Field(default_factory=list)
+    duration_minutes: int = Field(..., ge=5, le=600)
+    windows: conlist(ScheduleWindow, min_items=1, max_items=50)
+    club_id: Optional[int] = None
+    courts: int = Field(default=1, ge=0, le=4)
+    type: LessonType = LessonType.private
+    total_amount: Optional[Decimal] = Field(default=None, ge=0)
+    notes: Optional[str] = None
+
+
+class ScheduleSolveRequest(BaseModel):
+    coach_id: Optional[int] = None
+    requests: conlist(ScheduleRequestItem, min_items=1, max_items=1000)
+    time_budget_ms: int = Field(default=500, ge=10, le=5_000)
+    commit: bool = False
+    status: LessonStatus = LessonStatus.draft
+
+
+class ScheduledLesson(BaseModel):
+    request: int
+    coach_id: int
+    date: dt.date
+    start_time: dt.time
+    end_time: dt.time
+    club_id: Optional[int]
+    court_ids: List[int]
+    lesson_id: Optional[int] = None
+
+
+class UnscheduledRequest(BaseModel):
+    request: int
+    reason: str
+
+
+class ScheduleSolveResult(BaseModel):
+    committed: bool
+    scheduled: List[ScheduledLesson]
+    unscheduled: List[UnscheduledRequest]
+    gap_minutes: int
+    iterations: int
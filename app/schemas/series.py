@@ -0,0 +1,93 @@
+import datetime as dt
+from decimal import Decimal
+from typing import List, Optional
+
+from dateutil.rrule import rrulestr
+from pydantic import BaseModel, Field, validator
+
+from app.models.enums import LessonStatus, LessonType, StrokeCode
+from app.schemas.court import CourtRead
+from app.schemas.player import PlayerRead
+from app.schemas.stroke import StrokeRead
+
+
+def _validate_rrule(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return value
+    value = value.strip()
+    if value.upper().startswith("RRULE:"):
+        value = value[6:]
+    try:
+        rrulestr(value, dtstart=dt.datetime(2000, 1, 1))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid recurrence rule") from exc
+    return value
+
+
+class LessonSeriesBase(BaseModel):
+    rrule: str = Field(..., description="RFC 5545 recurrence rule, e.g. FREQ=WEEKLY;BYDAY=TU")
+    starts_on: dt.date
+    ends_on: Optional[dt.date] = None
+    start_time: dt.time
+    end_time: dt.time
+    total_amount: Decimal = Field(..., ge=0)
+    type: LessonType
+    status: LessonStatus = LessonStatus.set
+    club_id: Optional[int] = None
+    club_reimbursement_amount: Optional[Decimal] = None
+    notes: Optional[str] = None
+
+    _rrule = validator("rrule", allow_reuse=True)(_validate_rrule)
+
+
+class LessonSeriesCreate(LessonSeriesBase):
+    coach_id: int
+    player_ids: List[int] = Field(default_factory=list)
+    stroke_codes: List[StrokeCode] = Field(default_factory=list)
+    court_ids: List[int] = Field(default_factory=list)
+
+
+class LessonSeriesUpdate(BaseModel):
+    rrule: Optional[str] = None
+    starts_on: Optional[dt.date] = None
+    ends_on: Optional[dt.date] = None
+    start_time: Optional[dt.time] = None
+    end_time: Optional[dt.time] = None
+    total_amount: Optional[Decimal] = Field(default=None, ge=0)
+    type: Optional[LessonType] = None
+    status: Optional[LessonStatus] = None
+    club_id: Optional[int] = None
+    club_reimbursement_amount: Optional[Decimal] = None
+    notes: Optional[str] = None
+    active: Optional[bool] = None
+    player_ids: Optional[List[int]] = None
+    stroke_codes: Optional[List[StrokeCode]] = None
+    court_ids: Optional[List[int]] = None
+
+    _rrule = validator("rrule", allow_reuse=True)(_validate_rrule)
+
+
+class LessonSeriesRead(LessonSeriesBase):
+    id: int
+    coach_id: int
+    duration_minutes: int
+    active: bool
+    expanded_until: Optional[dt.date] = None
+    players: List[PlayerRead]
+    strokes: List[StrokeRead]
+    courts: List[CourtRead]
+
+    class Config:
+        orm_mode = True
+
+
+class SeriesConflict(BaseModel):
+    series_id: int
+    date: dt.date
+    errors: List[str]
+
+
+class SeriesExpansionResult(BaseModel):
+    series: int
+    lessons: int
+    conflicts: List[SeriesConflict] = Field(default_factory=list)
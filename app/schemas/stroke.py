@@ -23,3 +23,9 @@ class StrokeRead(StrokeBase):
 
     class Config:
         orm_mode = True
+
+
+class StrokeRecommendation(BaseModel):
+    code: StrokeCode
+    label: str
+    score: float
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import StrokeCode
+from app.schemas.club import ClubRead
+from app.schemas.court import CourtBase, CourtRead
+from app.schemas.invoice import InvoiceRead
+from app.schemas.lesson import LessonBase, LessonRead
+from app.schemas.player import PlayerBase, PlayerRead
+from app.schemas.stroke import StrokeRead
+
+
+class SyncCourt(CourtRead):
+    club_id: int
+
+
+class SyncDeletion(BaseModel):
+    entity: str
+    id: int
+    deleted_at: datetime
+
+
+class SyncChanges(BaseModel):
+    next_token: Optional[str]
+    has_more: bool
+    clubs: List[ClubRead] = []
+    courts: List[SyncCourt] = []
+    strokes: List[StrokeRead] = []
+    players: List[PlayerRead] = []
+    lessons: List[LessonRead] = []
+    invoices: List[InvoiceRead] = []
+    deleted: List[SyncDeletion] = []
+
+
+class SyncCourtUpsert(CourtBase):
+    client_id: UUID
+    club_id: int
+    updated_at: datetime
+
+
+class SyncPlayerUpsert(PlayerBase):
+    client_id: UUID
+    updated_at: datetime
+
+
+class SyncLessonUpsert(LessonBase):
+    client_id: UUID
+    coach_id: Optional[int] = Field(default=None, description="Required for admins; coaches always upsert their own")
+    player_ids: List[int] = Field(default_factory=list)
+    player_client_ids: List[UUID] = Field(default_factory=list)
+    stroke_codes: List[StrokeCode] = Field(default_factory=list)
+    court_ids: List[int] = Field(default_factory=list)
+    court_client_ids: List[UUID] = Field(default_factory=list)
+    updated_at: datetime
+
+
+class SyncUpsertRequest(BaseModel):
+    courts: List[SyncCourtUpsert] = Field(default_factory=list, max_items=500)
+    players: List[SyncPlayerUpsert] = Field(default_factory=list, max_items=500)
+    lessons: List[SyncLessonUpsert] = Field(default_factory=list, max_items=500)
+
+
+class SyncUpsertError(BaseModel):
+    client_id: UUID
+    errors: List[str]
+
+
+class SyncUpsertResult(BaseModel):
+    courts: Dict[UUID, int] = {}
+    players: Dict[UUID, int] = {}
+    lessons: Dict[UUID, int] = {}
+    stale: List[UUID] = []
+    errors: List[SyncUpsertError] = []
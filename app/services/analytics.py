@@ -0,0 +1,291 @@
+"""Optional embedded DuckDB mirror of lessons and invoices for analytical scans.
+
+The mirror is enabled by ``ANALYTICS_DB_PATH``. ``sync`` copies rows whose
+``updated_at`` moved past the stored watermark (minus a small overlap for
+transactions that committed late), refreshes the association rows of those
+lessons and drops the rows named by ``sync_tombstones`` recorded since the
+previous sync.
+"""
+
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Boolean, Date, DateTime, Integer, Numeric, Table, Time, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.tombstone import Tombstone
+from app.services import exports as export_service
+
+# Parent tables synced by ``updated_at`` and the association tables refreshed
+# alongside them (keyed by the parent foreign key column).
+SYNCED_TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "lessons": [
+        ("lesson_players", "lesson_id"),
+        ("lesson_strokes", "lesson_id"),
+        ("lesson_courts", "lesson_id"),
+    ],
+    "invoices": [],
+    "invoice_items": [],
+}
+
+# The tombstone entity whose deletions remove mirrored rows, and the column
+# holding its id. Invoice items go away with their invoice.
+DELETED_BY: Dict[str, Tuple[str, str]] = {
+    "lessons": ("lessons", "id"),
+    "invoices": ("invoices", "id"),
+    "invoice_items": ("invoices", "invoice_id"),
+}
+
+PREDEFINED_QUERIES: Dict[str, Dict[str, Any]] = {
+    "monthly_revenue": {
+        "description": "Gross, reimbursement and net lesson amounts per month",
+        "sql": """
+            SELECT date_trunc('month', date) AS month,
+                   count(*) AS lessons,
+                   sum(total_amount) AS gross,
+                   sum(coalesce(club_reimbursement_amount, 0)) AS club_reimbursement,
+                   sum(total_amount - coalesce(club_reimbursement_amount, 0)) AS net
+            FROM lessons
+            WHERE date BETWEEN $date_from AND $date_to
+              AND ($coach_id IS NULL OR coach_id = $coach_id)
+              AND ($club_id IS NULL OR club_id = $club_id)
+            GROUP BY 1 ORDER BY 1
+        """,
+    },
+    "club_utilisation": {
+        "description": "Lessons and booked minutes per club and month",
+        "sql": """
+            SELECT club_id, date_trunc('month', date) AS month,
+                   count(*) AS lessons, sum(duration_minutes) AS minutes
+            FROM lessons
+            WHERE date BETWEEN $date_from AND $date_to
+              AND ($coach_id IS NULL OR coach_id = $coach_id)
+              AND ($club_id IS NULL OR club_id = $club_id)
+            GROUP BY 1, 2 ORDER BY 2, 1
+        """,
+    },
+    "stroke_usage": {
+        "description": "Lessons per stroke and month",
+        "sql": """
+            SELECT ls.stroke_id, date_trunc('month', l.date) AS month, count(*) AS lessons
+            FROM lesson_strokes ls JOIN lessons l ON l.id = ls.lesson_id
+            WHERE l.date BETWEEN $date_from AND $date_to
+              AND ($coach_id IS NULL OR l.coach_id = $coach_id)
+              AND ($club_id IS NULL OR l.club_id = $club_id)
+            GROUP BY 1, 2 ORDER BY 2, 1
+        """,
+    },
+    "invoice_status_summary": {
+        "description": "Invoice counts and net totals per status and period end month",
+        "sql": """
+            SELECT status, date_trunc('month', period_end) AS month,
+                   count(*) AS invoices, sum(total_net) AS total_net
+            FROM invoices
+            WHERE period_end BETWEEN $date_from AND $date_to
+              AND ($coach_id IS NULL OR coach_id = $coach_id)
+            GROUP BY 1, 2 ORDER BY 2, 1
+        """,
+    },
+}
+
+_write_lock = threading.Lock()
+
+
+class AnalyticsUnavailableError(RuntimeError):
+    """Raised when the analytics mirror is disabled or its dependencies are missing."""
+
+
+def is_enabled() -> bool:
+    return bool(settings.analytics_db_path)
+
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise AnalyticsUnavailableError(
+            "Analytics mirror requires duckdb; install lagana-coach-api[analytics]"
+        ) from exc
+    return duckdb
+
+
+@contextmanager
+def connect(read_only: bool = False) -> Iterator[Any]:
+    if not is_enabled():
+        raise AnalyticsUnavailableError("Analytics mirror is not configured (ANALYTICS_DB_PATH)")
+    duckdb = _duckdb()
+    connection = duckdb.connect(settings.analytics_db_path, read_only=read_only)
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def _duckdb_type(column) -> str:
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return "BOOLEAN"
+    if isinstance(column_type, Integer):
+        return "BIGINT"
+    if isinstance(column_type, Numeric):
+        return f"DECIMAL({column_type.precision or 18}, {column_type.scale or 2})"
+    if isinstance(column_type, DateTime):
+        return "TIMESTAMPTZ" if column_type.timezone else "TIMESTAMP"
+    if isinstance(column_type, Date):
+        return "DATE"
+    if isinstance(column_type, Time):
+        return "TIME"
+    return "VARCHAR"
+
+
+def _create_table_sql(table: Table) -> str:
+    columns = [f'"{column.name}" {_duckdb_type(column)}' for column in table.columns]
+    primary_key = ", ".join(f'"{column.name}"' for column in table.primary_key.columns)
+    return f'CREATE TABLE IF NOT EXISTS {table.name} ({", ".join(columns)}, PRIMARY KEY ({primary_key}))'
+
+
+def _ensure_schema(connection) -> None:
+    for table in export_service.EXPORT_TABLES.values():
+        connection.execute(_create_table_sql(table))
+        # Columns added to the primary after the mirror was created.
+        for column in table.columns:
+            connection.execute(
+                f'ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS "{column.name}" {_duckdb_type(column)}'
+            )
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS _sync_state (table_name VARCHAR PRIMARY KEY, watermark TIMESTAMP)"
+    )
+
+
+def _watermark(connection, table_name: str) -> Optional[datetime]:
+    row = connection.execute(
+        "SELECT watermark FROM _sync_state WHERE table_name = ?", [table_name]
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _since(watermark: Optional[datetime]) -> Optional[datetime]:
+    if watermark is None:
+        return None
+    return watermark - timedelta(seconds=settings.analytics_sync_overlap_seconds)
+
+
+def _deleted_ids(db: Session, entity: str, since: Optional[datetime]) -> Tuple[List[int], Optional[datetime]]:
+    """Ids of ``entity`` rows deleted since ``since`` and the newest deletion time seen."""
+    clauses = [Tombstone.entity == entity]
+    if since is not None:
+        clauses.append(Tombstone.deleted_at >= since)
+    rows = db.execute(
+        select(Tombstone.entity_id, func.max(Tombstone.deleted_at)).where(*clauses).group_by(Tombstone.entity_id)
+    ).all()
+    newest = max((row[1] for row in rows), default=None)
+    return [row[0] for row in rows], newest
+
+
+def _upsert_batch(connection, table_name: str, batch) -> None:
+    connection.register("_incoming", batch)
+    try:
+        connection.execute(f"INSERT OR REPLACE INTO {table_name} BY NAME SELECT * FROM _incoming")
+    finally:
+        connection.unregister("_incoming")
+
+
+def _sync_table(db: Session, connection, table_name: str, chunk_size: int) -> Dict[str, int]:
+    table = export_service.EXPORT_TABLES[table_name]
+    watermark = _watermark(connection, table_name)
+    since = _since(watermark)
+
+    # Deletions go first: SQLite may hand a deleted id to a new row, which the
+    # upsert below then puts back.
+    entity, key = DELETED_BY[table_name]
+    deletions_state = f"{table_name}:deletions"
+    removed, deleted_until = _deleted_ids(db, entity, _since(_watermark(connection, deletions_state)))
+    deleted = 0
+    if removed:
+        placeholders = ", ".join("?" for _ in removed)
+        deleted = connection.execute(
+            f"SELECT count(*) FROM {table_name} WHERE {key} IN ({placeholders})", removed
+        ).fetchone()[0]
+        connection.execute(f"DELETE FROM {table_name} WHERE {key} IN ({placeholders})", removed)
+        for child_name, foreign_key in SYNCED_TABLES[table_name]:
+            connection.execute(f"DELETE FROM {child_name} WHERE {foreign_key} IN ({placeholders})", removed)
+        connection.execute("INSERT OR REPLACE INTO _sync_state VALUES (?, ?)", [deletions_state, deleted_until])
+
+    upserted = 0
+    new_watermark = watermark
+    where = table.c.updated_at >= since if since is not None else None
+    for batch in export_service.iter_record_batches(db, table_name, chunk_size, where=where):
+        _upsert_batch(connection, table_name, batch)
+        upserted += batch.num_rows
+        batch_max = max(batch.column("updated_at").to_pylist())
+        if new_watermark is None or batch_max > new_watermark:
+            new_watermark = batch_max
+
+        parent_ids = batch.column("id").to_pylist()
+        for child_name, foreign_key in SYNCED_TABLES[table_name]:
+            child = export_service.EXPORT_TABLES[child_name]
+            placeholders = ", ".join("?" for _ in parent_ids)
+            connection.execute(f"DELETE FROM {child_name} WHERE {foreign_key} IN ({placeholders})", parent_ids)
+            for child_batch in export_service.iter_record_batches(
+                db, child_name, chunk_size, where=child.c[foreign_key].in_(parent_ids)
+            ):
+                _upsert_batch(connection, child_name, child_batch)
+
+    if new_watermark is not None:
+        connection.execute(
+            "INSERT OR REPLACE INTO _sync_state VALUES (?, ?)", [table_name, new_watermark]
+        )
+    return {"upserted": upserted, "deleted": deleted}
+
+
+def sync(db: Session, chunk_size: int = 0) -> Dict[str, Dict[str, int]]:
+    """Bring the mirror up to date with the primary database."""
+    with _write_lock, connect() as connection:
+        _ensure_schema(connection)
+        return {
+            table_name: _sync_table(db, connection, table_name, chunk_size)
+            for table_name in SYNCED_TABLES
+        }
+
+
+def run_query(name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    definition = PREDEFINED_QUERIES[name]
+    arguments = {
+        "date_from": params.get("date_from") or date(1970, 1, 1),
+        "date_to": params.get("date_to") or date(9999, 12, 31),
+        "coach_id": params.get("coach_id"),
+        "club_id": params.get("club_id"),
+    }
+    arguments = {key: value for key, value in arguments.items() if f"${key}" in definition["sql"]}
+    with connect(read_only=True) as connection:
+        cursor = connection.execute(definition["sql"], arguments)
+        columns = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+    return {"name": name, "columns": columns, "rows": [list(row) for row in rows]}
+
+
+def fetch_player_months(
+    *,
+    club_id: Optional[int] = None,
+    coach_id: Optional[int] = None,
+    until: Optional[date] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Mirror-backed equivalent of :func:`app.services.reports.fetch_player_months`."""
+    sql = """
+        SELECT DISTINCT lp.player_id, year(l.date) * 12 + month(l.date) - 1 AS month
+        FROM lesson_players lp JOIN lessons l ON l.id = lp.lesson_id
+        WHERE ($club_id IS NULL OR l.club_id = $club_id)
+          AND ($coach_id IS NULL OR l.coach_id = $coach_id)
+          AND ($until IS NULL OR l.date <= $until)
+    """
+    with connect(read_only=True) as connection:
+        rows = connection.execute(sql, {"club_id": club_id, "coach_id": coach_id, "until": until}).fetchall()
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    data = np.asarray(rows, dtype=np.int64)
+    return data[:, 0], data[:, 1]
@@ -0,0 +1,339 @@
+"""Constraint-based lesson auto-scheduling.
+
+Requested lessons are placed on the 5-minute grid of the occupancy index.
+A placement is feasible when the coach is free (existing lessons plus the
+placements made so far) and enough active courts of the club are free. For
+each request and window the feasible starts are computed at once with
+cumulative sums over the day's arrays.
+
+The cost of a placement is how much it changes the coach's idle time that
+day, i.e. the gaps between the first and last lesson. Filling a gap
+therefore scores below zero, and extending the day by exactly the lesson's
+length scores zero.
+
+The greedy pass places the most constrained requests first. Local search
+then repeats, within the time budget, until a pass finds no improvement:
+
+- it retries requests that are still unscheduled;
+- it moves each placement to its best spot when that lowers the total gap;
+- it takes one placement out to let an unscheduled request in, and keeps
+  the change only if both fit.
+"""
+
+import time as clock
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.coach import Coach
+from app.models.enums import LessonStatus
+from app.models.lesson import Lesson
+from app.schemas.schedule import ScheduleRequestItem
+from app.services.lessons import PreparedLesson
+from app.services.occupancy import SLOT_MINUTES, SLOTS_PER_DAY, end_slot, occupancy, slot_time, start_slot
+
+NO_SLOT = "No free slot for the coach and courts in the requested windows"
+
+
+@dataclass
+class Task:
+    index: int
+    coach_id: int
+    slots: int
+    club_id: Optional[int]
+    courts: int
+    windows: List[Tuple[date, int, int]]
+
+    @property
+    def freedom(self) -> int:
+        return sum(max(high - low - self.slots + 1, 0) for _, low, high in self.windows)
+
+
+@dataclass
+class Placement:
+    day: date
+    start: int
+    court_rows: Tuple[int, ...]
+
+
+class _CoachDay:
+    __slots__ = ("busy", "first", "last", "count")
+
+    def __init__(self, busy: np.ndarray) -> None:
+        self.busy = busy
+        self.refresh()
+
+    def refresh(self) -> None:
+        occupied = np.flatnonzero(self.busy)
+        self.count = int(occupied.size)
+        self.first = int(occupied[0]) if self.count else None
+        self.last = int(occupied[-1]) + 1 if self.count else None
+
+    @property
+    def gap(self) -> int:
+        return self.last - self.first - self.count if self.count else 0
+
+
+def _free_starts(busy: np.ndarray, length: int) -> np.ndarray:
+    """For each start along the last axis, whether ``length`` slots from there are all free."""
+    counts = np.cumsum(busy != 0, axis=-1)
+    padded = np.concatenate([np.zeros(busy.shape[:-1] + (1,), dtype=counts.dtype), counts], axis=-1)
+    return padded[..., length:] == padded[..., :-length]
+
+
+class Schedule:
+    def __init__(
+        self,
+        tasks: Sequence[Task],
+        coach_days: Dict[Tuple[int, date], np.ndarray],
+        court_days: Dict[Tuple[int, date], np.ndarray],
+        court_ids: Optional[Dict[int, List[int]]] = None,
+    ) -> None:
+        self.tasks = list(tasks)
+        self._tasks = {task.index: task for task in self.tasks}
+        self.court_ids = court_ids or {}
+        self._coach = {key: _CoachDay(busy) for key, busy in coach_days.items()}
+        self._courts = court_days
+        self.placements: Dict[int, Placement] = {}
+        self.iterations = 0
+
+    def _coach_day(self, coach_id: int, day: date) -> _CoachDay:
+        state = self._coach.get((coach_id, day))
+        if state is None:
+            state = self._coach[(coach_id, day)] = _CoachDay(np.zeros(SLOTS_PER_DAY, dtype=np.uint8))
+        return state
+
+    @property
+    def gap_slots(self) -> int:
+        return sum(state.gap for state in self._coach.values())
+
+    def best(self, task: Task) -> Optional[Tuple[int, Placement]]:
+        """Cheapest feasible placement of ``task`` given everything placed so far."""
+        best: Optional[Tuple[int, Placement]] = None
+        length = task.slots
+        for day, low, high in task.windows:
+            if high - low < length:
+                continue
+            state = self._coach_day(task.coach_id, day)
+            feasible = _free_starts(state.busy[low:high], length)
+            court_free = None
+            if task.courts:
+                court_free = _free_starts(self._courts[(task.club_id, day)][:, low:high], length)
+                feasible &= court_free.sum(axis=0) >= task.courts
+            starts = np.flatnonzero(feasible)
+            if not starts.size:
+                continue
+            if state.count:
+                ends = starts + low + length
+                span = np.maximum(ends, state.last) - np.minimum(starts + low, state.first)
+                costs = span - (state.last - state.first) - length
+                pick = int(np.argmin(costs))
+                cost = int(costs[pick])
+            else:
+                pick, cost = 0, 0
+            if best is not None and cost >= best[0]:
+                continue
+            rows: Tuple[int, ...] = ()
+            if court_free is not None:
+                rows = tuple(np.flatnonzero(court_free[:, starts[pick]])[: task.courts].tolist())
+            best = (cost, Placement(day, low + int(starts[pick]), rows))
+        return best
+
+    def place(self, task: Task, placement: Placement) -> None:
+        end = placement.start + task.slots
+        state = self._coach_day(task.coach_id, placement.day)
+        state.busy[placement.start : end] += 1
+        state.refresh()
+        if placement.court_rows:
+            self._courts[(task.club_id, placement.day)][list(placement.court_rows), placement.start : end] += 1
+        self.placements[task.index] = placement
+
+    def remove(self, task: Task) -> Placement:
+        placement = self.placements.pop(task.index)
+        end = placement.start + task.slots
+        state = self._coach[(task.coach_id, placement.day)]
+        state.busy[placement.start : end] -= 1
+        state.refresh()
+        if placement.court_rows:
+            self._courts[(task.club_id, placement.day)][list(placement.court_rows), placement.start : end] -= 1
+        return placement
+
+    def _insert(self, task: Task) -> bool:
+        found = self.best(task)
+        if found is None:
+            return False
+        self.place(task, found[1])
+        return True
+
+    def _relocate(self, task: Task) -> bool:
+        key = (task.coach_id, self.placements[task.index].day)
+        before = self._coach[key].gap
+        current = self.remove(task)
+        removal = self._coach[key].gap - before
+        found = self.best(task)
+        if found is not None and removal + found[0] < 0:
+            self.place(task, found[1])
+            return True
+        self.place(task, current)
+        return False
+
+    def _competes(self, task: Task, other: Task) -> bool:
+        return other.coach_id == task.coach_id or bool(task.courts and other.courts and other.club_id == task.club_id)
+
+    def _eject(self, task: Task, deadline: float) -> bool:
+        days = {day for day, _, _ in task.windows}
+        blockers = [
+            self._tasks[index]
+            for index, placement in self.placements.items()
+            if placement.day in days and self._competes(task, self._tasks[index])
+        ]
+        for other in blockers:
+            if clock.perf_counter() >= deadline:
+                break
+            previous = self.remove(other)
+            if self._insert(task):
+                if self._insert(other):
+                    return True
+                self.remove(task)
+            self.place(other, previous)
+        return False
+
+    def solve(self, budget_seconds: float) -> None:
+        deadline = clock.perf_counter() + budget_seconds
+        for task in sorted(self.tasks, key=lambda task: (task.freedom, -task.slots, task.index)):
+            self._insert(task)
+        improved = True
+        while improved and clock.perf_counter() < deadline:
+            improved = False
+            self.iterations += 1
+            for task in self.tasks:
+                if clock.perf_counter() >= deadline:
+                    return
+                if task.index not in self.placements:
+                    improved |= self._insert(task) or self._eject(task, deadline)
+                else:
+                    improved |= self._relocate(task)
+
+
+def _window(day: date, start: time, end: time) -> Tuple[date, int, int]:
+    return day, end_slot(start), start_slot(end)
+
+
+def build_schedule(
+    db: Session, items: Sequence[ScheduleRequestItem], coaches: Dict[int, Coach], coach_ids: Sequence[int]
+) -> Tuple[Schedule, Dict[int, str]]:
+    """Tasks plus the coach and court occupancy they compete for.
+
+    ``coach_ids`` gives the coach of each request. Requests that cannot be
+    attempted at all get a reason instead of a task.
+    """
+    rejected: Dict[int, str] = {}
+    tasks: List[Task] = []
+    courts: Dict[int, List[int]] = {}
+    for index, (item, coach_id) in enumerate(zip(items, coach_ids)):
+        coach = coaches[coach_id]
+        club_id = item.club_id or coach.default_club_id
+        if item.courts and club_id is None:
+            rejected[index] = "A club is required when courts are requested"
+            continue
+        if club_id is not None and club_id not in {club.id for club in coach.clubs}:
+            rejected[index] = f"Coach {coach_id} is not a member of club {club_id}"
+            continue
+        if item.courts and club_id not in courts:
+            courts[club_id] = occupancy.ensure_loaded(db, club_id).court_ids
+        if item.courts > len(courts.get(club_id, ())):
+            rejected[index] = f"Club {club_id} does not have {item.courts} active court(s)"
+            continue
+        slots = -(-item.duration_minutes // SLOT_MINUTES)
+        windows = [_window(window.date, window.start_time, window.end_time) for window in item.windows]
+        tasks.append(Task(index, coach_id, slots, club_id, item.courts, windows))
+
+    keys = {(task.coach_id, day) for task in tasks for day, _, _ in task.windows}
+    coach_days = {key: np.zeros(SLOTS_PER_DAY, dtype=np.uint8) for key in keys}
+    if keys:
+        booked = db.execute(
+            select(Lesson.coach_id, Lesson.date, Lesson.start_time, Lesson.end_time).where(
+                Lesson.coach_id.in_({coach_id for coach_id, _ in keys}),
+                Lesson.date.in_({day for _, day in keys}),
+            )
+        )
+        for row in booked:
+            busy = coach_days.get((row.coach_id, row.date))
+            if busy is not None:
+                busy[start_slot(row.start_time) : end_slot(row.end_time)] += 1
+
+    court_days: Dict[Tuple[int, date], np.ndarray] = {}
+    for club_id in courts:
+        club_days = {day for task in tasks if task.club_id == club_id and task.courts for day, _, _ in task.windows}
+        for day, grid in occupancy.snapshot(db, club_id, sorted(club_days)).items():
+            court_days[(club_id, day)] = grid
+    return Schedule(tasks, coach_days, court_days, courts), rejected
+
+
+def solve(
+    db: Session,
+    items: Sequence[ScheduleRequestItem],
+    coaches: Dict[int, Coach],
+    coach_ids: Sequence[int],
+    budget_ms: int,
+) -> Tuple[Schedule, Dict[int, str]]:
+    schedule, rejected = build_schedule(db, items, coaches, coach_ids)
+    schedule.solve(budget_ms / 1000)
+    for task in schedule.tasks:
+        if task.index not in schedule.placements:
+            rejected[task.index] = NO_SLOT
+    return schedule, rejected
+
+
+def scheduled_lessons(schedule: Schedule, items: Sequence[ScheduleRequestItem]) -> List[dict]:
+    lessons = []
+    for task in sorted(schedule.tasks, key=lambda task: task.index):
+        placement = schedule.placements.get(task.index)
+        if placement is None:
+            continue
+        start = slot_time(placement.start)
+        end = (datetime.combine(placement.day, start) + timedelta(minutes=items[task.index].duration_minutes)).time()
+        court_ids = schedule.court_ids.get(task.club_id, [])
+        lessons.append(
+            {
+                "request": task.index,
+                "coach_id": task.coach_id,
+                "date": placement.day,
+                "start_time": start,
+                "end_time": end,
+                "club_id": task.club_id,
+                "court_ids": [court_ids[row] for row in placement.court_rows],
+            }
+        )
+    return lessons
+
+
+def prepare_lessons(
+    items: Sequence[ScheduleRequestItem], lessons: Sequence[dict], status: LessonStatus
+) -> List[PreparedLesson]:
+    prepared = []
+    for lesson in lessons:
+        item = items[lesson["request"]]
+        prepared.append(
+            PreparedLesson(
+                values={
+                    "coach_id": lesson["coach_id"],
+                    "club_id": lesson["club_id"],
+                    "date": lesson["date"],
+                    "start_time": lesson["start_time"],
+                    "end_time": lesson["end_time"],
+                    "duration_minutes": item.duration_minutes,
+                    "total_amount": item.total_amount if item.total_amount is not None else 0,
+                    "type": item.type,
+                    "status": status,
+                    "notes": item.notes,
+                },
+                player_ids=list(dict.fromkeys(item.player_ids)),
+                court_ids=list(lesson["court_ids"]),
+            )
+        )
+    return prepared
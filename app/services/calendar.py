@@ -0,0 +1,175 @@
+"""iCalendar feeds of lessons per coach and per club.
+
+Calendar clients poll feeds every few minutes. Each poll first runs one
+aggregate query, ``count`` and ``max(updated_at)`` over the feed's lessons,
+and builds the ``ETag`` from it. A matching ``If-None-Match`` ends the
+request there with a 304. Otherwise the feed comes from a per-scope cache
+keyed by that ETag. Only on a miss are the ICS lines written, from a column
+projection of the lessons plus their court (and, for coach feeds, player)
+names.
+"""
+
+import hashlib
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.associations import lesson_courts_table, lesson_players_table
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.court import Court
+from app.models.enums import LessonStatus
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.utils.cache import TTLCache
+
+MAX_LINE_OCTETS = 75
+
+feed_cache = TTLCache(ttl_seconds=settings.calendar_cache_ttl_seconds, max_entries=512)
+
+
+def feed_clauses(scope: str, subject_id: int) -> List:
+    owner = Lesson.coach_id if scope == "coach" else Lesson.club_id
+    return [owner == subject_id, Lesson.date >= date.today() - timedelta(days=settings.calendar_past_days)]
+
+
+def feed_etag(db: Session, scope: str, subject_id: int) -> str:
+    count, latest = db.execute(
+        select(func.count(Lesson.id), func.max(Lesson.updated_at)).where(*feed_clauses(scope, subject_id))
+    ).one()
+    digest = hashlib.sha1(f"{scope}:{subject_id}:{count}:{latest}".encode()).hexdigest()[:24]
+    return f'"{digest}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Split a content line into CRLF + space continuations of at most 75 octets."""
+    encoded = line.encode()
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+    parts, current, size, limit = [], [], 0, MAX_LINE_OCTETS
+    for char in line:
+        width = len(char.encode())
+        if size + width > limit:
+            parts.append("".join(current))
+            current, size, limit = [], 0, MAX_LINE_OCTETS - 1
+        current.append(char)
+        size += width
+    parts.append("".join(current))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _names(db: Session, table, column: str, model, name_column, clauses: List) -> Dict[int, List[str]]:
+    rows = db.execute(
+        select(table.c.lesson_id, name_column)
+        .join(model, model.id == table.c[column])
+        .where(table.c.lesson_id.in_(select(Lesson.id).where(*clauses)))
+        .order_by(table.c.lesson_id, model.id)
+    )
+    names: Dict[int, List[str]] = defaultdict(list)
+    for lesson_id, name in rows:
+        names[lesson_id].append(name)
+    return names
+
+
+def _stamp(value: datetime) -> str:
+    return f"{value:%Y%m%dT%H%M%S}Z"
+
+
+def _event(row, courts: List[str], players: Optional[List[str]], scope: str) -> Iterable[str]:
+    kind = f"{row.type.value.title()} lesson"
+    if scope == "coach":
+        summary = f"{kind}: {', '.join(players)}" if players else kind
+    else:
+        summary = f"{kind} ({row.coach_name})"
+    location = ", ".join(filter(None, [row.club_name, ", ".join(courts)]))
+    yield "BEGIN:VEVENT"
+    yield f"UID:lesson-{row.id}@lagana-coach"
+    yield f"DTSTAMP:{_stamp(row.updated_at)}"
+    yield f"LAST-MODIFIED:{_stamp(row.updated_at)}"
+    yield f"DTSTART:{row.date:%Y%m%d}T{row.start_time:%H%M%S}"
+    yield f"DTEND:{row.date:%Y%m%d}T{row.end_time:%H%M%S}"
+    yield f"SUMMARY:{escape_text(summary)}"
+    if location:
+        yield f"LOCATION:{escape_text(location)}"
+    if scope == "coach" and row.notes:
+        yield f"DESCRIPTION:{escape_text(row.notes)}"
+    yield f"STATUS:{'TENTATIVE' if row.status == LessonStatus.draft else 'CONFIRMED'}"
+    yield "END:VEVENT"
+
+
+def feed_name(db: Session, scope: str, subject_id: int) -> Optional[str]:
+    if scope == "coach":
+        return db.scalar(select(Coach.full_name).where(Coach.id == subject_id))
+    return db.scalar(select(Club.name).where(Club.id == subject_id))
+
+
+def render_feed(db: Session, scope: str, subject_id: int, name: str) -> bytes:
+    clauses = feed_clauses(scope, subject_id)
+    courts = _names(db, lesson_courts_table, "court_id", Court, Court.name, clauses)
+    players = {}
+    if scope == "coach":
+        players = _names(db, lesson_players_table, "player_id", Player, Player.full_name, clauses)
+    rows = db.execute(
+        select(
+            Lesson.id,
+            Lesson.date,
+            Lesson.start_time,
+            Lesson.end_time,
+            Lesson.type,
+            Lesson.status,
+            Lesson.notes,
+            Lesson.updated_at,
+            Club.name.label("club_name"),
+            Coach.full_name.label("coach_name"),
+        )
+        .join(Coach, Coach.id == Lesson.coach_id)
+        .outerjoin(Club, Club.id == Lesson.club_id)
+        .where(*clauses)
+        .order_by(Lesson.date, Lesson.start_time, Lesson.id)
+    )
+
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{escape_text(settings.project_name)}//Lessons//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ]
+    if settings.calendar_timezone:
+        lines.append(f"X-WR-TIMEZONE:{settings.calendar_timezone}")
+    for row in rows:
+        lines.extend(_event(row, courts.get(row.id, []), players.get(row.id), scope))
+    lines.append("END:VCALENDAR")
+    return "".join(fold(line) for line in lines).encode()
+
+
+def cached_feed(db: Session, scope: str, subject_id: int, etag: str) -> Optional[bytes]:
+    """The feed body for ``etag``, rendering it on a cache miss; ``None`` when the coach or club does not exist."""
+    key = (scope, subject_id, etag)
+    body = feed_cache.get(key)
+    if body is None:
+        name = feed_name(db, scope, subject_id)
+        if name is None:
+            return None
+        body = render_feed(db, scope, subject_id, name)
+        feed_cache.invalidate(lambda cached: cached[:2] == (scope, subject_id))
+        feed_cache.set(key, body)
+    return body
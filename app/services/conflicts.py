@@ -0,0 +1,152 @@
+"""Double-booking checks for coaches and courts.
+
+Every check, for one lesson or a whole import, is a single query: the
+lessons on the affected dates whose time window touches the candidates'
+window, restricted to the involved coaches and courts. On PostgreSQL the
+window is a ``tsrange`` overlap served by the GiST index from migration
+0006; elsewhere it is a range scan on ``ix_lessons_date_start``. Exact
+pairwise overlaps, including overlaps inside the batch itself, are then
+resolved in memory.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.associations import lesson_courts_table
+from app.models.lesson import Lesson
+
+# Beyond this many distinct dates the window becomes a plain ``date IN (...)``
+# instead of one range predicate per date.
+MAX_DATE_WINDOWS = 100
+
+
+@dataclass
+class Slot:
+    date: date
+    start_time: time
+    end_time: time
+    coach_id: int
+    court_ids: Sequence[int] = ()
+    lesson_id: Optional[int] = None
+    label: Optional[str] = None
+
+
+@dataclass
+class _Booking:
+    lesson_id: Optional[int]
+    coach_id: int
+    start_time: time
+    end_time: time
+    court_ids: Set[int] = field(default_factory=set)
+    label: Optional[str] = None
+
+
+def _window_clause(db: Session, windows: Dict[date, Tuple[time, time]]):
+    if len(windows) > MAX_DATE_WINDOWS:
+        return Lesson.date.in_(list(windows))
+    if db.get_bind().dialect.name == "postgresql":
+        period = func.tsrange(Lesson.date + Lesson.start_time, Lesson.date + Lesson.end_time)
+        return or_(
+            *(
+                period.op("&&")(func.tsrange(datetime.combine(day, start), datetime.combine(day, end)))
+                for day, (start, end) in windows.items()
+            )
+        )
+    return or_(
+        *(
+            and_(Lesson.date == day, Lesson.start_time < end, Lesson.end_time > start)
+            for day, (start, end) in windows.items()
+        )
+    )
+
+
+def _existing_bookings(db: Session, slots: Sequence[Slot]) -> Dict[tuple, List[_Booking]]:
+    """Stored bookings near the slots, indexed by ``(date, "coach" | "court", id)``."""
+    windows: Dict[date, Tuple[time, time]] = {}
+    for slot in slots:
+        start, end = windows.get(slot.date, (slot.start_time, slot.end_time))
+        windows[slot.date] = (min(start, slot.start_time), max(end, slot.end_time))
+    coach_ids = {slot.coach_id for slot in slots}
+    court_ids = {court_id for slot in slots for court_id in slot.court_ids}
+    owner = Lesson.coach_id.in_(coach_ids)
+    if court_ids:
+        owner = or_(owner, lesson_courts_table.c.court_id.in_(court_ids))
+
+    rows = db.execute(
+        select(
+            Lesson.id,
+            Lesson.coach_id,
+            Lesson.date,
+            Lesson.start_time,
+            Lesson.end_time,
+            lesson_courts_table.c.court_id,
+        )
+        .outerjoin(lesson_courts_table, lesson_courts_table.c.lesson_id == Lesson.id)
+        .where(_window_clause(db, windows), owner)
+    )
+    moving = {slot.lesson_id for slot in slots if slot.lesson_id is not None}
+    bookings: Dict[int, _Booking] = {}
+    dates: Dict[int, date] = {}
+    for row in rows:
+        if row.id in moving:
+            continue
+        booking = bookings.get(row.id)
+        if booking is None:
+            booking = bookings[row.id] = _Booking(row.id, row.coach_id, row.start_time, row.end_time)
+            dates[row.id] = row.date
+        if row.court_id is not None:
+            booking.court_ids.add(row.court_id)
+
+    index: Dict[tuple, List[_Booking]] = defaultdict(list)
+    for lesson_id, booking in bookings.items():
+        _add(index, dates[lesson_id], booking)
+    return index
+
+
+def _add(index: Dict[tuple, List[_Booking]], day: date, booking: _Booking) -> None:
+    index[(day, "coach", booking.coach_id)].append(booking)
+    for court_id in booking.court_ids:
+        index[(day, "court", court_id)].append(booking)
+
+
+def _describe(booking: _Booking, slot: Slot) -> List[str]:
+    if not (booking.start_time < slot.end_time and booking.end_time > slot.start_time):
+        return []
+    other = f"lesson {booking.lesson_id}" if booking.lesson_id is not None else booking.label or "another lesson"
+    window = f"{booking.start_time:%H:%M}-{booking.end_time:%H:%M}"
+    messages = []
+    if booking.coach_id == slot.coach_id:
+        messages.append(f"Coach is already booked by {other} ({window})")
+    for court_id in sorted(booking.court_ids.intersection(slot.court_ids)):
+        messages.append(f"Court {court_id} is already booked by {other} ({window})")
+    return messages
+
+
+def find_conflicts(db: Session, slots: Sequence[Slot]) -> List[List[str]]:
+    """Conflict messages for each slot (empty when it is free), in one query.
+
+    Slots are checked against stored lessons and against earlier slots of the
+    same batch; a slot carrying ``lesson_id`` ignores that lesson's stored row.
+    """
+    if not slots:
+        return []
+    index = _existing_bookings(db, slots)
+    results: List[List[str]] = []
+    for slot in slots:
+        keys = [(slot.date, "coach", slot.coach_id)] + [(slot.date, "court", court_id) for court_id in slot.court_ids]
+        candidates = {id(booking): booking for key in keys for booking in index.get(key, ())}
+        messages = [message for booking in candidates.values() for message in _describe(booking, slot)]
+        results.append(messages)
+        if not messages:
+            booking = _Booking(None, slot.coach_id, slot.start_time, slot.end_time, set(slot.court_ids), slot.label)
+            _add(index, slot.date, booking)
+    return results
+
+
+def lesson_slot(values: dict, court_ids: Sequence[int], label: Optional[str] = None) -> Slot:
+    return Slot(values["date"], values["start_time"], values["end_time"], values["coach_id"], court_ids, label=label)
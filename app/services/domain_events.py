@@ -0,0 +1,328 @@
+"""Domain events raised inside a transaction and handled once it commits.
+
+Code that changes lessons or invoices calls ``bus.record(db, ...)`` before
+committing. The events wait in ``session.info``: a rollback discards them,
+and a commit hands them to every subscribed handler, so handlers never
+see a change that did not happen and the write path does not grow with
+each new subscriber.
+
+A handler is called with a fresh ``Session`` on the committing engine and
+the list of its events from that commit, and runs in one of three modes:
+
+``inline``
+    In the committing thread, right after the commit. For in-process
+    state the response must already reflect, such as cache updates.
+``thread``
+    On a shared thread pool of ``DOMAIN_EVENTS_WORKERS`` threads, so the
+    request does not wait for it. Coroutine handlers always run here.
+``queue``
+    Durably: the transaction also writes one ``domain_event_outbox`` row
+    per event, which the thread pool processes after the commit. Rows a
+    crash or a failure left behind are retried by the
+    ``dispatch-domain-events`` job.
+
+With ``DOMAIN_EVENTS_WORKERS=0`` every handler runs inline.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import date, timedelta
+from typing import Callable, ClassVar, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from sqlalchemy import event, func, inspect as inspect_instance, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.invoice import Invoice
+from app.models.lesson import Lesson
+from app.models.outbox_event import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+MODES = ("inline", "thread", "queue")
+# Above this many lessons per commit, subscribers keeping per-lesson state rebuild it instead.
+INCREMENTAL_LIMIT = 50
+MAX_ATTEMPTS = 5
+
+_PENDING = "domain_events"
+_OUTBOX = "domain_event_outbox"
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    name: ClassVar[str] = ""
+
+
+@dataclass(frozen=True)
+class LessonEvent(DomainEvent):
+    lesson_id: int
+    coach_id: int
+    club_id: Optional[int]
+    date: date
+
+    @classmethod
+    def of(cls, lesson: Lesson) -> "LessonEvent":
+        return cls(lesson_id=lesson.id, coach_id=lesson.coach_id, club_id=lesson.club_id, date=lesson.date)
+
+    @classmethod
+    def for_ids(cls, db: Session, lesson_ids: Sequence[int]) -> List["LessonEvent"]:
+        if not lesson_ids:
+            return []
+        rows = db.execute(
+            select(Lesson.id, Lesson.coach_id, Lesson.club_id, Lesson.date)
+            .where(Lesson.id.in_(lesson_ids))
+            .order_by(Lesson.id)
+        )
+        return [cls(lesson_id=row.id, coach_id=row.coach_id, club_id=row.club_id, date=row.date) for row in rows]
+
+
+@dataclass(frozen=True)
+class InvoiceEvent(DomainEvent):
+    invoice_id: int
+    coach_id: int
+
+    @classmethod
+    def of(cls, invoice: Invoice) -> "InvoiceEvent":
+        return cls(invoice_id=invoice.id, coach_id=invoice.coach_id)
+
+    @classmethod
+    def for_ids(cls, db: Session, invoice_ids: Sequence[int]) -> List["InvoiceEvent"]:
+        if not invoice_ids:
+            return []
+        rows = db.execute(select(Invoice.id, Invoice.coach_id).where(Invoice.id.in_(invoice_ids)).order_by(Invoice.id))
+        return [cls(invoice_id=row.id, coach_id=row.coach_id) for row in rows]
+
+
+@dataclass(frozen=True)
+class LessonCreated(LessonEvent):
+    name: ClassVar[str] = "lesson.created"
+
+
+@dataclass(frozen=True)
+class LessonUpdated(LessonEvent):
+    name: ClassVar[str] = "lesson.updated"
+
+
+@dataclass(frozen=True)
+class LessonDeleted(LessonEvent):
+    name: ClassVar[str] = "lesson.deleted"
+
+
+@dataclass(frozen=True)
+class InvoiceConfirmed(InvoiceEvent):
+    name: ClassVar[str] = "invoice.confirmed"
+
+
+@dataclass(frozen=True)
+class InvoiceIssued(InvoiceEvent):
+    name: ClassVar[str] = "invoice.issued"
+
+
+@dataclass(frozen=True)
+class InvoicePaid(InvoiceEvent):
+    name: ClassVar[str] = "invoice.paid"
+
+
+EVENT_TYPES: Dict[str, Type[DomainEvent]] = {
+    cls.name: cls for cls in (LessonCreated, LessonUpdated, LessonDeleted, InvoiceConfirmed, InvoiceIssued, InvoicePaid)
+}
+
+
+def to_payload(domain_event: DomainEvent) -> dict:
+    return {key: value.isoformat() if isinstance(value, date) else value for key, value in asdict(domain_event).items()}
+
+
+def from_payload(name: str, payload: dict) -> DomainEvent:
+    cls = EVENT_TYPES[name]
+    values = dict(payload)
+    for item in fields(cls):
+        if item.type is date and isinstance(values.get(item.name), str):
+            values[item.name] = date.fromisoformat(values[item.name])
+    return cls(**values)
+
+
+def lesson_changes(events: Sequence[DomainEvent]) -> Tuple[Set[int], Set[int]]:
+    """``(changed, deleted)`` lesson ids; a lesson created or updated and then deleted counts as deleted."""
+    deleted = {item.lesson_id for item in events if isinstance(item, LessonDeleted)}
+    changed = {item.lesson_id for item in events if isinstance(item, LessonEvent)} - deleted
+    return changed, deleted
+
+
+Handler = Callable[[Session, List[DomainEvent]], object]
+
+
+@dataclass(frozen=True)
+class Subscription:
+    name: str
+    func: Handler
+    types: Tuple[Type[DomainEvent], ...]
+    mode: str
+
+    def matching(self, events: Sequence[DomainEvent]) -> List[DomainEvent]:
+        return [item for item in events if isinstance(item, self.types)]
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, *types: Type[DomainEvent], mode: str = "inline", name: Optional[str] = None):
+        """Decorator registering ``func(db, events)`` for events of ``types`` (or their subclasses)."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown handler mode: {mode}")
+
+        def register(func: Handler) -> Handler:
+            handler_mode = "thread" if mode == "inline" and inspect.iscoroutinefunction(func) else mode
+            subscription = Subscription(
+                name=name or f"{func.__module__}.{func.__qualname__}",
+                func=func,
+                types=types or (DomainEvent,),
+                mode=handler_mode,
+            )
+            self._subscriptions[subscription.name] = subscription
+            return func
+
+        return register
+
+    def unsubscribe(self, func: Handler) -> None:
+        for name in [name for name, subscription in self._subscriptions.items() if subscription.func is func]:
+            del self._subscriptions[name]
+
+    def record(self, db: Session, *events: DomainEvent) -> None:
+        db.info.setdefault(_PENDING, []).extend(events)
+
+    def _submit(self, func: Callable, *args) -> None:
+        if settings.domain_events_workers <= 0:
+            func(*args)
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.domain_events_workers, thread_name_prefix="domain-events"
+                )
+            executor = self._executor
+        executor.submit(func, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _call(self, subscription: Subscription, bind, events: List[DomainEvent]) -> None:
+        with Session(bind=bind) as db:
+            result = subscription.func(db, events)
+            if inspect.isawaitable(result):
+                asyncio.run(result)
+
+    def _call_logged(self, subscription: Subscription, bind, events: List[DomainEvent]) -> None:
+        try:
+            self._call(subscription, bind, events)
+        except Exception:
+            logger.exception("Domain event handler %s failed on %s events", subscription.name, len(events))
+
+    def _before_commit(self, session: Session) -> None:
+        events = session.info.get(_PENDING)
+        if not events:
+            return
+        rows = [
+            OutboxEvent(handler=subscription.name, event=item.name, payload=to_payload(item))
+            for subscription in self._subscriptions.values()
+            if subscription.mode == "queue"
+            for item in subscription.matching(events)
+        ]
+        if rows:
+            session.add_all(rows)
+            session.info.setdefault(_OUTBOX, []).extend(rows)
+
+    def _after_commit(self, session: Session) -> None:
+        events = session.info.pop(_PENDING, None)
+        rows = session.info.pop(_OUTBOX, [])
+        if not events:
+            return
+        bind = session.get_bind()
+        for subscription in self._subscriptions.values():
+            matching = subscription.matching(events)
+            if not matching or subscription.mode == "queue":
+                continue
+            if subscription.mode == "inline":
+                self._call_logged(subscription, bind, matching)
+            else:
+                self._submit(self._call_logged, subscription, bind, matching)
+        if rows:
+            # The rows are expired by the commit; their identity still holds the id without a query.
+            self._submit(self.drain, bind, [inspect_instance(row).identity[0] for row in rows])
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(_PENDING, None)
+        session.info.pop(_OUTBOX, None)
+
+    def drain(self, bind, outbox_ids: Optional[Sequence[int]] = None, *, older_than_seconds: int = 0) -> dict:
+        """Run queued handlers for the given outbox rows, or for every pending row old enough to have been missed."""
+        result = {"processed": 0, "failed": 0}
+        with Session(bind=bind) as db:
+            if outbox_ids is None:
+                cutoff = db.scalar(select(func.now())) - timedelta(seconds=older_than_seconds)
+                outbox_ids = db.scalars(
+                    select(OutboxEvent.id)
+                    .where(
+                        OutboxEvent.processed_at.is_(None),
+                        OutboxEvent.attempts < MAX_ATTEMPTS,
+                        OutboxEvent.created_at <= cutoff,
+                    )
+                    .order_by(OutboxEvent.id)
+                ).all()
+            for outbox_id in outbox_ids:
+                # SKIP LOCKED lets the job and post-commit drains share the table without running a row twice.
+                row = db.scalars(
+                    select(OutboxEvent)
+                    .where(OutboxEvent.id == outbox_id, OutboxEvent.processed_at.is_(None))
+                    .with_for_update(skip_locked=True)
+                ).first()
+                if row is None:
+                    db.rollback()
+                    continue
+                subscription = self._subscriptions.get(row.handler)
+                try:
+                    if subscription is None:
+                        raise LookupError(f"No handler named {row.handler}")
+                    self._call(subscription, bind, [from_payload(row.event, row.payload)])
+                except Exception as exc:
+                    db.rollback()
+                    logger.exception("Queued domain event %s for %s failed", outbox_id, row.handler)
+                    db.execute(
+                        update(OutboxEvent)
+                        .where(OutboxEvent.id == outbox_id)
+                        .values(attempts=OutboxEvent.attempts + 1, last_error=f"{type(exc).__name__}: {exc}")
+                    )
+                    result["failed"] += 1
+                else:
+                    row.attempts += 1
+                    row.processed_at = func.now()
+                    result["processed"] += 1
+                db.commit()
+        return result
+
+
+bus = EventBus()
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    bus._before_commit(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    bus._after_commit(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    bus._after_rollback(session)
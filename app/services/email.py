@@ -20,30 +20,101 @@ def render_template(template_name: str, **context) -> str:
     return template.render(**context)
 
 
-def send_email(subject: str, to_email: str, html_body: str) -> None:
-    if not settings.smtp_host:
-        logger.warning("SMTP not configured. Skipping email send to %s", to_email)
-        return
-
+def build_message(subject: str, to_email: str, html_body: str) -> EmailMessage:
     message = EmailMessage()
     message["Subject"] = subject
     message["From"] = settings.smtp_from or settings.smtp_user
     message["To"] = to_email
     message.set_content("This email requires an HTML capable client.")
     message.add_alternative(html_body, subtype="html")
+    return message
 
-    try:
-        if settings.smtp_tls:
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port or 587) as smtp:
+
+class SMTPConnectionError(Exception):
+    """The SMTP server cannot be reached, refused the session or keeps dropping it."""
+
+
+class SMTPSession:
+    """One SMTP connection reused for many messages.
+
+    Opening a connection costs a TCP handshake, ``STARTTLS`` and ``AUTH``;
+    a session pays that once and then sends each message as its own
+    ``MAIL``/``RCPT``/``DATA`` transaction. If the server drops the
+    connection (idle timeout, per-connection message limit) the next send
+    reconnects once and retries. Failures of the connection itself raise
+    ``SMTPConnectionError``; refused recipients and messages raise the
+    usual ``smtplib`` errors and leave the session usable.
+    """
+
+    def __init__(self) -> None:
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def __enter__(self) -> "SMTPSession":
+        self._connect()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _connect(self) -> None:
+        port = settings.smtp_port or (587 if settings.smtp_tls else 25)
+        try:
+            smtp = smtplib.SMTP(settings.smtp_host, port, timeout=settings.smtp_timeout_seconds)
+        except OSError as exc:
+            raise SMTPConnectionError(f"Could not connect to {settings.smtp_host}:{port}: {exc}") from exc
+        try:
+            if settings.smtp_tls:
                 smtp.starttls()
-                if settings.smtp_user and settings.smtp_password:
-                    smtp.login(settings.smtp_user, settings.smtp_password)
-                smtp.send_message(message)
-        else:
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port or 25) as smtp:
-                if settings.smtp_user and settings.smtp_password:
-                    smtp.login(settings.smtp_user, settings.smtp_password)
-                smtp.send_message(message)
+            if settings.smtp_user and settings.smtp_password:
+                smtp.login(settings.smtp_user, settings.smtp_password)
+        except OSError as exc:
+            smtp.close()
+            raise SMTPConnectionError(f"Could not open an SMTP session: {exc}") from exc
+        self._smtp = smtp
+
+    def _send(self, message: EmailMessage) -> None:
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPException:
+            raise
+        except OSError as exc:
+            # Socket errors and timeouts: the connection is unusable, unlike a refused recipient.
+            self._smtp.close()
+            self._smtp = None
+            raise SMTPConnectionError(f"SMTP connection failed: {exc}") from exc
+
+    def send(self, message: EmailMessage) -> None:
+        if self._smtp is None:
+            self._connect()
+        try:
+            self._send(message)
+        except smtplib.SMTPServerDisconnected:
+            self._smtp = None
+            self._connect()
+            try:
+                self._send(message)
+            except smtplib.SMTPServerDisconnected as exc:
+                self._smtp = None
+                raise SMTPConnectionError("SMTP server dropped the connection again after reconnecting") from exc
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except smtplib.SMTPException:
+            self._smtp.close()
+        self._smtp = None
+
+
+def send_email(subject: str, to_email: str, html_body: str) -> None:
+    if not settings.smtp_host:
+        logger.warning("SMTP not configured. Skipping email send to %s", to_email)
+        return
+
+    try:
+        with SMTPSession() as session:
+            session.send(build_message(subject, to_email, html_body))
     except Exception as exc:  # pragma: no cover - logged for observability
         logger.error("Failed to send email: %s", exc)
 
@@ -0,0 +1,217 @@
+"""Change events pushed to open dashboards over server-sent events.
+
+Every committed lesson and invoice domain event is turned into a small
+stream event (``lesson.created``, ``invoice.paid``, ...). ``broadcaster``
+hands them to every open ``/events/stream`` connection whose scope they
+match. A connection is a
+bounded ``asyncio.Queue`` read by a coroutine on the server's event loop,
+so an idle client costs one queue and one suspended generator, not a thread.
+
+The backend decides how events reach the other workers. ``local`` delivers
+inside the publishing process only. ``postgres`` sends each event through
+``NOTIFY``; every worker keeps one ``LISTEN`` connection whose socket the
+event loop watches, and feeds its own connections from it.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.domain_events import DomainEvent, InvoiceEvent, LessonEvent, bus
+
+logger = logging.getLogger(__name__)
+
+Event = Dict[str, Any]
+Deliver = Callable[[List[Event]], None]
+
+RETRY_MILLISECONDS = 3000
+NOTIFY_RECONNECT_SECONDS = 5
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One stream's scope and queue; ``None`` in the queue tells the stream to close."""
+
+    coach_id: Optional[int]
+    club_id: Optional[int]
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=settings.events_queue_size))
+
+    def wants(self, event: Event) -> bool:
+        if self.coach_id is not None and event.get("coach_id") != self.coach_id:
+            return False
+        # Invoices carry no club, so a club filter narrows lesson events only.
+        return self.club_id is None or event.get("club_id", self.club_id) == self.club_id
+
+    def offer(self, events: List[Event]) -> None:
+        """Runs on ``loop``. A client that fell this far behind is cut off; it reconnects and refetches."""
+        try:
+            self.queue.put_nowait(events)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class LocalBackend:
+    def start(self, loop: asyncio.AbstractEventLoop, deliver: Deliver) -> None:
+        pass
+
+    def publish(self, events: List[Event], deliver: Deliver) -> None:
+        deliver(events)
+
+
+class PostgresBackend:
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self._connection = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def publish(self, events: List[Event], deliver: Deliver) -> None:
+        from app.db.session import engine
+
+        with engine.begin() as connection:
+            for event in events:
+                connection.execute(select(func.pg_notify(self.channel, json.dumps(event))))
+
+    def start(self, loop: asyncio.AbstractEventLoop, deliver: Deliver) -> None:
+        with self._lock:
+            if self._connection is not None and self._loop is loop:
+                return
+            import psycopg2
+            import psycopg2.extensions
+
+            dsn = make_url(settings.sqlalchemy_database_uri).set(drivername="postgresql")
+            connection = psycopg2.connect(dsn.render_as_string(hide_password=False))
+            connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            loop.add_reader(connection.fileno(), self._drain, deliver)
+            self._connection, self._loop = connection, loop
+
+    def _drain(self, deliver: Deliver) -> None:
+        connection, loop = self._connection, self._loop
+        try:
+            connection.poll()
+        except Exception:
+            logger.exception("Lost the event LISTEN connection; reconnecting")
+            loop.remove_reader(connection.fileno())
+            connection.close()
+            self._connection = None
+            loop.call_later(NOTIFY_RECONNECT_SECONDS, self._restart, loop, deliver)
+            return
+        events = [json.loads(notify.payload) for notify in connection.notifies]
+        connection.notifies.clear()
+        if events:
+            deliver(events)
+
+    def _restart(self, loop: asyncio.AbstractEventLoop, deliver: Deliver) -> None:
+        try:
+            self.start(loop, deliver)
+        except Exception:
+            logger.exception("Could not reconnect the event LISTEN connection")
+            loop.call_later(NOTIFY_RECONNECT_SECONDS, self._restart, loop, deliver)
+
+
+def create_backend(name: str):
+    if name == "local":
+        return LocalBackend()
+    if name == "postgres":
+        return PostgresBackend(settings.events_channel)
+    raise ValueError(f"Unknown events backend: {name}")
+
+
+class Broadcaster:
+    def __init__(self, backend) -> None:
+        self.backend = backend
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, coach_id: Optional[int] = None, club_id: Optional[int] = None) -> Subscription:
+        """Must be called on the event loop that will read the subscription."""
+        loop = asyncio.get_running_loop()
+        self.backend.start(loop, self.deliver)
+        subscription = Subscription(coach_id=coach_id, club_id=club_id, loop=loop)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    @property
+    def connections(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, events: Iterable[Event]) -> None:
+        """Safe to call from any thread after commit; a failure is logged and never fails the write."""
+        events = list(events)
+        if not events:
+            return
+        try:
+            self.backend.publish(events, self.deliver)
+        except Exception:
+            logger.exception("Could not publish %s change events", len(events))
+
+    def deliver(self, events: List[Event]) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            wanted = [event for event in events if subscription.wants(event)]
+            if not wanted:
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, wanted)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+
+def format_event(event: Event) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+async def stream(subscription: Subscription, keepalive_seconds: float) -> AsyncIterator[str]:
+    """SSE frames for ``subscription`` with comment keepalives; unsubscribes when the client goes away."""
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            try:
+                events = await asyncio.wait_for(subscription.queue.get(), keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if events is None:
+                return
+            yield "".join(format_event(event) for event in events)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+broadcaster = Broadcaster(create_backend(settings.events_backend))
+
+
+def stream_event(item: DomainEvent) -> Event:
+    if isinstance(item, LessonEvent):
+        return {
+            "type": item.name,
+            "id": item.lesson_id,
+            "coach_id": item.coach_id,
+            "club_id": item.club_id,
+            "date": item.date.isoformat(),
+        }
+    return {"type": item.name, "id": item.invoice_id, "coach_id": item.coach_id}
+
+
+@bus.subscribe(LessonEvent, InvoiceEvent, mode="thread")
+def _publish_changes(db: Session, events: List[DomainEvent]) -> None:
+    broadcaster.publish(stream_event(item) for item in events)
@@ -0,0 +1,128 @@
+import enum
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from sqlalchemy import JSON, Boolean, Date, DateTime, Enum, Integer, Numeric, Table, Time, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.associations import lesson_courts_table, lesson_players_table, lesson_strokes_table
+from app.models.invoice import Invoice
+from app.models.invoice_item import InvoiceItem
+from app.models.lesson import Lesson
+from app.utils.streams import StreamBuffer
+
+EXPORT_TABLES: Dict[str, Table] = {
+    "lessons": Lesson.__table__,
+    "lesson_players": lesson_players_table,
+    "lesson_strokes": lesson_strokes_table,
+    "lesson_courts": lesson_courts_table,
+    "invoices": Invoice.__table__,
+    "invoice_items": InvoiceItem.__table__,
+}
+
+
+class ExportUnavailableError(RuntimeError):
+    """Raised when the optional columnar dependencies are not installed."""
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise ExportUnavailableError(
+            "Parquet export requires pyarrow; install lagana-coach-api[analytics]"
+        ) from exc
+    return pyarrow
+
+
+def _arrow_type(pa, column):
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Numeric):
+        return pa.decimal128(column_type.precision or 18, column_type.scale or 2)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Time):
+        return pa.time64("us")
+    return pa.string()
+
+
+def arrow_schema(table: Table):
+    pa = _pyarrow()
+    return pa.schema(
+        [pa.field(column.name, _arrow_type(pa, column), nullable=column.nullable) for column in table.columns]
+    )
+
+
+def _column_converter(column):
+    if isinstance(column.type, Enum):
+        return lambda value: value.value if isinstance(value, enum.Enum) else value
+    if isinstance(column.type, JSON):
+        return lambda value: None if value is None else json.dumps(value)
+    return None
+
+
+def iter_record_batches(db: Session, table_name: str, chunk_size: int = 0, *, where=None) -> Iterator:
+    """Yield Arrow record batches for ``table_name`` from a server-side cursor, one chunk at a time.
+
+    ``where`` optionally restricts the rows (e.g. to those changed since a watermark).
+    """
+    pa = _pyarrow()
+    table = EXPORT_TABLES[table_name]
+    schema = arrow_schema(table)
+    converters = [_column_converter(column) for column in table.columns]
+    chunk_size = chunk_size or settings.export_chunk_size
+
+    stmt = select(table).order_by(*table.primary_key.columns)
+    if where is not None:
+        stmt = stmt.where(where)
+    result = db.execute(stmt.execution_options(yield_per=chunk_size))
+    for partition in result.partitions():
+        columns: List[list] = [list(values) for values in zip(*partition)]
+        for position, converter in enumerate(converters):
+            if converter is not None:
+                columns[position] = [converter(value) for value in columns[position]]
+        yield pa.record_batch(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+
+def write_parquet(db: Session, table_name: str, destination, chunk_size: int = 0) -> int:
+    """Write ``table_name`` to ``destination`` (path or file object); returns the row count."""
+    pa = _pyarrow()
+    rows = 0
+    with pa.parquet.ParquetWriter(destination, arrow_schema(EXPORT_TABLES[table_name])) as writer:
+        for batch in iter_record_batches(db, table_name, chunk_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def export_all(db: Session, out_dir: Path, chunk_size: int = 0) -> Dict[str, int]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return {
+        table_name: write_parquet(db, table_name, str(out_dir / f"{table_name}.parquet"), chunk_size)
+        for table_name in EXPORT_TABLES
+    }
+
+
+def stream_parquet(db: Session, table_name: str, chunk_size: int = 0) -> Iterator[bytes]:
+    pa = _pyarrow()
+    buffer = StreamBuffer()
+    try:
+        with pa.parquet.ParquetWriter(buffer, arrow_schema(EXPORT_TABLES[table_name])) as writer:
+            for batch in iter_record_batches(db, table_name, chunk_size):
+                writer.write_batch(batch)
+                yield buffer.drain()
+        yield buffer.drain()
+    finally:
+        db.close()
@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+from typing import List, Sequence
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.associations import lesson_players_table, lesson_strokes_table
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.stroke import Stroke
+from app.services.recommendations import LEVEL_INDEX
+
+SKILL_WEIGHT = 1.0
+EXPOSURE_WEIGHT = 0.5
+
+
+def recent_exposure(db: Session, player_ids: Sequence[int], since: date) -> np.ndarray:
+    """Player x stroke lesson counts since ``since``, rows ordered like ``player_ids``."""
+    stroke_ids = db.execute(select(Stroke.id).order_by(Stroke.id)).scalars().all()
+    exposure = np.zeros((len(player_ids), len(stroke_ids)), dtype=np.float64)
+    if not player_ids or not stroke_ids:
+        return exposure
+
+    stmt = (
+        select(lesson_players_table.c.player_id, lesson_strokes_table.c.stroke_id, func.count())
+        .join(Lesson, Lesson.id == lesson_players_table.c.lesson_id)
+        .join(lesson_strokes_table, lesson_strokes_table.c.lesson_id == Lesson.id)
+        .where(lesson_players_table.c.player_id.in_(player_ids), Lesson.date >= since)
+        .group_by(lesson_players_table.c.player_id, lesson_strokes_table.c.stroke_id)
+    )
+    counts = np.asarray(db.execute(stmt).all(), dtype=np.int64).reshape(-1, 3)
+    if counts.size:
+        player_order = np.asarray(player_ids, dtype=np.int64)
+        sorter = np.argsort(player_order)
+        rows = sorter[np.searchsorted(player_order, counts[:, 0], sorter=sorter)]
+        cols = np.searchsorted(np.asarray(stroke_ids, dtype=np.int64), counts[:, 1])
+        np.add.at(exposure, (rows, cols), counts[:, 2])
+    return exposure
+
+
+def balance_groups(features: np.ndarray, n_groups: int, *, seed: int = 0, max_swaps: int = 0) -> np.ndarray:
+    """Assign each row of ``features`` to one of ``n_groups`` groups with similar feature sums.
+
+    A seeded snake draft over the players ranked by overall strength gives
+    group sizes that differ by at most one; a vectorised pairwise-swap pass
+    then reduces the spread of per-group feature totals.
+    """
+    n_players = features.shape[0]
+    if n_players == 0:
+        return np.empty(0, dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    strength = features.sum(axis=1) + rng.uniform(0, 1e-6, size=n_players)
+    order = np.argsort(-strength, kind="stable")
+    rank = np.arange(n_players)
+    lap, position = np.divmod(rank, n_groups)
+    groups = np.empty(n_players, dtype=np.int64)
+    groups[order] = np.where(lap % 2 == 0, position, n_groups - 1 - position)
+
+    sizes = np.bincount(groups, minlength=n_groups)
+    target = features.mean(axis=0)
+    squared_norms = np.einsum("ij,ij->i", features, features)
+    gram = features @ features.T
+    max_swaps = max_swaps or n_players
+    for _ in range(max_swaps):
+        sums = np.zeros((n_groups, features.shape[1]))
+        np.add.at(sums, groups, features)
+        deviation = sums - sizes[:, None] * target
+        # Cost change of swapping players i and j between their groups:
+        # 2 (x_j - x_i) . (D_gi - D_gj) + 2 ||x_j - x_i||^2
+        projected = features @ deviation[groups].T
+        diagonal = np.diag(projected)
+        cross = projected.T - diagonal[None, :] - diagonal[:, None] + projected
+        distance = squared_norms[:, None] + squared_norms[None, :] - 2 * gram
+        delta = 2 * cross + 2 * distance
+        delta[groups[:, None] == groups[None, :]] = np.inf
+        best = int(np.argmin(delta))
+        i, j = divmod(best, n_players)
+        if delta[i, j] >= -1e-9:
+            break
+        groups[i], groups[j] = groups[j], groups[i]
+    return groups
+
+
+def build_lesson_groups(
+    db: Session,
+    players: Sequence[Player],
+    n_groups: int,
+    *,
+    seed: int = 0,
+    exposure_days: int = 90,
+) -> List[List[Player]]:
+    players = sorted(players, key=lambda player: player.id)
+    player_ids = [player.id for player in players]
+    skill = np.asarray([LEVEL_INDEX[player.skill_level] for player in players], dtype=np.float64)
+    exposure = recent_exposure(db, player_ids, date.today() - timedelta(days=exposure_days))
+    if exposure.size and exposure.max() > 0:
+        exposure = np.log1p(exposure) / np.log1p(exposure.max(axis=0, keepdims=True).clip(min=1))
+    features = np.hstack([SKILL_WEIGHT * skill[:, None], EXPOSURE_WEIGHT * exposure])
+
+    assignment = balance_groups(features, n_groups, seed=seed)
+    groups: List[List[Player]] = [[] for _ in range(n_groups)]
+    for player, group in zip(players, assignment.tolist()):
+        groups[group].append(player)
+    return groups
@@ -1,20 +1,30 @@
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Sequence, Tuple
 
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_RIGHT
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models.enums import InvoiceStatus, LessonStatus
+from app.models.enums import InvoiceStatus, LessonPaymentStatus, LessonStatus
 from app.models.invoice import Invoice
 from app.models.invoice_item import InvoiceItem
 from app.models.lesson import Lesson
+from app.services.domain_events import (
+    DomainEvent,
+    InvoiceConfirmed,
+    InvoiceIssued,
+    InvoicePaid,
+    LessonUpdated,
+    bus,
+)
+from app.services.lessons import transition_lessons
 
 storage_dir = Path(settings.file_storage_dir) / "invoices"
 storage_dir.mkdir(parents=True, exist_ok=True)
@@ -109,30 +119,79 @@ def confirm_invoice(
         lesson.status = LessonStatus.invoiced
 
     db.flush()
+    bus.record(db, InvoiceConfirmed.of(invoice), *(LessonUpdated.of(lesson) for lesson in lessons))
     return invoice
 
 
 def issue_invoice(db: Session, invoice: Invoice) -> Invoice:
     invoice.status = InvoiceStatus.issued
     invoice.issued_at = datetime.utcnow()
-    _write_invoice_documents(invoice)
+    invoice.pdf_url = str(document_paths(invoice.id)[0])
     db.add(invoice)
+    bus.record(db, InvoiceIssued.of(invoice))
     return invoice
 
 
-def mark_invoice_paid(invoice: Invoice) -> Invoice:
+def mark_invoice_paid(db: Session, invoice: Invoice) -> Invoice:
     invoice.status = InvoiceStatus.paid
+    lesson_ids = transition_lessons(
+        db,
+        [Lesson.id.in_(select(InvoiceItem.lesson_id).where(InvoiceItem.invoice_id == invoice.id))],
+        payment_status=LessonPaymentStatus.paid,
+    )
+    bus.record(db, InvoicePaid.of(invoice), *LessonUpdated.for_ids(db, lesson_ids))
     return invoice
 
 
-def _write_invoice_documents(invoice: Invoice) -> None:
-    pdf_path = storage_dir / f"invoice-{invoice.id}.pdf"
-    csv_path = storage_dir / f"invoice-{invoice.id}.csv"
-
-    _build_invoice_pdf(invoice, pdf_path)
-    _build_invoice_csv(invoice, csv_path)
-
-    invoice.pdf_url = str(pdf_path)
+def mark_invoices_paid(db: Session, invoice_ids: Sequence[int], batch_size: int = 1000) -> List[int]:
+    """Set-based ``mark_invoice_paid`` for issued invoices; returns the ids that changed."""
+    paid: List[int] = []
+    for start in range(0, len(invoice_ids), batch_size):
+        batch = list(invoice_ids[start : start + batch_size])
+        changed = list(
+            db.scalars(
+                update(Invoice)
+                .where(Invoice.id.in_(batch), Invoice.status == InvoiceStatus.issued)
+                .values(status=InvoiceStatus.paid, updated_at=func.now())
+                .returning(Invoice.id)
+                .execution_options(synchronize_session="fetch")
+            )
+        )
+        if changed:
+            lesson_ids = transition_lessons(
+                db,
+                [Lesson.id.in_(select(InvoiceItem.lesson_id).where(InvoiceItem.invoice_id.in_(changed)))],
+                payment_status=LessonPaymentStatus.paid,
+            )
+            bus.record(db, *InvoicePaid.for_ids(db, changed), *LessonUpdated.for_ids(db, lesson_ids))
+        paid.extend(changed)
+    return paid
+
+
+def document_paths(invoice_id: int) -> Tuple[Path, Path]:
+    return storage_dir / f"invoice-{invoice_id}.pdf", storage_dir / f"invoice-{invoice_id}.csv"
+
+
+@bus.subscribe(InvoiceIssued, mode="queue")
+def write_invoice_documents(db: Session, events: List[DomainEvent]) -> None:
+    """Render the documents of issued invoices, replacing any left from an earlier issue."""
+    for item in events:
+        invoice = db.get(Invoice, item.invoice_id)
+        if invoice is None:
+            continue
+        pdf_path, csv_path = document_paths(invoice.id)
+        _build_invoice_pdf(invoice, pdf_path)
+        _build_invoice_csv(invoice, csv_path)
+
+
+def ensure_invoice_documents(invoice: Invoice) -> Tuple[Path, Path]:
+    """Render whichever of the invoice's PDF/CSV documents is missing from storage."""
+    pdf_path, csv_path = document_paths(invoice.id)
+    if not pdf_path.exists():
+        _build_invoice_pdf(invoice, pdf_path)
+    if not csv_path.exists():
+        _build_invoice_csv(invoice, csv_path)
+    return pdf_path, csv_path
 
 
 def _build_invoice_pdf(invoice: Invoice, path: Path) -> None:
@@ -0,0 +1,80 @@
+import csv
+import io
+import zipfile
+from typing import Iterator, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.coach import Coach
+from app.models.invoice import Invoice
+from app.models.invoice_item import InvoiceItem
+from app.services import invoice as invoice_service
+from app.utils.streams import StreamBuffer
+
+COMPRESSION = {"stored": zipfile.ZIP_STORED, "deflate": zipfile.ZIP_DEFLATED}
+READ_CHUNK_SIZE = 64 * 1024
+
+SUMMARY_COLUMNS = [
+    Invoice.id,
+    Invoice.coach_id,
+    Coach.full_name.label("coach_name"),
+    Invoice.period_start,
+    Invoice.period_end,
+    Invoice.status,
+    Invoice.issued_at,
+    Invoice.due_date,
+    Invoice.total_gross,
+    Invoice.total_club_reimbursement,
+    Invoice.total_net,
+]
+
+
+def summary_query(clauses: List):
+    """One row per invoice with its coach name and item count."""
+    return (
+        select(*SUMMARY_COLUMNS, func.count(InvoiceItem.id).label("items"))
+        .join(Coach, Coach.id == Invoice.coach_id)
+        .outerjoin(InvoiceItem, InvoiceItem.invoice_id == Invoice.id)
+        .where(*clauses)
+        .group_by(*SUMMARY_COLUMNS)
+        .order_by(Invoice.period_end, Invoice.id)
+    )
+
+
+def _summary_csv(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in SUMMARY_COLUMNS] + ["items", "pdf", "csv"])
+    for row in rows:
+        values = ["" if value is None else getattr(value, "value", value) for value in row]
+        writer.writerow(values + [f"invoice-{row.id}.pdf", f"invoice-{row.id}.csv"])
+    return buffer.getvalue()
+
+
+def stream_archive(db: Session, clauses: List, compression: str = "deflate") -> Iterator[bytes]:
+    """Yield a zip of every matching invoice's PDF and CSV plus ``summary.csv``.
+
+    Documents are copied from storage in fixed-size chunks (missing ones are
+    rendered first); each chunk is drained to the client as soon as it is
+    compressed, so neither the archive nor a whole document is held in memory.
+    """
+    buffer = StreamBuffer()
+    try:
+        rows = db.execute(summary_query(clauses)).all()
+        with zipfile.ZipFile(buffer, "w", compression=COMPRESSION[compression]) as archive:
+            for row in rows:
+                pdf_path, csv_path = invoice_service.document_paths(row.id)
+                if not (pdf_path.exists() and csv_path.exists()):
+                    invoice_service.ensure_invoice_documents(db.get(Invoice, row.id))
+                for path in (pdf_path, csv_path):
+                    with path.open("rb") as source, archive.open(f"invoices/{path.name}", "w") as target:
+                        for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b""):
+                            target.write(chunk)
+                            data = buffer.drain()
+                            if data:
+                                yield data
+            archive.writestr("summary.csv", _summary_csv(rows))
+        yield buffer.drain()
+    finally:
+        db.close()
@@ -0,0 +1,355 @@
+"""Create and update many lessons in one request and one transaction.
+
+Every item is validated against references prefetched with one ``IN`` query
+per kind, and checked for double bookings with one more query, before
+anything is written, so the batch either applies all of its valid items
+(``best_effort``) or nothing at all when one of them fails
+(``all_or_nothing``).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, lazyload, selectinload
+
+from app.models.enums import LessonType
+from app.models.lesson import Lesson
+from app.schemas.lesson import LessonBatchCreate, LessonBatchUpdate, LessonCreate
+from app.services.conflicts import Slot, find_conflicts, lesson_slot
+from app.services.domain_events import LessonCreated, LessonUpdated, bus
+from app.services.lesson_refs import LessonReferences
+from app.services.lessons import PreparedLesson, insert_lessons
+from app.utils.time import calculate_duration_minutes
+
+BatchItem = Union[LessonBatchCreate, LessonBatchUpdate]
+
+
+@dataclass
+class _PlannedUpdate:
+    lesson: Lesson
+    values: Dict[str, object]
+    players: Optional[list] = None
+    strokes: Optional[list] = None
+    courts: Optional[list] = None
+
+
+@dataclass
+class _Related:
+    players: list = field(default_factory=list)
+    strokes: list = field(default_factory=list)
+    courts: list = field(default_factory=list)
+
+
+def _load_lessons(db: Session, lesson_ids: Set[int]) -> Dict[int, Lesson]:
+    if not lesson_ids:
+        return {}
+    stmt = (
+        select(Lesson)
+        .options(
+            lazyload("*"),
+            selectinload(Lesson.players).lazyload("*"),
+            selectinload(Lesson.strokes),
+            selectinload(Lesson.courts).lazyload("*"),
+        )
+        .where(Lesson.id.in_(lesson_ids))
+    )
+    return {lesson.id: lesson for lesson in db.scalars(stmt)}
+
+
+def _load_references(
+    db: Session, items: Sequence[BatchItem], lessons: Dict[int, Lesson], coach_id: Optional[int]
+) -> LessonReferences:
+    player_ids: Set[int] = set()
+    stroke_codes: Set[str] = set()
+    court_ids: Set[int] = set()
+    club_ids: Set[int] = set()
+    coach_ids: Set[int] = {coach_id} if coach_id is not None else set()
+    for item in items:
+        payload = item.lesson if isinstance(item, LessonBatchCreate) else item.changes
+        player_ids.update(payload.player_ids or ())
+        stroke_codes.update(code.value for code in payload.stroke_codes or ())
+        court_ids.update(payload.court_ids or ())
+        if payload.club_id:
+            club_ids.add(payload.club_id)
+        if isinstance(item, LessonBatchCreate):
+            if coach_id is None:
+                coach_ids.add(item.lesson.coach_id)
+        elif item.id in lessons:
+            lesson = lessons[item.id]
+            coach_ids.add(lesson.coach_id)
+            if lesson.club_id:
+                club_ids.add(lesson.club_id)
+    return LessonReferences.load(
+        db,
+        player_ids=player_ids,
+        stroke_codes=stroke_codes,
+        court_ids=court_ids,
+        club_ids=club_ids,
+        coach_ids=coach_ids,
+    )
+
+
+def _resolve_related(
+    refs: LessonReferences,
+    coach_id: int,
+    restricted: bool,
+    lesson_type: LessonType,
+    club_id: Optional[int],
+    player_ids: Optional[List[int]],
+    stroke_codes: Optional[list],
+    court_ids: Optional[List[int]],
+    errors: List[str],
+) -> _Related:
+    related = _Related()
+    if player_ids is not None:
+        if lesson_type != LessonType.club and not player_ids:
+            errors.append("At least one player is required for this lesson type")
+        for player_id in dict.fromkeys(player_ids):
+            player = refs.players_by_id.get(player_id)
+            if player is None:
+                errors.append(f"Player not found: {player_id}")
+            elif restricted and not refs.coach_has_player(coach_id, player_id):
+                errors.append(f"Cannot attach unassigned player: {player_id}")
+            else:
+                related.players.append(player)
+    if stroke_codes is not None:
+        for code in dict.fromkeys(code.value for code in stroke_codes):
+            stroke = refs.strokes_by_code.get(code)
+            if stroke is None:
+                errors.append(f"Stroke not found: {code}")
+            else:
+                related.strokes.append(stroke)
+    if court_ids:
+        if not club_id:
+            errors.append("Club is required when selecting courts")
+        else:
+            for court_id in dict.fromkeys(court_ids):
+                court = refs.court(club_id, str(court_id))
+                if court is None:
+                    errors.append(f"Court not found for the selected club: {court_id}")
+                else:
+                    related.courts.append(court)
+    return related
+
+
+def _duration(start_time, end_time, errors: List[str]) -> Optional[int]:
+    try:
+        return calculate_duration_minutes(start_time, end_time)
+    except ValueError as exc:
+        errors.append(str(exc))
+        return None
+
+
+def _plan_create(
+    refs: LessonReferences, payload: LessonCreate, coach_id: Optional[int]
+) -> Tuple[Optional[PreparedLesson], List[str]]:
+    restricted = coach_id is not None
+    coach_id = coach_id if restricted else payload.coach_id
+    if coach_id not in refs.coach_default_clubs:
+        return None, [f"Coach not found: {coach_id}"]
+
+    errors: List[str] = []
+    club_id, club_error = refs.resolve_club(coach_id, payload.club_id, restricted)
+    if club_error:
+        errors.append(club_error)
+    duration = _duration(payload.start_time, payload.end_time, errors)
+    related = _resolve_related(
+        refs,
+        coach_id,
+        restricted,
+        payload.type,
+        club_id,
+        payload.player_ids,
+        payload.stroke_codes,
+        payload.court_ids,
+        errors,
+    )
+    if errors:
+        return None, errors
+
+    values = payload.dict(exclude={"player_ids", "stroke_codes", "court_ids"})
+    if values["club_reimbursement_amount"] is not None:
+        values["club_reimbursement_amount"] = abs(values["club_reimbursement_amount"])
+    values.update(coach_id=coach_id, club_id=club_id, duration_minutes=duration)
+    return (
+        PreparedLesson(
+            values,
+            [player.id for player in related.players],
+            [stroke.id for stroke in related.strokes],
+            [court.id for court in related.courts],
+        ),
+        [],
+    )
+
+
+def _plan_update(
+    refs: LessonReferences, item: LessonBatchUpdate, lesson: Optional[Lesson], coach_id: Optional[int]
+) -> Tuple[Optional[_PlannedUpdate], List[str]]:
+    if lesson is None:
+        return None, ["Lesson not found"]
+    restricted = coach_id is not None
+    if restricted and lesson.coach_id != coach_id:
+        return None, ["Forbidden"]
+
+    errors: List[str] = []
+    data = item.changes.dict(exclude_unset=True)
+    player_ids = data.pop("player_ids", None)
+    stroke_codes = data.pop("stroke_codes", None)
+    court_ids = data.pop("court_ids", None)
+
+    if restricted or "club_id" in data:
+        club_id, club_error = refs.resolve_club(lesson.coach_id, data.get("club_id", lesson.club_id), restricted)
+        if club_error:
+            errors.append(club_error)
+        data["club_id"] = club_id
+    target_club_id = data.get("club_id", lesson.club_id)
+
+    if "start_time" in data or "end_time" in data:
+        data["duration_minutes"] = _duration(
+            data.get("start_time", lesson.start_time), data.get("end_time", lesson.end_time), errors
+        )
+    if data.get("club_reimbursement_amount") is not None:
+        data["club_reimbursement_amount"] = abs(data["club_reimbursement_amount"])
+
+    related = _resolve_related(
+        refs,
+        lesson.coach_id,
+        restricted,
+        data.get("type", lesson.type),
+        target_club_id,
+        player_ids,
+        stroke_codes,
+        court_ids,
+        errors,
+    )
+    if errors:
+        return None, errors
+
+    plan = _PlannedUpdate(lesson, data)
+    if player_ids is not None:
+        plan.players = related.players
+    if stroke_codes is not None:
+        plan.strokes = related.strokes
+    if court_ids is not None:
+        plan.courts = related.courts
+    elif "club_id" in data and lesson.courts:
+        plan.courts = [court for court in lesson.courts if court.club_id == target_club_id]
+    return plan, []
+
+
+def _apply_update(plan: _PlannedUpdate) -> None:
+    lesson = plan.lesson
+    for name, value in plan.values.items():
+        setattr(lesson, name, value)
+    if plan.players is not None:
+        lesson.players = plan.players
+    if plan.strokes is not None:
+        lesson.strokes = plan.strokes
+    if plan.courts is not None:
+        lesson.courts = plan.courts
+
+
+def _update_slot(index: int, plan: _PlannedUpdate) -> Slot:
+    lesson, values = plan.lesson, plan.values
+    courts = plan.courts if plan.courts is not None else lesson.courts
+    return Slot(
+        values.get("date", lesson.date),
+        values.get("start_time", lesson.start_time),
+        values.get("end_time", lesson.end_time),
+        values.get("coach_id", lesson.coach_id),
+        [court.id for court in courts],
+        lesson_id=lesson.id,
+        label=f"item {index}",
+    )
+
+
+def _drop_known_clients(
+    db: Session, creates: List[Tuple[int, PreparedLesson]], results: List[dict]
+) -> List[Tuple[int, PreparedLesson]]:
+    """Skip creates whose ``(coach_id, client_id)`` is already stored, so a retried batch adds nothing twice."""
+    client_ids = {prepared.values["client_id"] for _, prepared in creates if prepared.values.get("client_id")}
+    if not client_ids:
+        return creates
+    stored = {
+        (coach_id, client_id): lesson_id
+        for lesson_id, coach_id, client_id in db.execute(
+            select(Lesson.id, Lesson.coach_id, Lesson.client_id).where(Lesson.client_id.in_(client_ids))
+        )
+    }
+    kept: List[Tuple[int, PreparedLesson]] = []
+    seen: Set[tuple] = set()
+    for index, prepared in creates:
+        key = (prepared.values["coach_id"], prepared.values.get("client_id"))
+        if key[1] is None:
+            kept.append((index, prepared))
+        elif key in stored:
+            results[index].update(status="skipped", lesson_id=stored[key])
+        elif key in seen:
+            results[index].update(status="failed", errors=[f"Repeated client_id: {key[1]}"])
+        else:
+            seen.add(key)
+            kept.append((index, prepared))
+    return kept
+
+
+def _drop_conflicts(
+    db: Session,
+    creates: List[Tuple[int, PreparedLesson]],
+    updates: List[Tuple[int, _PlannedUpdate]],
+    results: List[dict],
+) -> Tuple[List[Tuple[int, PreparedLesson]], List[Tuple[int, _PlannedUpdate]]]:
+    """Check every planned write for double bookings with one query and fail the clashing items."""
+    slots = [_update_slot(index, plan) for index, plan in updates] + [
+        lesson_slot(prepared.values, prepared.court_ids, f"item {index}") for index, prepared in creates
+    ]
+    clashing = set()
+    for (index, _), messages in zip(updates + creates, find_conflicts(db, slots)):
+        if messages:
+            results[index].update(status="failed", errors=messages)
+            clashing.add(index)
+    return (
+        [item for item in creates if item[0] not in clashing],
+        [item for item in updates if item[0] not in clashing],
+    )
+
+
+def run_batch(db: Session, items: Sequence[BatchItem], *, mode: str, coach_id: Optional[int] = None) -> dict:
+    """Validate and apply ``items``; ``coach_id`` scopes the batch to that coach (coach users)."""
+    lessons = _load_lessons(db, {item.id for item in items if isinstance(item, LessonBatchUpdate)})
+    refs = _load_references(db, items, lessons, coach_id)
+
+    results: List[dict] = []
+    creates: List[Tuple[int, PreparedLesson]] = []
+    updates: List[Tuple[int, _PlannedUpdate]] = []
+    for index, item in enumerate(items):
+        if isinstance(item, LessonBatchCreate):
+            prepared, errors = _plan_create(refs, item.lesson, coach_id)
+            if prepared is not None:
+                creates.append((index, prepared))
+        else:
+            plan, errors = _plan_update(refs, item, lessons.get(item.id), coach_id)
+            if plan is not None:
+                updates.append((index, plan))
+        results.append({"index": index, "status": "failed" if errors else "skipped", "errors": errors})
+
+    creates = _drop_known_clients(db, creates, results)
+    creates, updates = _drop_conflicts(db, creates, updates, results)
+    failed = any(result["errors"] for result in results)
+    if not (creates or updates) or (failed and mode == "all_or_nothing"):
+        return {"mode": mode, "committed": False, "results": results}
+
+    for index, plan in updates:
+        _apply_update(plan)
+        results[index].update(status="updated", lesson_id=plan.lesson.id)
+    db.flush()
+    lesson_ids = insert_lessons(db, [prepared for _, prepared in creates])
+    for (index, _), lesson_id in zip(creates, lesson_ids):
+        results[index].update(status="created", lesson_id=lesson_id)
+    bus.record(
+        db,
+        *(LessonUpdated.of(plan.lesson) for _, plan in updates),
+        *LessonCreated.for_ids(db, lesson_ids),
+    )
+    db.commit()
+    return {"mode": mode, "committed": True, "results": results}
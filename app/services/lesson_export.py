@@ -0,0 +1,120 @@
+import csv
+import enum
+import io
+import json
+from collections import defaultdict
+from typing import Dict, Iterator, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.associations import lesson_courts_table, lesson_players_table, lesson_strokes_table
+from app.models.court import Court
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.stroke import Stroke
+
+LIST_DELIMITER = "|"
+
+LESSON_COLUMNS = [
+    Lesson.id,
+    Lesson.coach_id,
+    Lesson.club_id,
+    Lesson.date,
+    Lesson.start_time,
+    Lesson.end_time,
+    Lesson.duration_minutes,
+    Lesson.total_amount,
+    Lesson.club_reimbursement_amount,
+    Lesson.type,
+    Lesson.status,
+    Lesson.payment_status,
+    Lesson.notes,
+]
+LIST_FIELDS = ["player_ids", "player_names", "stroke_codes", "court_ids", "court_names"]
+FIELDNAMES = [column.key for column in LESSON_COLUMNS] + LIST_FIELDS
+
+
+def _related(db: Session, lesson_ids: Sequence[int]) -> Dict[int, Dict[str, list]]:
+    related: Dict[int, Dict[str, list]] = defaultdict(lambda: {field: [] for field in LIST_FIELDS})
+    players = db.execute(
+        select(lesson_players_table.c.lesson_id, Player.id, Player.full_name)
+        .join(Player, Player.id == lesson_players_table.c.player_id)
+        .where(lesson_players_table.c.lesson_id.in_(lesson_ids))
+        .order_by(lesson_players_table.c.lesson_id, Player.id)
+    )
+    for lesson_id, player_id, full_name in players:
+        related[lesson_id]["player_ids"].append(player_id)
+        related[lesson_id]["player_names"].append(full_name)
+    strokes = db.execute(
+        select(lesson_strokes_table.c.lesson_id, Stroke.code)
+        .join(Stroke, Stroke.id == lesson_strokes_table.c.stroke_id)
+        .where(lesson_strokes_table.c.lesson_id.in_(lesson_ids))
+        .order_by(lesson_strokes_table.c.lesson_id, Stroke.id)
+    )
+    for lesson_id, code in strokes:
+        related[lesson_id]["stroke_codes"].append(code.value)
+    courts = db.execute(
+        select(lesson_courts_table.c.lesson_id, Court.id, Court.name)
+        .join(Court, Court.id == lesson_courts_table.c.court_id)
+        .where(lesson_courts_table.c.lesson_id.in_(lesson_ids))
+        .order_by(lesson_courts_table.c.lesson_id, Court.id)
+    )
+    for lesson_id, court_id, name in courts:
+        related[lesson_id]["court_ids"].append(court_id)
+        related[lesson_id]["court_names"].append(name)
+    return related
+
+
+def iter_lesson_chunks(db: Session, clauses: List, chunk_size: int = 0) -> Iterator[List[dict]]:
+    """Yield lessons matching ``clauses`` as flat dicts, one server-side cursor chunk at a time."""
+    chunk_size = chunk_size or settings.export_chunk_size
+    stmt = (
+        select(*LESSON_COLUMNS)
+        .where(*clauses)
+        .order_by(Lesson.date, Lesson.start_time, Lesson.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for partition in db.execute(stmt).partitions():
+        related = _related(db, [row.id for row in partition])
+        chunk = []
+        for row in partition:
+            record = {
+                key: value.value if isinstance(value, enum.Enum) else value
+                for key, value in row._mapping.items()
+            }
+            record.update(related[row.id])
+            chunk.append(record)
+        yield chunk
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return LIST_DELIMITER.join(str(item) for item in value)
+    return str(value)
+
+
+def stream_csv(db: Session, clauses: List, chunk_size: int = 0) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    try:
+        writer.writerow(FIELDNAMES)
+        for chunk in iter_lesson_chunks(db, clauses, chunk_size):
+            writer.writerows([_csv_value(record[field]) for field in FIELDNAMES] for record in chunk)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def stream_ndjson(db: Session, clauses: List, chunk_size: int = 0) -> Iterator[str]:
+    try:
+        for chunk in iter_lesson_chunks(db, clauses, chunk_size):
+            yield "".join(json.dumps(record, default=str) + "\n" for record in chunk)
+    finally:
+        db.close()
@@ -0,0 +1,204 @@
+"""Bulk lesson import from CSV or JSON lines.
+
+The whole file is validated in one pass: references are resolved with one
+``IN`` query per kind (see :class:`LessonReferences`), durations are computed
+for all rows at once, double bookings are checked with one query for the
+whole file, and the valid rows are written with batched executemany
+inserts. Invalid rows are reported and skipped.
+"""
+
+import csv
+import io
+import json
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.models.enums import LessonType
+from app.schemas.lesson import LessonImportRow
+from app.services.conflicts import find_conflicts, lesson_slot
+from app.services.domain_events import LessonCreated, bus
+from app.services.lesson_refs import LessonReferences
+from app.services.lessons import PreparedLesson, insert_lessons
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or (content_type or "").endswith(("ndjson", "jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def read_records(content: bytes, import_format: str) -> List[Tuple[int, object]]:
+    """Return ``(row number, record)`` pairs; undecodable JSON lines are returned as ``None`` records."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise ValueError("Import file must be UTF-8 encoded") from exc
+
+    if import_format == "ndjson":
+        records: List[Tuple[int, object]] = []
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append((number, json.loads(line)))
+            except json.JSONDecodeError:
+                records.append((number, None))
+        return records
+    reader = csv.DictReader(io.StringIO(text))
+    return [(number, dict(record)) for number, record in enumerate(reader, start=2)]
+
+
+def _format_validation_error(exc: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()]
+
+
+def _resolve_row(
+    refs: LessonReferences, row: LessonImportRow, coach_id: Optional[int], restricted: bool
+) -> Tuple[Optional[PreparedLesson], List[str]]:
+    errors: List[str] = []
+    if coach_id is None:
+        return None, ["coach_id: field required"]
+    if coach_id not in refs.coach_default_clubs:
+        return None, [f"Coach not found: {coach_id}"]
+
+    club_id, club_error = refs.resolve_club(coach_id, row.club_id, restricted)
+    if club_error:
+        errors.append(club_error)
+
+    player_ids: List[int] = []
+    for reference in row.players:
+        player = refs.player(reference)
+        if player is None:
+            errors.append(f"Player not found: {reference}")
+        elif restricted and not refs.coach_has_player(coach_id, player.id):
+            errors.append(f"Cannot attach unassigned player: {reference}")
+        elif player.id not in player_ids:
+            player_ids.append(player.id)
+    if row.type != LessonType.club and not row.players:
+        errors.append("At least one player is required for this lesson type")
+
+    stroke_ids: List[int] = []
+    for code in dict.fromkeys(row.strokes):
+        stroke = refs.strokes_by_code.get(code.value)
+        if stroke is None:
+            errors.append(f"Stroke not found: {code.value}")
+        else:
+            stroke_ids.append(stroke.id)
+
+    court_ids: List[int] = []
+    if row.courts and not club_id:
+        errors.append("Club is required when selecting courts")
+    else:
+        for reference in row.courts:
+            court = refs.court(club_id, reference)
+            if court is None:
+                errors.append(f"Court not found for the selected club: {reference}")
+            elif court.id not in court_ids:
+                court_ids.append(court.id)
+
+    if errors:
+        return None, errors
+    reimbursement = row.club_reimbursement_amount
+    values: Dict[str, object] = {
+        "coach_id": coach_id,
+        "club_id": club_id,
+        "date": row.date,
+        "start_time": row.start_time,
+        "end_time": row.end_time,
+        "total_amount": row.total_amount,
+        "type": row.type,
+        "status": row.status,
+        "payment_status": row.payment_status,
+        "club_reimbursement_amount": abs(reimbursement) if reimbursement is not None else None,
+        "notes": row.notes,
+    }
+    return PreparedLesson(values, player_ids, stroke_ids, court_ids), []
+
+
+def validate_records(
+    db: Session, records: List[Tuple[int, object]], coach_id: Optional[int] = None
+) -> Tuple[List[PreparedLesson], Dict[int, List[str]]]:
+    """Validate parsed records; ``coach_id`` scopes every row to that coach (coach users)."""
+    errors: Dict[int, List[str]] = {}
+    parsed: List[Tuple[int, LessonImportRow]] = []
+    for number, record in records:
+        if not isinstance(record, dict):
+            errors[number] = ["Row is not a JSON object"]
+            continue
+        try:
+            parsed.append((number, LessonImportRow.parse_obj(record)))
+        except ValidationError as exc:
+            errors[number] = _format_validation_error(exc)
+
+    if not parsed:
+        return [], errors
+
+    starts = np.fromiter((row.start_time.hour * 60 + row.start_time.minute for _, row in parsed), np.int64)
+    ends = np.fromiter((row.end_time.hour * 60 + row.end_time.minute for _, row in parsed), np.int64)
+    durations = ends - starts
+
+    player_refs = {reference for _, row in parsed for reference in row.players}
+    court_refs = {reference for _, row in parsed for reference in row.courts}
+    refs = LessonReferences.load(
+        db,
+        player_ids={int(reference) for reference in player_refs if reference.isdigit()},
+        player_emails={reference for reference in player_refs if not reference.isdigit()},
+        stroke_codes={code for _, row in parsed for code in row.strokes},
+        court_ids={int(reference) for reference in court_refs if reference.isdigit()},
+        court_names={reference for reference in court_refs if not reference.isdigit()},
+        club_ids={row.club_id for _, row in parsed if row.club_id},
+        coach_ids={coach_id} if coach_id is not None else {row.coach_id for _, row in parsed if row.coach_id},
+    )
+
+    restricted = coach_id is not None
+    resolved: List[Tuple[int, PreparedLesson]] = []
+    for (number, row), duration in zip(parsed, durations.tolist()):
+        lesson, row_errors = _resolve_row(refs, row, coach_id if restricted else row.coach_id, restricted)
+        if duration <= 0:
+            row_errors.insert(0, "End time must be after start time")
+        if row_errors:
+            errors[number] = row_errors
+            continue
+        lesson.values["duration_minutes"] = duration
+        resolved.append((number, lesson))
+
+    conflicts = find_conflicts(
+        db, [lesson_slot(lesson.values, lesson.court_ids, f"row {number}") for number, lesson in resolved]
+    )
+    prepared: List[PreparedLesson] = []
+    for (number, lesson), messages in zip(resolved, conflicts):
+        if messages:
+            errors[number] = messages
+        else:
+            prepared.append(lesson)
+    return prepared, errors
+
+
+def import_lessons(
+    db: Session,
+    content: bytes,
+    import_format: str,
+    *,
+    coach_id: Optional[int] = None,
+    dry_run: bool = False,
+    batch_size: int = 0,
+) -> dict:
+    records = read_records(content, import_format)
+    prepared, errors = validate_records(db, records, coach_id)
+    imported = 0
+    if prepared and not dry_run:
+        lesson_ids = insert_lessons(db, prepared, batch_size)
+        bus.record(db, *LessonCreated.for_ids(db, lesson_ids))
+        db.commit()
+        imported = len(lesson_ids)
+    return {
+        "dry_run": dry_run,
+        "total_rows": len(records),
+        "valid_rows": len(prepared),
+        "imported": imported,
+        "errors": [{"row": number, "errors": messages} for number, messages in sorted(errors.items())],
+    }
@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session, lazyload
+
+from app.models.associations import coach_club_table, player_coach_table
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.court import Court
+from app.models.player import Player
+from app.models.stroke import Stroke
+
+
+@dataclass
+class LessonReferences:
+    """Players, strokes, courts, clubs and coach memberships referenced by a batch of lessons.
+
+    Every kind of reference is resolved with a single ``IN`` query so that
+    validating N lessons costs a constant number of round trips. Entities are
+    loaded without their (selectin) relationships.
+    """
+
+    players_by_id: Dict[int, Player] = field(default_factory=dict)
+    players_by_email: Dict[str, Player] = field(default_factory=dict)
+    strokes_by_code: Dict[str, Stroke] = field(default_factory=dict)
+    courts_by_id: Dict[int, Court] = field(default_factory=dict)
+    courts_by_name: Dict[Tuple[int, str], Court] = field(default_factory=dict)
+    clubs_by_id: Dict[int, Club] = field(default_factory=dict)
+    coach_default_clubs: Dict[int, Optional[int]] = field(default_factory=dict)
+    coach_players: Set[Tuple[int, int]] = field(default_factory=set)
+    coach_clubs: Set[Tuple[int, int]] = field(default_factory=set)
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        *,
+        player_ids: Iterable[int] = (),
+        player_emails: Iterable[str] = (),
+        stroke_codes: Iterable[str] = (),
+        court_ids: Iterable[int] = (),
+        court_names: Iterable[str] = (),
+        club_ids: Iterable[int] = (),
+        coach_ids: Iterable[int] = (),
+    ) -> "LessonReferences":
+        refs = cls()
+        player_ids, player_emails = set(player_ids), {email.lower() for email in player_emails}
+        if player_ids or player_emails:
+            conditions = []
+            if player_ids:
+                conditions.append(Player.id.in_(player_ids))
+            if player_emails:
+                conditions.append(func.lower(Player.email).in_(player_emails))
+            for player in db.scalars(select(Player).options(lazyload("*")).where(or_(*conditions))):
+                refs.players_by_id[player.id] = player
+                if player.email:
+                    refs.players_by_email[player.email.lower()] = player
+
+        stroke_codes = set(stroke_codes)
+        if stroke_codes:
+            for stroke in db.scalars(select(Stroke).where(Stroke.code.in_(stroke_codes))):
+                refs.strokes_by_code[stroke.code.value] = stroke
+
+        court_ids, court_names = set(court_ids), {name.lower() for name in court_names}
+        if court_ids or court_names:
+            conditions = []
+            if court_ids:
+                conditions.append(Court.id.in_(court_ids))
+            if court_names:
+                conditions.append(func.lower(Court.name).in_(court_names))
+            for court in db.scalars(select(Court).options(lazyload("*")).where(or_(*conditions))):
+                refs.courts_by_id[court.id] = court
+                refs.courts_by_name[(court.club_id, court.name.lower())] = court
+
+        club_ids = set(club_ids)
+        if club_ids:
+            for club in db.scalars(select(Club).options(lazyload("*")).where(Club.id.in_(club_ids))):
+                refs.clubs_by_id[club.id] = club
+
+        coach_ids = set(coach_ids)
+        if coach_ids:
+            refs.coach_default_clubs = dict(
+                db.execute(select(Coach.id, Coach.default_club_id).where(Coach.id.in_(coach_ids))).all()
+            )
+            if refs.players_by_id:
+                refs.coach_players = set(
+                    db.execute(
+                        select(player_coach_table.c.coach_id, player_coach_table.c.player_id).where(
+                            player_coach_table.c.coach_id.in_(coach_ids),
+                            player_coach_table.c.player_id.in_(refs.players_by_id),
+                        )
+                    ).all()
+                )
+            refs.coach_clubs = set(
+                db.execute(
+                    select(coach_club_table.c.coach_id, coach_club_table.c.club_id).where(
+                        coach_club_table.c.coach_id.in_(coach_ids)
+                    )
+                ).all()
+            )
+        return refs
+
+    def player(self, reference: str) -> Optional[Player]:
+        reference = reference.strip()
+        if reference.isdigit():
+            return self.players_by_id.get(int(reference))
+        return self.players_by_email.get(reference.lower())
+
+    def court(self, club_id: Optional[int], reference: str) -> Optional[Court]:
+        reference = reference.strip()
+        if reference.isdigit():
+            court = self.courts_by_id.get(int(reference))
+        else:
+            court = self.courts_by_name.get((club_id, reference.lower())) if club_id else None
+        if court is None or court.club_id != club_id:
+            return None
+        return court
+
+    def coach_has_player(self, coach_id: int, player_id: int) -> bool:
+        return (coach_id, player_id) in self.coach_players
+
+    def coach_has_club(self, coach_id: int, club_id: int) -> bool:
+        return (coach_id, club_id) in self.coach_clubs
+
+    def default_club(self, coach_id: int) -> Optional[int]:
+        memberships = sorted(club_id for member, club_id in self.coach_clubs if member == coach_id)
+        default = self.coach_default_clubs.get(coach_id)
+        if default in memberships:
+            return default
+        return memberships[0] if memberships else None
+
+    def resolve_club(
+        self, coach_id: int, requested_club_id: Optional[int], restricted: bool
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """Mirror of the lessons router's club resolution; returns ``(club_id, error)``.
+
+        ``restricted`` applies the coach-user rules: the club must be one of the
+        coach's memberships and defaults to the coach's default club.
+        """
+        if requested_club_id:
+            if restricted and not self.coach_has_club(coach_id, requested_club_id):
+                return None, "Coach cannot use this club"
+            if requested_club_id not in self.clubs_by_id:
+                return None, f"Club not found: {requested_club_id}"
+            return requested_club_id, None
+        if not restricted:
+            return None, None
+        club_id = self.default_club(coach_id)
+        if club_id is None:
+            return None, "Coach is not associated with any club"
+        return club_id, None
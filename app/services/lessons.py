@@ -0,0 +1,132 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import case, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.associations import lesson_courts_table, lesson_players_table, lesson_strokes_table
+from app.models.enums import LessonPaymentStatus, LessonStatus
+from app.models.lesson import Lesson
+from app.schemas.lesson import LessonFilters
+
+# Status changes a bulk transition may make; ``invoiced`` is only reached
+# through the invoice flow and never left in bulk.
+ALLOWED_STATUS_TRANSITIONS: Dict[LessonStatus, Sequence[LessonStatus]] = {
+    LessonStatus.draft: (LessonStatus.set, LessonStatus.executed),
+    LessonStatus.set: (LessonStatus.draft, LessonStatus.executed),
+    LessonStatus.executed: (LessonStatus.set,),
+    LessonStatus.invoiced: (),
+}
+ALLOWED_PAYMENT_TRANSITIONS: Dict[LessonPaymentStatus, Sequence[LessonPaymentStatus]] = {
+    LessonPaymentStatus.open: (LessonPaymentStatus.paid,),
+    LessonPaymentStatus.paid: (LessonPaymentStatus.open,),
+}
+
+
+@dataclass
+class PreparedLesson:
+    """Column values and association ids of a validated lesson, ready for a bulk insert."""
+
+    values: Dict[str, object]
+    player_ids: List[int] = field(default_factory=list)
+    stroke_ids: List[int] = field(default_factory=list)
+    court_ids: List[int] = field(default_factory=list)
+
+
+def lesson_filter_clauses(filters: LessonFilters) -> List:
+    """WHERE clauses for the ``list_lessons`` filter set, usable with ORM queries and Core selects."""
+    clauses = []
+    if filters.date_from:
+        clauses.append(Lesson.date >= filters.date_from)
+    if filters.date_to:
+        clauses.append(Lesson.date <= filters.date_to)
+    if filters.status:
+        clauses.append(Lesson.status == filters.status)
+    if filters.payment_status:
+        clauses.append(Lesson.payment_status == filters.payment_status)
+    if filters.club_id:
+        clauses.append(Lesson.club_id == filters.club_id)
+    if filters.player_id:
+        clauses.append(
+            Lesson.id.in_(
+                select(lesson_players_table.c.lesson_id).where(
+                    lesson_players_table.c.player_id == filters.player_id
+                )
+            )
+        )
+    return clauses
+
+
+def _batches(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def insert_lessons(db: Session, lessons: Sequence[PreparedLesson], batch_size: int = 0) -> List[int]:
+    """Insert lessons and their association rows with one executemany per table and batch.
+
+    Returns the new lesson ids in input order. The caller owns the transaction.
+    """
+    batch_size = batch_size or settings.import_batch_size
+    lesson_ids: List[int] = []
+    for batch in _batches(lessons, batch_size):
+        ids = db.scalars(
+            insert(Lesson).returning(Lesson.id, sort_by_parameter_order=True),
+            [lesson.values for lesson in batch],
+        ).all()
+        lesson_ids.extend(ids)
+
+        for table, column, attribute in (
+            (lesson_players_table, "player_id", "player_ids"),
+            (lesson_strokes_table, "stroke_id", "stroke_ids"),
+            (lesson_courts_table, "court_id", "court_ids"),
+        ):
+            rows = [
+                {"lesson_id": lesson_id, column: related_id}
+                for lesson_id, lesson in zip(ids, batch)
+                for related_id in getattr(lesson, attribute)
+            ]
+            if rows:
+                db.execute(insert(table), rows)
+    return lesson_ids
+
+
+def _sources(transitions: Dict, target) -> List:
+    return [source for source, targets in transitions.items() if target in targets]
+
+
+def transition_lessons(
+    db: Session,
+    clauses: List,
+    *,
+    status: Optional[LessonStatus] = None,
+    payment_status: Optional[LessonPaymentStatus] = None,
+) -> List[int]:
+    """Move every lesson matching ``clauses`` to the target status and/or payment status.
+
+    Only allowed transitions are applied; the check is part of the single
+    ``UPDATE ... RETURNING`` so lessons in other states are left untouched.
+    Returns the ids of the lessons that changed. The caller commits.
+    """
+    values: Dict[str, object] = {}
+    eligible = []
+    if status is not None:
+        can_move = Lesson.status.in_(_sources(ALLOWED_STATUS_TRANSITIONS, status))
+        values["status"] = case((can_move, status), else_=Lesson.status)
+        eligible.append(can_move)
+    if payment_status is not None:
+        can_pay = Lesson.payment_status.in_(_sources(ALLOWED_PAYMENT_TRANSITIONS, payment_status))
+        values["payment_status"] = case((can_pay, payment_status), else_=Lesson.payment_status)
+        eligible.append(can_pay)
+    if not values:
+        return []
+    values["updated_at"] = func.now()
+    stmt = (
+        update(Lesson)
+        .where(*clauses, or_(*eligible))
+        .values(**values)
+        .returning(Lesson.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    return list(db.scalars(stmt))
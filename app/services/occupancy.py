@@ -0,0 +1,246 @@
+"""In-memory court occupancy for free-slot search.
+
+Each club is loaded once, in a single query over ``lesson_courts``. The
+result is kept as one row of 5-minute slots per court per day. A row is a
+``uint8`` array that counts the lessons covering each slot. Counts are used
+instead of bits so that removing one of two overlapping lessons leaves the
+slot busy. Lesson writes then update only the days they touch. A free-slot
+query compares the arrays against zero and never reads the lessons table.
+
+The index lives in each process, like the stroke recommender, and follows
+lesson writes through their domain events, including imports and series
+expansion. A commit that changes more than ``INCREMENTAL_LIMIT`` lessons
+drops the index instead, and it is rebuilt for each club the next time that
+club is queried.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.associations import lesson_courts_table
+from app.models.court import Court
+from app.models.lesson import Lesson
+from app.services.domain_events import INCREMENTAL_LIMIT, DomainEvent, LessonEvent, bus, lesson_changes
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+# lesson_id -> (club_id, date, first slot, end slot, court rows)
+Contribution = Tuple[int, date, int, int, Tuple[int, ...]]
+
+
+def start_slot(value: time) -> int:
+    return (value.hour * 60 + value.minute) // SLOT_MINUTES
+
+
+def end_slot(value: time) -> int:
+    """First slot after ``value``, rounding partial slots up so they count as busy."""
+    minutes = value.hour * 60 + value.minute + (1 if value.second or value.microsecond else 0)
+    return min(-(-minutes // SLOT_MINUTES), SLOTS_PER_DAY)
+
+
+def slot_time(slot: int) -> time:
+    minutes = slot * SLOT_MINUTES
+    return time(minutes // 60, minutes % 60)
+
+
+@dataclass
+class _ClubIndex:
+    court_ids: List[int]
+    court_names: List[str]
+    rows: Dict[int, int]
+    days: Dict[date, np.ndarray] = field(default_factory=dict)
+
+    def day(self, day: date) -> np.ndarray:
+        grid = self.days.get(day)
+        if grid is None:
+            grid = self.days[day] = np.zeros((len(self.court_ids), SLOTS_PER_DAY), dtype=np.uint8)
+        return grid
+
+
+class CourtOccupancy:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._clubs: Dict[int, _ClubIndex] = {}
+        self._court_clubs: Dict[int, int] = {}
+        self._contributions: Dict[int, Contribution] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._clubs)
+
+    def invalidate(self, club_id: Optional[int] = None) -> None:
+        with self._lock:
+            if club_id is None:
+                self._clubs.clear()
+                self._court_clubs.clear()
+                self._contributions.clear()
+                return
+            index = self._clubs.pop(club_id, None)
+            if index is not None:
+                for court_id in index.court_ids:
+                    self._court_clubs.pop(court_id, None)
+            for lesson_id in [key for key, value in self._contributions.items() if value[0] == club_id]:
+                del self._contributions[lesson_id]
+
+    def ensure_loaded(self, db: Session, club_id: int) -> _ClubIndex:
+        index = self._clubs.get(club_id)
+        if index is not None:
+            return index
+        with self._lock:
+            index = self._clubs.get(club_id)
+            if index is None:
+                index = self._load(db, club_id)
+            return index
+
+    def _load(self, db: Session, club_id: int) -> _ClubIndex:
+        courts = db.execute(
+            select(Court.id, Court.name).where(Court.club_id == club_id, Court.active.is_(True)).order_by(Court.name, Court.id)
+        ).all()
+        index = _ClubIndex(
+            [row.id for row in courts],
+            [row.name for row in courts],
+            {row.id: position for position, row in enumerate(courts)},
+        )
+        bookings = db.execute(
+            select(Lesson.id, Lesson.date, Lesson.start_time, Lesson.end_time, lesson_courts_table.c.court_id)
+            .join(lesson_courts_table, lesson_courts_table.c.lesson_id == Lesson.id)
+            .join(Court, Court.id == lesson_courts_table.c.court_id)
+            .where(Court.club_id == club_id, Court.active.is_(True))
+            .order_by(Lesson.id)
+        )
+        rows_by_lesson: Dict[int, list] = {}
+        for row in bookings:
+            entry = rows_by_lesson.get(row.id)
+            if entry is None:
+                entry = rows_by_lesson[row.id] = [row.date, start_slot(row.start_time), end_slot(row.end_time), []]
+            entry[3].append(index.rows[row.court_id])
+        for lesson_id, (day, first, last, rows) in rows_by_lesson.items():
+            contribution = (club_id, day, first, last, tuple(rows))
+            self._apply(index, contribution, 1)
+            self._contributions[lesson_id] = contribution
+
+        self._clubs[club_id] = index
+        for court_id in index.court_ids:
+            self._court_clubs[court_id] = club_id
+        return index
+
+    @staticmethod
+    def _apply(index: _ClubIndex, contribution: Contribution, sign: int) -> None:
+        _, day, first, last, rows = contribution
+        if not rows or first >= last:
+            return
+        grid = index.day(day)
+        selected = list(rows)
+        if sign > 0:
+            grid[selected, first:last] += 1
+        else:
+            grid[selected, first:last] -= 1
+
+    def _retract(self, lesson_id: int) -> None:
+        previous = self._contributions.pop(lesson_id, None)
+        if previous is not None and previous[0] in self._clubs:
+            self._apply(self._clubs[previous[0]], previous, -1)
+
+    def apply_lesson(self, lesson: Lesson) -> None:
+        """Replace the stored occupancy of ``lesson`` with its current date, times and courts."""
+        with self._lock:
+            self._retract(lesson.id)
+            by_club: Dict[int, List[int]] = {}
+            for court in lesson.courts:
+                club_id = self._court_clubs.get(court.id)
+                if club_id is not None:
+                    by_club.setdefault(club_id, []).append(self._clubs[club_id].rows[court.id])
+            # A lesson's courts all belong to its club, so there is at most one entry.
+            for club_id, rows in by_club.items():
+                contribution = (club_id, lesson.date, start_slot(lesson.start_time), end_slot(lesson.end_time), tuple(rows))
+                self._apply(self._clubs[club_id], contribution, 1)
+                self._contributions[lesson.id] = contribution
+
+    def remove_lesson(self, lesson_id: int) -> None:
+        with self._lock:
+            self._retract(lesson_id)
+
+    def free_slots(
+        self,
+        db: Session,
+        club_id: int,
+        date_from: date,
+        date_to: date,
+        duration_minutes: int,
+        *,
+        opens: time,
+        closes: time,
+    ) -> List[dict]:
+        """Maximal free windows of at least ``duration_minutes`` per court and day, between ``opens`` and ``closes``."""
+        index = self.ensure_loaded(db, club_id)
+        first, last = end_slot(opens), start_slot(closes)
+        needed = -(-duration_minutes // SLOT_MINUTES)
+        n_days = (date_to - date_from).days + 1
+        if not index.court_ids or last - first < needed or n_days <= 0:
+            return []
+
+        busy = np.zeros((n_days, len(index.court_ids), last - first), dtype=bool)
+        with self._lock:
+            for offset in range(n_days):
+                grid = index.days.get(date_from + timedelta(days=offset))
+                if grid is not None:
+                    busy[offset] = grid[:, first:last] != 0
+
+        # Pad with a busy slot on both sides; +1/-1 steps then mark where free runs start and end.
+        padded = np.ones((n_days, len(index.court_ids), last - first + 2), dtype=np.int8)
+        padded[:, :, 1:-1] = busy
+        steps = np.diff(padded, axis=2)
+        starts = np.argwhere(steps == -1)
+        ends = np.argwhere(steps == 1)[:, 2]
+        lengths = ends - starts[:, 2]
+        keep = lengths >= needed
+        return [
+            {
+                "date": date_from + timedelta(days=int(offset)),
+                "court_id": index.court_ids[row],
+                "court_name": index.court_names[row],
+                "start_time": slot_time(first + int(start)),
+                "end_time": slot_time(first + int(end)),
+            }
+            for (offset, row, start), end in zip(starts[keep].tolist(), ends[keep].tolist())
+        ]
+
+    def snapshot(self, db: Session, club_id: int, days: Iterable[date]) -> Dict[date, np.ndarray]:
+        """Copies of the club's court grids for ``days``, safe to modify."""
+        index = self.ensure_loaded(db, club_id)
+        with self._lock:
+            return {
+                day: index.days[day].copy()
+                if day in index.days
+                else np.zeros((len(index.court_ids), SLOTS_PER_DAY), dtype=np.uint8)
+                for day in days
+            }
+
+    def warm(self, db: Session) -> None:
+        for club_id in db.execute(select(Court.club_id).distinct()).scalars():
+            self.ensure_loaded(db, club_id)
+
+
+occupancy = CourtOccupancy()
+
+
+@bus.subscribe(LessonEvent)
+def _track_lessons(db: Session, events: List[DomainEvent]) -> None:
+    if not occupancy.loaded:
+        return
+    changed, deleted = lesson_changes(events)
+    if len(changed) + len(deleted) > INCREMENTAL_LIMIT:
+        occupancy.invalidate()
+        return
+    for lesson_id in deleted:
+        occupancy.remove_lesson(lesson_id)
+    if changed:
+        for lesson in db.scalars(select(Lesson).where(Lesson.id.in_(changed)).options(selectinload(Lesson.courts))):
+            occupancy.apply_lesson(lesson)
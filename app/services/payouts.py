@@ -0,0 +1,266 @@
+"""Payout files that pay coaches for their issued invoices.
+
+Invoices are aggregated into one payee per coach in SQL. A first pass over
+that query validates bank details and produces the transaction count and
+control sum both formats need in their headers; a second pass writes the
+file payee by payee (``XMLGenerator`` for SEPA, fixed-width records for
+BACS), so memory stays bounded by one flush of output however many coaches
+are paid.
+"""
+
+import string
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+from xml.sax.saxutils import XMLGenerator
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.coach import Coach
+from app.models.enums import InvoiceStatus
+from app.models.invoice import Invoice
+from app.utils.banking import (
+    normalize_account_number,
+    normalize_bic,
+    normalize_iban,
+    normalize_sort_code,
+    restrict_charset,
+)
+from app.utils.streams import StreamBuffer
+
+SEPA_NAMESPACE = "urn:iso:std:iso:20022:tech:xsd:pain.001.001.03"
+SEPA_CHARSET = string.ascii_letters + string.digits + "/-?:().,'+ "
+BACS_CHARSET = string.ascii_uppercase + string.digits + ".&/- "
+BACS_CREDIT = "99"
+BACS_CONTRA = "17"
+CENT = Decimal("0.01")
+FETCH_SIZE = 1_000
+FLUSH_EVERY = 500
+
+
+class PayoutConfigurationError(RuntimeError):
+    pass
+
+
+@dataclass
+class Payee:
+    coach_id: int
+    name: str
+    invoices: int
+    amount: Decimal
+    iban: Optional[str] = None
+    bic: Optional[str] = None
+    sort_code: Optional[str] = None
+    account_number: Optional[str] = None
+
+
+def payee_query(clauses: List):
+    """One row per coach with the count and net total of their issued invoices."""
+    return (
+        select(
+            Coach.id,
+            Coach.full_name,
+            Coach.account_holder_name,
+            Coach.iban,
+            Coach.swift_bic,
+            Coach.sort_code,
+            Coach.account_number,
+            func.count(Invoice.id).label("invoices"),
+            func.sum(Invoice.total_net).label("amount"),
+        )
+        .join(Invoice, Invoice.coach_id == Coach.id)
+        .where(Invoice.status == InvoiceStatus.issued, *clauses)
+        .group_by(Coach.id)
+        .order_by(Coach.id)
+    )
+
+
+def validate_payee(row, payout_format: str) -> Tuple[Optional[Payee], Optional[str]]:
+    amount = Decimal(row.amount or 0).quantize(CENT)
+    if amount <= 0:
+        return None, "Nothing to pay"
+    payee = Payee(row.id, row.account_holder_name or row.full_name, row.invoices, amount)
+    if payout_format == "sepa":
+        payee.iban = normalize_iban(row.iban)
+        if payee.iban is None:
+            return None, "Missing or invalid IBAN"
+        if row.swift_bic:
+            payee.bic = normalize_bic(row.swift_bic)
+            if payee.bic is None:
+                return None, "Invalid BIC"
+    else:
+        payee.sort_code = normalize_sort_code(row.sort_code)
+        payee.account_number = normalize_account_number(row.account_number)
+        if payee.sort_code is None or payee.account_number is None:
+            return None, "Missing or invalid sort code / account number"
+    return payee, None
+
+
+def _rows(db: Session, clauses: List):
+    return db.execute(payee_query(clauses).execution_options(yield_per=FETCH_SIZE))
+
+
+def summarize(db: Session, clauses: List, payout_format: str) -> dict:
+    """Validation pass: totals over payable coaches plus one issue per coach that cannot be paid."""
+    payees = invoices = 0
+    total = Decimal("0.00")
+    issues: List[dict] = []
+    for row in _rows(db, clauses):
+        payee, error = validate_payee(row, payout_format)
+        if error:
+            issues.append({"coach_id": row.id, "coach_name": row.full_name, "error": error})
+            continue
+        payees += 1
+        invoices += payee.invoices
+        total += payee.amount
+    return {
+        "format": payout_format,
+        "currency": "GBP" if payout_format == "bacs" else settings.payout_currency,
+        "payees": payees,
+        "invoices": invoices,
+        "total": total,
+        "issues": issues,
+    }
+
+
+def debtor_details(payout_format: str) -> dict:
+    """The paying account from settings; raises when the chosen format cannot be produced."""
+    debtor = {"name": settings.payout_debtor_name or settings.project_name}
+    if payout_format == "sepa":
+        debtor["iban"] = normalize_iban(settings.payout_debtor_iban)
+        if debtor["iban"] is None:
+            raise PayoutConfigurationError("PAYOUT_DEBTOR_IBAN is missing or invalid")
+        debtor["bic"] = normalize_bic(settings.payout_debtor_bic)
+    else:
+        debtor["sort_code"] = normalize_sort_code(settings.payout_debtor_sort_code)
+        debtor["account_number"] = normalize_account_number(settings.payout_debtor_account_number)
+        if debtor["sort_code"] is None or debtor["account_number"] is None:
+            raise PayoutConfigurationError("PAYOUT_DEBTOR_SORT_CODE / PAYOUT_DEBTOR_ACCOUNT_NUMBER are missing or invalid")
+    return debtor
+
+
+def _payees(db: Session, clauses: List, payout_format: str) -> Iterator[Payee]:
+    for row in _rows(db, clauses):
+        payee, _ = validate_payee(row, payout_format)
+        if payee is not None:
+            yield payee
+
+
+def _element(writer: XMLGenerator, path: str, text: str, attrs: Optional[dict] = None) -> None:
+    """Write ``text`` inside the nested elements of a ``A/B/C`` path."""
+    names = path.split("/")
+    for name in names[:-1]:
+        writer.startElement(name, {})
+    writer.startElement(names[-1], attrs or {})
+    writer.characters(text)
+    for name in reversed(names):
+        writer.endElement(name)
+
+
+def stream_sepa(
+    db: Session,
+    clauses: List,
+    summary: dict,
+    debtor: dict,
+    *,
+    execution_date: date,
+    remittance: str,
+) -> Iterator[bytes]:
+    """Yield a pain.001.001.03 credit transfer with one transaction per payee."""
+    buffer = StreamBuffer()
+    try:
+        writer = XMLGenerator(buffer, encoding="utf-8", short_empty_elements=True)
+        created = datetime.utcnow().replace(microsecond=0)
+        message_id = f"PAYOUT-{created:%Y%m%d%H%M%S}"
+        count, control_sum = str(summary["payees"]), f"{summary['total']:.2f}"
+        debtor_name = restrict_charset(debtor["name"], SEPA_CHARSET, 70)
+
+        writer.startDocument()
+        writer.startElement("Document", {"xmlns": SEPA_NAMESPACE})
+        writer.startElement("CstmrCdtTrfInitn", {})
+        writer.startElement("GrpHdr", {})
+        _element(writer, "MsgId", message_id)
+        _element(writer, "CreDtTm", created.isoformat())
+        _element(writer, "NbOfTxs", count)
+        _element(writer, "CtrlSum", control_sum)
+        _element(writer, "InitgPty/Nm", debtor_name)
+        writer.endElement("GrpHdr")
+
+        writer.startElement("PmtInf", {})
+        _element(writer, "PmtInfId", message_id)
+        _element(writer, "PmtMtd", "TRF")
+        _element(writer, "BtchBookg", "true")
+        _element(writer, "NbOfTxs", count)
+        _element(writer, "CtrlSum", control_sum)
+        _element(writer, "PmtTpInf/SvcLvl/Cd", "SEPA")
+        _element(writer, "ReqdExctnDt", execution_date.isoformat())
+        _element(writer, "Dbtr/Nm", debtor_name)
+        _element(writer, "DbtrAcct/Id/IBAN", debtor["iban"])
+        if debtor["bic"]:
+            _element(writer, "DbtrAgt/FinInstnId/BIC", debtor["bic"])
+        else:
+            _element(writer, "DbtrAgt/FinInstnId/Othr/Id", "NOTPROVIDED")
+        _element(writer, "ChrgBr", "SLEV")
+        yield buffer.drain()
+
+        for number, payee in enumerate(_payees(db, clauses, "sepa"), start=1):
+            writer.startElement("CdtTrfTxInf", {})
+            _element(writer, "PmtId/EndToEndId", f"{message_id}-{payee.coach_id}"[:35])
+            _element(writer, "Amt/InstdAmt", f"{payee.amount:.2f}", {"Ccy": summary["currency"]})
+            if payee.bic:
+                _element(writer, "CdtrAgt/FinInstnId/BIC", payee.bic)
+            _element(writer, "Cdtr/Nm", restrict_charset(payee.name, SEPA_CHARSET, 70))
+            _element(writer, "CdtrAcct/Id/IBAN", payee.iban)
+            _element(writer, "RmtInf/Ustrd", restrict_charset(remittance, SEPA_CHARSET, 140))
+            writer.endElement("CdtTrfTxInf")
+            if number % FLUSH_EVERY == 0:
+                yield buffer.drain()
+
+        writer.endElement("PmtInf")
+        writer.endElement("CstmrCdtTrfInitn")
+        writer.endElement("Document")
+        writer.endDocument()
+        yield buffer.drain()
+    finally:
+        db.close()
+
+
+def bacs_record(
+    sort_code: str,
+    account_number: str,
+    transaction_code: str,
+    debtor: dict,
+    pence: int,
+    reference: str,
+    name: str,
+) -> str:
+    """One 100-character Standard 18 record."""
+    return (
+        f"{sort_code}{account_number}0{transaction_code}"
+        f"{debtor['sort_code']}{debtor['account_number']}    {pence:011d}"
+        f"{restrict_charset(debtor['name'].upper(), BACS_CHARSET, 18):<18}"
+        f"{restrict_charset(reference.upper(), BACS_CHARSET, 18):<18}"
+        f"{restrict_charset(name.upper(), BACS_CHARSET, 18):<18}\n"
+    )
+
+
+def stream_bacs(db: Session, clauses: List, summary: dict, debtor: dict, *, reference: str) -> Iterator[bytes]:
+    """Yield Standard 18 credit records, one per payee, followed by the balancing contra record."""
+    lines: List[str] = []
+    try:
+        for payee in _payees(db, clauses, "bacs"):
+            pence = int(payee.amount * 100)
+            lines.append(bacs_record(payee.sort_code, payee.account_number, BACS_CREDIT, debtor, pence, reference, payee.name))
+            if len(lines) == FLUSH_EVERY:
+                yield "".join(lines).encode("ascii")
+                lines.clear()
+        total = int(summary["total"] * 100)
+        lines.append(
+            bacs_record(debtor["sort_code"], debtor["account_number"], BACS_CONTRA, debtor, total, "CONTRA", debtor["name"])
+        )
+        yield "".join(lines).encode("ascii")
+    finally:
+        db.close()
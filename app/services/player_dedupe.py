@@ -0,0 +1,249 @@
+"""Duplicate player detection and set-based merging.
+
+Players are grouped by blocking keys (normalized phone, e-mail local part
+and first initial + Soundex of the surname) and only pairs sharing a block
+are scored, so the work grows with block sizes rather than with n². Blocks
+larger than ``window`` are compared with a sorted-neighbourhood window
+instead of all pairs. Merging moves association rows with ``INSERT ...
+SELECT`` / ``DELETE`` statements and never loads lessons.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, delete, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.models.associations import lesson_players_table, player_coach_table, series_players_table
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.services.domain_events import LessonUpdated, bus
+from app.services.sync import record_deletions
+
+NAME_WEIGHT = 0.5
+PHONE_WEIGHT = 0.25
+EMAIL_WEIGHT = 0.15
+BIRTH_DATE_WEIGHT = 0.1
+SOUNDEX_CODES = {char: str(code) for code, chars in enumerate(("AEIOUYHW", "BFPV", "CGJKQSXZ", "DT", "L", "MN", "R")) for char in chars}
+FETCH_SIZE = 10_000
+
+# (association table, column of the other side) for every table keyed by player_id
+PLAYER_LINKS = (
+    (player_coach_table, "coach_id"),
+    (lesson_players_table, "lesson_id"),
+    (series_players_table, "series_id"),
+)
+
+
+@dataclass(slots=True)
+class PlayerKey:
+    id: int
+    name: str
+    phone: Optional[str]
+    email_local: Optional[str]
+    birth_date: Optional[date]
+
+
+def normalize_name(value: Optional[str]) -> str:
+    ascii_text = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode().lower()
+    return " ".join(re.sub(r"[^a-z ]", " ", ascii_text).split())
+
+
+def normalize_phone(value: Optional[str]) -> Optional[str]:
+    """Last nine digits, which drops country codes and trunk prefixes."""
+    digits = re.sub(r"\D", "", value or "")
+    return digits[-9:] if len(digits) >= 7 else None
+
+
+def email_local_part(value: Optional[str]) -> Optional[str]:
+    if not value or "@" not in value:
+        return None
+    local = value.split("@", 1)[0].split("+", 1)[0].lower().replace(".", "")
+    return local if len(local) >= 3 else None
+
+
+def soundex(word: str) -> str:
+    word = re.sub(r"[^A-Z]", "", word.upper())
+    if not word:
+        return ""
+    encoded, previous = [word[0]], SOUNDEX_CODES.get(word[0])
+    for char in word[1:]:
+        code = SOUNDEX_CODES[char]
+        if code != "0" and code != previous:
+            encoded.append(code)
+        if char not in "HW":
+            previous = code
+    return "".join(encoded).ljust(4, "0")[:4]
+
+
+def name_key(name: str) -> Optional[str]:
+    tokens = name.split()
+    if not tokens:
+        return None
+    return f"{tokens[0][0]}:{soundex(tokens[-1])}"
+
+
+def blocking_keys(player: PlayerKey) -> List[str]:
+    keys = []
+    if player.phone:
+        keys.append(f"phone:{player.phone}")
+    if player.email_local:
+        keys.append(f"email:{player.email_local}")
+    key = name_key(player.name)
+    if key:
+        keys.append(f"name:{key}")
+    return keys
+
+
+def _initial_match(left: str, right: str) -> bool:
+    left_tokens, right_tokens = left.split(), right.split()
+    if len(left_tokens) < 2 or len(right_tokens) < 2 or left_tokens[-1] != right_tokens[-1]:
+        return False
+    first, second = sorted((left_tokens[0], right_tokens[0]), key=len)
+    return len(first) == 1 and second.startswith(first)
+
+
+def name_similarity(left: str, right: str, matcher: Optional[SequenceMatcher] = None) -> float:
+    """Sequence similarity, treating an initial as matching the full first name ("j smith" ~ "john smith")."""
+    ratio = (matcher or SequenceMatcher(None, left, right)).ratio()
+    return max(ratio, 0.9) if _initial_match(left, right) else ratio
+
+
+def score_pair(left: PlayerKey, right: PlayerKey, min_score: float = 0.0) -> Optional[Tuple[float, List[str]]]:
+    """Score a pair, or ``None`` as soon as it provably cannot reach ``min_score``."""
+    score, reasons, factor = 0.0, [], 1.0
+    if left.phone and left.phone == right.phone:
+        score += PHONE_WEIGHT
+        reasons.append("phone")
+    if left.email_local and left.email_local == right.email_local:
+        score += EMAIL_WEIGHT
+        reasons.append("email")
+    if left.birth_date and right.birth_date:
+        if left.birth_date == right.birth_date:
+            score += BIRTH_DATE_WEIGHT
+            reasons.append("birth date")
+        else:
+            factor = 0.5
+            reasons.append("birth date differs")
+
+    # The name term is the expensive one: skip it when even its upper bound falls short.
+    needed = min_score / factor - score
+    if needed > NAME_WEIGHT + 1e-9:
+        return None
+    if needed > NAME_WEIGHT * 0.9 or left.name == right.name:
+        if left.name != right.name:
+            return None
+        similarity = 1.0
+    else:
+        matcher = SequenceMatcher(None, left.name, right.name)
+        if needed > 0 and not _initial_match(left.name, right.name) and NAME_WEIGHT * matcher.quick_ratio() < needed:
+            return None
+        similarity = name_similarity(left.name, right.name, matcher)
+    score = (score + NAME_WEIGHT * similarity) * factor
+    if score < min_score:
+        return None
+    return round(score, 4), [f"name {similarity:.2f}"] + reasons
+
+
+def load_player_keys(db: Session, include_inactive: bool = False) -> Dict[int, PlayerKey]:
+    stmt = select(Player.id, Player.full_name, Player.phone, Player.email, Player.birth_date)
+    if not include_inactive:
+        stmt = stmt.where(Player.active.is_(True))
+    return {
+        row.id: PlayerKey(
+            row.id,
+            normalize_name(row.full_name),
+            normalize_phone(row.phone),
+            email_local_part(row.email),
+            row.birth_date,
+        )
+        for row in db.execute(stmt.execution_options(yield_per=FETCH_SIZE))
+    }
+
+
+def candidate_pairs(players: Iterable[PlayerKey], window: int = 25) -> Iterator[Tuple[PlayerKey, PlayerKey]]:
+    """Pairs sharing a blocking key; a pair sharing several keys is yielded once per key."""
+    blocks: Dict[str, List[PlayerKey]] = defaultdict(list)
+    for player in players:
+        for key in blocking_keys(player):
+            blocks[key].append(player)
+
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) > window:
+            members.sort(key=lambda player: (player.name, player.id))
+        for index, player in enumerate(members):
+            for other in members[index + 1 : index + 1 + window]:
+                yield (player, other) if player.id < other.id else (other, player)
+
+
+def find_duplicates(
+    db: Session, *, min_score: float = 0.5, limit: int = 100, window: int = 25, include_inactive: bool = False
+) -> List[dict]:
+    players = load_player_keys(db, include_inactive)
+    seen: Set[Tuple[int, int]] = set()
+    scored = []
+    for left, right in candidate_pairs(players.values(), window):
+        result = score_pair(left, right, min_score)
+        if result is not None and (left.id, right.id) not in seen:
+            seen.add((left.id, right.id))
+            scored.append((result[0], left.id, right.id, result[1]))
+    scored.sort(key=lambda item: (-item[0], item[1], item[2]))
+    return [
+        {"player_ids": [left_id, right_id], "score": score, "reasons": reasons}
+        for score, left_id, right_id, reasons in scored[:limit]
+    ]
+
+
+def merge_players(db: Session, target: Player, source_ids: Sequence[int]) -> None:
+    """Fold ``source_ids`` into ``target``; the caller commits.
+
+    Coach, lesson and series links are re-pointed at the target (skipping the
+    ones it already has), empty contact fields on the target are filled from
+    the sources, and the source players are deleted.
+    """
+    source_ids = list(source_ids)
+    record_deletions(db, Player, [Player.id.in_(source_ids)])
+    lesson_ids = db.scalars(
+        update(Lesson)
+        .where(
+            Lesson.id.in_(
+                select(lesson_players_table.c.lesson_id).where(lesson_players_table.c.player_id.in_(source_ids))
+            )
+        )
+        .values(updated_at=func.now())
+        .returning(Lesson.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    for table, column in PLAYER_LINKS:
+        existing = table.alias("existing")
+        db.execute(
+            insert(table).from_select(
+                [column, "player_id"],
+                select(table.c[column], literal(target.id))
+                .where(
+                    table.c.player_id.in_(source_ids),
+                    ~exists().where(and_(existing.c[column] == table.c[column], existing.c.player_id == target.id)),
+                )
+                .distinct(),
+            )
+        )
+        db.execute(delete(table).where(table.c.player_id.in_(source_ids)))
+    bus.record(db, *LessonUpdated.for_ids(db, lesson_ids))
+
+    sources = db.execute(
+        select(Player.email, Player.phone, Player.birth_date, Player.notes)
+        .where(Player.id.in_(source_ids))
+        .order_by(Player.id)
+    ).all()
+    db.execute(delete(Player).where(Player.id.in_(source_ids)).execution_options(synchronize_session=False))
+    db.flush()
+    for field in ("email", "phone", "birth_date", "notes"):
+        if getattr(target, field) is None:
+            setattr(target, field, next((getattr(row, field) for row in sources if getattr(row, field)), None))
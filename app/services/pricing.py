@@ -0,0 +1,138 @@
+"""Set-based lesson repricing from rate cards.
+
+Every repriceable lesson is joined to the active rate cards of its coach that
+match its club, type and player count; ``ROW_NUMBER`` keeps the most specific
+one (a club over any club, a type over any type, then the narrowest player
+band). Lessons without a card fall back to ``Coach.hourly_rate``. Preview and
+apply share that query, and applying it is a single ``UPDATE ... FROM``.
+"""
+
+from typing import List
+
+from sqlalchemy import Numeric, and_, case, cast, func, literal_column, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.associations import lesson_players_table
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus
+from app.models.lesson import Lesson
+from app.models.rate_card import RateCard
+from app.services.domain_events import LessonUpdated, bus
+
+# Invoiced or paid amounts are history and are never rewritten.
+REPRICEABLE = (Lesson.status != LessonStatus.invoiced, Lesson.payment_status != LessonPaymentStatus.paid)
+MINUTES_PER_HOUR = literal_column("60.0", Numeric())
+UNBOUNDED_BAND = 10_000
+
+
+def _amount(hourly_rate, duration_minutes):
+    return func.round(cast(hourly_rate * duration_minutes / MINUTES_PER_HOUR, Numeric(12, 4)), 2)
+
+
+def priced_lessons(clauses: List):
+    """Subquery of repriceable lessons whose computed amounts differ from the stored ones."""
+    counts = (
+        select(lesson_players_table.c.lesson_id, func.count().label("players"))
+        .group_by(lesson_players_table.c.lesson_id)
+        .subquery()
+    )
+    players = func.coalesce(counts.c.players, 0)
+    card_matches = and_(
+        RateCard.coach_id == Lesson.coach_id,
+        RateCard.active.is_(True),
+        or_(RateCard.club_id.is_(None), RateCard.club_id == Lesson.club_id),
+        or_(RateCard.lesson_type.is_(None), RateCard.lesson_type == Lesson.type),
+        RateCard.min_players <= players,
+        or_(RateCard.max_players.is_(None), RateCard.max_players >= players),
+    )
+    rank = func.row_number().over(
+        partition_by=Lesson.id,
+        order_by=(
+            RateCard.club_id.is_(None),
+            RateCard.lesson_type.is_(None),
+            func.coalesce(RateCard.max_players, UNBOUNDED_BAND) - RateCard.min_players,
+            RateCard.id.desc(),
+        ),
+    )
+    ranked = (
+        select(
+            Lesson.id.label("lesson_id"),
+            Lesson.date,
+            Lesson.duration_minutes,
+            Lesson.total_amount,
+            Lesson.club_reimbursement_amount,
+            RateCard.id.label("rate_card_id"),
+            func.coalesce(RateCard.hourly_rate, Coach.hourly_rate).label("hourly_rate"),
+            RateCard.club_reimbursement_hourly_rate,
+            rank.label("rank"),
+        )
+        .join(Coach, Coach.id == Lesson.coach_id)
+        .outerjoin(counts, counts.c.lesson_id == Lesson.id)
+        .outerjoin(RateCard, card_matches)
+        .where(*REPRICEABLE, *clauses)
+        .subquery()
+    )
+    new_total = _amount(ranked.c.hourly_rate, ranked.c.duration_minutes)
+    new_reimbursement = case(
+        (
+            ranked.c.club_reimbursement_hourly_rate.is_not(None),
+            _amount(ranked.c.club_reimbursement_hourly_rate, ranked.c.duration_minutes),
+        ),
+        else_=ranked.c.club_reimbursement_amount,
+    )
+    return (
+        select(
+            ranked.c.lesson_id,
+            ranked.c.date,
+            ranked.c.rate_card_id,
+            ranked.c.total_amount.label("total_amount_before"),
+            new_total.label("total_amount_after"),
+            ranked.c.club_reimbursement_amount.label("club_reimbursement_before"),
+            new_reimbursement.label("club_reimbursement_after"),
+        )
+        .where(
+            ranked.c.rank == 1,
+            ranked.c.hourly_rate.is_not(None),
+            or_(
+                ranked.c.total_amount != new_total,
+                ranked.c.club_reimbursement_amount.is_distinct_from(new_reimbursement),
+            ),
+        )
+        .subquery()
+    )
+
+
+def reprice_lessons(db: Session, clauses: List, *, dry_run: bool = False, preview_limit: int = 100) -> dict:
+    """Summarize (and unless ``dry_run`` apply) the repricing of lessons matching ``clauses``; the caller commits."""
+    priced = priced_lessons(clauses)
+    summary = db.execute(
+        select(
+            func.count(priced.c.lesson_id),
+            func.coalesce(func.sum(priced.c.total_amount_before), 0),
+            func.coalesce(func.sum(priced.c.total_amount_after), 0),
+        )
+    ).one()
+    changes = db.execute(
+        select(priced).order_by(priced.c.date, priced.c.lesson_id).limit(preview_limit)
+    ).mappings().all()
+
+    if summary[0] and not dry_run:
+        lesson_ids = db.scalars(
+            update(Lesson)
+            .where(Lesson.id == priced.c.lesson_id)
+            .values(
+                total_amount=priced.c.total_amount_after,
+                club_reimbursement_amount=priced.c.club_reimbursement_after,
+                updated_at=func.now(),
+            )
+            .returning(Lesson.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        bus.record(db, *LessonUpdated.for_ids(db, lesson_ids))
+    return {
+        "dry_run": dry_run,
+        "lessons": summary[0],
+        "total_before": summary[1],
+        "total_after": summary[2],
+        "changes": [dict(change) for change in changes],
+    }
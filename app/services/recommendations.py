@@ -0,0 +1,260 @@
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.associations import lesson_players_table, lesson_strokes_table
+from app.models.enums import SkillLevel
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.stroke import Stroke
+from app.services.domain_events import INCREMENTAL_LIMIT, DomainEvent, LessonEvent, bus, lesson_changes
+
+LEVELS: List[SkillLevel] = list(SkillLevel)
+LEVEL_INDEX = {level: position for position, level in enumerate(LEVELS)}
+
+# Weight of level-wide popularity relative to co-occurrence affinity; keeps
+# cold-start players (no exposure yet) from getting an empty ranking.
+POPULARITY_WEIGHT = 0.25
+
+Contribution = Tuple[Tuple[int, ...], Tuple[Tuple[int, SkillLevel], ...]]
+
+
+class StrokeRecommender:
+    """Per skill level stroke co-occurrence and player exposure matrices.
+
+    The matrices are built from the database on first use and then kept in
+    sync incrementally: every lesson write replaces that lesson's previous
+    contribution instead of triggering a full rebuild.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._stroke_ids: List[int] = []
+        self._stroke_meta: Dict[int, Tuple[str, str]] = {}
+        self._stroke_cols: Dict[int, int] = {}
+        self._cooccurrence: Dict[SkillLevel, np.ndarray] = {}
+        self._exposure: Dict[SkillLevel, np.ndarray] = {}
+        self._player_rows: Dict[int, Tuple[SkillLevel, int]] = {}
+        self._row_counts: Dict[SkillLevel, int] = {}
+        self._contributions: Dict[int, Contribution] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._contributions.clear()
+            self._player_rows.clear()
+
+    def ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._rebuild(db)
+
+    def _rebuild(self, db: Session) -> None:
+        strokes = db.execute(select(Stroke.id, Stroke.code, Stroke.label).order_by(Stroke.id)).all()
+        self._stroke_ids = [row.id for row in strokes]
+        self._stroke_meta = {row.id: (row.code.value, row.label) for row in strokes}
+        self._stroke_cols = {stroke_id: col for col, stroke_id in enumerate(self._stroke_ids)}
+        n_strokes = len(self._stroke_ids)
+
+        lesson_strokes = np.asarray(
+            db.execute(select(lesson_strokes_table.c.lesson_id, lesson_strokes_table.c.stroke_id)).all(),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        lesson_players = db.execute(
+            select(lesson_players_table.c.lesson_id, Player.id, Player.skill_level).join(
+                Player, Player.id == lesson_players_table.c.player_id
+            )
+        ).all()
+
+        lesson_ids = np.unique(
+            np.concatenate([lesson_strokes[:, 0], np.asarray([row[0] for row in lesson_players], dtype=np.int64)])
+        )
+        incidence = np.zeros((lesson_ids.size, n_strokes), dtype=np.int32)
+        if lesson_strokes.size:
+            rows = np.searchsorted(lesson_ids, lesson_strokes[:, 0])
+            cols = np.fromiter((self._stroke_cols[sid] for sid in lesson_strokes[:, 1].tolist()), dtype=np.int64)
+            incidence[rows, cols] = 1
+
+        self._player_rows = {}
+        self._row_counts = {level: 0 for level in LEVELS}
+        for _, player_id, level in lesson_players:
+            if player_id not in self._player_rows:
+                self._player_rows[player_id] = (level, self._row_counts[level])
+                self._row_counts[level] += 1
+
+        lp_lessons = np.asarray([row[0] for row in lesson_players], dtype=np.int64)
+        lp_levels = np.asarray([LEVEL_INDEX[row[2]] for row in lesson_players], dtype=np.int64)
+        lp_rows = np.asarray([self._player_rows[row[1]][1] for row in lesson_players], dtype=np.int64)
+        lp_lesson_rows = np.searchsorted(lesson_ids, lp_lessons)
+        lesson_levels = np.zeros((lesson_ids.size, len(LEVELS)), dtype=bool)
+        lesson_levels[lp_lesson_rows, lp_levels] = True
+
+        self._cooccurrence = {}
+        self._exposure = {}
+        for level in LEVELS:
+            level_idx = LEVEL_INDEX[level]
+            selected = incidence[lesson_levels[:, level_idx]]
+            self._cooccurrence[level] = selected.T @ selected
+            exposure = np.zeros((max(self._row_counts[level], 1) * 2, n_strokes), dtype=np.int32)
+            mask = lp_levels == level_idx
+            np.add.at(exposure, lp_rows[mask], incidence[lp_lesson_rows[mask]])
+            self._exposure[level] = exposure
+
+        self._contributions = {}
+        strokes_by_lesson: Dict[int, List[int]] = {}
+        for lesson_id, stroke_id in lesson_strokes.tolist():
+            strokes_by_lesson.setdefault(lesson_id, []).append(self._stroke_cols[stroke_id])
+        players_by_lesson: Dict[int, List[Tuple[int, SkillLevel]]] = {}
+        for lesson_id, player_id, level in lesson_players:
+            players_by_lesson.setdefault(lesson_id, []).append((player_id, level))
+        for lesson_id in lesson_ids.tolist():
+            self._contributions[lesson_id] = (
+                tuple(strokes_by_lesson.get(lesson_id, ())),
+                tuple(players_by_lesson.get(lesson_id, ())),
+            )
+        self._loaded = True
+
+    def _player_row(self, player_id: int, level: SkillLevel) -> int:
+        known = self._player_rows.get(player_id)
+        if known is not None:
+            return known[1]
+        row = self._row_counts[level]
+        exposure = self._exposure[level]
+        if row >= exposure.shape[0]:
+            grown = np.zeros((exposure.shape[0] * 2, exposure.shape[1]), dtype=exposure.dtype)
+            grown[: exposure.shape[0]] = exposure
+            self._exposure[level] = grown
+        self._player_rows[player_id] = (level, row)
+        self._row_counts[level] = row + 1
+        return row
+
+    def _apply(self, contribution: Contribution, sign: int) -> None:
+        stroke_cols, players = contribution
+        if not stroke_cols:
+            return
+        cols = np.asarray(stroke_cols)
+        for level in {level for _, level in players}:
+            self._cooccurrence[level][np.ix_(cols, cols)] += sign
+        for player_id, level in players:
+            self._exposure[level][self._player_row(player_id, level), cols] += sign
+
+    def apply_lesson(self, lesson: Lesson) -> None:
+        """Replace the stored contribution of ``lesson`` with its current strokes and players."""
+        if not self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            if any(stroke.id not in self._stroke_cols for stroke in lesson.strokes) or any(
+                self._player_rows.get(player.id, (player.skill_level,))[0] != player.skill_level
+                for player in lesson.players
+            ):
+                self.invalidate()
+                return
+            previous = self._contributions.pop(lesson.id, None)
+            if previous is not None:
+                self._apply(previous, -1)
+            contribution = (
+                tuple(self._stroke_cols[stroke.id] for stroke in lesson.strokes),
+                tuple((player.id, player.skill_level) for player in lesson.players),
+            )
+            self._apply(contribution, 1)
+            self._contributions[lesson.id] = contribution
+
+    def remove_lesson(self, lesson_id: int) -> None:
+        if not self._loaded:
+            return
+        with self._lock:
+            previous = self._contributions.pop(lesson_id, None)
+            if previous is not None:
+                self._apply(previous, -1)
+
+    def recommend(
+        self,
+        db: Session,
+        players: Sequence[Player],
+        *,
+        limit: int = 3,
+    ) -> List[Tuple[str, str, float]]:
+        """Rank strokes that commonly accompany what ``players`` already practised at their level.
+
+        Returns ``(code, label, score)`` tuples, best first.
+        """
+        self.ensure_loaded(db)
+        with self._lock:
+            if not self._stroke_ids:
+                return []
+            level = _dominant_level(player.skill_level for player in players)
+            cooccurrence = self._cooccurrence[level].astype(np.float64)
+            exposure = np.zeros(len(self._stroke_ids), dtype=np.float64)
+            for player in players:
+                known = self._player_rows.get(player.id)
+                if known is not None:
+                    exposure += self._exposure[known[0]][known[1]]
+
+        frequency = np.diag(cooccurrence).copy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            conditional = np.nan_to_num(cooccurrence / frequency[:, None])
+        np.fill_diagonal(conditional, 0.0)
+
+        total_exposure = exposure.sum()
+        affinity = exposure @ conditional / total_exposure if total_exposure else np.zeros_like(exposure)
+        popularity = frequency / frequency.sum() if frequency.sum() else np.zeros_like(frequency)
+        novelty = 1.0 / (1.0 + exposure)
+        scores = (affinity + POPULARITY_WEIGHT * popularity) * novelty
+
+        limit = min(limit, scores.size)
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (*self._stroke_meta[self._stroke_ids[col]], round(float(scores[col]), 4))
+            for col in top.tolist()
+        ]
+
+
+def _dominant_level(levels: Iterable[SkillLevel]) -> SkillLevel:
+    counts = Counter(levels)
+    if not counts:
+        return SkillLevel.beginner
+    return max(counts.items(), key=lambda item: (item[1], LEVEL_INDEX[item[0]]))[0]
+
+
+recommender = StrokeRecommender()
+
+
+def recommend_for_players(db: Session, players: Sequence[Player], limit: int = 3) -> List[dict]:
+    return [
+        {"code": code, "label": label, "score": score}
+        for code, label, score in recommender.recommend(db, players, limit=limit)
+    ]
+
+
+@bus.subscribe(LessonEvent)
+def _track_lessons(db: Session, events: List[DomainEvent]) -> None:
+    if not recommender.loaded:
+        return
+    changed, deleted = lesson_changes(events)
+    if len(changed) + len(deleted) > INCREMENTAL_LIMIT:
+        recommender.invalidate()
+        return
+    for lesson_id in deleted:
+        recommender.remove_lesson(lesson_id)
+    if changed:
+        lessons = db.scalars(
+            select(Lesson)
+            .where(Lesson.id.in_(changed))
+            .options(selectinload(Lesson.strokes), selectinload(Lesson.players))
+        )
+        for lesson in lessons:
+            recommender.apply_lesson(lesson)
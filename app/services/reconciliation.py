@@ -0,0 +1,276 @@
+"""Match bank statement credits to issued invoices.
+
+Invoices are indexed by amount in minor units; each amount bucket is sorted
+by the invoice's issue date so a transaction only looks at invoices of the
+same amount inside its date window (two bisects). References that name an
+invoice (``INV 123``, ``Invoice #123``) are looked up directly. Every lookup
+is O(log n), so a statement is reconciled in O((n + m) log m).
+"""
+
+import csv
+import io
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dateutil import parser as date_parser
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.enums import InvoiceStatus
+from app.models.invoice import Invoice
+
+DATE_HEADERS = ("date", "posted", "posting date", "booking date", "transaction date", "value date")
+AMOUNT_HEADERS = ("amount", "credit", "paid in", "value")
+REFERENCE_HEADERS = ("reference", "description", "details", "memo", "narrative", "payee", "name")
+
+INVOICE_REFERENCE = re.compile(r"INV(?:OICE)?(?:NO|NUMBER)?0*(\d+)")
+OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|(?=</BANKTRANLIST>))", re.S | re.I)
+OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+AMOUNT_WEIGHT = 0.5
+REFERENCE_WEIGHT = 0.4
+DATE_WEIGHT = 0.1
+AMBIGUITY_MARGIN = 0.05
+
+
+@dataclass
+class BankTransaction:
+    row: int
+    posted_on: date
+    amount_minor: int
+    reference: str
+
+
+@dataclass
+class InvoiceCandidate:
+    invoice_id: int
+    amount_minor: int
+    anchor: int  # issue date as a proleptic ordinal
+
+
+@dataclass
+class Candidate:
+    invoice_id: int
+    score: float
+    reasons: List[str] = field(default_factory=list)
+
+
+def to_minor(value) -> int:
+    return int((Decimal(value) * 100).to_integral_value())
+
+
+def normalize_reference(value: str) -> str:
+    return re.sub(r"[^A-Z0-9]", "", (value or "").upper())
+
+
+def referenced_invoice_ids(reference: str) -> List[int]:
+    return [int(match) for match in INVOICE_REFERENCE.findall(normalize_reference(reference))]
+
+
+def _parse_amount(raw: str) -> Decimal:
+    cleaned = re.sub(r"[^0-9,.\-()]", "", raw or "")
+    negative = cleaned.startswith("(") and cleaned.endswith(")")
+    cleaned = cleaned.strip("()")
+    if "," in cleaned and "." in cleaned:
+        if cleaned.rfind(".") > cleaned.rfind(","):
+            cleaned = cleaned.replace(",", "")
+        else:
+            cleaned = cleaned.replace(".", "").replace(",", ".")
+    elif "," in cleaned:
+        decimal_comma = len(cleaned.rsplit(",", 1)[1]) == 2
+        cleaned = cleaned.replace(",", ".") if decimal_comma else cleaned.replace(",", "")
+    amount = Decimal(cleaned)
+    return -amount if negative else amount
+
+
+def _pick(header: Sequence[str], names: Sequence[str]) -> Optional[str]:
+    lowered = {column.strip().lower(): column for column in header}
+    return next((lowered[name] for name in names if name in lowered), None)
+
+
+def parse_csv(text: str, dayfirst: bool = True) -> Tuple[List[BankTransaction], Dict[int, str]]:
+    reader = csv.DictReader(io.StringIO(text))
+    header = reader.fieldnames or []
+    date_column, amount_column = _pick(header, DATE_HEADERS), _pick(header, AMOUNT_HEADERS)
+    if not date_column or not amount_column:
+        raise ValueError("Statement CSV needs a date and an amount column")
+    reference_columns = [column for column in header if column.strip().lower() in REFERENCE_HEADERS]
+
+    transactions: List[BankTransaction] = []
+    errors: Dict[int, str] = {}
+    for number, record in enumerate(reader, start=2):
+        try:
+            posted_on = date_parser.parse(record[date_column], dayfirst=dayfirst).date()
+            amount = _parse_amount(record[amount_column])
+        except (ValueError, OverflowError, InvalidOperation, TypeError):
+            errors[number] = "Unreadable date or amount"
+            continue
+        reference = " ".join(record.get(column) or "" for column in reference_columns)
+        transactions.append(BankTransaction(number, posted_on, to_minor(amount), reference))
+    return transactions, errors
+
+
+def parse_ofx(text: str) -> Tuple[List[BankTransaction], Dict[int, str]]:
+    transactions: List[BankTransaction] = []
+    errors: Dict[int, str] = {}
+    for number, block in enumerate(OFX_TRANSACTION.findall(text), start=1):
+        fields = {name.upper(): value.strip() for name, value in OFX_FIELD.findall(block)}
+        try:
+            posted_on = datetime.strptime(fields["DTPOSTED"][:8], "%Y%m%d").date()
+            amount = Decimal(fields["TRNAMT"].replace(",", "."))
+        except (KeyError, ValueError, InvalidOperation):
+            errors[number] = "Unreadable DTPOSTED or TRNAMT"
+            continue
+        reference = " ".join(fields.get(name, "") for name in ("NAME", "MEMO", "REFNUM", "CHECKNUM"))
+        transactions.append(BankTransaction(number, posted_on, to_minor(amount), reference))
+    return transactions, errors
+
+
+def parse_statement(content: bytes, statement_format: str) -> Tuple[List[BankTransaction], Dict[int, str]]:
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = content.decode("latin-1")
+    if statement_format == "ofx":
+        return parse_ofx(text)
+    return parse_csv(text)
+
+
+def detect_format(filename: Optional[str], content: bytes) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ofx", ".qfx")) or b"<OFX>" in content[:4096].upper():
+        return "ofx"
+    return "csv"
+
+
+class InvoiceIndex:
+    """Issued invoices bucketed by amount (minor units) and sorted by issue date."""
+
+    def __init__(self, invoices: Sequence[InvoiceCandidate]) -> None:
+        self.by_id: Dict[int, InvoiceCandidate] = {invoice.invoice_id: invoice for invoice in invoices}
+        buckets: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for invoice in invoices:
+            buckets[invoice.amount_minor].append((invoice.anchor, invoice.invoice_id))
+        self._anchors: Dict[int, List[int]] = {}
+        self._ids: Dict[int, List[int]] = {}
+        for amount, entries in buckets.items():
+            entries.sort()
+            self._anchors[amount] = [anchor for anchor, _ in entries]
+            self._ids[amount] = [invoice_id for _, invoice_id in entries]
+
+    @classmethod
+    def load(cls, db: Session, clauses: List) -> "InvoiceIndex":
+        rows = db.execute(
+            select(Invoice.id, Invoice.total_net, Invoice.issued_at, Invoice.period_end).where(
+                Invoice.status == InvoiceStatus.issued, *clauses
+            )
+        ).all()
+        return cls(
+            [
+                InvoiceCandidate(
+                    row.id,
+                    to_minor(row.total_net),
+                    (row.issued_at.date() if row.issued_at else row.period_end).toordinal(),
+                )
+                for row in rows
+            ]
+        )
+
+    def within(self, amount_minor: int, low: int, high: int) -> List[InvoiceCandidate]:
+        anchors = self._anchors.get(amount_minor)
+        if not anchors:
+            return []
+        start, end = bisect_left(anchors, low), bisect_right(anchors, high)
+        return [self.by_id[invoice_id] for invoice_id in self._ids[amount_minor][start:end]]
+
+
+def score_transaction(
+    index: InvoiceIndex, transaction: BankTransaction, window_days: int, grace_days: int = 7
+) -> List[Candidate]:
+    """Candidates for one credit, best first."""
+    posted = transaction.posted_on.toordinal()
+    referenced = set(referenced_invoice_ids(transaction.reference))
+    candidates: Dict[int, Candidate] = {}
+
+    for invoice in index.within(transaction.amount_minor, posted - window_days, posted + grace_days):
+        distance = abs(posted - invoice.anchor)
+        candidate = Candidate(invoice.invoice_id, AMOUNT_WEIGHT, ["amount"])
+        candidate.score += DATE_WEIGHT * max(0.0, 1 - distance / max(window_days, 1))
+        candidate.reasons.append(f"{distance}d from issue")
+        candidates[invoice.invoice_id] = candidate
+
+    for invoice_id in referenced:
+        invoice = index.by_id.get(invoice_id)
+        if invoice is None:
+            continue
+        candidate = candidates.setdefault(invoice_id, Candidate(invoice_id, 0.0))
+        candidate.score += REFERENCE_WEIGHT
+        candidate.reasons.append("reference")
+        if invoice.amount_minor != transaction.amount_minor:
+            candidate.reasons.append("amount differs")
+
+    ranked = sorted(candidates.values(), key=lambda candidate: (-candidate.score, candidate.invoice_id))
+    for candidate in ranked:
+        candidate.score = round(candidate.score, 4)
+    return ranked
+
+
+def reconcile(
+    index: InvoiceIndex,
+    transactions: Sequence[BankTransaction],
+    *,
+    threshold: float,
+    window_days: int,
+    review_limit: int = 3,
+) -> dict:
+    """Pick auto-applicable matches (one invoice per transaction and vice versa) and a review list."""
+    scored = []
+    unmatched = 0
+    for transaction in transactions:
+        if transaction.amount_minor <= 0:
+            continue
+        candidates = score_transaction(index, transaction, window_days)
+        if candidates:
+            scored.append((transaction, candidates))
+        else:
+            unmatched += 1
+
+    scored.sort(key=lambda item: -item[1][0].score)
+    claimed: set = set()
+    matches: List[dict] = []
+    review: List[dict] = []
+    for transaction, candidates in scored:
+        open_candidates = [candidate for candidate in candidates if candidate.invoice_id not in claimed]
+        best = open_candidates[0] if open_candidates else None
+        runner_up = open_candidates[1].score if len(open_candidates) > 1 else 0.0
+        if best and best.score >= threshold and best.score - runner_up >= AMBIGUITY_MARGIN:
+            claimed.add(best.invoice_id)
+            matches.append(
+                {
+                    "row": transaction.row,
+                    "invoice_id": best.invoice_id,
+                    "amount": Decimal(transaction.amount_minor) / 100,
+                    "score": best.score,
+                }
+            )
+            continue
+        review.append(
+            {
+                "row": transaction.row,
+                "posted_on": transaction.posted_on,
+                "amount": Decimal(transaction.amount_minor) / 100,
+                "reference": transaction.reference.strip(),
+                "candidates": [
+                    {"invoice_id": candidate.invoice_id, "score": candidate.score, "reasons": candidate.reasons}
+                    for candidate in (open_candidates or candidates)[:review_limit]
+                ],
+            }
+        )
+    matches.sort(key=lambda match: match["row"])
+    review.sort(key=lambda item: item["row"])
+    return {"matches": matches, "review": review, "unmatched": unmatched}
@@ -0,0 +1,110 @@
+"""Day-before reminder e-mails for players with a confirmed lesson.
+
+One query selects the day's lessons joined to their players' addresses,
+minus the (lesson, player, date) triples already recorded in
+``lesson_reminders``. The messages are rendered from one compiled template
+and sent over a single ``SMTPSession``. Each batch of successful sends is
+recorded and committed before the next starts, so a rerun after a crash
+sends at most one batch twice and a rerun after success sends nothing.
+A refused recipient counts as failed and the run goes on. A failure of the
+connection itself records what was sent and ends the run with
+``SMTPConnectionError``, instead of waiting out the timeout for every
+remaining row.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, exists, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.associations import lesson_players_table
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.enums import LessonStatus
+from app.models.lesson import Lesson
+from app.models.lesson_reminder import LessonReminder
+from app.models.player import Player
+from app.services.email import SMTPConnectionError, SMTPSession, build_message, env
+
+logger = logging.getLogger(__name__)
+
+SUBJECT = "Reminder: your lesson on {date:%A %d %B}"
+
+
+def pending_reminders(db: Session, day: date) -> List:
+    already_sent = exists().where(
+        LessonReminder.lesson_id == Lesson.id,
+        LessonReminder.player_id == Player.id,
+        LessonReminder.lesson_date == Lesson.date,
+    )
+    return db.execute(
+        select(
+            Lesson.id.label("lesson_id"),
+            Lesson.date,
+            Lesson.start_time,
+            Lesson.end_time,
+            Lesson.type,
+            Coach.full_name.label("coach_name"),
+            Club.name.label("club_name"),
+            Player.id.label("player_id"),
+            Player.full_name.label("player_name"),
+            Player.email,
+        )
+        .join(lesson_players_table, lesson_players_table.c.lesson_id == Lesson.id)
+        .join(Player, and_(Player.id == lesson_players_table.c.player_id, Player.active.is_(True)))
+        .join(Coach, Coach.id == Lesson.coach_id)
+        .outerjoin(Club, Club.id == Lesson.club_id)
+        .where(Lesson.date == day, Lesson.status == LessonStatus.set, Player.email.isnot(None), ~already_sent)
+        .order_by(Lesson.start_time, Lesson.id, Player.id)
+    ).all()
+
+
+def send_lesson_reminders(db: Session, day: Optional[date] = None, batch_size: int = 0) -> dict:
+    day = day or date.today() + timedelta(days=1)
+    batch_size = batch_size or settings.reminder_batch_size
+    rows = pending_reminders(db, day)
+    result = {"date": day, "pending": len(rows), "sent": 0, "failed": 0}
+    if not rows:
+        return result
+    if not settings.smtp_host:
+        logger.warning("SMTP not configured. Skipping %s lesson reminders for %s", len(rows), day)
+        return result
+
+    template = env.get_template("email/lesson_reminder.html")
+    with SMTPSession() as session:
+        for start in range(0, len(rows), batch_size):
+            sent = []
+            for row in rows[start : start + batch_size]:
+                body = template.render(
+                    player_name=row.player_name,
+                    coach_name=row.coach_name,
+                    club_name=row.club_name,
+                    lesson_type=row.type.value,
+                    date=row.date,
+                    start_time=row.start_time,
+                    end_time=row.end_time,
+                )
+                try:
+                    session.send(build_message(SUBJECT.format(date=row.date), row.email, body))
+                except SMTPConnectionError:
+                    _record(db, sent, result)
+                    raise
+                except Exception as exc:
+                    logger.error(
+                        "Failed to send reminder for lesson %s to player %s: %s", row.lesson_id, row.player_id, exc
+                    )
+                    result["failed"] += 1
+                    continue
+                sent.append({"lesson_id": row.lesson_id, "player_id": row.player_id, "lesson_date": row.date})
+            _record(db, sent, result)
+    return result
+
+
+def _record(db: Session, sent: List[dict], result: dict) -> None:
+    if sent:
+        db.execute(insert(LessonReminder), sent)
+        db.commit()
+        result["sent"] += len(sent)
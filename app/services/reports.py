@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import extract, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.associations import lesson_players_table
+from app.models.lesson import Lesson
+from app.services import analytics
+from app.utils.cache import TTLCache
+
+report_cache = TTLCache(ttl_seconds=settings.report_cache_ttl_seconds)
+
+
+@dataclass(frozen=True)
+class RetentionMatrix:
+    cohort_months: np.ndarray
+    sizes: np.ndarray
+    active: np.ndarray
+    observable: np.ndarray
+
+    @property
+    def retention(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = self.active / self.sizes[:, None]
+        return np.where(self.observable, ratios, np.nan)
+
+
+def month_index(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def fetch_player_months(
+    db: Session,
+    *,
+    club_id: Optional[int] = None,
+    coach_id: Optional[int] = None,
+    until: Optional[date] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return parallel arrays of (player_id, month index) for every month a player had a lesson."""
+    year = extract("year", Lesson.date)
+    month = extract("month", Lesson.date)
+    stmt = (
+        select(lesson_players_table.c.player_id, year, month)
+        .join(Lesson, Lesson.id == lesson_players_table.c.lesson_id)
+        .distinct()
+    )
+    if club_id:
+        stmt = stmt.where(Lesson.club_id == club_id)
+    if coach_id:
+        stmt = stmt.where(Lesson.coach_id == coach_id)
+    if until:
+        stmt = stmt.where(Lesson.date <= until)
+
+    rows = db.execute(stmt).all()
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    data = np.asarray(rows, dtype=np.int64)
+    return data[:, 0], data[:, 1] * 12 + data[:, 2] - 1
+
+
+def build_retention_matrix(
+    player_ids: np.ndarray,
+    months: np.ndarray,
+    *,
+    first_cohort: int,
+    last_cohort: int,
+    max_offset: int,
+    current_month: int,
+) -> RetentionMatrix:
+    n_cohorts = max(last_cohort - first_cohort + 1, 0)
+    n_offsets = max_offset + 1
+    cohort_months = np.arange(first_cohort, first_cohort + n_cohorts, dtype=np.int64)
+    observable = cohort_months[:, None] + np.arange(n_offsets) <= current_month
+
+    if player_ids.size == 0 or n_cohorts == 0:
+        zeros = np.zeros((n_cohorts, n_offsets), dtype=np.int64)
+        return RetentionMatrix(cohort_months, zeros[:, 0], zeros, observable)
+
+    _, player_idx = np.unique(player_ids, return_inverse=True)
+    first_month = np.full(player_idx.max() + 1, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first_month, player_idx, months)
+
+    cohort_of_row = first_month[player_idx]
+    offsets = months - cohort_of_row
+    cohort_pos = cohort_of_row - first_cohort
+    mask = (cohort_pos >= 0) & (cohort_pos < n_cohorts) & (offsets <= max_offset)
+
+    flat = cohort_pos[mask] * n_offsets + offsets[mask]
+    active = np.bincount(flat, minlength=n_cohorts * n_offsets).reshape(n_cohorts, n_offsets)
+    return RetentionMatrix(cohort_months, active[:, 0].copy(), active, observable)
+
+
+def retention_report(
+    db: Session,
+    *,
+    date_from: date,
+    date_to: date,
+    club_id: Optional[int] = None,
+    coach_id: Optional[int] = None,
+    max_offset: int = 12,
+    today: Optional[date] = None,
+) -> RetentionMatrix:
+    today = today or date.today()
+    use_mirror = settings.analytics_serve_reports and analytics.is_enabled()
+    key = ("retention", use_mirror, date_from, date_to, club_id, coach_id, max_offset, month_index(today))
+
+    def _compute() -> RetentionMatrix:
+        if use_mirror:
+            player_ids, months = analytics.fetch_player_months(club_id=club_id, coach_id=coach_id, until=today)
+        else:
+            player_ids, months = fetch_player_months(db, club_id=club_id, coach_id=coach_id, until=today)
+        return build_retention_matrix(
+            player_ids,
+            months,
+            first_cohort=month_index(date_from),
+            last_cohort=month_index(date_to),
+            max_offset=max_offset,
+            current_month=month_index(today),
+        )
+
+    return report_cache.get_or_set(key, _compute)
+
+
+def retention_rows(matrix: RetentionMatrix) -> List[dict]:
+    retention = matrix.retention
+    rows = []
+    for position, cohort in enumerate(matrix.cohort_months.tolist()):
+        observable = matrix.observable[position]
+        rows.append(
+            {
+                "cohort": month_label(cohort),
+                "size": int(matrix.sizes[position]),
+                "active": [
+                    int(count) if seen else None
+                    for count, seen in zip(matrix.active[position].tolist(), observable.tolist())
+                ],
+                "retention": [
+                    None if not seen or np.isnan(ratio) else round(float(ratio), 4)
+                    for ratio, seen in zip(retention[position].tolist(), observable.tolist())
+                ],
+            }
+        )
+    return rows
@@ -0,0 +1,300 @@
+"""Recurring lesson series: rolling-horizon expansion and set-based edits.
+
+Expansion materializes every occurrence between a series' ``expanded_until``
+watermark and the horizon with the shared bulk insert; occurrences that would
+double-book the coach or a court are skipped, reported and retried by the
+next expansion. Editing a series rewrites its future, still editable
+occurrences with ``UPDATE`` and ``INSERT ... SELECT`` statements instead of
+touching lessons one by one, and is refused when the new times or courts
+clash with another lesson.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from dateutil.rrule import rrulestr
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.associations import (
+    lesson_courts_table,
+    lesson_players_table,
+    lesson_strokes_table,
+    series_courts_table,
+    series_players_table,
+    series_strokes_table,
+)
+from app.models.enums import LessonPaymentStatus, LessonStatus
+from app.models.lesson import Lesson
+from app.models.lesson_series import LessonSeries
+from app.services.conflicts import Slot, find_conflicts, lesson_slot
+from app.services.domain_events import LessonCreated, LessonDeleted, LessonUpdated, bus
+from app.services.lessons import PreparedLesson, insert_lessons
+from app.services.sync import record_deletions
+
+# Occurrences in these states still follow their series; executed or invoiced
+# lessons are history and are never rewritten.
+EDITABLE_STATUSES = (LessonStatus.draft, LessonStatus.set)
+
+# (series association table, lesson association table, related id column)
+TEMPLATE_TABLES = {
+    "players": (series_players_table, lesson_players_table, "player_id"),
+    "strokes": (series_strokes_table, lesson_strokes_table, "stroke_id"),
+    "courts": (series_courts_table, lesson_courts_table, "court_id"),
+}
+SCHEDULE_FIELDS = {"rrule", "starts_on", "ends_on"}
+# Edits that move occurrences in time or onto other courts.
+BOOKING_FIELDS = {"start_time", "end_time", "courts"}
+PROPAGATED_FIELDS = {
+    "start_time",
+    "end_time",
+    "duration_minutes",
+    "total_amount",
+    "type",
+    "club_id",
+    "club_reimbursement_amount",
+    "notes",
+}
+
+SERIES_COLUMNS = [
+    LessonSeries.id,
+    LessonSeries.coach_id,
+    LessonSeries.club_id,
+    LessonSeries.rrule,
+    LessonSeries.starts_on,
+    LessonSeries.ends_on,
+    LessonSeries.start_time,
+    LessonSeries.end_time,
+    LessonSeries.duration_minutes,
+    LessonSeries.total_amount,
+    LessonSeries.type,
+    LessonSeries.status,
+    LessonSeries.club_reimbursement_amount,
+    LessonSeries.notes,
+    LessonSeries.expanded_until,
+]
+
+
+class SeriesConflictError(ValueError):
+    """Raised when a series edit would double-book the coach or a court."""
+
+
+def occurrence_dates(rule: str, starts_on: date, window_start: date, window_end: date) -> List[date]:
+    """Dates produced by ``rule`` (anchored at ``starts_on``) within the inclusive window."""
+    if window_start > window_end:
+        return []
+    recurrence = rrulestr(rule, dtstart=datetime.combine(starts_on, time.min))
+    return [
+        moment.date()
+        for moment in recurrence.between(
+            datetime.combine(window_start, time.min), datetime.combine(window_end, time.min), inc=True
+        )
+    ]
+
+
+def _templates(db: Session, series_ids: List[int]) -> Dict[int, Dict[str, List[int]]]:
+    templates: Dict[int, Dict[str, List[int]]] = defaultdict(lambda: {name: [] for name in TEMPLATE_TABLES})
+    if not series_ids:
+        return templates
+    for name, (series_table, _, column) in TEMPLATE_TABLES.items():
+        rows = db.execute(
+            select(series_table.c.series_id, series_table.c[column])
+            .where(series_table.c.series_id.in_(series_ids))
+            .order_by(series_table.c.series_id, series_table.c[column])
+        )
+        for series_id, related_id in rows:
+            templates[series_id][name].append(related_id)
+    return templates
+
+
+def expand_series(
+    db: Session,
+    *,
+    today: Optional[date] = None,
+    horizon_days: int = 0,
+    series_ids: Optional[Iterable[int]] = None,
+    batch_size: int = 0,
+) -> Dict[str, Any]:
+    """Materialize occurrences of active series up to ``today + horizon_days`` and commit.
+
+    All new occurrences are checked for double bookings in one pass; the ones
+    that clash are not created and come back under ``conflicts``, and are
+    tried again by the next expansion.
+    """
+    today = today or date.today()
+    horizon = today + timedelta(days=horizon_days or settings.series_horizon_days)
+    stmt = select(*SERIES_COLUMNS).where(
+        LessonSeries.active.is_(True),
+        or_(LessonSeries.expanded_until.is_(None), LessonSeries.expanded_until < horizon),
+    )
+    if series_ids is not None:
+        stmt = stmt.where(LessonSeries.id.in_(list(series_ids)))
+    rows = db.execute(stmt).all()
+    if not rows:
+        return {"series": 0, "lessons": 0, "conflicts": []}
+
+    ids = [row.id for row in rows]
+    templates = _templates(db, ids)
+    existing: Set[tuple] = set(
+        db.execute(
+            select(Lesson.series_id, Lesson.date).where(Lesson.series_id.in_(ids), Lesson.date >= today)
+        ).all()
+    )
+
+    prepared: List[PreparedLesson] = []
+    for row in rows:
+        # A lapsed watermark resumes at today; past dates are never backfilled.
+        window_start = max(row.starts_on, today)
+        if row.expanded_until is not None:
+            window_start = max(window_start, row.expanded_until + timedelta(days=1))
+        window_end = min(horizon, row.ends_on) if row.ends_on else horizon
+        template = templates[row.id]
+        for day in occurrence_dates(row.rrule, row.starts_on, window_start, window_end):
+            if (row.id, day) in existing:
+                continue
+            values = {
+                "series_id": row.id,
+                "coach_id": row.coach_id,
+                "club_id": row.club_id,
+                "date": day,
+                "start_time": row.start_time,
+                "end_time": row.end_time,
+                "duration_minutes": row.duration_minutes,
+                "total_amount": row.total_amount,
+                "type": row.type,
+                "status": row.status,
+                "payment_status": LessonPaymentStatus.open,
+                "club_reimbursement_amount": row.club_reimbursement_amount,
+                "notes": row.notes,
+            }
+            prepared.append(PreparedLesson(values, template["players"], template["strokes"], template["courts"]))
+
+    slots = [
+        lesson_slot(lesson.values, lesson.court_ids, label=f"series {lesson.values['series_id']}")
+        for lesson in prepared
+    ]
+    conflicts = []
+    free: List[PreparedLesson] = []
+    # The watermark of a series stops before its first skipped date, so later
+    # runs retry (and report) that date until the clash is gone.
+    watermarks = {series_id: horizon for series_id in ids}
+    for lesson, messages in zip(prepared, find_conflicts(db, slots)):
+        if messages:
+            series_id, day = lesson.values["series_id"], lesson.values["date"]
+            conflicts.append({"series_id": series_id, "date": day, "errors": messages})
+            watermarks[series_id] = min(watermarks[series_id], day - timedelta(days=1))
+        else:
+            free.append(lesson)
+
+    lesson_ids = insert_lessons(db, free, batch_size)
+    db.execute(
+        update(LessonSeries),
+        [{"id": series_id, "expanded_until": watermark} for series_id, watermark in watermarks.items()],
+    )
+    bus.record(db, *LessonCreated.for_ids(db, lesson_ids))
+    db.commit()
+    return {"series": len(rows), "lessons": len(free), "conflicts": conflicts}
+
+
+def _future_occurrences(series_id: int, today: date):
+    return select(Lesson.id).where(
+        Lesson.series_id == series_id,
+        Lesson.date >= today,
+        Lesson.status.in_(EDITABLE_STATUSES),
+    )
+
+
+def _delete_lessons(db: Session, occurrences) -> None:
+    lesson_ids = db.scalars(occurrences).all()
+    if not lesson_ids:
+        return
+    bus.record(db, *LessonDeleted.for_ids(db, lesson_ids))
+    # Association rows are removed explicitly so backends without enforced
+    # ON DELETE CASCADE (SQLite) do not keep orphans.
+    for _, lesson_table, _ in TEMPLATE_TABLES.values():
+        db.execute(delete(lesson_table).where(lesson_table.c.lesson_id.in_(lesson_ids)))
+    record_deletions(db, Lesson, [Lesson.id.in_(lesson_ids)])
+    db.execute(delete(Lesson).where(Lesson.id.in_(lesson_ids)).execution_options(synchronize_session=False))
+
+
+def _ensure_free(db: Session, series: LessonSeries, future, changed: Set[str]) -> None:
+    """Raise ``SeriesConflictError`` if the edited occurrences would clash with other lessons."""
+    rows = db.execute(select(Lesson.id, Lesson.date).where(Lesson.id.in_(future)).order_by(Lesson.date)).all()
+    court_ids: Dict[int, List[int]] = defaultdict(list)
+    if "courts" in changed:
+        for row in rows:
+            court_ids[row.id] = [court.id for court in series.courts]
+    elif rows:
+        links = select(lesson_courts_table.c.lesson_id, lesson_courts_table.c.court_id).where(
+            lesson_courts_table.c.lesson_id.in_([row.id for row in rows])
+        )
+        for lesson_id, court_id in db.execute(links):
+            court_ids[lesson_id].append(court_id)
+
+    slots = [
+        Slot(row.date, series.start_time, series.end_time, series.coach_id, court_ids[row.id], lesson_id=row.id)
+        for row in rows
+    ]
+    clashes = [
+        f"{slot.date}: {'; '.join(messages)}" for slot, messages in zip(slots, find_conflicts(db, slots)) if messages
+    ]
+    if clashes:
+        raise SeriesConflictError("; ".join(clashes))
+
+
+def propagate_changes(db: Session, series: LessonSeries, changed: Set[str], today: Optional[date] = None) -> None:
+    """Apply a flushed series edit to its future editable occurrences; the caller commits.
+
+    Schedule changes drop those occurrences and reset the watermark so the next
+    expansion regenerates them; other changes are rewritten in place after
+    checking the new times and courts for double bookings.
+    """
+    today = today or date.today()
+    future = _future_occurrences(series.id, today)
+
+    if changed & SCHEDULE_FIELDS or "active" in changed:
+        _delete_lessons(db, future)
+        series.expanded_until = None
+        return
+
+    if changed & BOOKING_FIELDS:
+        _ensure_free(db, series, future, changed)
+    values = {name: getattr(series, name) for name in changed & PROPAGATED_FIELDS}
+    template_changes = [name for name in TEMPLATE_TABLES if name in changed]
+    if values or template_changes:
+        values["updated_at"] = func.now()
+        lesson_ids = db.scalars(
+            update(Lesson)
+            .where(Lesson.id.in_(future))
+            .values(**values)
+            .returning(Lesson.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        bus.record(db, *LessonUpdated.for_ids(db, lesson_ids))
+    for name in template_changes:
+        series_table, lesson_table, column = TEMPLATE_TABLES[name]
+        db.execute(delete(lesson_table).where(lesson_table.c.lesson_id.in_(future)))
+        db.execute(
+            insert(lesson_table).from_select(
+                ["lesson_id", column],
+                select(Lesson.id, series_table.c[column])
+                .join(series_table, series_table.c.series_id == Lesson.series_id)
+                .where(Lesson.id.in_(future)),
+            )
+        )
+
+
+def detach_series(db: Session, series: LessonSeries, today: Optional[date] = None) -> None:
+    """Drop future editable occurrences and unlink past ones before the series is deleted."""
+    today = today or date.today()
+    _delete_lessons(db, _future_occurrences(series.id, today))
+    lesson_ids = db.scalars(
+        update(Lesson)
+        .where(Lesson.series_id == series.id)
+        .values(series_id=None, updated_at=func.now())
+        .returning(Lesson.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    bus.record(db, *LessonUpdated.for_ids(db, lesson_ids))
@@ -0,0 +1,186 @@
+"""Delta sync: every change since a client's token, in one ordered sequence.
+
+Upserts of every synced table and the tombstones left by hard deletes are
+merged into one sequence ordered by ``(changed_at, kind, id)``, where
+``changed_at`` is ``updated_at`` (``deleted_at`` for tombstones). A sync
+token encodes the last position a client received. Each branch of the
+union is a range scan with a limit on its ``(updated_at, id)`` index, so a
+page costs about the same whether the client was offline for a minute or
+for months.
+
+Rows are only returned once they are ``SYNC_SETTLE_SECONDS`` old. A
+transaction stamps ``updated_at`` when it starts, but its rows only become
+visible when it commits; the delay keeps those rows from landing behind a
+token that a client already holds. The delay alone only covers transactions
+shorter than it, so on PostgreSQL the cut-off also stays before the start of
+the oldest transaction still open in the database (``pg_stat_activity``):
+a long import, series expansion or repricing holds sync back until it
+commits instead of being skipped. Other backends rely on the delay only.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, insert, literal, null, or_, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.associations import coach_club_table, player_coach_table
+from app.models.club import Club
+from app.models.court import Court
+from app.models.invoice import Invoice
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.stroke import Stroke
+from app.models.tombstone import SYNCED_TABLES, Tombstone
+
+# Position in this tuple is the ``kind`` part of the sequence, so parents sort before children within a timestamp.
+MODELS = (Club, Court, Stroke, Player, Lesson, Invoice)
+TOMBSTONE_KIND = len(MODELS)
+assert tuple(model.__tablename__ for model in MODELS) == SYNCED_TABLES
+
+Position = Tuple[datetime, int, int]
+
+OLDEST_OPEN_TRANSACTION = text(
+    "SELECT min(xact_start) FROM pg_stat_activity"
+    " WHERE datname = current_database() AND xact_start IS NOT NULL AND pid <> pg_backend_pid()"
+)
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def encode_token(position: Position) -> str:
+    changed_at, kind, row_id = position
+    raw = json.dumps([changed_at.isoformat(), kind, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: str) -> Position:
+    try:
+        changed_at, kind, row_id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return datetime.fromisoformat(changed_at), int(kind), int(row_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidSyncToken("Invalid sync token") from exc
+
+
+def _scope_clauses(model, coach_id: Optional[int]) -> List:
+    if coach_id is None:
+        return []
+    clubs = select(coach_club_table.c.club_id).where(coach_club_table.c.coach_id == coach_id)
+    if model is Club:
+        return [Club.id.in_(clubs)]
+    if model is Court:
+        return [Court.club_id.in_(clubs)]
+    if model is Player:
+        return [Player.id.in_(select(player_coach_table.c.player_id).where(player_coach_table.c.coach_id == coach_id))]
+    if model in (Lesson, Invoice):
+        return [model.coach_id == coach_id]
+    return []
+
+
+def _after(changed_at, row_id, kind: int, since: Optional[Position]) -> List:
+    """Sequence predicate ``(changed_at, kind, id) > since`` with the branch's constant ``kind`` folded in."""
+    if since is None:
+        return []
+    at, since_kind, since_id = since
+    if kind > since_kind:
+        return [changed_at >= at]
+    if kind < since_kind:
+        return [changed_at > at]
+    return [or_(changed_at > at, and_(changed_at == at, row_id > since_id))]
+
+
+def _branch(kind: int, row_id, changed_at, clauses: List, since: Optional[Position], until: datetime, limit: int):
+    ranged = (
+        select(literal(kind).label("kind"), row_id.label("id"), changed_at.label("changed_at"))
+        .where(*clauses, *_after(changed_at, row_id, kind, since), changed_at <= until)
+        .order_by(changed_at, row_id)
+        .limit(limit)
+        .subquery()
+    )
+    return select(ranged.c.kind, ranged.c.id, ranged.c.changed_at)
+
+
+def _oldest_open_transaction(db: Session) -> Optional[datetime]:
+    """Start of the oldest other transaction still open, where the backend exposes it."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return db.scalar(OLDEST_OPEN_TRANSACTION)
+
+
+def _settled_until(db: Session) -> datetime:
+    """The newest ``changed_at`` that no open transaction can still write behind."""
+    until = db.scalar(select(func.now())) - timedelta(seconds=settings.sync_settle_seconds)
+    oldest = _oldest_open_transaction(db)
+    if oldest is not None:
+        until = min(until, oldest - timedelta(microseconds=1))
+    return until
+
+
+def change_page(db: Session, since: Optional[Position], *, coach_id: Optional[int] = None, limit: int = 500):
+    """The next ``limit`` positions after ``since`` plus whether more follow."""
+    until = _settled_until(db)
+    branches = [
+        _branch(kind, model.id, model.updated_at, _scope_clauses(model, coach_id), since, until, limit + 1)
+        for kind, model in enumerate(MODELS)
+    ]
+    tombstone_scope = []
+    if coach_id is not None:
+        clubs = select(coach_club_table.c.club_id).where(coach_club_table.c.coach_id == coach_id)
+        tombstone_scope = [
+            or_(Tombstone.coach_id == coach_id, Tombstone.club_id.in_(clubs), Tombstone.entity == Stroke.__tablename__)
+        ]
+    branches.append(_branch(TOMBSTONE_KIND, Tombstone.id, Tombstone.deleted_at, tombstone_scope, since, until, limit + 1))
+    merged = union_all(*branches).subquery()
+    rows = db.execute(
+        select(merged.c.kind, merged.c.id, merged.c.changed_at)
+        .order_by(merged.c.changed_at, merged.c.kind, merged.c.id)
+        .limit(limit + 1)
+    ).all()
+    return rows[:limit], len(rows) > limit
+
+
+def changes(db: Session, token: Optional[str], *, coach_id: Optional[int] = None, limit: int = 500) -> dict:
+    since = decode_token(token) if token else None
+    rows, has_more = change_page(db, since, coach_id=coach_id, limit=limit)
+    ids: Dict[int, List[int]] = {}
+    for row in rows:
+        ids.setdefault(row.kind, []).append(row.id)
+
+    result: dict = {table: [] for table in SYNCED_TABLES}
+    for kind, model in enumerate(MODELS):
+        if kind in ids:
+            result[model.__tablename__] = db.query(model).filter(model.id.in_(ids[kind])).order_by(model.id).all()
+    result["deleted"] = []
+    if TOMBSTONE_KIND in ids:
+        result["deleted"] = [
+            {"entity": tombstone.entity, "id": tombstone.entity_id, "deleted_at": tombstone.deleted_at}
+            for tombstone in db.query(Tombstone).filter(Tombstone.id.in_(ids[TOMBSTONE_KIND])).order_by(Tombstone.id)
+        ]
+    last = rows[-1] if rows else None
+    result["next_token"] = encode_token((last.changed_at, last.kind, last.id)) if last else token
+    result["has_more"] = has_more
+    return result
+
+
+def record_deletions(db: Session, model, clauses: List) -> None:
+    """Tombstones for rows about to be removed by a bulk ``DELETE``; ORM deletes are recorded automatically.
+
+    Players get one tombstone per linked coach, so call this before their ``player_coach`` rows go.
+    """
+    entity = literal(model.__tablename__)
+    if model is Player:
+        rows = (
+            select(entity, Player.id, player_coach_table.c.coach_id, null())
+            .outerjoin(player_coach_table, player_coach_table.c.player_id == Player.id)
+            .where(*clauses)
+        )
+    else:
+        coach_id = model.coach_id if hasattr(model, "coach_id") else null()
+        club_id = {Club: Club.id, Court: Court.club_id}.get(model, null())
+        rows = select(entity, model.id, coach_id, club_id).where(*clauses)
+    db.execute(insert(Tombstone).from_select(["entity", "entity_id", "coach_id", "club_id"], rows))
@@ -0,0 +1,338 @@
+"""Apply a batch of offline mutations keyed by client-generated ids.
+
+Clients create courts, players and lessons offline with a UUID ``client_id``
+and replay them with ``PUT /sync/upsert``; replaying the same mutation twice
+changes nothing. Each table is written with one
+``INSERT ... ON CONFLICT (client_id) DO UPDATE`` (``(coach_id, client_id)``
+for lessons) whose ``WHERE`` keeps the stored row when its ``edited_at`` is
+newer than the mutation's ``updated_at``: last writer wins by the time of
+the edit, not by the time it reached the server. Device clocks ahead of the
+server are clamped to the server's now.
+
+Lessons may point at players and courts from the same batch through
+``player_client_ids`` / ``court_client_ids``. They are validated like the
+lesson batch endpoint, including the double-booking check. Invalid items are
+reported and left out; everything else is written in the caller's
+transaction.
+"""
+
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.associations import (
+    coach_club_table,
+    lesson_courts_table,
+    lesson_players_table,
+    lesson_strokes_table,
+    player_coach_table,
+)
+from app.models.club import Club
+from app.models.court import Court
+from app.models.enums import LessonStatus
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.schemas.lesson import LessonBatchCreate, LessonCreate
+from app.schemas.sync import SyncCourtUpsert, SyncLessonUpsert, SyncPlayerUpsert, SyncUpsertRequest
+from app.services.conflicts import find_conflicts, lesson_slot
+from app.services.lesson_batch import _load_references, _plan_create
+from app.services.lessons import PreparedLesson
+
+
+def _upsert(db: Session):
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _latest(items: Sequence) -> List:
+    """One mutation per ``client_id``: the most recent edit."""
+    latest: Dict[UUID, object] = {}
+    for item in items:
+        if item.client_id not in latest or item.updated_at >= latest[item.client_id].updated_at:
+            latest[item.client_id] = item
+    return list(latest.values())
+
+
+class _Outcome:
+    def __init__(self) -> None:
+        self.ids: Dict[str, Dict[UUID, int]] = {"courts": {}, "players": {}, "lessons": {}}
+        self.stale: List[UUID] = []
+        self.errors: Dict[UUID, List[str]] = {}
+        self.created_lessons: List[int] = []
+        self.updated_lessons: List[int] = []
+        self.court_club_ids: Set[int] = set()
+
+    def fail(self, client_id: UUID, *errors: str) -> None:
+        self.errors.setdefault(client_id, []).extend(errors)
+
+    def as_result(self) -> dict:
+        return {
+            **self.ids,
+            "stale": self.stale,
+            "errors": [{"client_id": client_id, "errors": errors} for client_id, errors in self.errors.items()],
+        }
+
+
+def _write(db: Session, model, conflict_on: List[str], rows: List[dict], guard) -> Dict[UUID, int]:
+    """One ``INSERT ... ON CONFLICT DO UPDATE``; returns ``client_id -> id`` for the rows it wrote."""
+    if not rows:
+        return {}
+    stmt = _upsert(db)(model).values(rows)
+    keep = set(conflict_on) | {"created_at"}
+    changes = {name: stmt.excluded[name] for name in rows[0] if name not in keep}
+    changes["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(
+        index_elements=conflict_on,
+        set_=changes,
+        where=and_(model.edited_at <= stmt.excluded.edited_at, *guard(stmt.excluded)),
+    ).returning(model.id, model.client_id)
+    return {client_id: row_id for row_id, client_id in db.execute(stmt)}
+
+
+def _mark_stale(db: Session, model, outcome: _Outcome, key: str, client_ids: Set[UUID], clauses: List) -> None:
+    """Record the stored id of mutations that lost to a newer edit."""
+    lost = client_ids - set(outcome.ids[key])
+    if not lost:
+        return
+    rows = db.execute(select(model.id, model.client_id).where(model.client_id.in_(lost), *clauses))
+    for row_id, client_id in rows:
+        outcome.ids[key][client_id] = row_id
+        outcome.stale.append(client_id)
+
+
+def _upsert_courts(
+    db: Session, items: List[SyncCourtUpsert], coach_id: Optional[int], now: datetime, outcome: _Outcome
+) -> None:
+    club_ids = {item.club_id for item in items}
+    known_clubs = set(db.scalars(select(Club.id).where(Club.id.in_(club_ids)))) if club_ids else set()
+    if coach_id is not None and club_ids:
+        known_clubs &= set(
+            db.scalars(
+                select(coach_club_table.c.club_id).where(
+                    coach_club_table.c.coach_id == coach_id, coach_club_table.c.club_id.in_(club_ids)
+                )
+            )
+        )
+    stored = {
+        (club_id, name.lower()): client_id
+        for club_id, name, client_id in db.execute(
+            select(Court.club_id, Court.name, Court.client_id).where(Court.club_id.in_(known_clubs))
+        )
+    }
+    client_ids = {item.client_id for item in items}
+    owners = dict(db.execute(select(Court.client_id, Court.club_id).where(Court.client_id.in_(client_ids))).all())
+
+    rows = []
+    for item in items:
+        if item.club_id not in known_clubs:
+            outcome.fail(item.client_id, f"Club not found or not allowed: {item.club_id}")
+        elif owners.get(item.client_id, item.club_id) != item.club_id:
+            outcome.fail(item.client_id, "Court belongs to another club")
+        elif stored.get((item.club_id, item.name.lower()), item.client_id) != item.client_id:
+            outcome.fail(item.client_id, "Court with this name already exists for the club")
+        else:
+            rows.append(
+                {
+                    "client_id": item.client_id,
+                    "club_id": item.club_id,
+                    "name": item.name,
+                    "active": item.active,
+                    "edited_at": min(_utc(item.updated_at), now),
+                }
+            )
+    outcome.ids["courts"].update(
+        _write(db, Court, ["client_id"], rows, lambda excluded: [Court.club_id == excluded.club_id])
+    )
+    _mark_stale(db, Court, outcome, "courts", {row["client_id"] for row in rows}, [])
+    outcome.court_club_ids.update(row["club_id"] for row in rows)
+
+
+def _upsert_players(
+    db: Session, items: List[SyncPlayerUpsert], coach_id: Optional[int], now: datetime, outcome: _Outcome
+) -> None:
+    client_ids = {item.client_id for item in items}
+    existing = dict(db.execute(select(Player.client_id, Player.id).where(Player.client_id.in_(client_ids))).all())
+    linked: Set[int] = set()
+    if coach_id is not None and existing:
+        linked = set(
+            db.scalars(
+                select(player_coach_table.c.player_id).where(
+                    player_coach_table.c.coach_id == coach_id,
+                    player_coach_table.c.player_id.in_(existing.values()),
+                )
+            )
+        )
+    emails = {item.email.lower() for item in items if item.email}
+    email_owners = {}
+    if emails:
+        email_owners = dict(
+            db.execute(
+                select(func.lower(Player.email), Player.client_id).where(func.lower(Player.email).in_(emails))
+            ).all()
+        )
+
+    rows = []
+    for item in items:
+        if coach_id is not None and item.client_id in existing and existing[item.client_id] not in linked:
+            outcome.fail(item.client_id, "Forbidden")
+        elif item.email and email_owners.get(item.email.lower(), item.client_id) != item.client_id:
+            outcome.fail(item.client_id, f"Email already used by another player: {item.email}")
+        else:
+            rows.append(
+                {
+                    "client_id": item.client_id,
+                    **item.dict(exclude={"client_id", "updated_at"}),
+                    "edited_at": min(_utc(item.updated_at), now),
+                }
+            )
+    written = _write(db, Player, ["client_id"], rows, lambda excluded: [])
+    outcome.ids["players"].update(written)
+    _mark_stale(db, Player, outcome, "players", {row["client_id"] for row in rows}, [])
+    created = [player_id for client_id, player_id in written.items() if client_id not in existing]
+    if coach_id is not None and created:
+        db.execute(
+            insert(player_coach_table), [{"coach_id": coach_id, "player_id": player_id} for player_id in created]
+        )
+
+
+def _resolve_client_ids(
+    db: Session, model, key: str, client_ids: Set[UUID], outcome: _Outcome
+) -> Dict[UUID, int]:
+    known = dict(outcome.ids[key])
+    missing = client_ids - set(known) - set(outcome.errors)
+    if missing:
+        known.update(db.execute(select(model.client_id, model.id).where(model.client_id.in_(missing))).all())
+    return known
+
+
+def _plan_lessons(
+    db: Session, items: List[SyncLessonUpsert], coach_id: Optional[int], now: datetime, outcome: _Outcome
+) -> List[Tuple[SyncLessonUpsert, PreparedLesson]]:
+    player_refs = {client_id for item in items for client_id in item.player_client_ids}
+    court_refs = {client_id for item in items for client_id in item.court_client_ids}
+    players = _resolve_client_ids(db, Player, "players", player_refs, outcome)
+    courts = _resolve_client_ids(db, Court, "courts", court_refs, outcome)
+
+    payloads: List[Tuple[SyncLessonUpsert, LessonCreate]] = []
+    for item in items:
+        errors = [f"Player not found: {cid}" for cid in item.player_client_ids if cid not in players]
+        errors += [f"Court not found: {cid}" for cid in item.court_client_ids if cid not in courts]
+        owner = coach_id if coach_id is not None else item.coach_id
+        if owner is None:
+            errors.append("coach_id is required")
+        if errors:
+            outcome.fail(item.client_id, *errors)
+            continue
+        fields = item.dict(exclude={"updated_at", "player_client_ids", "court_client_ids"})
+        fields.update(
+            coach_id=owner,
+            player_ids=[*item.player_ids, *(players[cid] for cid in item.player_client_ids)],
+            court_ids=[*item.court_ids, *(courts[cid] for cid in item.court_client_ids)],
+        )
+        payloads.append((item, LessonCreate(**fields)))
+
+    batch = [LessonBatchCreate(op="create", lesson=payload) for _, payload in payloads]
+    refs = _load_references(db, batch, {}, coach_id)
+    planned = []
+    for item, payload in payloads:
+        prepared, errors = _plan_create(refs, payload, coach_id)
+        if errors:
+            outcome.fail(item.client_id, *errors)
+        else:
+            prepared.values["edited_at"] = min(_utc(item.updated_at), now)
+            planned.append((item, prepared))
+    return planned
+
+
+def _upsert_lessons(
+    db: Session, items: List[SyncLessonUpsert], coach_id: Optional[int], now: datetime, outcome: _Outcome
+) -> None:
+    planned = _plan_lessons(db, items, coach_id, now, outcome)
+    keys = {(prepared.values["coach_id"], item.client_id) for item, prepared in planned}
+    stored = {}
+    if keys:
+        stored = {
+            (row.coach_id, row.client_id): row
+            for row in db.execute(
+                select(Lesson.id, Lesson.coach_id, Lesson.client_id, Lesson.edited_at, Lesson.status).where(
+                    Lesson.client_id.in_({client_id for _, client_id in keys})
+                )
+            )
+            if (row.coach_id, row.client_id) in keys
+        }
+
+    fresh = []
+    for item, prepared in planned:
+        row = stored.get((prepared.values["coach_id"], item.client_id))
+        newer = row is not None and _utc(row.edited_at) > prepared.values["edited_at"]
+        if newer or (row is not None and row.status == LessonStatus.invoiced):
+            outcome.ids["lessons"][item.client_id] = row.id
+            outcome.stale.append(item.client_id)
+        else:
+            fresh.append((item, prepared, row.id if row is not None else None))
+
+    slots = [
+        replace(lesson_slot(prepared.values, prepared.court_ids, str(item.client_id)), lesson_id=lesson_id)
+        for item, prepared, lesson_id in fresh
+    ]
+    writable = []
+    for (item, prepared, lesson_id), conflicts in zip(fresh, find_conflicts(db, slots)):
+        if conflicts:
+            outcome.fail(item.client_id, *conflicts)
+        else:
+            writable.append((item, prepared, lesson_id))
+
+    written = _write(
+        db,
+        Lesson,
+        ["coach_id", "client_id"],
+        [prepared.values for _, prepared, _ in writable],
+        lambda excluded: [Lesson.status != LessonStatus.invoiced],
+    )
+    outcome.ids["lessons"].update(written)
+    owners = [Lesson.coach_id.in_({owner for owner, _ in keys})]
+    _mark_stale(db, Lesson, outcome, "lessons", {item.client_id for item, _, _ in writable}, owners)
+
+    applied = [
+        (written[item.client_id], prepared, lesson_id)
+        for item, prepared, lesson_id in writable
+        if item.client_id in written
+    ]
+    if not applied:
+        return
+    lesson_ids = [row_id for row_id, _, _ in applied]
+    for table, column, attribute in (
+        (lesson_players_table, "player_id", "player_ids"),
+        (lesson_strokes_table, "stroke_id", "stroke_ids"),
+        (lesson_courts_table, "court_id", "court_ids"),
+    ):
+        db.execute(delete(table).where(table.c.lesson_id.in_(lesson_ids)))
+        rows = [
+            {"lesson_id": row_id, column: related_id}
+            for row_id, prepared, _ in applied
+            for related_id in getattr(prepared, attribute)
+        ]
+        if rows:
+            db.execute(insert(table), rows)
+    for row_id, _, lesson_id in applied:
+        (outcome.updated_lessons if lesson_id else outcome.created_lessons).append(row_id)
+
+
+def upsert(db: Session, payload: SyncUpsertRequest, *, coach_id: Optional[int] = None) -> _Outcome:
+    """Write ``payload`` in the caller's transaction; ``coach_id`` scopes it to that coach (coach users)."""
+    now = _utc(db.scalar(select(func.now())))
+    outcome = _Outcome()
+    _upsert_courts(db, _latest(payload.courts), coach_id, now, outcome)
+    _upsert_players(db, _latest(payload.players), coach_id, now, outcome)
+    _upsert_lessons(db, _latest(payload.lessons), coach_id, now, outcome)
+    return outcome
@@ -0,0 +1,43 @@
+import re
+import unicodedata
+from typing import Optional
+
+IBAN_PATTERN = re.compile(r"^[A-Z]{2}\d{2}[A-Z0-9]{11,30}$")
+BIC_PATTERN = re.compile(r"^[A-Z]{4}[A-Z]{2}[A-Z0-9]{2}(?:[A-Z0-9]{3})?$")
+
+
+def _compact(value: Optional[str]) -> str:
+    return re.sub(r"[\s\-]", "", value or "").upper()
+
+
+def normalize_iban(value: Optional[str]) -> Optional[str]:
+    """Upper-cased IBAN without separators, or ``None`` when it fails the format or mod-97 check."""
+    iban = _compact(value)
+    if not IBAN_PATTERN.match(iban):
+        return None
+    rearranged = iban[4:] + iban[:4]
+    digits = "".join(str(int(char, 36)) for char in rearranged)
+    return iban if int(digits) % 97 == 1 else None
+
+
+def normalize_bic(value: Optional[str]) -> Optional[str]:
+    bic = _compact(value)
+    return bic if BIC_PATTERN.match(bic) else None
+
+
+def normalize_sort_code(value: Optional[str]) -> Optional[str]:
+    digits = _compact(value)
+    return digits if len(digits) == 6 and digits.isdigit() else None
+
+
+def normalize_account_number(value: Optional[str]) -> Optional[str]:
+    """UK account number padded to eight digits (seven-digit accounts take a leading zero)."""
+    digits = _compact(value)
+    return digits.zfill(8) if digits.isdigit() and len(digits) in (7, 8) else None
+
+
+def restrict_charset(value: Optional[str], allowed: str, length: int) -> str:
+    """Transliterate to ASCII and replace characters outside ``allowed`` with spaces."""
+    ascii_text = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode()
+    cleaned = "".join(char if char in allowed else " " for char in ascii_text)
+    return " ".join(cleaned.split())[:length]
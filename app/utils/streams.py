@@ -0,0 +1,35 @@
+import io
+
+
+class StreamBuffer(io.RawIOBase):
+    """Write-only file object whose contents are drained in pieces by a streaming response.
+
+    Writers that only append (ParquetWriter, ZipFile on an unseekable file,
+    XMLGenerator) can target it while the caller yields ``drain()`` after each
+    unit of work, so at most one unit of output is held in memory.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
@@ -46,6 +46,7 @@ def configure_settings(tmp_path_factory: pytest.TempPathFactory):
     tmp = tmp_path_factory.mktemp("storage")
     settings.file_storage_dir = str(tmp)
     settings.allowed_origins = ["http://testserver"]
+    settings.domain_events_workers = 0
 
 
 @pytest.fixture(scope="function")
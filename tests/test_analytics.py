@@ -0,0 +1,73 @@
+from datetime import date, time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.user import User
+from app.services import analytics
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+
+def test_mirror_syncs_changes_and_serves_queries(
+    client: TestClient, db_session: Session, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "analytics_db_path", str(tmp_path / "analytics.duckdb"))
+    admin = User(email="analytics.admin@example.com", hashed_password=get_password_hash("pass"), role=UserRole.admin, is_active=True)
+    coach_user = User(email="analytics.coach@example.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Analytics Coach", email="analytics.coach@example.com", user=coach_user, active=True)
+    first, second = Player(full_name="Mirror One", active=True), Player(full_name="Mirror Two", active=True)
+    lessons = [
+        Lesson(
+            coach=coach,
+            date=date(2023, 3, day),
+            start_time=time(8, 0),
+            end_time=time(9, 0),
+            duration_minutes=60,
+            total_amount=50,
+            club_reimbursement_amount=10,
+            type=LessonType.private,
+            status=LessonStatus.executed,
+            payment_status=LessonPaymentStatus.open,
+            players=[first],
+        )
+        for day in (1, 2)
+    ]
+    db_session.add_all([admin, coach, second, *lessons])
+    db_session.commit()
+
+    analytics.sync(db_session)
+    lessons[0].players = [first, second]
+    db_session.delete(lessons[1])
+    db_session.commit()
+    result = analytics.sync(db_session)
+    assert result["lessons"]["deleted"] == 1
+    assert analytics.sync(db_session)["lessons"]["deleted"] == 0
+
+    with analytics.connect(read_only=True) as connection:
+        players = connection.execute(
+            "SELECT player_id FROM lesson_players WHERE lesson_id = ? ORDER BY player_id", [lessons[0].id]
+        ).fetchall()
+    assert [row[0] for row in players] == sorted([first.id, second.id])
+
+    token = client.post(
+        "/api/v1/auth/login", json={"email": "analytics.admin@example.com", "password": "pass"}
+    ).json()["access_token"]
+    response = client.post(
+        "/api/v1/analytics/query",
+        json={"name": "monthly_revenue", "params": {"coach_id": coach.id}},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    row = dict(zip(data["columns"], data["rows"][0]))
+    assert row["lessons"] == 1
+    assert float(row["net"]) == 40.0
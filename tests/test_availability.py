@@ -0,0 +1,99 @@
+from datetime import date, time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.court import Court
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, UserRole
+from app.models.lesson import Lesson
+from app.models.user import User
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def windows(response, court_id):
+    return [
+        (slot["date"], slot["start_time"][:5], slot["end_time"][:5])
+        for slot in response.json()["slots"]
+        if slot["court_id"] == court_id
+    ]
+
+
+def test_availability_comes_from_occupancy_index_and_follows_lesson_writes(client: TestClient, db_session: Session):
+    user = User(email="availability@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Availability Coach", email="availability@test.com", user=user, active=True)
+    club = Club(name="Availability Club")
+    club.courts.extend([Court(name="A"), Court(name="B"), Court(name="Closed", active=False)])
+    coach.clubs.append(club)
+    coach.default_club = club
+    db_session.add_all([coach, club])
+    db_session.commit()
+    court_a, court_b = club.courts[0].id, club.courts[1].id
+
+    stored = Lesson(
+        coach_id=coach.id,
+        club_id=club.id,
+        date=date(2032, 6, 1),
+        start_time=time(8, 0),
+        end_time=time(9, 30),
+        duration_minutes=90,
+        total_amount=40,
+        type=LessonType.club,
+        status=LessonStatus.set,
+        payment_status=LessonPaymentStatus.open,
+    )
+    stored.courts = [club.courts[0]]
+    db_session.add(stored)
+    db_session.commit()
+
+    headers = {"Authorization": f"Bearer {login(client, 'availability@test.com', 'pass')}"}
+    url = f"/api/v1/clubs/{club.id}/availability"
+    params = {"from": "2032-06-01", "to": "2032-06-02", "duration": 60, "opens": "08:00", "closes": "12:00"}
+
+    response = client.get(url, params=params, headers=headers)
+    assert response.status_code == 200
+    assert windows(response, court_a) == [("2032-06-01", "09:30", "12:00"), ("2032-06-02", "08:00", "12:00")]
+    assert windows(response, court_b) == [("2032-06-01", "08:00", "12:00"), ("2032-06-02", "08:00", "12:00")]
+    assert {slot["court_name"] for slot in response.json()["slots"]} == {"A", "B"}
+
+    created = client.post(
+        "/api/v1/lessons/",
+        json={
+            "coach_id": 0,
+            "date": "2032-06-01",
+            "start_time": "10:07",
+            "end_time": "11:00",
+            "total_amount": 40,
+            "type": "club",
+            "court_ids": [court_a],
+        },
+        headers=headers,
+    )
+    assert created.status_code == 201
+    # Partially used slots count as busy, so 10:07 blocks from 10:05.
+    response = client.get(url, params={**params, "to": "2032-06-01"}, headers=headers)
+    assert windows(response, court_a) == [("2032-06-01", "11:00", "12:00")]
+    response = client.get(url, params={**params, "to": "2032-06-01", "duration": 30}, headers=headers)
+    assert windows(response, court_a) == [("2032-06-01", "09:30", "10:05"), ("2032-06-01", "11:00", "12:00")]
+
+    lesson_id = created.json()["id"]
+    moved = client.patch(f"/api/v1/lessons/{lesson_id}", json={"court_ids": [court_b]}, headers=headers)
+    assert moved.status_code == 200
+    response = client.get(url, params={**params, "to": "2032-06-01"}, headers=headers)
+    assert windows(response, court_a) == [("2032-06-01", "09:30", "12:00")]
+    assert windows(response, court_b) == [("2032-06-01", "08:00", "10:05"), ("2032-06-01", "11:00", "12:00")]
+
+    assert client.delete(f"/api/v1/lessons/{lesson_id}", headers=headers).status_code == 200
+    response = client.get(url, params={**params, "to": "2032-06-01"}, headers=headers)
+    assert windows(response, court_b) == [("2032-06-01", "08:00", "12:00")]
+
+    assert client.get(url, params={**params, "to": "2032-05-01"}, headers=headers).status_code == 400
+    assert client.get(url, params={**params, "to": "2032-08-01"}, headers=headers).status_code == 400
+    assert client.get("/api/v1/clubs/999999/availability", params=params, headers=headers).status_code == 404
@@ -0,0 +1,93 @@
+from datetime import date, datetime, time, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.court import Court
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.user import User
+from app.services.calendar import fold
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_calendar_feeds_are_signed_and_answer_conditional_gets(client: TestClient, db_session: Session):
+    user = User(email="calendar@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Calendar Coach", email="calendar@test.com", user=user, active=True)
+    club = Club(name="Calendar Club", courts=[Court(name="Court; One")])
+    coach.clubs.append(club)
+    player = Player(full_name="Ana, Calendar", skill_level=SkillLevel.beginner, active=True, coaches=[coach])
+    lesson = Lesson(
+        coach=coach,
+        club=club,
+        date=date.today() + timedelta(days=3),
+        start_time=time(9, 30),
+        end_time=time(10, 30),
+        duration_minutes=60,
+        total_amount=40,
+        type=LessonType.private,
+        status=LessonStatus.draft,
+        payment_status=LessonPaymentStatus.open,
+        notes="Bring balls",
+        players=[player],
+        courts=club.courts,
+    )
+    db_session.add_all([coach, lesson])
+    db_session.commit()
+
+    headers = {"Authorization": f"Bearer {login(client, 'calendar@test.com', 'pass')}"}
+    feeds = client.get("/api/v1/calendar/feeds", headers=headers).json()
+    coach_url, club_url = feeds["coach"]["url"], feeds["clubs"][0]["url"]
+    assert coach_url.endswith(".ics") and feeds["clubs"][0]["name"] == "Calendar Club"
+
+    response = client.get(coach_url)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+    body = response.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    assert f"DTSTART:{lesson.date:%Y%m%d}T093000\r\n" in body
+    assert "SUMMARY:Private lesson: Ana\\, Calendar\r\n" in body
+    assert "LOCATION:Calendar Club\\, Court\\; One\r\n" in body
+    assert "DESCRIPTION:Bring balls\r\n" in body
+    assert "STATUS:TENTATIVE\r\n" in body
+
+    etag = response.headers["etag"]
+    cached = client.get(coach_url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    club_feed = client.get(club_url).text
+    assert "SUMMARY:Private lesson (Calendar Coach)\r\n" in club_feed
+    assert "Ana" not in club_feed and "Bring balls" not in club_feed
+
+    db_session.execute(
+        update(Lesson).where(Lesson.id == lesson.id).values(status=LessonStatus.set, updated_at=datetime(2100, 1, 1))
+    )
+    db_session.commit()
+    changed = client.get(coach_url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "STATUS:CONFIRMED\r\n" in changed.text
+
+    token = coach_url.rsplit("/", 1)[1]
+    forged = f"{int(token.split('-')[0]) + 1}-{token.split('-')[1]}"
+    assert client.get(coach_url.replace(token, forged)).status_code == 404
+    assert client.get(club_url.replace("/club/", "/coach/")).status_code == 404
+
+
+def test_fold_splits_long_lines_on_character_boundaries():
+    line = "SUMMARY:" + "é" * 60
+    folded = fold(line)
+    parts = folded[:-2].split("\r\n ")
+    assert all(len(part.encode()) <= 75 for part in parts)
+    assert "".join(parts) == line
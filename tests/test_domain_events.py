@@ -0,0 +1,112 @@
+from datetime import date, time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, UserRole
+from app.models.lesson import Lesson
+from app.models.outbox_event import OutboxEvent
+from app.models.user import User
+from app.services import invoice as invoice_service
+from app.services.domain_events import (
+    InvoicePaid,
+    LessonCreated,
+    LessonDeleted,
+    LessonEvent,
+    LessonUpdated,
+    bus,
+    from_payload,
+    to_payload,
+)
+
+
+def test_events_reach_handlers_only_after_commit(db_session: Session):
+    seen = []
+
+    def handler(db, events):
+        seen.append(list(events))
+
+    bus.subscribe(LessonCreated)(handler)
+    try:
+        created = LessonCreated(lesson_id=-1, coach_id=-1, club_id=None, date=date(2030, 1, 1))
+        db_session.execute(select(1))
+        bus.record(db_session, created)
+        db_session.rollback()
+        assert seen == []
+
+        db_session.execute(select(1))
+        bus.record(db_session, created, LessonDeleted(lesson_id=-2, coach_id=-1, club_id=None, date=date(2030, 1, 1)))
+        db_session.commit()
+        assert seen == [[created]]
+    finally:
+        bus.unsubscribe(handler)
+
+
+def test_payload_round_trip():
+    event = LessonDeleted(lesson_id=3, coach_id=4, club_id=None, date=date(2030, 5, 6))
+    assert from_payload(event.name, to_payload(event)) == event
+    assert isinstance(event, LessonEvent)
+
+
+def test_queued_handler_failures_are_kept_for_retry(db_session: Session):
+    calls = []
+
+    def flaky(db, events):
+        calls.append(list(events))
+        if len(calls) == 1:
+            raise RuntimeError("renderer unavailable")
+
+    bus.subscribe(InvoicePaid, mode="queue", name="tests.flaky")(flaky)
+    try:
+        paid = InvoicePaid(invoice_id=-5, coach_id=-5)
+        db_session.execute(select(1))
+        bus.record(db_session, paid)
+        db_session.commit()
+
+        row = db_session.scalars(select(OutboxEvent).where(OutboxEvent.handler == "tests.flaky")).one()
+        assert row.processed_at is None
+        assert row.attempts == 1
+        assert "renderer unavailable" in row.last_error
+
+        assert bus.drain(db_session.get_bind())["processed"] >= 1
+        db_session.refresh(row)
+        assert row.processed_at is not None
+        assert calls == [[paid], [paid]]
+    finally:
+        bus.unsubscribe(flaky)
+
+
+def test_invoicing_records_lesson_updates(db_session: Session):
+    user = User(email="events.invoice@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Events Invoice Coach", email="events.invoice@test.com", user=user, active=True)
+    lesson = Lesson(
+        coach=coach,
+        date=date(2031, 2, 3),
+        start_time=time(9, 0),
+        end_time=time(10, 0),
+        duration_minutes=60,
+        total_amount=40,
+        type=LessonType.private,
+        status=LessonStatus.executed,
+        payment_status=LessonPaymentStatus.open,
+    )
+    db_session.add_all([coach, lesson])
+    db_session.commit()
+    updated = []
+
+    def handler(db, events):
+        updated.extend(event.lesson_id for event in events)
+
+    bus.subscribe(LessonUpdated)(handler)
+    try:
+        invoice = invoice_service.confirm_invoice(db_session, coach.id, lesson.date, lesson.date, [lesson.id])
+        db_session.commit()
+        assert updated == [lesson.id]
+
+        invoice_service.mark_invoice_paid(db_session, invoice)
+        db_session.commit()
+        assert updated == [lesson.id, lesson.id]
+    finally:
+        bus.unsubscribe(handler)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.enums import InvoiceStatus, UserRole
+from app.models.invoice import Invoice
+from app.models.user import User
+from app.services.events import broadcaster, stream
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def frames(chunk: str):
+    return [json.loads(line[len("data: "):]) for line in chunk.splitlines() if line.startswith("data: ")]
+
+
+def test_event_stream_pushes_scoped_lesson_and_invoice_changes(client: TestClient, db_session: Session):
+    coaches = []
+    for name in ("events.one", "events.two"):
+        user = User(email=f"{name}@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+        coaches.append(Coach(full_name=name, email=f"{name}@test.com", user=user, active=True))
+    club = Club(name="Events Club")
+    for coach in coaches:
+        coach.clubs.append(club)
+    invoice = Invoice(coach=coaches[0], period_start=date(2035, 1, 1), period_end=date(2035, 1, 31), status=InvoiceStatus.issued)
+    db_session.add_all([*coaches, invoice])
+    db_session.commit()
+    one = {"Authorization": f"Bearer {login(client, 'events.one@test.com', 'pass')}"}
+    two = {"Authorization": f"Bearer {login(client, 'events.two@test.com', 'pass')}"}
+    lesson = {
+        "coach_id": coaches[0].id,
+        "club_id": club.id,
+        "date": "2035-01-05",
+        "start_time": "09:00",
+        "end_time": "10:00",
+        "total_amount": 40,
+        "type": "club",
+    }
+
+    async def scenario():
+        own = stream(broadcaster.subscribe(coach_id=coaches[0].id), keepalive_seconds=0.05)
+        staff = stream(broadcaster.subscribe(club_id=club.id), keepalive_seconds=5)
+        assert await own.__anext__() == "retry: 3000\n\n"
+        assert await staff.__anext__() == "retry: 3000\n\n"
+        assert await own.__anext__() == ": keepalive\n\n"
+        assert broadcaster.connections == 2
+
+        created = await asyncio.to_thread(client.post, "/api/v1/lessons/", json=lesson, headers=two)
+        assert created.status_code == 201
+        foreign_id = created.json()["id"]
+        later = {**lesson, "start_time": "11:00", "end_time": "12:00"}
+        created = await asyncio.to_thread(client.post, "/api/v1/lessons/", json=later, headers=one)
+        lesson_id = created.json()["id"]
+        await asyncio.to_thread(client.delete, f"/api/v1/lessons/{lesson_id}", headers=one)
+        paid = await asyncio.to_thread(client.post, f"/api/v1/invoices/{invoice.id}/mark-paid", json={}, headers=one)
+        assert paid.status_code == 200
+
+        received = []
+        while len(received) < 3:
+            chunk = await asyncio.wait_for(own.__anext__(), 1)
+            if chunk.startswith("event: "):
+                received.extend(frames(chunk))
+        assert [(event["type"], event["id"]) for event in received] == [
+            ("lesson.created", lesson_id),
+            ("lesson.deleted", lesson_id),
+            ("invoice.paid", invoice.id),
+        ]
+        assert received[0] == {
+            "type": "lesson.created",
+            "id": lesson_id,
+            "coach_id": coaches[0].id,
+            "club_id": club.id,
+            "date": "2035-01-05",
+        }
+
+        seen = []
+        while len(seen) < 4:
+            seen.extend(frames(await asyncio.wait_for(staff.__anext__(), 1)))
+        assert [event["id"] for event in seen] == [foreign_id, lesson_id, lesson_id, invoice.id]
+
+        await own.aclose()
+        await staff.aclose()
+        assert broadcaster.connections == 0
+
+    asyncio.run(scenario())
+    assert client.get("/api/v1/events/stream").status_code == 401
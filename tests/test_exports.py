@@ -0,0 +1,59 @@
+import io
+from datetime import date, time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, UserRole
+from app.models.lesson import Lesson
+from app.models.user import User
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_admin_can_stream_lessons_as_parquet(client: TestClient, db_session: Session):
+    admin = User(email="export.admin@example.com", hashed_password=get_password_hash("pass"), role=UserRole.admin, is_active=True)
+    coach_user = User(email="export.coach@example.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Export Coach", email="export.coach@example.com", user=coach_user, active=True)
+    db_session.add_all([admin, coach])
+    for day in range(1, 6):
+        db_session.add(
+            Lesson(
+                coach=coach,
+                date=date(2024, 7, day),
+                start_time=time(9, 0),
+                end_time=time(10, 0),
+                duration_minutes=60,
+                total_amount=45,
+                type=LessonType.private,
+                status=LessonStatus.executed,
+                payment_status=LessonPaymentStatus.open,
+            )
+        )
+    db_session.commit()
+    expected_rows = db_session.query(Lesson).count()
+
+    token = client.post(
+        "/api/v1/auth/login", json={"email": "export.admin@example.com", "password": "pass"}
+    ).json()["access_token"]
+    response = client.get(
+        "/api/v1/exports/lessons.parquet",
+        params={"chunk_size": 2},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_rows == expected_rows
+    assert parquet.metadata.num_row_groups == -(-expected_rows // 2)
+    table = parquet.read()
+    assert set(table.column("type").to_pylist()) <= {"club", "private"}
+
+    coach_token = client.post(
+        "/api/v1/auth/login", json={"email": "export.coach@example.com", "password": "pass"}
+    ).json()["access_token"]
+    forbidden = client.get("/api/v1/exports/lessons.parquet", headers={"Authorization": f"Bearer {coach_token}"})
+    assert forbidden.status_code == 403
@@ -1,3 +1,6 @@
+import csv
+import io
+import zipfile
 from datetime import date, time, timedelta
 
 from fastapi.testclient import TestClient
@@ -9,6 +12,7 @@ from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, User
 from app.models.lesson import Lesson
 from app.models.player import Player
 from app.models.user import User
+from app.services import invoice as invoice_service
 
 
 def create_coach_with_player(db: Session):
@@ -92,3 +96,23 @@ def test_invoice_generation_flow(client: TestClient, db_session: Session):
     )
     assert mark_paid.status_code == 200
     assert mark_paid.json()["status"] == "paid"
+    db_session.expire_all()
+    assert {db_session.get(Lesson, lesson.id).payment_status for lesson in (lesson1, lesson2)} == {
+        LessonPaymentStatus.paid
+    }
+
+    _, csv_path = invoice_service.document_paths(invoice_id)
+    csv_path.unlink()
+    archive = client.get(
+        "/api/v1/invoices/archive",
+        headers={"Authorization": f"Bearer {token}"},
+        params={"from": str(date.today()), "to": str(date.today() + timedelta(days=7)), "compression": "stored"},
+    )
+    assert archive.status_code == 200
+    assert archive.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(archive.content)) as bundle:
+        names = bundle.namelist()
+        assert f"invoices/invoice-{invoice_id}.pdf" in names
+        assert bundle.read(f"invoices/invoice-{invoice_id}.csv").startswith(b"Description,Amount")
+        summary = list(csv.DictReader(io.StringIO(bundle.read("summary.csv").decode())))
+    assert [(row["id"], row["status"], row["items"]) for row in summary] == [(str(invoice_id), "paid", "4")]
@@ -0,0 +1,124 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.jobs import runner
+from app.jobs.cron import CronSchedule
+from app.jobs.tasks import JOBS, purge_in_batches, purge_invoice_files
+from app.models.enums import UserRole
+from app.models.invoice import Invoice
+from app.models.password_reset_token import PasswordResetToken
+from app.models.user import User
+from app.services import invoice as invoice_service
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_cron_schedule_next_after():
+    moment = datetime(2026, 10, 19, 10, 7)
+    assert CronSchedule.parse("*/15 * * * *").next_after(moment) == datetime(2026, 10, 19, 10, 15)
+    assert CronSchedule.parse("0 17 * * *").next_after(moment) == datetime(2026, 10, 19, 17, 0)
+    assert CronSchedule.parse("30 4 * * 0").next_after(moment) == datetime(2026, 10, 25, 4, 30)
+    assert CronSchedule.parse("0 9 1 * 1").next_after(moment) == datetime(2026, 10, 26, 9, 0)
+    assert CronSchedule.parse("0 0 29 2 *").next_after(moment) == datetime(2028, 2, 29, 0, 0)
+    for expression in ("* * *", "60 * * * *", "5-1 * * * *", "*/0 * * * *"):
+        with pytest.raises(ValueError):
+            CronSchedule.parse(expression)
+
+
+def test_purge_deletes_used_and_expired_tokens_in_batches(db_session: Session):
+    user = User(email="jobs.tokens@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    now = datetime.now(timezone.utc)
+    stale = [
+        PasswordResetToken(user=user, token=f"jobs-stale-{index}", expires_at=now - timedelta(hours=1))
+        for index in range(4)
+    ]
+    used = PasswordResetToken(user=user, token="jobs-used", expires_at=now + timedelta(hours=1), used=True)
+    live = PasswordResetToken(user=user, token="jobs-live", expires_at=now + timedelta(hours=1))
+    db_session.add_all([user, *stale, used, live])
+    db_session.commit()
+
+    clauses = [PasswordResetToken.user_id == user.id, PasswordResetToken.used.is_(True) | (PasswordResetToken.expires_at < now)]
+    assert purge_in_batches(db_session, PasswordResetToken, clauses, batch_size=2) == 5
+    remaining = db_session.scalars(select(PasswordResetToken.token).where(PasswordResetToken.user_id == user.id)).all()
+    assert remaining == ["jobs-live"]
+
+
+def test_purge_invoice_files_keeps_live_and_recent_documents(db_session: Session, tmp_path, monkeypatch):
+    monkeypatch.setattr(invoice_service, "storage_dir", tmp_path)
+    invoice = db_session.scalars(select(Invoice).limit(1)).first()
+    live_id = invoice.id if invoice else None
+    orphan_id = 987_654
+    old = time.time() - 2 * 60 * 60
+    paths = {
+        "orphan_pdf": tmp_path / f"invoice-{orphan_id}.pdf",
+        "orphan_csv": tmp_path / f"invoice-{orphan_id}.csv",
+        "recent": tmp_path / f"invoice-{orphan_id + 1}.pdf",
+        "unrelated": tmp_path / "notes.txt",
+    }
+    if live_id is not None:
+        paths["live"] = tmp_path / f"invoice-{live_id}.pdf"
+    for name, path in paths.items():
+        path.write_text(name)
+        if name != "recent":
+            os.utime(path, (old, old))
+
+    result = purge_invoice_files(db_session)
+
+    assert result["deleted"] == 2
+    assert not paths["orphan_pdf"].exists() and not paths["orphan_csv"].exists()
+    assert all(path.exists() for name, path in paths.items() if not name.startswith("orphan"))
+
+
+def test_admin_triggers_job_and_reads_history(client: TestClient, db_session: Session):
+    admin = User(email="jobs.admin@test.com", hashed_password=get_password_hash("pass"), role=UserRole.admin, is_active=True)
+    coach = User(email="jobs.coach@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    expired = PasswordResetToken(user=coach, token="jobs-endpoint", expires_at=datetime.now(timezone.utc) - timedelta(days=1))
+    db_session.add_all([admin, coach, expired])
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {login(client, 'jobs.admin@test.com', 'pass')}"}
+
+    coach_headers = {"Authorization": f"Bearer {login(client, 'jobs.coach@test.com', 'pass')}"}
+    assert client.post("/api/v1/jobs/purge-password-reset-tokens/run", headers=coach_headers).status_code == 403
+    assert client.post("/api/v1/jobs/no-such-job/run", headers=headers).status_code == 404
+
+    response = client.post("/api/v1/jobs/purge-password-reset-tokens/run", headers=headers)
+    assert response.status_code == 200
+    run = response.json()
+    assert run["status"] == "succeeded" and run["trigger"] == "manual"
+    assert run["result"]["deleted"] >= 1
+    assert db_session.scalar(select(PasswordResetToken).where(PasswordResetToken.token == "jobs-endpoint")) is None
+
+    with runner.job_lock(db_session, "analyze-tables") as acquired:
+        assert acquired
+        assert client.post("/api/v1/jobs/analyze-tables/run", headers=headers).status_code == 409
+
+    history = client.get("/api/v1/jobs/runs", params={"job": "purge-password-reset-tokens"}, headers=headers)
+    assert history.status_code == 200
+    assert history.json()[0]["id"] == run["id"]
+
+    listing = client.get("/api/v1/jobs", headers=headers)
+    assert listing.status_code == 200
+    jobs = {job["name"]: job for job in listing.json()}
+    assert set(jobs) == set(JOBS)
+    assert jobs["purge-password-reset-tokens"]["last_run"]["id"] == run["id"]
+    assert jobs["send-lesson-reminders"]["schedule"] == settings.reminder_cron
+
+
+def test_scheduled_slot_runs_once(db_session: Session):
+    job = JOBS["purge-lesson-reminders"]
+    slot = datetime(2026, 10, 19, 3, 45)
+    first = runner.run_job(db_session, job, trigger="schedule", scheduled_for=slot)
+    assert first is not None and first.status == "succeeded"
+    assert runner.run_job(db_session, job, trigger="schedule", scheduled_for=slot) is None
@@ -0,0 +1,89 @@
+from datetime import date, time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, StrokeCode, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.stroke import Stroke
+from app.models.user import User
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_batch_lessons_modes(client: TestClient, db_session: Session):
+    user = User(email="batch@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Batch Coach", email="batch@test.com", user=user, active=True)
+    club = Club(name="Batch Club")
+    coach.clubs.append(club)
+    coach.default_club = club
+    player = Player(full_name="Batch Player", skill_level=SkillLevel.beginner, active=True, coaches=[coach])
+    stranger = Player(full_name="Batch Stranger", skill_level=SkillLevel.beginner, active=True)
+    db_session.add_all([coach, club, player, stranger])
+    if not db_session.query(Stroke).filter(Stroke.code == StrokeCode.smash).first():
+        db_session.add(Stroke(code=StrokeCode.smash, label="Smash"))
+    db_session.commit()
+    existing = Lesson(
+        coach_id=coach.id,
+        club_id=club.id,
+        date=date(2024, 6, 1),
+        start_time=time(9, 0),
+        end_time=time(10, 0),
+        duration_minutes=60,
+        total_amount=40,
+        type=LessonType.private,
+        status=LessonStatus.set,
+        payment_status=LessonPaymentStatus.open,
+        players=[player],
+    )
+    db_session.add(existing)
+    db_session.commit()
+
+    def create_item(player_id: int) -> dict:
+        return {
+            "op": "create",
+            "lesson": {
+                "coach_id": 0,
+                "date": "2024-06-02",
+                "start_time": "18:00",
+                "end_time": "19:00",
+                "total_amount": 40,
+                "type": "private",
+                "player_ids": [player_id],
+            },
+        }
+
+    items = [
+        create_item(player.id),
+        {"op": "update", "id": existing.id, "changes": {"end_time": "10:45", "stroke_codes": ["smash"]}},
+        create_item(stranger.id),
+    ]
+    headers = {"Authorization": f"Bearer {login(client, 'batch@test.com', 'pass')}"}
+
+    response = client.post("/api/v1/lessons/batch", json={"items": items}, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["committed"] is False
+    assert [result["status"] for result in data["results"]] == ["skipped", "skipped", "failed"]
+    assert data["results"][2]["errors"] == [f"Cannot attach unassigned player: {stranger.id}"]
+
+    response = client.post("/api/v1/lessons/batch", json={"mode": "best_effort", "items": items}, headers=headers)
+    data = response.json()
+    assert data["committed"] is True
+    assert [result["status"] for result in data["results"]] == ["created", "updated", "failed"]
+
+    db_session.expire_all()
+    created = db_session.get(Lesson, data["results"][0]["lesson_id"])
+    assert (created.coach_id, created.club_id, created.duration_minutes) == (coach.id, club.id, 60)
+    assert [p.id for p in created.players] == [player.id]
+    updated = db_session.get(Lesson, existing.id)
+    assert updated.duration_minutes == 105
+    assert [stroke.code for stroke in updated.strokes] == [StrokeCode.smash]
@@ -0,0 +1,55 @@
+from datetime import date, time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.court import Court
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.user import User
+
+
+def test_groups_balance_skill_across_courts(client: TestClient, db_session: Session):
+    user = User(email="groups@example.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Groups Coach", email="groups@example.com", user=user, active=True)
+    club = Club(name="Groups Club")
+    courts = [Court(name=f"Court {number}", club=club) for number in range(1, 4)]
+    levels = [SkillLevel.beginner, SkillLevel.intermediate, SkillLevel.advanced] * 4
+    players = [
+        Player(full_name=f"Group Player {index}", skill_level=level, active=True, coaches=[coach])
+        for index, level in enumerate(levels)
+    ]
+    lesson = Lesson(
+        coach=coach,
+        club=club,
+        date=date(2024, 6, 1),
+        start_time=time(18, 0),
+        end_time=time(19, 30),
+        duration_minutes=90,
+        total_amount=120,
+        type=LessonType.club,
+        status=LessonStatus.set,
+        payment_status=LessonPaymentStatus.open,
+        players=players,
+        courts=courts,
+    )
+    db_session.add_all([coach, club, lesson])
+    db_session.commit()
+
+    token = client.post(
+        "/api/v1/auth/login", json={"email": "groups@example.com", "password": "pass"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post(f"/api/v1/lessons/{lesson.id}/groups", json={"seed": 7}, headers=headers)
+    assert response.status_code == 200
+    groups = response.json()["groups"]
+    assert [len(group["players"]) for group in groups] == [4, 4, 4]
+    assert {group["mean_skill"] for group in groups} == {1.0}
+
+    again = client.post(f"/api/v1/lessons/{lesson.id}/groups", json={"seed": 7}, headers=headers)
+    assert again.json() == response.json()
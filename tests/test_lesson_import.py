@@ -0,0 +1,92 @@
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.court import Court
+from app.models.enums import SkillLevel, StrokeCode, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.stroke import Stroke
+from app.models.user import User
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_import_lessons_validates_all_rows_and_inserts_valid_ones(client: TestClient, db_session: Session):
+    user = User(email="import@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Import Coach", email="import@test.com", user=user, active=True)
+    club = Club(name="Import Club")
+    club.courts.append(Court(name="Center"))
+    coach.clubs.append(club)
+    coach.default_club = club
+    player = Player(
+        full_name="Import Player", email="import.player@test.com", skill_level=SkillLevel.beginner, active=True, coaches=[coach]
+    )
+    stranger = Player(full_name="Import Stranger", email="import.stranger@test.com", skill_level=SkillLevel.beginner, active=True)
+    db_session.add_all([coach, club, player, stranger])
+    if not db_session.query(Stroke).filter(Stroke.code == StrokeCode.volley).first():
+        db_session.add(Stroke(code=StrokeCode.volley, label="Volley"))
+    db_session.commit()
+
+    header = "date,start_time,end_time,total_amount,type,player_ids,stroke_codes,court_names\n"
+    rows = [
+        "2024-03-01,09:00,10:30,45,private,import.player@test.com,volley,Center\n",
+        f"2024-03-02,09:00,10:00,45,club,{player.id}|IMPORT.PLAYER@test.com,,\n",
+        "2024-03-03,10:00,09:00,45,private,import.player@test.com,,\n",
+        "2024-03-04,09:00,10:00,45,private,import.stranger@test.com,,Outside\n",
+        "2024-03-05,09:00,10:00,-1,private,import.player@test.com,,\n",
+        "2024-03-01,10:00,11:00,45,private,import.player@test.com,,\n",
+    ]
+    content = (header + "".join(rows)).encode()
+    token = login(client, "import@test.com", "pass")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post(
+        "/api/v1/lessons/import",
+        params={"dry_run": "true"},
+        files={"file": ("lessons.csv", content, "text/csv")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["total_rows"], data["valid_rows"], data["imported"]) == (6, 2, 0)
+    errors = {error["row"]: error["errors"] for error in data["errors"]}
+    assert errors[4] == ["End time must be after start time"]
+    assert "Cannot attach unassigned player: import.stranger@test.com" in errors[5]
+    assert "Court not found for the selected club: Outside" in errors[5]
+    assert errors[6][0].startswith("total_amount")
+    assert errors[7] == ["Coach is already booked by row 2 (09:00-10:30)"]
+    assert db_session.query(Lesson).filter(Lesson.coach_id == coach.id).count() == 0
+
+    response = client.post(
+        "/api/v1/lessons/import", files={"file": ("lessons.csv", content, "text/csv")}, headers=headers
+    )
+    assert response.json()["imported"] == 2
+    lessons = db_session.query(Lesson).filter(Lesson.coach_id == coach.id).order_by(Lesson.date).all()
+    assert [lesson.duration_minutes for lesson in lessons] == [90, 60]
+    assert all(lesson.club_id == club.id for lesson in lessons)
+    assert [court.name for court in lessons[0].courts] == ["Center"]
+    assert [stroke.code for stroke in lessons[0].strokes] == [StrokeCode.volley]
+    assert [p.id for p in lessons[1].players] == [player.id]
+
+    lines = [
+        json.dumps({"date": "2024-04-01", "start_time": "08:00", "end_time": "09:00", "total_amount": 30,
+                    "type": "private", "player_ids": [player.id]}),
+        "not json",
+    ]
+    response = client.post(
+        "/api/v1/lessons/import",
+        files={"file": ("lessons.jsonl", "\n".join(lines).encode(), "application/x-ndjson")},
+        headers=headers,
+    )
+    data = response.json()
+    assert data["imported"] == 1
+    assert data["errors"] == [{"row": 2, "errors": ["Row is not a JSON object"]}]
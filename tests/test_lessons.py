@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from datetime import date, time
 from decimal import Decimal
 
@@ -5,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.core.security import get_password_hash
 from app.models.club import Club
+from app.models.court import Court
 from app.models.coach import Coach
 from app.models.player import Player
 from app.models.lesson import Lesson
@@ -95,3 +99,151 @@ def test_update_lesson_negative_reimbursement(db_session: Session, client):
     assert response.status_code == 200
     data = response.json()
     assert data["club_reimbursement_amount"] == 17
+
+
+def test_export_lessons_streams_flattened_rows(db_session: Session, client):
+    user = User(email="export.lessons@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Export Lessons Coach", email="export.lessons@test.com", user=user, active=True)
+    club = Club(name="Export Lessons Club")
+    coach.clubs.append(club)
+    players = [
+        Player(full_name=f"Export Player {index}", skill_level=SkillLevel.beginner, active=True, coaches=[coach])
+        for index in range(2)
+    ]
+    db_session.add_all([coach, club, *players])
+    db_session.commit()
+    for day in (3, 4, 5):
+        lesson = Lesson(
+            coach_id=coach.id,
+            club_id=club.id,
+            date=date(2024, 2, day),
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            duration_minutes=60,
+            total_amount=Decimal("50"),
+            type=LessonType.private,
+            status=LessonStatus.executed,
+            payment_status=LessonPaymentStatus.open,
+            players=players,
+        )
+        db_session.add(lesson)
+    db_session.commit()
+
+    token = login(client, "export.lessons@test.com", "pass")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get(
+        "/api/v1/lessons/export",
+        params={"format": "csv", "chunk_size": 2, "date_from": "2024-02-04"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["date"] for row in rows] == ["2024-02-04", "2024-02-05"]
+    assert rows[0]["player_names"] == "Export Player 0|Export Player 1"
+
+    response = client.get("/api/v1/lessons/export", params={"format": "ndjson"}, headers=headers)
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 3
+    assert len(records[0]["player_ids"]) == 2
+
+
+def test_bulk_transition_respects_allowed_transitions_and_scope(db_session: Session, client):
+    user = User(email="bulk.transition@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Bulk Transition Coach", email="bulk.transition@test.com", user=user, active=True)
+    other_user = User(email="bulk.other@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    other = Coach(full_name="Bulk Other Coach", email="bulk.other@test.com", user=other_user, active=True)
+    player = Player(full_name="Bulk Player", skill_level=SkillLevel.beginner, active=True, coaches=[coach, other])
+    db_session.add_all([coach, other, player])
+    db_session.commit()
+
+    def lesson_for(owner: Coach, day: int, lesson_status: LessonStatus) -> Lesson:
+        return Lesson(
+            coach_id=owner.id,
+            date=date(2024, 7, day),
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            duration_minutes=60,
+            total_amount=Decimal("50"),
+            type=LessonType.private,
+            status=lesson_status,
+            payment_status=LessonPaymentStatus.open,
+            players=[player],
+        )
+
+    lessons = [
+        lesson_for(coach, 1, LessonStatus.set),
+        lesson_for(coach, 2, LessonStatus.draft),
+        lesson_for(coach, 3, LessonStatus.invoiced),
+        lesson_for(other, 1, LessonStatus.set),
+    ]
+    db_session.add_all(lessons)
+    db_session.commit()
+
+    token = login(client, "bulk.transition@test.com", "pass")
+    response = client.post(
+        "/api/v1/lessons/bulk-transition",
+        json={"filters": {"date_from": "2024-07-01", "date_to": "2024-07-31"}, "status": "executed"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2, "lesson_ids": sorted([lessons[0].id, lessons[1].id])}
+
+    db_session.expire_all()
+    assert [db_session.get(Lesson, lesson.id).status for lesson in lessons] == [
+        LessonStatus.executed,
+        LessonStatus.executed,
+        LessonStatus.invoiced,
+        LessonStatus.set,
+    ]
+
+    response = client.post(
+        "/api/v1/lessons/bulk-transition",
+        json={"lesson_ids": [lessons[2].id, lessons[3].id], "payment_status": "paid"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.json()["lesson_ids"] == [lessons[2].id]
+
+
+def test_lesson_writes_reject_coach_and_court_double_booking(db_session: Session, client):
+    coaches = []
+    for name in ("overlap.one", "overlap.two"):
+        user = User(email=f"{name}@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+        coaches.append(Coach(full_name=name, email=f"{name}@test.com", user=user, active=True))
+    club = Club(name="Overlap Club")
+    club.courts.append(Court(name="Overlap Court"))
+    for coach in coaches:
+        coach.clubs.append(club)
+    db_session.add_all([*coaches, club])
+    db_session.commit()
+    court_id = club.courts[0].id
+
+    def book(email: str, start: str, end: str, courts=()):
+        headers = {"Authorization": f"Bearer {login(client, email, 'pass')}"}
+        payload = {
+            "coach_id": 0,
+            "club_id": club.id,
+            "date": "2031-03-03",
+            "start_time": start,
+            "end_time": end,
+            "total_amount": 40,
+            "type": "club",
+            "court_ids": list(courts),
+        }
+        return client.post("/api/v1/lessons/", json=payload, headers=headers)
+
+    first = book("overlap.one@test.com", "09:00", "10:00", [court_id])
+    assert first.status_code == 201
+    clash = book("overlap.one@test.com", "09:30", "10:30")
+    assert clash.status_code == 409
+    assert clash.json()["detail"] == f"Coach is already booked by lesson {first.json()['id']} (09:00-10:00)"
+    court_clash = book("overlap.two@test.com", "09:45", "11:00", [court_id])
+    assert court_clash.status_code == 409
+    assert court_clash.json()["detail"].startswith(f"Court {court_id} is already booked")
+    assert book("overlap.two@test.com", "10:00", "11:00", [court_id]).status_code == 201
+
+    later = book("overlap.one@test.com", "11:00", "12:00")
+    headers = {"Authorization": f"Bearer {login(client, 'overlap.one@test.com', 'pass')}"}
+    moved = client.patch(f"/api/v1/lessons/{later.json()['id']}", json={"start_time": "09:50"}, headers=headers)
+    assert moved.status_code == 409
+    assert client.patch(f"/api/v1/lessons/{first.json()['id']}", json={"end_time": "09:55"}, headers=headers).status_code == 200
@@ -0,0 +1,93 @@
+import xml.etree.ElementTree as ET
+from datetime import date
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.coach import Coach
+from app.models.enums import InvoiceStatus, UserRole
+from app.models.invoice import Invoice
+from app.models.user import User
+from app.utils.banking import normalize_account_number, normalize_iban
+
+NS = {"p": "urn:iso:std:iso:20022:tech:xsd:pain.001.001.03"}
+PERIOD = {"from": "2031-01-01", "to": "2031-01-31"}
+
+
+def test_bank_detail_normalization():
+    assert normalize_iban("gb82 west 1234 5698 7654 32") == "GB82WEST12345698765432"
+    assert normalize_iban("GB82WEST12345698765431") is None
+    assert normalize_account_number("1234567") == "01234567"
+    assert normalize_account_number("12-34") is None
+
+
+def test_admin_streams_sepa_and_bacs_payout_files(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "payout_debtor_name", "Lagana Club")
+    monkeypatch.setattr(settings, "payout_debtor_iban", "NL91ABNA0417164300")
+    monkeypatch.setattr(settings, "payout_debtor_sort_code", "20-00-00")
+    monkeypatch.setattr(settings, "payout_debtor_account_number", "55779911")
+
+    admin = User(email="payout.admin@example.com", hashed_password=get_password_hash("pass"), role=UserRole.admin, is_active=True)
+    db_session.add(admin)
+    details = [
+        ("Zoë Müller", "DE89 3704 0044 0532 0130 00", "DEUTDEFF", "40-47-84", "71234567", ["120.00", "30.50"]),
+        ("Bad Iban", "DE00370400440532013000", None, "123", None, ["80.00"]),
+    ]
+    coaches = []
+    for index, (name, iban, bic, sort_code, account, amounts) in enumerate(details):
+        user = User(email=f"payout.coach{index}@example.com", hashed_password="x", role=UserRole.coach, is_active=True)
+        coach = Coach(
+            full_name=name,
+            email=user.email,
+            user=user,
+            iban=iban,
+            swift_bic=bic,
+            sort_code=sort_code,
+            account_number=account,
+        )
+        coach.invoices = [
+            Invoice(
+                period_start=date(2031, 1, 1),
+                period_end=date(2031, 1, 31),
+                status=InvoiceStatus.issued,
+                total_gross=Decimal(amount),
+                total_net=Decimal(amount),
+            )
+            for amount in amounts
+        ]
+        coaches.append(coach)
+    db_session.add_all(coaches)
+    db_session.commit()
+
+    token = client.post("/api/v1/auth/login", json={"email": "payout.admin@example.com", "password": "pass"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    preview = client.get("/api/v1/payouts/preview", params=PERIOD, headers=headers).json()
+    assert (preview["payees"], preview["invoices"], Decimal(preview["total"])) == (1, 2, Decimal("150.50"))
+    assert preview["issues"] == [{"coach_id": coaches[1].id, "coach_name": "Bad Iban", "error": "Missing or invalid IBAN"}]
+    assert client.get("/api/v1/payouts/file", params=PERIOD, headers=headers).status_code == 422
+
+    response = client.get(
+        "/api/v1/payouts/file",
+        params={**PERIOD, "skip_invalid": "true", "execution_date": "2031-02-03"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    document = ET.fromstring(response.content)
+    assert document.findtext("p:CstmrCdtTrfInitn/p:GrpHdr/p:CtrlSum", namespaces=NS) == "150.50"
+    transfers = document.findall(".//p:CdtTrfTxInf", NS)
+    assert len(transfers) == 1
+    assert transfers[0].findtext("p:Cdtr/p:Nm", namespaces=NS) == "Zoe Muller"
+    assert transfers[0].findtext("p:CdtrAcct/p:Id/p:IBAN", namespaces=NS) == "DE89370400440532013000"
+    assert transfers[0].find("p:Amt/p:InstdAmt", NS).attrib == {"Ccy": "EUR"}
+
+    bacs = client.get(
+        "/api/v1/payouts/file", params={**PERIOD, "format": "bacs", "skip_invalid": "true"}, headers=headers
+    ).text.splitlines()
+    assert [len(line) for line in bacs] == [100, 100]
+    assert bacs[0].startswith("4047847123456709920000055779911    00000015050LAGANA CLUB")
+    assert bacs[0].endswith("ZOE MULLER".ljust(18))
+    assert bacs[1][15:17] == "17" and bacs[1][35:46] == "00000015050"
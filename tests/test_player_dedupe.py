@@ -0,0 +1,69 @@
+from datetime import date, time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.coach import Coach
+from app.models.enums import LessonStatus, LessonType, SkillLevel, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.user import User
+from app.services.player_dedupe import PlayerKey, blocking_keys, normalize_name, normalize_phone, score_pair, soundex
+
+
+def test_blocking_keys_and_scoring():
+    assert [soundex(word) for word in ("Robert", "Rupert", "Ashcraft", "Tymczak")] == ["R163", "R163", "A261", "T522"]
+    assert normalize_phone("+44 7700 900123") == normalize_phone("07700-900123")
+    john = PlayerKey(1, normalize_name("John Smith"), normalize_phone("07700 900123"), "jsmith", None)
+    initial = PlayerKey(2, normalize_name("J. Smyth"), normalize_phone("+44 7700 900123"), None, None)
+    assert set(blocking_keys(john)) & set(blocking_keys(initial)) == {"phone:700900123", "name:j:S530"}
+    score, reasons = score_pair(john, initial)
+    assert score > 0.6 and "phone" in reasons
+    assert score_pair(john, PlayerKey(3, "maria lopez", None, None, None), 0.5) is None
+
+
+def test_admin_finds_and_merges_duplicate_players(client: TestClient, db_session: Session):
+    admin = User(email="dedupe.admin@test.com", hashed_password=get_password_hash("pass"), role=UserRole.admin, is_active=True)
+    coaches = [
+        Coach(full_name=f"Dedupe Coach {index}", email=f"dedupe{index}@test.com", active=True,
+              user=User(email=f"dedupe{index}@test.com", hashed_password="x", role=UserRole.coach, is_active=True))
+        for index in range(2)
+    ]
+    target = Player(full_name="Johnathan Dedupe", phone="+44 7700 900777", skill_level=SkillLevel.beginner, coaches=[coaches[0]])
+    source = Player(
+        full_name="J. Dedupe",
+        phone="07700 900777",
+        email="j.dedupe@test.com",
+        birth_date=date(2010, 5, 4),
+        skill_level=SkillLevel.beginner,
+        coaches=[coaches[1]],
+    )
+    other = Player(full_name="Unrelated Person", phone="0123 456789", skill_level=SkillLevel.beginner, coaches=[coaches[0]])
+    lessons = [
+        Lesson(coach=coaches[index], date=date(2030, 6, 1 + index), start_time=time(9), end_time=time(10),
+               duration_minutes=60, total_amount=30, type=LessonType.private, status=LessonStatus.set, players=players)
+        for index, players in enumerate([[target, source], [source]])
+    ]
+    db_session.add_all([admin, *coaches, target, source, other, *lessons])
+    db_session.commit()
+    token = client.post("/api/v1/auth/login", json={"email": "dedupe.admin@test.com", "password": "pass"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    source_id = source.id
+
+    candidates = client.get("/api/v1/players/duplicates", headers=headers).json()
+    pair = next(candidate for candidate in candidates if target.id in candidate["player_ids"])
+    assert sorted(pair["player_ids"]) == sorted([target.id, source.id])
+    assert "phone" in pair["reasons"]
+    assert all(other.id not in candidate["player_ids"] for candidate in candidates)
+
+    assert client.post("/api/v1/players/merge", json={"target_id": target.id, "source_ids": [target.id]}, headers=headers).status_code == 400
+    response = client.post("/api/v1/players/merge", json={"target_id": target.id, "source_ids": [source.id]}, headers=headers)
+    assert response.status_code == 200, response.text
+    merged = response.json()
+    assert sorted(coach["id"] for coach in merged["coaches"]) == sorted(coach.id for coach in coaches)
+    assert (merged["email"], merged["birth_date"]) == ("j.dedupe@test.com", "2010-05-04")
+
+    db_session.expire_all()
+    assert db_session.get(Player, source_id) is None
+    assert [[player.id for player in db_session.get(Lesson, lesson.id).players] for lesson in lessons] == [[target.id], [target.id]]
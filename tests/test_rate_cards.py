@@ -0,0 +1,91 @@
+from datetime import date, time
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.user import User
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_reprice_uses_most_specific_card_and_coach_fallback(client: TestClient, db_session: Session):
+    user = User(email="rates@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Rates Coach", email="rates@test.com", user=user, active=True, hourly_rate=Decimal("40"))
+    club = Club(name="Rates Club")
+    coach.clubs.append(club)
+    players = [
+        Player(full_name=f"Rates Player {index}", skill_level=SkillLevel.beginner, active=True, coaches=[coach])
+        for index in range(2)
+    ]
+    db_session.add_all([coach, club, *players])
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {login(client, 'rates@test.com', 'pass')}"}
+
+    def lesson(lesson_type, minutes, amount, club_id=None, attendees=(), status=LessonStatus.set):
+        return Lesson(
+            coach_id=coach.id,
+            club_id=club_id,
+            date=date(2030, 5, 1),
+            start_time=time(9, 0),
+            end_time=time(9 + minutes // 60, minutes % 60),
+            duration_minutes=minutes,
+            total_amount=Decimal(amount),
+            type=lesson_type,
+            status=status,
+            payment_status=LessonPaymentStatus.open,
+            players=list(attendees),
+        )
+
+    lessons = [
+        lesson(LessonType.private, 60, "10", club.id, players[:1]),
+        lesson(LessonType.private, 90, "10", None, players),
+        lesson(LessonType.club, 30, "10", club.id),
+        lesson(LessonType.private, 60, "10", club.id, players[:1], status=LessonStatus.invoiced),
+        lesson(LessonType.club, 60, "40", club.id),
+    ]
+    db_session.add_all(lessons)
+    db_session.commit()
+
+    cards = [
+        {"club_id": club.id, "lesson_type": "private", "min_players": 1, "max_players": 1, "hourly_rate": "60"},
+        {"min_players": 2, "max_players": 4, "hourly_rate": "50", "club_reimbursement_hourly_rate": "10"},
+        {"hourly_rate": "45"},
+        {"hourly_rate": "99", "active": False},
+    ]
+    for card in cards:
+        response = client.post("/api/v1/rate-cards/", json=card, headers=headers)
+        assert response.status_code == 201, response.text
+    # Narrow the catch-all card so club lessons fall back to the coach hourly rate.
+    catch_all = response.json()["id"] - 1
+    assert client.patch(f"/api/v1/rate-cards/{catch_all}", json={"lesson_type": "private", "min_players": 5}, headers=headers).status_code == 200
+    assert client.post("/api/v1/rate-cards/", json={"min_players": 3, "max_players": 1, "hourly_rate": "1"}, headers=headers).status_code == 422
+
+    preview = client.post("/api/v1/rate-cards/reprice", json={"dry_run": True}, headers=headers).json()
+    assert preview["lessons"] == 3
+    assert Decimal(preview["total_before"]) == 30 and Decimal(preview["total_after"]) == 155
+    after = {change["lesson_id"]: (Decimal(change["total_amount_after"]), change["club_reimbursement_after"]) for change in preview["changes"]}
+    assert after == {
+        lessons[0].id: (Decimal(60), None),
+        lessons[1].id: (Decimal(75), 15.0),
+        lessons[2].id: (Decimal(20), None),
+    }
+    db_session.expire_all()
+    assert db_session.get(Lesson, lessons[0].id).total_amount == 10
+
+    applied = client.post("/api/v1/rate-cards/reprice", json={"date_from": "2030-05-01"}, headers=headers).json()
+    assert (applied["dry_run"], applied["lessons"]) == (False, 3)
+    db_session.expire_all()
+    assert [db_session.get(Lesson, item.id).total_amount for item in lessons] == [60, 75, 20, 10, 40]
+    assert db_session.get(Lesson, lessons[1].id).club_reimbursement_amount == 15
+    assert client.post("/api/v1/rate-cards/reprice", json={}, headers=headers).json()["lessons"] == 0
@@ -0,0 +1,95 @@
+from datetime import date, time
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, StrokeCode, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.stroke import Stroke
+from app.models.user import User
+from app.services.recommendations import StrokeRecommender, recommender
+
+
+def get_strokes(db: Session, *codes: StrokeCode):
+    strokes = []
+    for code in codes:
+        stroke = db.query(Stroke).filter(Stroke.code == code).first()
+        if not stroke:
+            stroke = Stroke(code=code, label=code.value.replace("_", " ").title())
+            db.add(stroke)
+            db.commit()
+        strokes.append(stroke)
+    return strokes
+
+
+def create_lesson(db: Session, coach: Coach, players, strokes) -> Lesson:
+    lesson = Lesson(
+        coach_id=coach.id,
+        date=date(2024, 5, 1),
+        start_time=time(9, 0),
+        end_time=time(10, 0),
+        duration_minutes=60,
+        total_amount=40,
+        type=LessonType.private,
+        status=LessonStatus.set,
+        payment_status=LessonPaymentStatus.open,
+    )
+    lesson.players = list(players)
+    lesson.strokes = list(strokes)
+    db.add(lesson)
+    db.commit()
+    db.refresh(lesson)
+    return lesson
+
+
+def test_recommendations_follow_cooccurrence_and_update_incrementally(client: TestClient, db_session: Session):
+    user = User(email="recommend@example.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Recommend Coach", email="recommend@example.com", user=user, active=True)
+    coach.clubs.append(Club(name="Recommend Club"))
+    veteran = Player(full_name="Veteran", skill_level=SkillLevel.advanced, active=True, coaches=[coach])
+    learner = Player(full_name="Learner", skill_level=SkillLevel.advanced, active=True, coaches=[coach])
+    db_session.add_all([coach, veteran, learner])
+    db_session.commit()
+
+    forehand, volley, vibora = get_strokes(db_session, StrokeCode.forehand, StrokeCode.volley, StrokeCode.vibora)
+    create_lesson(db_session, coach, [veteran], [forehand, vibora])
+    create_lesson(db_session, coach, [veteran], [forehand, vibora, volley])
+    create_lesson(db_session, coach, [learner], [forehand])
+    recommender.invalidate()
+
+    token = client.post(
+        "/api/v1/auth/login", json={"email": "recommend@example.com", "password": "pass"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get(f"/api/v1/players/{learner.id}/recommended-strokes", headers=headers)
+    assert response.status_code == 200
+    assert response.json()[0]["code"] == "vibora"
+
+    response = client.post(
+        "/api/v1/lessons/",
+        headers=headers,
+        json={
+            "coach_id": coach.id,
+            "date": "2024-05-08",
+            "start_time": "09:00",
+            "end_time": "10:00",
+            "total_amount": 40,
+            "type": "private",
+            "player_ids": [learner.id],
+            "stroke_codes": ["forehand", "vibora"],
+        },
+    )
+    assert response.status_code == 201
+
+    rebuilt = StrokeRecommender()
+    rebuilt.ensure_loaded(db_session)
+    for level in SkillLevel:
+        assert np.array_equal(recommender._cooccurrence[level], rebuilt._cooccurrence[level])
+
+    response = client.get(f"/api/v1/players/{learner.id}/recommended-strokes", headers=headers)
+    assert response.json()[0]["code"] == "volley"
@@ -0,0 +1,104 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.coach import Coach
+from app.models.enums import InvoiceStatus, UserRole
+from app.models.invoice import Invoice
+from app.models.user import User
+from app.services.reconciliation import (
+    BankTransaction,
+    InvoiceCandidate,
+    InvoiceIndex,
+    parse_ofx,
+    reconcile,
+    referenced_invoice_ids,
+)
+
+OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240305120000<TRNAMT>120.50<NAME>J SMITH<MEMO>inv-0042
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240306<TRNAMT>-15.00<NAME>FEES
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def login(client: TestClient) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": "reconcile@test.com", "password": "pass"})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_parse_ofx_and_references():
+    transactions, errors = parse_ofx(OFX)
+    assert errors == {}
+    assert [(t.posted_on, t.amount_minor) for t in transactions] == [(date(2024, 3, 5), 12050), (date(2024, 3, 6), -1500)]
+    assert referenced_invoice_ids(transactions[0].reference) == [42]
+    assert referenced_invoice_ids("Payment for Invoice #7 and INV 8") == [7, 8]
+
+
+def test_reconcile_prefers_reference_and_flags_ambiguous_amounts():
+    march = date(2024, 3, 1).toordinal()
+    index = InvoiceIndex(
+        [
+            InvoiceCandidate(1, 5000, march),
+            InvoiceCandidate(2, 5000, march + 2),
+            InvoiceCandidate(3, 7000, march - 200),
+        ]
+    )
+    transactions = [
+        BankTransaction(1, date(2024, 3, 10), 5000, "lessons INV2"),
+        BankTransaction(2, date(2024, 3, 11), 5000, "lessons"),
+        BankTransaction(3, date(2024, 3, 12), 7000, "no match in window"),
+    ]
+    result = reconcile(index, transactions, threshold=0.9, window_days=60)
+    assert [(match["row"], match["invoice_id"]) for match in result["matches"]] == [(1, 2)]
+    assert [item["row"] for item in result["review"]] == [2]
+    assert [candidate["invoice_id"] for candidate in result["review"][0]["candidates"]] == [1]
+    assert result["unmatched"] == 1
+
+
+def test_reconcile_endpoint_marks_matched_invoices_paid(client: TestClient, db_session: Session):
+    user = User(email="reconcile@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Reconcile Coach", email="reconcile@test.com", user=user, active=True)
+    db_session.add(coach)
+    db_session.commit()
+    issued_at = datetime(2024, 4, 1, 10, 0)
+    invoices = [
+        Invoice(
+            coach_id=coach.id,
+            period_start=date(2024, 3, 1),
+            period_end=date(2024, 3, 31),
+            status=InvoiceStatus.issued,
+            total_gross=Decimal(amount),
+            total_net=Decimal(amount),
+            issued_at=issued_at,
+        )
+        for amount in ("80.00", "95.50")
+    ]
+    db_session.add_all(invoices)
+    db_session.commit()
+
+    statement = "Date,Amount,Reference\n" + "\n".join(
+        [
+            f"03/04/2024,80.00,INV {invoices[0].id}",
+            f"{(issued_at + timedelta(days=5)):%d/%m/%Y},\"1,000.00\",unknown",
+            "not a date,1,x",
+        ]
+    )
+    response = client.post(
+        "/api/v1/invoices/reconcile",
+        files={"file": ("statement.csv", statement.encode(), "text/csv")},
+        headers={"Authorization": f"Bearer {login(client)}"},
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert (data["transactions"], data["applied"], data["unmatched"]) == (2, 1, 1)
+    assert data["matches"][0]["invoice_id"] == invoices[0].id
+    assert data["errors"] == [{"row": 4, "error": "Unreadable date or amount"}]
+
+    db_session.expire_all()
+    assert [db_session.get(Invoice, invoice.id).status for invoice in invoices] == [InvoiceStatus.paid, InvoiceStatus.issued]
@@ -0,0 +1,168 @@
+import socketserver
+import threading
+from datetime import date, time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, UserRole
+from app.models.lesson import Lesson
+from app.models.lesson_reminder import LessonReminder
+from app.models.player import Player
+from app.models.user import User
+from app.services.email import SMTPConnectionError
+from app.services.reminders import send_lesson_reminders
+
+
+class StandInSMTP(socketserver.ThreadingTCPServer):
+    """Plain-text SMTP server that accepts everything except recipients containing ``reject``.
+
+    A recipient containing ``drop`` makes it hang up and refuse every later connection.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.connections = 0
+        self.messages = []
+        self.refusing = False
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        self.server.connections += 1
+        if self.server.refusing:
+            return
+        self.reply("220 stand-in ESMTP")
+        recipients = []
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 stand-in")
+            elif verb == "RCPT" and "drop" in command:
+                self.server.refusing = True
+                return
+            elif verb == "RCPT" and "reject" in command:
+                self.reply("550 no such user")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[1].strip("<> "))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 go ahead")
+                lines = []
+                for data in self.rfile:
+                    if data in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data.decode())
+                self.server.messages.append((recipients, "".join(lines)))
+                recipients = []
+                self.reply("250 queued")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                if verb == "RSET":
+                    recipients = []
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    server = StandInSMTP()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "smtp_host", "127.0.0.1")
+    monkeypatch.setattr(settings, "smtp_port", server.server_address[1])
+    monkeypatch.setattr(settings, "smtp_tls", False)
+    monkeypatch.setattr(settings, "smtp_from", "coach@lagana.test")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def lesson(coach: Coach, club: Club, day: date, hour: int, players, status=LessonStatus.set) -> Lesson:
+    return Lesson(
+        coach=coach,
+        club=club,
+        date=day,
+        start_time=time(hour, 0),
+        end_time=time(hour + 1, 0),
+        duration_minutes=60,
+        total_amount=40,
+        type=LessonType.private,
+        status=status,
+        payment_status=LessonPaymentStatus.open,
+        players=players,
+    )
+
+
+def test_reminders_reuse_one_connection_and_skip_recorded_sends(db_session: Session, smtp_server: StandInSMTP):
+    day = date(2037, 5, 4)
+    user = User(email="reminder.coach@test.com", hashed_password="x", role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Reminder Coach", email="reminder.coach@test.com", user=user, active=True)
+    club = Club(name="Reminder Club")
+    players = [
+        Player(full_name=f"Reminder {index}", email=f"reminder.{index}@test.com", skill_level=SkillLevel.beginner)
+        for index in range(5)
+    ]
+    players += [
+        Player(full_name="Reminder Reject", email="reminder.reject@test.com", skill_level=SkillLevel.beginner),
+        Player(full_name="Reminder Silent", skill_level=SkillLevel.beginner),
+    ]
+    db_session.add_all(
+        [
+            lesson(coach, club, day, 9, players[:3]),
+            lesson(coach, club, day, 11, players[3:]),
+            lesson(coach, club, day, 13, players[:1], status=LessonStatus.draft),
+            lesson(coach, club, date(2037, 5, 5), 9, players[:1]),
+        ]
+    )
+    db_session.commit()
+
+    result = send_lesson_reminders(db_session, day, batch_size=2)
+    assert result == {"date": day, "pending": 6, "sent": 5, "failed": 1}
+    assert smtp_server.connections == 1
+    assert sorted(recipients[0] for recipients, _ in smtp_server.messages) == [
+        f"reminder.{index}@test.com" for index in range(5)
+    ]
+    recipients, body = smtp_server.messages[0]
+    assert "Subject: Reminder: your lesson on Monday 04 May" in body
+    assert "Hello Reminder 0," in body and "Reminder Coach" in body and "Reminder Club" in body
+    assert db_session.query(LessonReminder).filter(LessonReminder.lesson_date == day).count() == 5
+
+    again = send_lesson_reminders(db_session, day, batch_size=2)
+    assert again == {"date": day, "pending": 1, "sent": 0, "failed": 1}
+    assert len(smtp_server.messages) == 5
+
+
+def test_reminders_stop_when_the_server_goes_away(db_session: Session, smtp_server: StandInSMTP):
+    day = date(2037, 6, 8)
+    user = User(email="reminder.outage@test.com", hashed_password="x", role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Outage Coach", email="reminder.outage@test.com", user=user, active=True)
+    club = Club(name="Outage Club")
+    players = [
+        Player(full_name=f"Outage {index}", email=f"outage.{index}@test.com", skill_level=SkillLevel.beginner)
+        for index in range(2)
+    ]
+    players += [
+        Player(full_name=f"Outage Late {index}", email=f"outage.drop.{index}@test.com", skill_level=SkillLevel.beginner)
+        for index in range(3)
+    ]
+    db_session.add_all([lesson(coach, club, day, 9, players[:2]), lesson(coach, club, day, 11, players[2:])])
+    db_session.commit()
+
+    with pytest.raises(SMTPConnectionError):
+        send_lesson_reminders(db_session, day, batch_size=10)
+
+    # One session for the first sends and one refused reconnect; the remaining rows are not tried.
+    assert smtp_server.connections == 2
+    assert db_session.query(LessonReminder).filter(LessonReminder.lesson_date == day).count() == 2
@@ -0,0 +1,84 @@
+from datetime import date, time
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.user import User
+from app.services.reports import build_retention_matrix, month_index
+
+
+def create_coach(db: Session, email: str) -> Coach:
+    user = User(email=email, hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Report Coach", email=email, user=user, active=True)
+    db.add(coach)
+    db.commit()
+    db.refresh(coach)
+    return coach
+
+
+def create_lesson(db: Session, coach: Coach, players, lesson_date: date) -> Lesson:
+    lesson = Lesson(
+        coach_id=coach.id,
+        date=lesson_date,
+        start_time=time(9, 0),
+        end_time=time(10, 0),
+        duration_minutes=60,
+        total_amount=40,
+        type=LessonType.private,
+        status=LessonStatus.executed,
+        payment_status=LessonPaymentStatus.open,
+    )
+    lesson.players = list(players)
+    db.add(lesson)
+    db.commit()
+    return lesson
+
+
+def test_build_retention_matrix_counts_cohorts():
+    jan, feb, mar = month_index(date(2024, 1, 1)), month_index(date(2024, 2, 1)), month_index(date(2024, 3, 1))
+    player_ids = np.array([1, 1, 1, 2, 3, 3])
+    months = np.array([jan, feb, mar, jan, feb, mar])
+
+    matrix = build_retention_matrix(
+        player_ids, months, first_cohort=jan, last_cohort=feb, max_offset=2, current_month=mar
+    )
+
+    assert matrix.sizes.tolist() == [2, 1]
+    assert matrix.active.tolist() == [[2, 1, 1], [1, 1, 0]]
+    assert matrix.observable.tolist() == [[True, True, True], [True, True, False]]
+
+
+def test_retention_endpoint_is_scoped_to_coach(client: TestClient, db_session: Session):
+    coach = create_coach(db_session, "retention@example.com")
+    other = create_coach(db_session, "retention.other@example.com")
+    alice = Player(full_name="Alice Retained", active=True, coaches=[coach])
+    bob = Player(full_name="Bob Churned", active=True, coaches=[coach, other])
+    db_session.add_all([alice, bob])
+    db_session.commit()
+
+    create_lesson(db_session, coach, [alice, bob], date(2024, 1, 10))
+    create_lesson(db_session, coach, [alice], date(2024, 4, 10))
+    create_lesson(db_session, other, [bob], date(2024, 4, 12))
+
+    token = client.post(
+        "/api/v1/auth/login", json={"email": "retention@example.com", "password": "pass"}
+    ).json()["access_token"]
+    response = client.get(
+        "/api/v1/reports/retention",
+        params={"date_from": "2024-01-01", "date_to": "2024-02-01", "max_offset": 3, "coach_id": other.id},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["coach_id"] == coach.id
+    january = data["cohorts"][0]
+    assert january["cohort"] == "2024-01"
+    assert january["size"] == 2
+    assert january["active"] == [2, 0, 0, 1]
+    assert january["retention"][3] == 0.5
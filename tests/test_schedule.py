@@ -0,0 +1,98 @@
+from datetime import date, time
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.court import Court
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.user import User
+from app.services.occupancy import occupancy
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def booked(coach: Coach, start: time, end: time, courts=()) -> Lesson:
+    lesson = Lesson(
+        coach_id=coach.id,
+        club_id=coach.default_club_id,
+        date=date(2033, 1, 10),
+        start_time=start,
+        end_time=end,
+        duration_minutes=60,
+        total_amount=40,
+        type=LessonType.club,
+        status=LessonStatus.set,
+        payment_status=LessonPaymentStatus.open,
+    )
+    lesson.courts = list(courts)
+    return lesson
+
+
+def test_solve_schedule_packs_the_coach_day_around_existing_bookings(client: TestClient, db_session: Session):
+    club = Club(name="Schedule Club", courts=[Court(name="Centre")])
+    elsewhere = Club(name="Schedule Elsewhere")
+    coaches = []
+    for name in ("schedule.one", "schedule.two"):
+        user = User(email=f"{name}@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+        coach = Coach(full_name=name, email=f"{name}@test.com", user=user, active=True, hourly_rate=Decimal("60"))
+        coach.clubs.append(club)
+        coach.default_club = club
+        coaches.append(coach)
+    player = Player(full_name="Schedule Player", skill_level=SkillLevel.beginner, active=True, coaches=[coaches[0]])
+    db_session.add_all([*coaches, elsewhere, player])
+    db_session.commit()
+    db_session.add_all([booked(coaches[0], time(10, 0), time(11, 0)), booked(coaches[1], time(8, 0), time(9, 0), club.courts)])
+    db_session.commit()
+    occupancy.invalidate(club.id)
+
+    window = {"date": "2033-01-10", "start_time": "08:00", "end_time": "13:00"}
+    requests = [
+        {"player_ids": [player.id], "duration_minutes": 60, "windows": [window]},
+        {"player_ids": [player.id], "duration_minutes": 60, "windows": [window]},
+        {"player_ids": [player.id], "duration_minutes": 60, "windows": [window], "club_id": elsewhere.id},
+        {"player_ids": [player.id], "duration_minutes": 60, "windows": [{**window, "end_time": "09:00"}]},
+    ]
+    headers = {"Authorization": f"Bearer {login(client, 'schedule.one@test.com', 'pass')}"}
+
+    response = client.post("/api/v1/schedule/solve", json={"requests": requests}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"] is False
+    assert [(lesson["request"], lesson["start_time"], lesson["end_time"]) for lesson in body["scheduled"]] == [
+        (0, "09:00:00", "10:00:00"),
+        (1, "11:00:00", "12:00:00"),
+    ]
+    assert {tuple(lesson["court_ids"]) for lesson in body["scheduled"]} == {(club.courts[0].id,)}
+    assert body["gap_minutes"] == 0
+    assert body["unscheduled"] == [
+        {"request": 2, "reason": f"Coach {coaches[0].id} is not a member of club {elsewhere.id}"},
+        {"request": 3, "reason": "No free slot for the coach and courts in the requested windows"},
+    ]
+
+    response = client.post("/api/v1/schedule/solve", json={"requests": requests[:2], "commit": True}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"] is True
+    lesson_ids = [lesson["lesson_id"] for lesson in body["scheduled"]]
+    lessons = db_session.query(Lesson).filter(Lesson.id.in_(lesson_ids)).order_by(Lesson.start_time).all()
+    assert [(lesson.start_time, lesson.total_amount) for lesson in lessons] == [
+        (time(9, 0), Decimal("60.00")),
+        (time(11, 0), Decimal("60.00")),
+    ]
+    assert all(lesson.players == [player] and lesson.courts == club.courts for lesson in lessons)
+
+    response = client.post("/api/v1/schedule/solve", json={"requests": requests[:2]}, headers=headers)
+    assert [lesson["start_time"] for lesson in response.json()["scheduled"]] == ["12:00:00"]
+
+    other = {**requests[0], "coach_id": coaches[1].id}
+    assert client.post("/api/v1/schedule/solve", json={"requests": [other]}, headers=headers).status_code == 403
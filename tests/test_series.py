@@ -0,0 +1,192 @@
+from datetime import date, time, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, UserRole
+from app.models.lesson import Lesson
+from app.models.lesson_series import LessonSeries
+from app.models.player import Player
+from app.models.user import User
+from app.services.series import expand_series, occurrence_dates
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_occurrence_dates_respects_window_and_anchor():
+    days = occurrence_dates("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO", date(2024, 1, 1), date(2024, 1, 10), date(2024, 2, 5))
+    assert days == [date(2024, 1, 15), date(2024, 1, 29)]
+
+
+def test_series_expands_and_propagates_edits(client: TestClient, db_session: Session):
+    user = User(email="series@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Series Coach", email="series@test.com", user=user, active=True)
+    club = Club(name="Series Club")
+    coach.clubs.append(club)
+    coach.default_club = club
+    first = Player(full_name="Series First", skill_level=SkillLevel.beginner, active=True, coaches=[coach])
+    second = Player(full_name="Series Second", skill_level=SkillLevel.beginner, active=True, coaches=[coach])
+    db_session.add_all([coach, club, first, second])
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {login(client, 'series@test.com', 'pass')}"}
+
+    today = date.today()
+    response = client.post(
+        "/api/v1/series/",
+        json={
+            "coach_id": 0,
+            "rrule": "RRULE:FREQ=WEEKLY",
+            "starts_on": today.isoformat(),
+            "ends_on": (today + timedelta(days=27)).isoformat(),
+            "start_time": "17:00",
+            "end_time": "18:00",
+            "total_amount": 35,
+            "type": "private",
+            "player_ids": [first.id],
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    series = response.json()
+    assert series["rrule"] == "FREQ=WEEKLY"
+
+    def occurrences():
+        db_session.expire_all()
+        return db_session.query(Lesson).filter(Lesson.series_id == series["id"]).order_by(Lesson.date).all()
+
+    lessons = occurrences()
+    assert [lesson.date for lesson in lessons] == [today + timedelta(days=7 * week) for week in range(4)]
+    assert all([player.id for player in lesson.players] == [first.id] for lesson in lessons)
+    assert all(lesson.club_id == club.id and lesson.duration_minutes == 60 for lesson in lessons)
+
+    lessons[0].status = LessonStatus.executed
+    db_session.commit()
+
+    response = client.patch(
+        f"/api/v1/series/{series['id']}",
+        json={"end_time": "18:30", "total_amount": 50, "player_ids": [first.id, second.id]},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    lessons = occurrences()
+    assert len(lessons) == 4
+    assert lessons[0].duration_minutes == 60
+    assert [len(lesson.players) for lesson in lessons] == [1, 2, 2, 2]
+    assert {(lesson.duration_minutes, int(lesson.total_amount)) for lesson in lessons[1:]} == {(90, 50)}
+
+    response = client.patch(
+        f"/api/v1/series/{series['id']}",
+        json={"rrule": "FREQ=WEEKLY;INTERVAL=2"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [lesson.date for lesson in occurrences()] == [today, today + timedelta(days=14)]
+
+    response = client.delete(f"/api/v1/series/{series['id']}", headers=headers)
+    assert response.status_code == 200
+    remaining = db_session.query(Lesson).filter(Lesson.id == lessons[0].id).one()
+    assert remaining.series_id is None
+
+
+def test_series_skips_and_refuses_double_bookings(client: TestClient, db_session: Session):
+    user = User(email="series.clash@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Series Clash Coach", email="series.clash@test.com", user=user, active=True)
+    club = Club(name="Series Clash Club")
+    coach.clubs.append(club)
+    coach.default_club = club
+    player = Player(full_name="Series Clash Player", skill_level=SkillLevel.beginner, active=True, coaches=[coach])
+    today = date.today()
+    booked = [
+        Lesson(
+            coach=coach,
+            date=today + timedelta(days=days),
+            start_time=start,
+            end_time=end,
+            duration_minutes=60,
+            total_amount=30,
+            type=LessonType.private,
+            status=LessonStatus.set,
+            payment_status=LessonPaymentStatus.open,
+        )
+        for days, start, end in ((7, time(17, 0), time(18, 0)), (14, time(19, 0), time(20, 0)))
+    ]
+    db_session.add_all([coach, club, player, *booked])
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {login(client, 'series.clash@test.com', 'pass')}"}
+
+    response = client.post(
+        "/api/v1/series/",
+        json={
+            "coach_id": 0,
+            "rrule": "FREQ=WEEKLY",
+            "starts_on": today.isoformat(),
+            "ends_on": (today + timedelta(days=20)).isoformat(),
+            "start_time": "17:00",
+            "end_time": "18:00",
+            "total_amount": 35,
+            "type": "private",
+            "player_ids": [player.id],
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    series_id = response.json()["id"]
+
+    def occurrences():
+        db_session.expire_all()
+        return db_session.query(Lesson).filter(Lesson.series_id == series_id).order_by(Lesson.date).all()
+
+    assert [lesson.date for lesson in occurrences()] == [today, today + timedelta(days=14)]
+
+    assert db_session.get(LessonSeries, series_id).expanded_until == today + timedelta(days=6)
+    result = expand_series(db_session, series_ids=[series_id])
+    assert result["lessons"] == 0
+    assert [(conflict["series_id"], conflict["date"]) for conflict in result["conflicts"]] == [
+        (series_id, today + timedelta(days=7))
+    ]
+    assert f"lesson {booked[0].id}" in result["conflicts"][0]["errors"][0]
+
+    response = client.patch(f"/api/v1/series/{series_id}", json={"end_time": "19:30"}, headers=headers)
+    assert response.status_code == 409
+    assert f"lesson {booked[1].id}" in response.json()["detail"]
+    assert {lesson.end_time for lesson in occurrences()} == {time(18, 0)}
+
+    db_session.delete(booked[0])
+    db_session.commit()
+    result = expand_series(db_session, series_ids=[series_id])
+    assert (result["lessons"], result["conflicts"]) == (1, [])
+    assert [lesson.date for lesson in occurrences()] == [today + timedelta(days=7 * week) for week in range(3)]
+
+
+def test_lapsed_series_resumes_at_today(db_session: Session):
+    user = User(email="series.lapsed@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="Series Lapsed Coach", email="series.lapsed@test.com", user=user, active=True)
+    db_session.add(coach)
+    db_session.commit()
+    today = date(2031, 6, 2)
+    series = LessonSeries(
+        coach_id=coach.id,
+        rrule="FREQ=WEEKLY",
+        starts_on=today - timedelta(days=70),
+        start_time=time(8, 0),
+        end_time=time(9, 0),
+        duration_minutes=60,
+        total_amount=30,
+        type=LessonType.club,
+        status=LessonStatus.set,
+        expanded_until=today - timedelta(days=28),
+    )
+    db_session.add(series)
+    db_session.commit()
+
+    result = expand_series(db_session, series_ids=[series.id], today=today, horizon_days=20)
+    dates = [lesson.date for lesson in db_session.query(Lesson).filter(Lesson.series_id == series.id).order_by(Lesson.date)]
+    assert dates == [today + timedelta(days=7 * week) for week in range(3)]
+    assert result["lessons"] == 3
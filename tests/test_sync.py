@@ -0,0 +1,229 @@
+import uuid
+from datetime import date, datetime, time, timedelta
+from time import sleep
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.club import Club
+from app.models.coach import Coach
+from app.models.court import Court
+from app.models.enums import LessonPaymentStatus, LessonStatus, LessonType, SkillLevel, UserRole
+from app.models.lesson import Lesson
+from app.models.player import Player
+from app.models.user import User
+from app.services import sync as sync_service
+
+
+def login(client: TestClient, email: str, password: str) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def make_lesson(coach: Coach, club: Club, hour: int) -> Lesson:
+    return Lesson(
+        coach=coach,
+        club=club,
+        date=date(2034, 2, 1),
+        start_time=time(hour, 0),
+        end_time=time(hour + 1, 0),
+        duration_minutes=60,
+        total_amount=40,
+        type=LessonType.club,
+        status=LessonStatus.set,
+        payment_status=LessonPaymentStatus.open,
+    )
+
+
+def sync_all(client: TestClient, headers: dict, token=None, limit=2):
+    merged = {"lessons": [], "players": [], "clubs": [], "courts": [], "deleted": []}
+    pages = 0
+    while True:
+        params = {"limit": limit, **({"since": token} if token else {})}
+        response = client.get("/api/v1/sync/changes", params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        for key in merged:
+            merged[key].extend(body[key])
+        token, pages = body["next_token"], pages + 1
+        if not body["has_more"]:
+            return merged, token, pages
+
+
+def test_sync_changes_pages_through_upserts_and_tombstones(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "sync_settle_seconds", 0)
+    coaches = []
+    for name in ("sync.one", "sync.two"):
+        user = User(email=f"{name}@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+        coaches.append(Coach(full_name=name, email=f"{name}@test.com", user=user, active=True))
+    club = Club(name="Sync Club", courts=[Court(name="Sync 1"), Court(name="Sync 2")])
+    for coach in coaches:
+        coach.clubs.append(club)
+    player = Player(full_name="Sync Player", skill_level=SkillLevel.beginner, active=True, coaches=[coaches[0]])
+    lessons = [make_lesson(coaches[0], club, 9), make_lesson(coaches[0], club, 11), make_lesson(coaches[1], club, 13)]
+    db_session.add_all([*coaches, player, *lessons])
+    db_session.commit()
+    kept, dropped, foreign = (lesson.id for lesson in lessons)
+    # One shared timestamp makes the first sync page through ties on (kind, id).
+    for model, rows in ((Club, [club]), (Court, club.courts), (Player, [player]), (Lesson, lessons)):
+        ids = [row.id for row in rows]
+        db_session.execute(update(model).where(model.id.in_(ids)).values(updated_at=datetime(2026, 1, 1)))
+    db_session.commit()
+
+    headers = {"Authorization": f"Bearer {login(client, 'sync.one@test.com', 'pass')}"}
+    first, token, pages = sync_all(client, headers)
+    assert pages > 1
+    assert sorted(lesson["id"] for lesson in first["lessons"]) == [kept, dropped]
+    assert [item["full_name"] for item in first["players"]] == ["Sync Player"]
+    assert [item["name"] for item in first["clubs"]] == ["Sync Club"]
+    assert {court["club_id"] for court in first["courts"]} == {club.id}
+
+    assert client.patch(f"/api/v1/lessons/{kept}", json={"notes": "moved"}, headers=headers).status_code == 200
+    assert client.delete(f"/api/v1/lessons/{dropped}", headers=headers).status_code == 200
+    court_id = club.courts[1].id
+    assert client.delete(f"/api/v1/clubs/{club.id}/courts/{court_id}", headers=headers).status_code == 200
+    other = {"Authorization": f"Bearer {login(client, 'sync.two@test.com', 'pass')}"}
+    assert client.delete(f"/api/v1/lessons/{foreign}", headers=other).status_code == 200
+
+    delta, next_token, _ = sync_all(client, headers, token, limit=50)
+    assert [(lesson["id"], lesson["notes"]) for lesson in delta["lessons"]] == [(kept, "moved")]
+    assert {(item["entity"], item["id"]) for item in delta["deleted"]} == {("lessons", dropped), ("courts", court_id)}
+    assert delta["players"] == []
+
+    response = client.get("/api/v1/sync/changes", params={"since": next_token}, headers=headers).json()
+    assert response["lessons"] == [] and response["deleted"] == []
+    assert response["next_token"] == next_token and response["has_more"] is False
+
+    # Deletions outside the coach's clubs and players stay invisible, like the rows themselves.
+    elsewhere = Club(name="Sync Elsewhere", courts=[Court(name="Elsewhere 1")])
+    stranger = Player(full_name="Sync Stranger", skill_level=SkillLevel.beginner, active=True, coaches=[coaches[1]])
+    db_session.add_all([elsewhere, stranger])
+    db_session.commit()
+    hidden = {("courts", elsewhere.courts[0].id), ("clubs", elsewhere.id), ("players", stranger.id)}
+    # SQLite stores ``now()`` to the second; keep these tombstones clear of the second ``next_token`` ends on.
+    sleep(1)
+    db_session.delete(elsewhere.courts[0])
+    db_session.delete(stranger)
+    db_session.commit()
+    db_session.delete(elsewhere)
+    db_session.commit()
+    unseen, _, _ = sync_all(client, headers, next_token, limit=50)
+    assert hidden.isdisjoint((item["entity"], item["id"]) for item in unseen["deleted"])
+    seen_by_other, _, _ = sync_all(client, other, next_token, limit=50)
+    assert ("players", stranger.id) in {(item["entity"], item["id"]) for item in seen_by_other["deleted"]}
+
+    assert client.get("/api/v1/sync/changes", params={"since": "not-a-token"}, headers=headers).status_code == 400
+
+
+def test_sync_waits_for_transactions_longer_than_the_settle_window(client: TestClient, db_session: Session, monkeypatch):
+    user = User(email="sync.long@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+    coach = Coach(full_name="sync.long", email="sync.long@test.com", user=user, active=True)
+    club = Club(name="Sync Long Club")
+    coach.clubs.append(club)
+    before, during = make_lesson(coach, club, 8), make_lesson(coach, club, 10)
+    db_session.add_all([coach, before, during])
+    db_session.commit()
+    # A write transaction opened a minute ago, far longer than the settle window, is still running.
+    started = datetime.utcnow().replace(microsecond=0) - timedelta(seconds=60)
+    for lesson, moment in ((before, started - timedelta(seconds=30)), (during, started + timedelta(seconds=30))):
+        db_session.execute(update(Lesson).where(Lesson.id == lesson.id).values(updated_at=moment))
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {login(client, 'sync.long@test.com', 'pass')}"}
+
+    monkeypatch.setattr(sync_service, "_oldest_open_transaction", lambda db: started)
+    first, token, _ = sync_all(client, headers, limit=50)
+    assert [lesson["id"] for lesson in first["lessons"]] == [before.id]
+
+    # It commits a row stamped with its start time; the next page still delivers it.
+    late = make_lesson(coach, club, 12)
+    db_session.add(late)
+    db_session.commit()
+    db_session.execute(update(Lesson).where(Lesson.id == late.id).values(updated_at=started))
+    db_session.commit()
+    monkeypatch.setattr(sync_service, "_oldest_open_transaction", lambda db: None)
+    second, _, _ = sync_all(client, headers, token, limit=50)
+    assert [lesson["id"] for lesson in second["lessons"]] == sorted([late.id, during.id])
+
+
+def test_upsert_applies_offline_mutations_last_writer_wins(client: TestClient, db_session: Session):
+    for name in ("upsert.one", "upsert.two"):
+        user = User(email=f"{name}@test.com", hashed_password=get_password_hash("pass"), role=UserRole.coach, is_active=True)
+        coach = Coach(full_name=name, email=f"{name}@test.com", user=user, active=True)
+        coach.clubs.append(Club(name=f"{name} club"))
+        db_session.add(coach)
+    db_session.commit()
+    club_id = db_session.query(Club).filter(Club.name == "upsert.one club").one().id
+    headers = {"Authorization": f"Bearer {login(client, 'upsert.one@test.com', 'pass')}"}
+    court, player, lesson = (str(uuid.uuid4()) for _ in range(3))
+    payload = {
+        "courts": [{"client_id": court, "club_id": club_id, "name": "Offline 1", "updated_at": "2026-01-01T10:00:00Z"}],
+        "players": [{"client_id": player, "full_name": "Offline Player", "updated_at": "2026-01-01T10:00:00Z"}],
+        "lessons": [
+            {
+                "client_id": lesson,
+                "club_id": club_id,
+                "date": "2036-03-01",
+                "start_time": "09:00",
+                "end_time": "10:00",
+                "total_amount": 30,
+                "type": "private",
+                "notes": "first",
+                "player_client_ids": [player],
+                "court_client_ids": [court],
+                "updated_at": "2026-01-01T10:00:00Z",
+            }
+        ],
+    }
+
+    first = client.put("/api/v1/sync/upsert", json=payload, headers=headers)
+    assert first.status_code == 200
+    body = first.json()
+    assert set(body["courts"]) == {court} and set(body["players"]) == {player} and set(body["lessons"]) == {lesson}
+    assert body["stale"] == [] and body["errors"] == []
+    stored = db_session.get(Lesson, body["lessons"][lesson])
+    assert [p.full_name for p in stored.players] == ["Offline Player"]
+    assert [c.name for c in stored.courts] == ["Offline 1"]
+
+    assert client.put("/api/v1/sync/upsert", json=payload, headers=headers).json() == body
+    assert db_session.query(Lesson).filter(Lesson.client_id == uuid.UUID(lesson)).count() == 1
+
+    older = {"lessons": [{**payload["lessons"][0], "notes": "older", "updated_at": "2026-01-01T09:00:00Z"}]}
+    response = client.put("/api/v1/sync/upsert", json=older, headers=headers).json()
+    assert response["stale"] == [lesson] and response["lessons"] == body["lessons"]
+
+    newer = {
+        "lessons": [
+            {**payload["lessons"][0], "notes": "newer", "court_client_ids": [], "updated_at": "2026-01-01T12:00:00+01:00"}
+        ]
+    }
+    response = client.put("/api/v1/sync/upsert", json=newer, headers=headers).json()
+    assert response["stale"] == [] and response["lessons"] == body["lessons"]
+    db_session.expire_all()
+    stored = db_session.get(Lesson, body["lessons"][lesson])
+    assert stored.notes == "newer" and stored.courts == []
+
+    broken = {**payload["lessons"][0], "client_id": str(uuid.uuid4()), "player_client_ids": [str(uuid.uuid4())]}
+    response = client.put("/api/v1/sync/upsert", json={"lessons": [broken]}, headers=headers).json()
+    assert response["lessons"] == {} and response["errors"][0]["client_id"] == broken["client_id"]
+
+    other = {"Authorization": f"Bearer {login(client, 'upsert.two@test.com', 'pass')}"}
+    response = client.put("/api/v1/sync/upsert", json={"players": payload["players"]}, headers=other).json()
+    assert response["players"] == {} and response["errors"] == [{"client_id": player, "errors": ["Forbidden"]}]
+
+    retried = {
+        "coach_id": 0,
+        "client_id": str(uuid.uuid4()),
+        "date": "2036-03-02",
+        "start_time": "09:00",
+        "end_time": "10:00",
+        "total_amount": 30,
+        "type": "club",
+    }
+    created = client.post("/api/v1/lessons/", json=retried, headers=headers)
+    again = client.post("/api/v1/lessons/", json=retried, headers=headers)
+    assert (created.status_code, again.status_code) == (201, 200)
+    assert again.json()["id"] == created.json()["id"] and again.json()["client_id"] == retried["client_id"]